@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { Card, Row, Col, Table, Progress, Tag, Typography, Statistic, Empty, message, Select, Space, Modal, List, Divider, Button, Tooltip } from 'antd';
 import { CheckCircleOutlined, WarningOutlined, AppstoreOutlined, DashboardOutlined, FilterOutlined, ExclamationCircleOutlined, InfoCircleOutlined, QuestionCircleOutlined, CaretUpOutlined, CaretDownOutlined } from '@ant-design/icons';
-import { QualityMetrics } from '../../types/api';
+import { QualityMetrics, QualityDistributions, MetricSummary } from '../../types/api';
 import ApiService from '../../services/api';
 
 const { Title, Text } = Typography;
@@ -10,8 +10,26 @@ interface QualityMetricsPageProps {
   analysisId: string | null;
 }
 
+const LEVEL_LABELS: Record<string, string> = { module: '모듈', class: '클래스', method: '메소드' };
+
+// 서버가 미리 계산한 히스토그램을 막대로 표시 (구간 경계는 서버 값 그대로)
+const HistogramBars: React.FC<{ summary: MetricSummary; color: string }> = ({ summary, color }) => {
+  const { edges, counts } = summary.histogram;
+  const maxCount = Math.max(1, ...counts);
+  return (
+    <div style={{ display: 'flex', alignItems: 'flex-end', gap: 2, height: 48 }}>
+      {counts.map((count, i) => (
+        <Tooltip key={i} title={`${edges[i]}${i + 1 < edges.length ? `–${edges[i + 1]}` : '+'}: ${count}`}>
+          <div style={{ flex: 1, height: `${(count / maxCount) * 100}%`, minHeight: count ? 2 : 0, background: color }} />
+        </Tooltip>
+      ))}
+    </div>
+  );
+};
+
 const QualityMetricsPage: React.FC<QualityMetricsPageProps> = ({ analysisId }) => {
   const [metrics, setMetrics] = useState<QualityMetrics[]>([]);
+  const [distributions, setDistributions] = useState<QualityDistributions | null>(null);
   const [filteredMetrics, setFilteredMetrics] = useState<QualityMetrics[]>([]);
   const [entityTypeFilter, setEntityTypeFilter] = useState<string | undefined>(undefined);
   const [currentPage, setCurrentPage] = useState(1);
@@ -28,6 +46,20 @@ const QualityMetricsPage: React.FC<QualityMetricsPageProps> = ({ analysisId }) =
     let isMounted = true;
     const abortController = new AbortController();
 
+    // 요약/분포는 서버에서 미리 계산된 값을 사용 (엔티티 목록은 상세 테이블에만 사용)
+    const fetchDistributions = async () => {
+      try {
+        const response = await ApiService.getQualityDistributions(analysisId);
+        if (isMounted) {
+          setDistributions(response);
+        }
+      } catch (error) {
+        if (isMounted) {
+          setDistributions(null); // 분포가 없는 분석 (데모 등): 엔티티 목록으로 계산
+        }
+      }
+    };
+
     const fetchMetrics = async () => {
       try {
         const response = await ApiService.getQualityMetrics(analysisId);
@@ -43,6 +75,7 @@ const QualityMetricsPage: React.FC<QualityMetricsPageProps> = ({ analysisId }) =
       }
     };
 
+    fetchDistributions();
     fetchMetrics();
 
     return () => {
@@ -150,11 +183,31 @@ const QualityMetricsPage: React.FC<QualityMetricsPageProps> = ({ analysisId }) =
   };
 
   const calculateOverallStats = () => {
+    if (distributions && distributions.entity_count > 0) {
+      const levels = Object.values(distributions.levels);
+      const total = levels.reduce((sum, level) => sum + level.count, 0) || 1;
+      const weightedMean = (name: string) =>
+        levels.reduce((sum, level) => sum + (level.metrics[name]?.mean ?? 0) * level.count, 0) / total;
+      const gradeDistribution = levels.reduce((acc: Record<string, number>, level) => {
+        Object.entries(level.grades).forEach(([grade, count]) => {
+          if (count) acc[grade] = (acc[grade] || 0) + count;
+        });
+        return acc;
+      }, {});
+      return {
+        avgComplexity: weightedMean('cyclomatic_complexity'),
+        avgMaintainability: weightedMean('maintainability_index'),
+        gradeDistribution,
+        entityCount: distributions.entity_count
+      };
+    }
+
     if (metrics.length === 0) {
       return { 
         avgComplexity: 0, 
         avgMaintainability: 0, 
-        gradeDistribution: {} as Record<string, number>
+        gradeDistribution: {} as Record<string, number>,
+        entityCount: 0
       };
     }
     
@@ -166,10 +219,10 @@ const QualityMetricsPage: React.FC<QualityMetricsPageProps> = ({ analysisId }) =
       return acc;
     }, {});
 
-    return { avgComplexity, avgMaintainability, gradeDistribution };
+    return { avgComplexity, avgMaintainability, gradeDistribution, entityCount: metrics.length };
   };
 
-  const { avgComplexity, avgMaintainability, gradeDistribution } = calculateOverallStats();
+  const { avgComplexity, avgMaintainability, gradeDistribution, entityCount } = calculateOverallStats();
 
   const columns = [
     {
@@ -400,7 +453,7 @@ const QualityMetricsPage: React.FC<QualityMetricsPageProps> = ({ analysisId }) =
             <Card>
               <Statistic
                 title="전체 엔티티"
-                value={metrics.length}
+                value={entityCount}
                 prefix={<AppstoreOutlined />}
               />
             </Card>
@@ -423,6 +476,62 @@ const QualityMetricsPage: React.FC<QualityMetricsPageProps> = ({ analysisId }) =
         </Row>
       </Card>
 
+      {/* Per-level distributions (precomputed by the server) */}
+      {distributions && Object.keys(distributions.levels).length > 0 && (
+        <Card
+          title="레벨별 분포"
+          size="small"
+          style={{ marginBottom: '24px' }}
+          extra={distributions.method === 'histogram' && <Text type="secondary">백분위수는 히스토그램 추정값</Text>}
+        >
+          <Row gutter={16}>
+            {Object.entries(distributions.levels).map(([level, summary]) => {
+              const complexity = summary.metrics['cyclomatic_complexity'];
+              const maintainability = summary.metrics['maintainability_index'];
+              return (
+                <Col span={8} key={level}>
+                  <Card size="small" title={`${LEVEL_LABELS[level] || level} (${summary.count})`}>
+                    {complexity && (
+                      <div style={{ marginBottom: 12 }}>
+                        <Text type="secondary" style={{ fontSize: 12 }}>
+                          복잡도 p50 {complexity.p50.toFixed(1)} · p90 {complexity.p90.toFixed(1)} · p99 {complexity.p99.toFixed(1)}
+                        </Text>
+                        <HistogramBars summary={complexity} color={getEntityTypeColor(level)} />
+                      </div>
+                    )}
+                    {maintainability && (
+                      <div style={{ marginBottom: 12 }}>
+                        <Text type="secondary" style={{ fontSize: 12 }}>
+                          유지보수성 p50 {maintainability.p50.toFixed(1)} · p90 {maintainability.p90.toFixed(1)}
+                        </Text>
+                        <HistogramBars summary={maintainability} color="#13c2c2" />
+                      </div>
+                    )}
+                    {summary.worst && summary.worst.length > 0 && (
+                      <List
+                        size="small"
+                        header={<Text strong style={{ fontSize: 12 }}>개선 우선 대상</Text>}
+                        dataSource={summary.worst.slice(0, 5)}
+                        renderItem={(entry) => (
+                          <List.Item style={{ padding: '4px 0' }}>
+                            <Tooltip title={entry.entity_id}>
+                              <Text style={{ fontSize: 12 }}>{entry.entity_id.split(':').pop()}</Text>
+                            </Tooltip>
+                            <Tag color={getGradeColor(entry.quality_grade)} style={{ fontSize: 11 }}>
+                              {entry.maintainability_index.toFixed(1)}
+                            </Tag>
+                          </List.Item>
+                        )}
+                      />
+                    )}
+                  </Card>
+                </Col>
+              );
+            })}
+          </Row>
+        </Card>
+      )}
+
       {/* Metrics Table */}
       <Card 
         title="상세 품질 메트릭" 
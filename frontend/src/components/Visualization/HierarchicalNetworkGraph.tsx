@@ -173,7 +173,7 @@ const HierarchicalNetworkGraph: React.FC<HierarchicalGraphProps> = ({
       const packageId = `pkg:${packageName}`;
       return allNodes.find(n => n.id === packageId)?.id;
     } else if (nodeId.startsWith('meth:') || nodeId.startsWith('field:')) {
-      // meth:cls:module_id:class_name:method_name:line_number → cls:module_id:class_name
+      // meth:cls:module_id:class_name:method_name → cls:module_id:class_name
       const parts = nodeId.split(':');
       if (parts.length >= 4 && parts[1] === 'cls') {
         const classId = `${parts[1]}:${parts[2]}:${parts[3]}`;
@@ -690,8 +690,8 @@ const HierarchicalNetworkGraph: React.FC<HierarchicalGraphProps> = ({
 
   // 클래스 ID 추출 (method/field에서)
   const extractClassId = (nodeId: string): string | null => {
-    // PyView 형식: meth:cls:mod:module_name:ClassName:method_name:line_number → cls:mod:module_name:ClassName
-    // PyView 형식: field:cls:mod:module_name:ClassName:field_name:line_number → cls:mod:module_name:ClassName
+    // PyView 형식: meth:cls:mod:module_name:ClassName:method_name → cls:mod:module_name:ClassName
+    // PyView 형식: field:cls:mod:module_name:ClassName:field_name → cls:mod:module_name:ClassName
     if (nodeId.startsWith('meth:') || nodeId.startsWith('field:')) {
       const parts = nodeId.split(':');
       if (parts.length >= 5 && parts[1] === 'cls') {
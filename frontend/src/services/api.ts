@@ -9,6 +9,7 @@ import type {
   SearchRequest,
   SearchResponse,
   QualityMetrics,
+  QualityDistributions,
   CycleDetectionResponse,
   ErrorResponse
 } from '@/types/api'
@@ -79,6 +80,12 @@ export class ApiService {
     return response.data
   }
 
+  // Get precomputed quality metric distributions (histograms, percentiles, worst-N)
+  static async getQualityDistributions(analysisId: string): Promise<QualityDistributions> {
+    const response = await apiClient.get<QualityDistributions>(`/analysis/${analysisId}/quality-distributions`)
+    return response.data
+  }
+
   // Get cycle detection results for analysis
   static async getCycleDetection(analysisId: string): Promise<CycleDetectionResponse> {
     const response = await apiClient.get<CycleDetectionResponse>(`/analysis/${analysisId}/cycles`)
@@ -78,6 +78,43 @@ export interface QualityMetrics {
   cycle_type?: string
 }
 
+// 서버에서 미리 계산된 품질 메트릭 분포
+export interface MetricSummary {
+  min: number
+  max: number
+  mean: number
+  p50: number
+  p90: number
+  p95: number
+  p99: number
+  histogram: {
+    edges: number[]
+    counts: number[]
+  }
+}
+
+export interface WorstEntity {
+  entity_id: string
+  maintainability_index: number
+  cyclomatic_complexity: number
+  lines_of_code: number
+  quality_grade: string
+}
+
+export interface LevelDistribution {
+  count: number
+  grades: Record<string, number>
+  metrics: Record<string, MetricSummary>
+  worst?: WorstEntity[]
+}
+
+export interface QualityDistributions {
+  entity_count: number
+  method: 'exact' | 'histogram'
+  levels: Record<string, LevelDistribution>
+  packages: Record<string, Record<string, LevelDistribution>>
+}
+
 // 순환 참조 관련 타입들
 export interface CyclePath {
   nodes: string[]
@@ -5,30 +5,42 @@ pydeps 모듈 레벨 분석과 AST 기반 클래스/메소드/필드 분석을 
 완전한 5단계 의존성 분석을 제공
 """
 
+import functools
 import os
 import sys
 import uuid
 import time
 import logging
 from pathlib import Path
-from typing import List, Dict, Set, Optional, Callable
+from typing import List, Dict, Set, Optional, Callable, Any
+from dataclasses import replace
 from datetime import datetime, timedelta
-from concurrent.futures import ProcessPoolExecutor, as_completed
 
 DEBUG_MODE = os.getenv('PYVIEW_DEBUG', 'false').lower() == 'true'
 
 from .models import (
     AnalysisResult, ProjectInfo, DependencyGraph,
     PackageInfo, ModuleInfo, ClassInfo, MethodInfo,
-    Relationship, CyclicDependency, QualityMetrics, EntityType,
-    create_module_id
+    Relationship, CyclicDependency, QualityMetrics, DependencyType,
+    create_package_id
 )
 from .ast_analyzer import ASTAnalyzer, FileAnalysis
 from .legacy_bridge import LegacyBridge
 from .code_metrics import CodeMetricsEngine
-from .cache_manager import CacheManager, IncrementalAnalyzer, AnalysisCache, FileMetadata
-from .performance_optimizer import LargeProjectAnalyzer, PerformanceConfig, ResultPaginator
+from .cache_manager import (
+    CacheManager, IncrementalAnalyzer, AnalysisCache, FileMetadata, build_reverse_import_graph
+)
+from .performance_optimizer import LargeProjectAnalyzer, MemoryMonitor, ParallelAnalyzer, PerformanceConfig
+from .cost_model import CostModel, AnalysisPlan
 from .gitignore_patterns import create_gitignore_matcher
+from .metric_distributions import compute_metric_distributions
+from .canonicalize import EntityCanonicalizer, normalize_path
+from .module_graph import ModuleGraph, build_module_import_edges, module_import_edges, imports_any
+from .file_cache import FileAnalysisCache
+from .cache_index import CacheIndex
+from .pipeline import StreamingIntegrator
+from .progress import ProgressChannel, DEFAULT_RATE_HZ
+from .entity_registry import EdgeTable, EntityRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -60,21 +72,12 @@ class AnalysisOptions:
         self.max_memory_mb = max_memory_mb                                                   # 메모리 사용량 제한 설정
 
 
-class ProgressCallback:
-    """분석 진행 상황을 받기 위한 인터페이스"""
+class ProgressCallback(ProgressChannel):
+    """분석 진행 상황을 받기 위한 인터페이스 (단계 변경은 즉시, 파일 단위 진행은 초당 rate_hz회로 합쳐서 전달)"""
 
-    def __init__(self, callback: Callable[[dict], None] = None):
+    def __init__(self, callback: Callable[[dict], None] = None, rate_hz: float = DEFAULT_RATE_HZ):
         """진행률 콜백 초기화"""
-        self.callback = callback or self._default_callback                                   # 사용자 정의 콜백 또는 기본 콜백 사용
-
-    def update(self, stage: str, progress: float, **kwargs):
-        """진행 상황 업데이트"""
-        data = {
-            'stage': stage,                                                                  # 현재 진행 중인 단계
-            'progress': progress,                                                            # 진행률 (0-100)
-            **kwargs                                                                         # 추가 정보들
-        }
-        self.callback(data)                                                                  # 콜백 함수 호출
+        super().__init__(callback or self._default_callback, rate_hz)                       # 사용자 정의 콜백 또는 기본 콜백 사용
 
     def _default_callback(self, data: dict):
         """콘솔에 로그를 출력하는 기본 콜백"""
@@ -86,17 +89,24 @@ class ProgressCallback:
 class AnalyzerEngine:
     """모든 분석 컴포넌트를 조율하는 메인 분석 엔진"""
 
-    def __init__(self, options: AnalysisOptions = None):
-        """분석 엔진 초기화"""
+    def __init__(self, options: AnalysisOptions = None, cache_manager: Optional[CacheManager] = None):
+        """분석 엔진 초기화 (cache_manager: 서버처럼 여러 엔진이 메모리 캐시를 공유할 때 전달)"""
         self.options = options or AnalysisOptions()                                          # 분석 옵션 설정 (기본값 또는 사용자 지정)
         self.logger = logging.getLogger(__name__)                                            # 로거 초기화
 
         # 핵심 분석 컴포넌트들 초기화
-        self.ast_analyzer = ASTAnalyzer(enable_type_inference=self.options.enable_type_inference)  # AST 기반 상세 분석기
+        self.cache_manager = ((cache_manager or CacheManager())                               # 분석 결과 캐시 관리자
+                              if options and options.enable_caching else None)
+        self.incremental_analyzer = IncrementalAnalyzer(self.cache_manager) if self.cache_manager else None  # 증분 분석기
+        self.file_cache = self.cache_manager.file_cache if self.cache_manager else None      # 파일 내용 기준 캐시 (프로젝트/체크아웃 간 공유, 같은 크기 한도)
+        self.ast_analyzer = ASTAnalyzer(                                                     # AST 기반 상세 분석기 (품질 메트릭도 같은 패스에서 계산)
+            enable_type_inference=self.options.enable_type_inference,
+            enable_quality_metrics=self.options.enable_quality_metrics,
+            file_cache=self.file_cache
+        )
         self.legacy_bridge = LegacyBridge()                                                  # pydeps 연동 브리지
         self.metrics_engine = CodeMetricsEngine() if self.options.enable_quality_metrics else None  # 코드 품질 메트릭 엔진
-        self.cache_manager = CacheManager() if options and options.enable_caching else None  # 분석 결과 캐시 관리자
-        self.incremental_analyzer = IncrementalAnalyzer(self.cache_manager) if self.cache_manager else None  # 증분 분석기
+        self.canonicalizer = EntityCanonicalizer()                                           # ID 기준 중복 병합 (분석마다 새로 생성)
 
         # 성능 최적화 컴포넌트들
         if options and options.enable_performance_optimization:                              # 성능 최적화가 활성화된 경우
@@ -108,15 +118,24 @@ class AnalyzerEngine:
                 enable_gc=True                                                               # 가비지 컬렉션 활성화
             )
             self.large_project_analyzer = LargeProjectAnalyzer(perf_config)                  # 대규모 프로젝트 분석기
-            self.result_paginator = ResultPaginator()                                        # 결과 페이징 처리기
+            self.cost_model = CostModel(                                                     # 샘플 파싱 기반 시간/메모리 예측과 전략 선택
+                max_memory_mb=options.max_memory_mb,
+                max_workers=options.max_workers,
+                enable_type_inference=self.options.enable_type_inference,
+                enable_quality_metrics=self.options.enable_quality_metrics
+            )
         else:
             self.large_project_analyzer = None                                               # 성능 최적화 비활성화
-            self.result_paginator = None
+            self.cost_model = None
 
         # 분석 상태 관리
         self.current_analysis_id: Optional[str] = None                                       # 현재 분석 세션 ID
         self.total_files = 0                                                                 # 전체 파일 수
+        self.file_metadata: Dict[str, FileMetadata] = {}                                     # 이번 분석에서 워커가 읽은 파일의 stat/해시
         self.processed_files = 0                                                             # 처리된 파일 수
+        self.module_graph: Optional[ModuleGraph] = None                                      # 마지막 분석의 모듈 import 그래프 (캐시에 함께 저장)
+        self.analysis_plan: Optional[AnalysisPlan] = None                                     # 마지막 전체 분석의 비용 모델 계획
+        self.entity_registry = EntityRegistry()                                              # 엔티티 ID 문자열 → 정수 (조인/그래프 알고리즘용)
     
     def analyze_project(self,
                        project_path: str,
@@ -133,6 +152,9 @@ class AnalyzerEngine:
         """
         start_time = time.time()                        # 분석 시작 시간 기록 (성능 측정용)
         self.current_analysis_id = str(uuid.uuid4())    # 각 분석 세션을 UUID로 고유 식별
+        self.file_metadata = {}                         # 캐시 저장 시 파일을 다시 읽지 않도록 워커 결과에서 수집
+        self.analysis_plan = None                       # 이전 분석의 계획이 증분 분석에 쓰이지 않도록 초기화
+        self.entity_registry = EntityRegistry()         # 분석마다 새 문자열 테이블
 
         if progress_callback is None:                   # 진행률 콜백이 없으면 기본 콜백 생성
             progress_callback = ProgressCallback()
@@ -143,17 +165,6 @@ class AnalyzerEngine:
             project_files = self._discover_project_files(project_path)      # 프로젝트 내 모든 Python 파일 수집
             self.total_files = len(project_files)                           # 전체 파일 수 저장 (진행률 계산용)
 
-            # Stage 1.2: Check for large project optimization
-            if self.large_project_analyzer and len(project_files) > 1000:  # 대규모 프로젝트 최적화 조건 확인 (1000개 파일 초과)
-                progress_callback.update("Analyzing project complexity", 7) # 진행률 7% - 복잡도 분석 시작
-                project_stats = self.large_project_analyzer.estimate_project_size(project_path)  # 파일 수뿐만 아니라 실제 복잡도 측정
-
-                if project_stats['complexity'] in ['high', 'very_high']:    # 높은 복잡도면 최적화된 분석 방법 사용
-                    progress_callback.update("Large project detected, using optimized analysis", 10)  # 진행률 10% - 대규모 분석 모드
-                    return self._analyze_large_project(project_path, project_files, progress_callback, start_time)  # 스트리밍 처리로 분석
-                else:
-                    progress_callback.update("Project size manageable, using standard analysis", 10)  # 진행률 10% - 표준 분석 모드
-
             # Stage 1.5: Check for incremental analysis possibility
             cache_id = None                                                 # 캐시 ID 초기화
             if self.incremental_analyzer:                                   # 증분 분석기가 활성화된 경우
@@ -166,11 +177,20 @@ class AnalyzerEngine:
                     progress_callback.update("Performing incremental analysis", 10)  # 진행률 10% - 증분 분석 시작
                     try:
                         # Attempt incremental analysis
-                        def full_analysis_fallback(path, files):           # 증분 분석 실패 시 대체 함수 정의
-                            return self._perform_full_analysis(path, files, progress_callback)  # 전체 분석으로 폴백
+                        def full_analysis_fallback(path, files):           # 변경이 너무 많을 때 사용하는 전체 분석 함수
+                            return self._perform_planned_analysis(path, files, progress_callback, start_time)  # 비용 모델 계획대로 전체 분석
+
+                        def merge_changes(cached_result, changed_files, deleted_files, module_graph=None):  # 변경 파일만 재분석해 캐시된 결과에 병합
+                            return self._perform_incremental_merge(
+                                project_path, cached_result, changed_files, deleted_files, progress_callback, start_time,
+                                module_graph
+                            )
 
                         result = self.incremental_analyzer.perform_incremental_analysis(  # 증분 분석 실행
-                            project_path, project_files, cache_id, full_analysis_fallback   # 프로젝트 경로, 파일 목록, 캐시 ID, 폴백 함수 전달
+                            project_path, project_files, cache_id,                         # 프로젝트 경로, 파일 목록, 캐시 ID
+                            full_analysis_fallback, merge_changes,                         # 폴백 함수와 엔티티 단위 병합 함수 전달
+                            self.file_metadata,                                            # 재분석한 파일의 메타데이터 (다시 읽지 않음)
+                            lambda: self.module_graph                                      # 병합(복사본 갱신) 결과의 모듈 그래프를 캐시에 저장
                         )
 
                         progress_callback.update("Incremental analysis complete", 100)     # 진행률 100% - 증분 분석 완료
@@ -180,11 +200,10 @@ class AnalyzerEngine:
                         self.logger.warning(f"Incremental analysis failed, falling back to full: {e}")  # 경고 로그 출력
                         # 전체 분석으로 계속 진행
 
-            # 전체 분석 수행
-            analysis_result = self._perform_full_analysis(project_path, project_files, progress_callback, start_time)  # 전체 분석 실행
-
+            # 전체 분석 수행 (비용 모델이 표준/대규모 경로, 워커 수, 배치 크기 선택)
+            analysis_result = self._perform_planned_analysis(project_path, project_files, progress_callback, start_time)
             # Stage 7: Save to cache if caching enabled
-            if self.cache_manager and not cache_id:                                        # 캐시 매니저가 있고 기존 캐시가 없으면
+            if self.cache_manager:                                                         # 캐시 매니저가 있으면 (증분 분석 실패 후 전체 분석한 경우 포함)
                 progress_callback.update("Saving analysis cache", 99)                      # 진행률 99% - 캐시 저장 중
                 self._save_analysis_cache(project_path, project_files, analysis_result)    # 분석 결과를 캐시에 저장
 
@@ -195,6 +214,54 @@ class AnalyzerEngine:
             self.logger.error(f"Analysis failed: {e}")                                     # 에러 로그 출력
             raise                                                                           # 예외 다시 발생시켜 상위로 전달
 
+    def _perform_planned_analysis(self, project_path: str, project_files: List[str],
+                                  progress_callback: ProgressCallback, start_time: float) -> AnalysisResult:
+        """비용 모델로 전략(표준/대규모), 워커 수, 배치 크기를 정한 뒤 전체 분석하고 예측값과 실제값을 결과에 기록"""
+        self.analysis_plan = None
+        if not self.cost_model:                                                             # 성능 최적화가 꺼져 있으면 표준 경로 그대로
+            return self._perform_full_analysis(project_path, project_files, progress_callback, start_time)
+
+        progress_callback.update("Estimating analysis cost", 7)                            # 진행률 7% - 파일 크기 분포 + 샘플 파싱
+        plan = self.analysis_plan = self.cost_model.plan(project_files)
+        self.logger.info(f"Analysis plan: {plan.strategy} path, {plan.workers} workers, batch {plan.batch_size}, "
+                         f"~{plan.predicted_seconds:.1f}s, ~{plan.predicted_memory_mb:.0f} MB"
+                         + (f" ({'; '.join(plan.reasons)})" if plan.reasons else ""))
+        memory_monitor = MemoryMonitor(self.options.max_memory_mb, sample_interval=0)       # 워커 포함 프로세스 트리 메모리
+        baseline_memory = memory_monitor.get_memory_usage()
+
+        if plan.strategy == "large":
+            progress_callback.update("Large project detected, using optimized analysis", 10)  # 진행률 10% - 대규모 분석 모드
+            self.large_project_analyzer = LargeProjectAnalyzer(replace(                     # 계획한 워커 수/배치 크기로 분석기 구성
+                self.large_project_analyzer.config, max_workers=plan.workers, batch_size=plan.batch_size
+            ))
+            result = self._analyze_large_project(project_path, project_files, progress_callback, start_time)
+        else:
+            progress_callback.update("Project size manageable, using standard analysis", 10)  # 진행률 10% - 표준 분석 모드
+            result = self._perform_full_analysis(project_path, project_files, progress_callback, start_time)
+
+        result.metrics = result.metrics or {}
+        result.metrics['cost_model'] = {                                                   # 모델 보정용: 예측값과 실제값을 나란히 저장
+            'plan': plan.to_dict(),
+            'predicted': {
+                'seconds': plan.predicted_seconds,
+                'memory_mb': plan.predicted_memory_mb,
+                'entities': plan.predicted_entities
+            },
+            'actual': {
+                'seconds': time.time() - start_time,
+                'memory_mb': (memory_monitor.get_memory_usage() - baseline_memory) / (1024 * 1024),
+                'entities': sum(count for kind, count in result.get_entity_count().items()
+                                if kind not in ('packages', 'cycles'))  # 예측과 같은 기준 (모듈/클래스/메서드/필드/관계)
+            }
+        }
+        return result
+
+    def _worker_count(self) -> int:
+        """이번 분석에서 쓸 워커 수 (비용 모델 계획이 있으면 계획값, 없으면 옵션값)"""
+        if self.analysis_plan is not None:
+            return self.analysis_plan.workers
+        return self.options.max_workers or 1
+
     def _discover_project_files(self, project_path: str) -> List[str]:
         """프로젝트 내 모든 Python 파일 탐색 (.gitignore 스타일 패턴 지원)"""
         python_files = []                                                                   # Python 파일 경로 리스트
@@ -264,7 +331,10 @@ class AnalyzerEngine:
         quality_metrics = []                                                               # 품질 메트릭 리스트 초기화
         if self.metrics_engine and self.options.enable_quality_metrics:
             progress_callback.update("Calculating quality metrics", 85)
-            quality_metrics = self._calculate_quality_metrics(integrated_data, project_files, progress_callback)
+            quality_metrics = self.canonicalizer.canonicalize_quality_metrics(
+                self._calculate_quality_metrics(ast_analyses, progress_callback)
+            )
+            integrated_data['metrics']['quality_distribution'] = self._summarize_quality_distributions(ast_analyses)
         else:
             progress_callback.update("Skipping quality metrics", 85)
 
@@ -345,10 +415,16 @@ class AnalyzerEngine:
                          progress_callback: ProgressCallback) -> List[FileAnalysis]:
         """모든 프로젝트 파일에 대해 AST 분석 실행"""
         # 멀티프로세싱 사용 여부 결정 (파일이 많고 멀티프로세싱이 활성화된 경우)            # 성능 최적화를 위한 분기 처리
-        if len(project_files) > 10 and self.options.max_workers and self.options.max_workers > 1:
-            return self._run_parallel_ast_analysis(project_files, progress_callback)        # 병렬 처리로 분석
+        if len(project_files) > 10 and self._worker_count() > 1:
+            analyses = self._run_parallel_ast_analysis(project_files, progress_callback)    # 병렬 처리로 분석
         else:
-            return self._run_sequential_ast_analysis(project_files, progress_callback)      # 순차 처리로 분석
+            analyses = self._run_sequential_ast_analysis(project_files, progress_callback)  # 순차 처리로 분석
+
+        for analysis in analyses:                                                           # 워커가 읽은 바이트의 해시와 stat을 그대로 기록
+            metadata = FileMetadata.from_analysis(analysis)
+            if metadata is not None:
+                self.file_metadata[analysis.file_path] = metadata
+        return analyses
     
     def _run_sequential_ast_analysis(self, project_files: List[str],
                                     progress_callback: ProgressCallback) -> List[FileAnalysis]:
@@ -356,60 +432,81 @@ class AnalyzerEngine:
         analyses = []                                                                           # 분석 결과를 저장할 리스트
         total_files = len(project_files)                                                        # 전체 파일 수
 
-        for i, file_path in enumerate(project_files):                                          # 각 파일을 순차적으로 처리
+        # 진행률 30%에서 65%까지: 파일마다 카운터만 올리고 스냅샷은 일정 주기로 합쳐서 전달
+        progress_callback.update("Analyzing files", 30)
+        progress_callback.set_totals(total_files, self._planned_bytes(project_files), end_progress=65)
+
+        for file_path in project_files:                                                         # 각 파일을 순차적으로 처리
+            analysis = None
             try:
                 # 개별 파일 분석 (클래스, 메소드, 필드 추출)                                    # AST 파싱으로 상세 구조 분석
                 analysis = self.ast_analyzer.analyze_file(file_path)                           # ASTAnalyzer로 파일 분석
                 if analysis:                                                                    # 분석 결과가 있으면
                     analyses.append(analysis)                                                   # 결과 리스트에 추가
 
-                # 진행률 업데이트 (30%에서 시작해서 65%까지)                                   # 전체 분석 파이프라인에서의 비중 반영
-                progress_percentage = 30 + (35 * (i + 1) / total_files)
-                progress_callback.update(f"Analyzing file {i+1}/{total_files}", progress_percentage)
-
             except Exception as e:                                                              # 개별 파일 분석 실패시
                 self.logger.warning(f"Failed to analyze file {file_path}: {e}")               # 경고 로그 (전체 실패하지 않고 계속 진행)
+            self._advance_progress(progress_callback, analysis)
 
         return analyses                                                                         # 모든 파일 분석 결과 반환
     
     def _run_parallel_ast_analysis(self, project_files: List[str],
                                   progress_callback: ProgressCallback) -> List[FileAnalysis]:
         """병렬로 여러 파일을 동시에 AST 분석 (멀티프로세싱)"""
-        analyses = []                                                                           # 분석 결과를 저장할 리스트
         total_files = len(project_files)                                                        # 전체 파일 수
-        completed_files = 0                                                                     # 완료된 파일 수
-
-        # 멀티프로세싱 풀로 병렬 처리 (CPU 집약적 작업이므로 프로세스 풀 사용)               # AST 파싱은 CPU 집약적이므로 멀티프로세싱 활용
-        with ProcessPoolExecutor(max_workers=self.options.max_workers) as executor:
-            # 모든 파일에 대해 분석 작업 제출
-            future_to_file = {
-                executor.submit(self._analyze_single_file, file_path): file_path               # 각 파일을 개별 프로세스에서 분석
-                for file_path in project_files
-            }
 
-            # 완료되는 대로 결과 수집
-            for future in as_completed(future_to_file):                                        # 완료 순서대로 결과 처리
-                file_path = future_to_file[future]                                             # 해당 파일 경로 가져오기
-                try:
-                    analysis = future.result()                                                  # 분석 결과 가져오기
-                    if analysis:                                                                # 분석 결과가 있으면
-                        analyses.append(analysis)                                               # 결과 리스트에 추가
-
-                except Exception as e:                                                          # 개별 파일 분석 실패시
-                    self.logger.warning(f"Parallel analysis failed for {file_path}: {e}")     # 경고 로그
+        # 제한된 작업 창 + 큰 파일 우선 + 메모리 기반 제출 중단 스케줄러로 처리               # 한 번에 모든 작업을 제출하지 않음
+        scheduler = ParallelAnalyzer(PerformanceConfig(max_workers=self._worker_count(),
+                                                       max_memory_mb=self.options.max_memory_mb,
+                                                       enable_progress=False))
+        analyses = []                                                                           # 분석 결과를 저장할 리스트
+        progress_callback.update("Analyzing files", 30)                                         # 진행률 30%에서 65%까지 (주기적 스냅샷)
+        progress_callback.set_totals(total_files, self._planned_bytes(project_files), end_progress=65)
+        for _, analysis in scheduler.iter_parallel(project_files, self._file_worker()):
+            if analysis:                                                                        # 분석 결과가 있으면
+                analyses.append(analysis)                                                       # 결과 리스트에 추가
+            self._advance_progress(progress_callback, analysis)                                 # 완료 파일 수/바이트 카운터만 증가
+        return analyses                                                                         # 모든 파일 분석 결과 반환
 
-                completed_files += 1                                                            # 완료 카운터 증가
-                # 진행률 업데이트 (30%에서 시작해서 65%까지)                                   # 전체 분석 과정에서의 진행률 반영
-                progress_percentage = 30 + (35 * completed_files / total_files)
-                progress_callback.update(f"Analyzing file {completed_files}/{total_files}", progress_percentage)
+    def _planned_bytes(self, project_files: List[str]) -> Optional[int]:
+        """진행률/ETA용 전체 바이트 수 (비용 모델이 이미 stat한 값 재사용, 없으면 파일 수 기준)"""
+        plan = self.analysis_plan
+        if plan is not None and plan.manifest.file_count == len(project_files):
+            return plan.manifest.total_bytes
+        return None
 
-        return analyses                                                                         # 모든 파일 분석 결과 반환
+    @staticmethod
+    def _advance_progress(progress_callback: ProgressCallback, analysis: Optional[FileAnalysis]):
+        """파일 하나 완료: 워커가 읽을 때 찍은 stat의 크기로 바이트 카운터 증가 (추가 stat 없음)"""
+        if analysis is None:
+            progress_callback.advance(failed=1)
+            return
+        file_stat = getattr(analysis, 'file_stat', None)
+        progress_callback.advance(bytes_done=file_stat[1] if file_stat else 0)
+
+    def _file_worker(self) -> Callable[[str], Optional[FileAnalysis]]:
+        """워커 프로세스로 보낼 수 있는(picklable) 단일 파일 분석 진입점"""
+        return functools.partial(
+            AnalyzerEngine._analyze_single_file,
+            enable_type_inference=self.options.enable_type_inference,
+            enable_quality_metrics=self.options.enable_quality_metrics,
+            file_cache_dir=str(self.file_cache.cache_dir) if self.file_cache else None,
+            file_cache_index=str(self.file_cache.index.db_path) if self.file_cache else None,
+            file_cache_max_bytes=self.file_cache.max_size_bytes if self.file_cache else None
+        )
     
     @staticmethod
-    def _analyze_single_file(file_path: str) -> Optional[FileAnalysis]:
+    def _analyze_single_file(file_path: str, enable_type_inference: bool = True,
+                             enable_quality_metrics: bool = True,
+                             file_cache_dir: Optional[str] = None, file_cache_index: Optional[str] = None,
+                             file_cache_max_bytes: Optional[int] = None) -> Optional[FileAnalysis]:
         """단일 파일 분석 (정적 메소드로 멀티프로세싱에서 사용)"""
         try:
-            analyzer = ASTAnalyzer()                                                            # 새 ASTAnalyzer 인스턴스 생성
+            file_cache = (FileAnalysisCache(file_cache_dir,                                     # 워커 프로세스에서도 같은 파일 캐시와 인덱스 공유
+                                            CacheIndex(file_cache_index) if file_cache_index else None,
+                                            file_cache_max_bytes)
+                          if file_cache_dir else None)
+            analyzer = ASTAnalyzer(enable_type_inference, enable_quality_metrics, file_cache)  # 새 ASTAnalyzer 인스턴스 생성
             return analyzer.analyze_file(file_path)                                             # 파일 분석 수행
         except Exception as e:                                                                  # 분석 실패시
             logging.getLogger(__name__).warning(f"Failed to analyze {file_path}: {e}")       # 로그 출력
@@ -418,6 +515,7 @@ class AnalyzerEngine:
     def _integrate_analyses(self, pydeps_result: Dict, ast_analyses: List[FileAnalysis],
                            progress_callback: ProgressCallback) -> Dict:
         """pydeps와 AST 분석 결과를 통합하여 완전한 5단계 의존성 그래프 생성"""
+        self.canonicalizer = EntityCanonicalizer()                                              # 이번 분석의 모듈 별칭 맵
 
         # 1단계: pydeps와 AST 결과 통합 (모듈-클래스-메소드-필드 계층 구조 완성)             # 1단계(모듈)와 2-5단계(클래스/메소드/필드) 연결
         packages, modules, relationships = self.legacy_bridge.merge_with_ast_analysis(
@@ -438,18 +536,31 @@ class AnalyzerEngine:
                 all_methods.extend(analysis.methods)                                           # 메소드들을 전체 리스트에 추가
                 all_fields.extend(analysis.fields)                                             # 필드들을 전체 리스트에 추가
 
-        # 3단계: 상세한 순환 참조 탐지 (클래스/메소드 레벨까지)                                # pydeps 모듈 레벨 순환 참조에 더해 상세 레벨 순환 참조 탐지
-        additional_cycles = self._detect_detailed_cycles(all_classes, all_methods, relationships)
-        # pydeps 실패시 AST 분석으로부터 import 순환 참조 추가 탐
-        ast_import_cycles = self._detect_import_cycles_from_ast(ast_analyses)
-        
-        # 집계된 ModuleInfo.imports로 구축한 모듈 레벨 import 순환으로 보강 
-        module_import_cycles = self._detect_import_cycles_from_modules(modules)
-        all_cycles = pydeps_result['cycles'] + additional_cycles + ast_import_cycles + module_import_cycles                              # 모든 레벨의 순환 참조 통합
+        # 2.5단계: ID 기준 정규화 - 중복 엔티티/관계를 여기서 한 번만 병합                     # 같은 파일의 pydeps/AST 모듈 별칭 처리 포함
+        canonical = self.canonicalizer.canonicalize(
+            packages, modules, all_classes, all_methods, all_fields, relationships
+        )
+        packages, modules = canonical['packages'], canonical['modules']
+        all_classes, all_methods, all_fields = canonical['classes'], canonical['methods'], canonical['fields']
+        relationships = canonical['relationships']
+
+        # 2.7단계: 모듈 import 그래프 - AST import 문을 프로젝트 모듈로 해석 (pydeps 결과와 ID 기준 병합)
+        relationships = self.canonicalizer.canonicalize_relationships(
+            relationships + build_module_import_edges(modules)
+        )
+        self.module_graph = ModuleGraph.from_relationships((m.id for m in modules), relationships)  # 캐시와 함께 저장되는 모듈 그래프
+        modules = self._apply_bacon_distances(modules, self.module_graph)
+        self.entity_registry.register(packages, modules, all_classes, all_methods, all_fields)  # 정규화된 엔티티에 정수 ID 부여 (레벨 순서)
+        edges = self.entity_registry.edges(relationships)                                      # 관계를 한 번만 정수 간선 배열로 변환해 순환 탐지/메트릭이 공유
+
+        # 3단계: 순환 참조 탐지 (모듈 import 그래프의 SCC + 클래스/메소드 레벨 상세 순환)
+        all_cycles = self.canonicalizer.canonicalize_cycles(                                   # 모든 레벨의 순환 참조 통합 (엔티티 집합 기준 중복 제거)
+            pydeps_result['cycles'] + self._detect_graph_cycles(all_classes, all_methods, relationships, edges)
+        )
 
         # 4단계: 향상된 메트릭 계산 (모든 엔티티에 대한 품질 지표)                             # 통합된 데이터로 포괄적인 품질 메트릭 계산
         enhanced_metrics = self._calculate_enhanced_metrics(
-            packages, modules, all_classes, all_methods, relationships                         # 모든 레벨의 엔티티와 관계 정보
+            packages, modules, all_classes, all_methods, relationships, edges                  # 모든 레벨의 엔티티와 관계 정보
         )
         return {
             'packages': packages,                                                               # 통합된 패키지 정보
@@ -462,446 +573,87 @@ class AnalyzerEngine:
             'metrics': enhanced_metrics                                                         # 계산된 품질 메트릭
         }
     
+    def _detect_graph_cycles(self, classes: List[ClassInfo], methods: List[MethodInfo],
+                             relationships: List[Relationship], edges: Optional[EdgeTable] = None) -> List[Dict]:
+        """import 간선은 SCC로, 나머지 간선은 상세 순환 탐지로 처리"""
+        edges = edges if edges is not None else self.entity_registry.edges(relationships)
+        import_indexes, other_indexes = [], []
+        for index, rel in enumerate(relationships):                                           # 간선 종류별로 인덱스만 나눔 (정수 ID 재사용)
+            (import_indexes if rel.relationship_type == DependencyType.IMPORT else other_indexes).append(index)
+        import_edges, other_edges = edges.subset(import_indexes), edges.subset(other_indexes)
+        return (self._detect_detailed_cycles(classes, methods, other_edges.relationships, other_edges)  # 클래스/메소드 레벨 순환
+                + self._detect_cycles_by_type(import_edges.relationships, 'import', import_edges))     # 모듈 import 순환 (SCC)
+
     def _detect_detailed_cycles(self, classes: List[ClassInfo], methods: List[MethodInfo],
-                              relationships: List[Relationship]) -> List[Dict]:
+                              relationships: List[Relationship], edges: Optional[EdgeTable] = None) -> List[Dict]:
         """클래스와 메소드 레벨의 상세한 순환 참조 탐지"""
         cycles = []                                                                             # 탐지된 순환 참조 리스트
 
-        # 관계들로부터 인접 그래프 구축 (방향성 그래프)                                           # 의존성 관계를 그래프로 표현
-        graph = {}                                                                              # 인접 리스트 그래프
-        for rel in relationships:                                                               # 모든 관계에 대해
-            if rel.from_entity not in graph:                                                   # 소스 엔티티가 그래프에 없으면
-                graph[rel.from_entity] = set()                                                 # 빈 집합으로 초기화
-            graph[rel.from_entity].add(rel.to_entity)                                         # 타겟 엔티티 추가 (방향성 간선)
-
-        # 단순한 DFS 기반 순환 탐지 (각 노드에서 시작)                                          # 깊이 우선 탐색으로 순환 찾기
-        visited = set()                                                                        # 전체 탐색에서 방문한 노드들
-
-        def has_cycle(node, path):
-            """현재 경로에서 순환이 있는지 확인"""
-            if node in path:                                                                   # 현재 경로에 이미 있으면 순환 발견
-                cycle_start = path.index(node)                                                 # 순환 시작 지점 찾기
-                return path[cycle_start:] + [node]                                             # 순환 경로 반환
-
-            if node not in graph:                                                              # 더 이상 연결된 노드가 없으면
-                return None                                                                    # 순환 없음
-
-            path.append(node)                                                                  # 현재 노드를 경로에 추가
-            for neighbor in graph[node]:                                                       # 연결된 모든 이웃 노드에 대해
-                cycle = has_cycle(neighbor, path)                                              # 재귀적으로 순환 탐지
-                if cycle:                                                                      # 순환이 발견되면
-                    return cycle                                                               # 순환 경로 반환
-            path.pop()                                                                         # 백트래킹 (현재 경로에서 노드 제거)
-            return None                                                                        # 이 경로에서는 순환 없음
-
-        # 모든 노드에서 순환 탐지 시작                                                           # 연결되지 않은 컴포넌트도 모두 확인
-        for node in graph:                                                                     # 그래프의 모든 노드에 대해
-            if node not in visited:                                                            # 아직 방문하지 않은 노드면
-                cycle = has_cycle(node, [])                                                     # 순환 탐지 시작
-                if cycle:                                                                       # 순환이 발견되면
-                    cycle_info = {                                                              # 순환 정보 생성
-                        'id': f"detailed_cycle_{len(cycles)}",                                 # 고유 순환 ID
-                        'entities': cycle,                                                      # 순환에 참여하는 엔티티들
-                        'cycle_type': 'call',  # 대부분의 상세 순환은 메소드 호출               # 순환 타입
-                        'severity': 'low' if len(cycle) <= 2 else 'medium',                   # 심각도 (길이에 따라)
-                        'description': f"Call cycle involving {len(cycle)} entities"           # 순환 설명
-                    }
-                    cycles.append(cycle_info)                                                   # 순환 리스트에 추가
+        # 관계를 정수 간선 배열(CSR)로 바꿔 각 노드에서 DFS로 처음 만나는 순환을 찾음             # 순환이 없다고 확인된 노드는 다시 탐색하지 않음
+        edges = edges if edges is not None else self.entity_registry.edges(relationships)
+        for cycle_nodes in edges.first_cycles():                                               # 시작 노드마다 처음 발견한 순환 (닫힌 경로)
+            cycle = self.entity_registry.render(cycle_nodes)                                   # 결과에만 문자열 ID 사용
+            cycles.append({                                                                    # 순환 정보 생성
+                'id': f"detailed_cycle_{len(cycles)}",                                         # 고유 순환 ID
+                'entities': cycle,                                                              # 순환에 참여하는 엔티티들
+                'cycle_type': 'call',  # 대부분의 상세 순환은 메소드 호출                       # 순환 타입
+                'severity': 'low' if len(cycle) <= 2 else 'medium',                           # 심각도 (길이에 따라)
+                'description': f"Call cycle involving {len(cycle)} entities"                   # 순환 설명
+            })
 
         return cycles                                                                           # 탐지된 모든 순환 참조 반환
 
-    def _detect_import_cycles_from_modules(self, modules: List[ModuleInfo]) -> List[Dict]:
-        """Detect import cycles using consolidated ModuleInfo.imports.
-        This complements AST-based detection and helps catch cycles missed by path-based normalization."""
-        cycles: List[Dict] = []
-        if not modules:
-            return cycles
-
-        # Build set of project modules (exclude external libraries)
-        project_modules = {m.name for m in modules}
-
-        if DEBUG_MODE:
-            with open('/tmp/pyview_debug.log', 'a') as f:
-                f.write(f"🔍 CYCLE DEBUG: Project modules: {list(project_modules)[:10]}...\n")
-
-        # Build module import graph: module_name -> set(imported_module_name)
-        # Only include imports between project modules to avoid false positives with external libraries
-        graph: Dict[str, Set[str]] = {}
-        external_imports = set()
-
-        for m in modules:
-            src = m.name
-            graph.setdefault(src, set())
-            for imp in getattr(m, 'imports', []) or []:
-                target = imp.module
-                if target:
-                    if target in project_modules:
-                        # Only add to graph if target is also a project module (not external library)
-                        graph[src].add(target)
-                    else:
-                        external_imports.add(target)
-
-        if DEBUG_MODE:
-            with open('/tmp/pyview_debug.log', 'a') as f:
-                f.write(f"🔍 CYCLE DEBUG: External imports found: {list(external_imports)[:10]}...\n")
-                f.write(f"🔍 CYCLE DEBUG: Internal graph edges: {sum(len(edges) for edges in graph.values())}\n")
-
-        # Kosaraju to find SCCs
-        visited: Set[str] = set()
-        order: List[str] = []
-        def dfs1(n: str) -> None:
-            visited.add(n)
-            for nb in graph.get(n, set()):
-                if nb not in visited and nb in graph:
-                    dfs1(nb)
-            order.append(n)
-        for n in list(graph.keys()):
-            if n not in visited:
-                dfs1(n)
-        transpose: Dict[str, Set[str]] = {}
-        for u, nbrs in graph.items():
-            transpose.setdefault(u, set())
-            for v in nbrs:
-                transpose.setdefault(v, set()).add(u)
-        visited.clear()
-        def dfs2(n: str, comp: List[str]) -> None:
-            visited.add(n)
-            comp.append(n)
-            for nb in transpose.get(n, set()):
-                if nb not in visited:
-                    dfs2(nb, comp)
-        cycle_id = 0
-        for n in reversed(order):
-            if n not in visited:
-                comp: List[str] = []
-                dfs2(n, comp)
-                if len(comp) >= 2:
-                    paths = []
-                    for u in comp:
-                        for v in graph.get(u, set()):
-                            if v in comp:
-                                paths.append({
-                                    'from': create_module_id(u),
-                                    'to': create_module_id(v),
-                                    'relationship_type': 'import',
-                                    'strength': 1.0
-                                })
-
-                    cycle_info = {
-                        'id': f"mod_import_cycle_{cycle_id}",
-                        'entities': [create_module_id(x) for x in comp],
-                        'paths': paths,
-                        'cycle_type': 'import',
-                        'severity': 'high' if len(comp) > 3 else 'medium',
-                        'description': f"Module import cycle involving {len(comp)} modules",
-                        'metrics': {
-                            'length': len(comp),
-                            'detection_method': 'module_list'
-                        }
-                    }
-
-                    if DEBUG_MODE:
-                        with open('/tmp/pyview_debug.log', 'a') as f:
-                            f.write(f"🔍 CYCLE FOUND: {cycle_info['description']}\n")
-                            f.write(f"🔍 CYCLE ENTITIES: {comp}\n")
-                            f.write(f"🔍 CYCLE PATHS: {len(paths)} edges\n")
-
-                    cycles.append(cycle_info)
-                    cycle_id += 1
-        return cycles
-    
-    def _detect_cycles_by_type(self, relationships: List[Relationship], cycle_type: str) -> List[Dict]:
+    def _detect_cycles_by_type(self, relationships: List[Relationship], cycle_type: str,
+                               edges: Optional[EdgeTable] = None) -> List[Dict]:
         """Detect cycles for a specific relationship type"""
         cycles = []
         
         if not relationships:
             return cycles
         
-        # Build adjacency graph
-        graph = {}
-        edge_info = {}  # Store relationship details
-        
-        for rel in relationships:
-            if rel.from_entity not in graph:
-                graph[rel.from_entity] = set()
-            graph[rel.from_entity].add(rel.to_entity)
-            edge_info[(rel.from_entity, rel.to_entity)] = rel
-        
-        # Find strongly connected components using DFS
-        visited = set()
-        finished = set()
-        stack = []
-        
-        def dfs1(node):
-            if node in visited:
-                return
-            visited.add(node)
-            for neighbor in graph.get(node, []):
-                dfs1(neighbor)
-            stack.append(node)
-        
-        # First DFS to get finish times
-        for node in graph:
-            dfs1(node)
-        
-        # Build reverse graph
-        reverse_graph = {}
-        for node in graph:
-            for neighbor in graph[node]:
-                if neighbor not in reverse_graph:
-                    reverse_graph[neighbor] = set()
-                reverse_graph[neighbor].add(node)
-        
-        # Second DFS on reverse graph
-        visited.clear()
-        
-        def dfs2(node, component):
-            if node in visited:
-                return
-            visited.add(node)
-            component.append(node)
-            for neighbor in reverse_graph.get(node, []):
-                dfs2(neighbor, component)
-        
-        # Find SCCs
-        while stack:
-            node = stack.pop()
-            if node not in visited:
-                component = []
-                dfs2(node, component)
-                
-                # Only consider components with cycles (size > 1)
-                if len(component) > 1:
-                    # Extract cycle path
-                    cycle_paths = []
-                    for i, entity in enumerate(component):
-                        next_entity = component[(i + 1) % len(component)]
-                        # Check if direct edge exists
-                        if entity in graph and next_entity in graph[entity]:
-                            rel = edge_info.get((entity, next_entity))
-                            if rel:
-                                cycle_paths.append({
-                                    'from': entity,
-                                    'to': next_entity,
-                                    'relationship_type': cycle_type,
-                                    'strength': rel.strength if hasattr(rel, 'strength') else 1.0,
-                                    'line_number': rel.line_number,
-                                    'file_path': rel.file_path
-                                })
-                    
-                    # Calculate severity based on cycle type and length
-                    if cycle_type == 'import':
-                        severity = 'high' if len(component) > 3 else 'medium'
-                    else:
-                        severity = 'low' if len(component) <= 2 else 'medium'
-                    
-                    cycle_info = {
-                        'id': f"{cycle_type}_cycle_{len(cycles)}",
-                        'entities': component,
-                        'paths': cycle_paths,
-                        'cycle_type': cycle_type,
-                        'severity': severity,
-                        'metrics': {
-                            'length': len(component),
-                            'edge_count': len(cycle_paths)
-                        },
-                        'description': f"{cycle_type.title()} cycle involving {len(component)} entities"
-                    }
-                    cycles.append(cycle_info)
-
-        return cycles
-    
-    def _detect_import_cycles_from_ast(self, ast_analyses: List[FileAnalysis]) -> List[Dict]:
-        """Detect import cycles from AST analysis when pydeps fails"""
-        cycles = []
-        
-        if not ast_analyses:
-            return cycles
-        
-        # Build import graph from AST analysis
-        import_graph: Dict[str, Set[str]] = {}
-        file_to_module: Dict[str, str] = {}
-        project_modules: Set[str] = set()
-
-        # First pass: collect all project modules
-        for analysis in ast_analyses:
-            if not analysis or not analysis.file_path:
-                continue
-            module_name = self._file_path_to_module_name(analysis.file_path)
-            project_modules.add(module_name)
-            file_to_module[analysis.file_path] = module_name
-
-        if DEBUG_MODE:
-            with open('/tmp/pyview_debug.log', 'a') as f:
-                f.write(f"🔍 AST DEBUG: Found {len(project_modules)} project modules\n")
-                f.write(f"🔍 AST DEBUG: Project modules: {list(project_modules)[:10]}...\n")
-
-        # Second pass: build graph with only project-internal imports
-        for analysis in ast_analyses:
-            if not analysis or not analysis.file_path:
-                continue
-
-            module_name = self._file_path_to_module_name(analysis.file_path)
-            import_graph.setdefault(module_name, set())
-
-            # Extract imports from AST analysis
-            for import_info in analysis.imports:
-                # Convert relative imports to absolute module names (best-effort)
-                imported_module = self._resolve_import_name(
-                    import_info.module, analysis.file_path
-                )
-                # Only add to graph if target is also a project module (not external library)
-                if imported_module and imported_module in project_modules:
-                    import_graph[module_name].add(imported_module)
-
-        # Use Kosaraju's algorithm to find all strongly connected components
-        # Step 1: Order vertices by finish time
-        visited: Set[str] = set()
-        order: List[str] = []
-
-        def dfs1(node: str) -> None:
-            visited.add(node)
-            for neighbor in import_graph.get(node, set()):
-                if neighbor not in visited and neighbor in import_graph:
-                    dfs1(neighbor)
-            order.append(node)
-
-        for node in list(import_graph.keys()):
-            if node not in visited:
-                dfs1(node)
-
-        # Step 2: Transpose graph
-        transpose: Dict[str, Set[str]] = {}
-        for u, neighbors in import_graph.items():
-            transpose.setdefault(u, set())
-            for v in neighbors:
-                transpose.setdefault(v, set()).add(u)
-
-        # Step 3: DFS on transposed graph to get SCCs
-        visited.clear()
-
-        def dfs2(node: str, component: List[str]) -> None:
-            visited.add(node)
-            component.append(node)
-            for neighbor in transpose.get(node, set()):
-                if neighbor not in visited:
-                    dfs2(neighbor, component)
-
-        cycle_id = 0
-        for node in reversed(order):
-            if node not in visited:
-                component: List[str] = []
-                dfs2(node, component)
-
-                # Emit cycles for SCCs with size >= 2
-                if len(component) >= 2:
-                    cycle_paths: List[Dict] = []
-                    # Add edges within the component as cycle paths
-                    for u in component:
-                        for v in import_graph.get(u, set()):
-                            if v in component:
-                                cycle_paths.append({
-                                    'from': create_module_id(u),
-                                    'to': create_module_id(v),
-                                    'relationship_type': 'import',
-                                    'strength': 1.0
-                                })
-                    cycle_info = {
-                        'id': f"ast_import_cycle_{cycle_id}",
-                        'entities': [create_module_id(x) for x in component],
-                        'paths': cycle_paths,
-                        'cycle_type': 'import',
-                        'severity': 'high' if len(component) > 3 else 'medium',
-                        'description': f"AST-detected import cycle involving {len(component)} modules",
-                        'metrics': {
-                            'length': len(component),
-                            'detection_method': 'ast'
-                        }
-                    }
-
-                    if DEBUG_MODE:
-                        with open('/tmp/pyview_debug.log', 'a') as f:
-                            f.write(f"🔍 AST CYCLE FOUND: {cycle_info['description']}\n")
-                            f.write(f"🔍 AST CYCLE ENTITIES: {component}\n")
-                            f.write(f"🔍 AST CYCLE PATHS: {len(cycle_paths)} edges\n")
-
-                    cycles.append(cycle_info)
-                    cycle_id += 1
-                # Handle self-loop (module importing itself)
-                elif len(component) == 1:
-                    u = component[0]
-                    # Only flag as a cycle if:
-                    # 1. The module actually imports itself (self-reference)
-                    # 2. The module has actual imports (not just an empty set)
-                    u_imports = import_graph.get(u, set())
-
-                    if u in u_imports and len(u_imports) > 0:
-                        cycles.append({
-                            'id': f"ast_import_cycle_{cycle_id}",
-                            'entities': [create_module_id(u)],
-                            'paths': [{
-                                'from': create_module_id(u),
-                                'to': create_module_id(u),
-                                'relationship_type': 'import',
-                                'strength': 1.0
-                            }],
-                            'cycle_type': 'import',
-                            'severity': 'medium',
-                            'description': "AST-detected self import cycle",
-                            'metrics': {
-                                'length': 1,
-                                'detection_method': 'ast'
-                            }
-                        })
-                        cycle_id += 1
+        # Integer edge arrays over the entity registry; SCCs without recursion
+        edges = edges if edges is not None else self.entity_registry.edges(relationships)
+        for members in edges.strongly_connected_components():
+            component = self.entity_registry.render(members)
+            # Extract cycle path
+            cycle_paths = []
+            for i, member in enumerate(members):
+                rel = edges.edge(member, members[(i + 1) % len(members)])  # Direct edge, if any
+                if rel:
+                    cycle_paths.append({
+                        'from': rel.from_entity,
+                        'to': rel.to_entity,
+                        'relationship_type': cycle_type,
+                        'strength': rel.strength if hasattr(rel, 'strength') else 1.0,
+                        'line_number': rel.line_number,
+                        'file_path': rel.file_path
+                    })
+            
+            # Calculate severity based on cycle type and length
+            if cycle_type == 'import':
+                severity = 'high' if len(component) > 3 else 'medium'
+            else:
+                severity = 'low' if len(component) <= 2 else 'medium'
+            
+            cycle_info = {
+                'id': f"{cycle_type}_cycle_{len(cycles)}",
+                'entities': component,
+                'paths': cycle_paths,
+                'cycle_type': cycle_type,
+                'severity': severity,
+                'metrics': {
+                    'length': len(component),
+                    'edge_count': len(cycle_paths)
+                },
+                'description': f"{cycle_type.title()} cycle involving {len(component)} entities"
+            }
+            cycles.append(cycle_info)
 
         return cycles
     
-    def _file_path_to_module_name(self, file_path: str) -> str:
-        """Convert file path to module name"""
-        # Remove .py extension
-        if file_path.endswith('.py'):
-            module_path = file_path[:-3]
-        else:
-            module_path = file_path
-
-        # Convert path separators to dots and create a proper module path
-        import os
-
-        # Split the path and filter out non-meaningful parts
-        parts = module_path.replace(os.sep, '/').split('/')
-
-        # Find the start of the actual module path (skip system paths)
-        start_idx = 0
-        for i, part in enumerate(parts):
-            # Look for common Python package indicators
-            if part in ['src', 'lib', 'autorag'] or part.endswith('.py') or (i > 0 and '.' in part):
-                start_idx = i
-                break
-
-        # Build module name from meaningful parts
-        meaningful_parts = parts[start_idx:]
-        if meaningful_parts:
-            # Remove empty parts and join with dots
-            module_name = '.'.join(part for part in meaningful_parts if part and part != '__pycache__')
-        else:
-            # Fallback to basename if no meaningful parts found
-            module_name = os.path.basename(module_path)
-
-        return module_name
-    
-    def _resolve_import_name(self, import_name: str, current_file: str) -> Optional[str]:
-        """Resolve import name to absolute module name"""
-        # For now, return the import name as is
-        # In a full implementation, this would handle relative imports properly
-        if import_name.startswith('.'):
-            # Relative import - for now, just strip the dot
-            return import_name.lstrip('.')
-        return import_name
-    
     def _calculate_enhanced_metrics(self, packages: List[PackageInfo], modules: List[ModuleInfo],
                                   classes: List[ClassInfo], methods: List[MethodInfo],
-                                  relationships: List[Relationship]) -> Dict:
+                                  relationships: List[Relationship], edges: Optional[EdgeTable] = None) -> Dict:
         """5단계 모든 레벨을 포함한 향상된 메트릭 계산"""
 
         metrics = {
@@ -921,112 +673,45 @@ class AnalyzerEngine:
             if method.complexity:                                                               # 복잡도 정보가 있으면
                 metrics['complexity_metrics'][method.id] = method.complexity                   # 메소드 ID와 복잡도 매핑
 
-        # 결합도 메트릭 계산                                                                     # 엔티티 간 의존성 강도 측정
-        in_degree = {}                                                                          # 들어오는 의존성 개수 (afferent coupling)
-        out_degree = {}                                                                         # 나가는 의존성 개수 (efferent coupling)
-
-        for rel in relationships:                                                               # 모든 관계에 대해
-            # 들어오는 관계 카운트 (다른 엔티티가 이 엔티티에 의존)                             # 해당 엔티티를 사용하는 다른 엔티티 수
-            if rel.to_entity not in in_degree:                                                 # 타겟 엔티티가 딕셔너리에 없으면
-                in_degree[rel.to_entity] = 0                                                   # 0으로 초기화
-            in_degree[rel.to_entity] += 1                                                      # 들어오는 의존성 카운트 증가
-
-            # 나가는 관계 카운트 (이 엔티티가 다른 엔티티에 의존)                               # 해당 엔티티가 사용하는 다른 엔티티 수
-            if rel.from_entity not in out_degree:                                              # 소스 엔티티가 딕셔너리에 없으면
-                out_degree[rel.from_entity] = 0                                                # 0으로 초기화
-            out_degree[rel.from_entity] += 1                                                   # 나가는 의존성 카운트 증가
+        # 결합도 메트릭 계산 (정수 간선 배열에서 차수를 세고 문자열 ID는 결과에만 사용)         # 엔티티 간 의존성 강도 측정
+        edges = edges if edges is not None else self.entity_registry.edges(relationships)
+        in_degree, out_degree = edges.degrees()  # 들어오는(afferent) / 나가는(efferent) 의존성 개수
 
         # 각 엔티티의 불안정성 계산 (instability = Ce / (Ca + Ce))                            # 불안정성은 변경에 대한 민감도를 나타냄
-        all_entities = set(in_degree.keys()) | set(out_degree.keys())                         # 모든 엔티티 집합
-        for entity in all_entities:                                                            # 각 엔티티에 대해
-            ca = in_degree.get(entity, 0)  # Afferent coupling (들어오는 의존성)                # 이 엔티티에 의존하는 다른 엔티티 수
-            ce = out_degree.get(entity, 0)  # Efferent coupling (나가는 의존성)                # 이 엔티티가 의존하는 다른 엔티티 수
-
-            instability = ce / (ca + ce) if (ca + ce) > 0 else 0.0                           # 불안정성 지수 계산 (0~1, 1에 가까울수록 불안정)
-            metrics['coupling_metrics'][entity] = {                                            # 엔티티별 결합도 메트릭 저장
+        coupling_metrics = metrics['coupling_metrics']
+        for node, entity in enumerate(self.entity_registry.strings):                          # 관계에 등장한 엔티티만 기록
+            ca = in_degree[node] if node < edges.node_count else 0                             # 이 엔티티에 의존하는 다른 엔티티 수
+            ce = out_degree[node] if node < edges.node_count else 0                            # 이 엔티티가 의존하는 다른 엔티티 수
+            if ca + ce == 0:
+                continue
+            coupling_metrics[entity] = {                                                       # 엔티티별 결합도 메트릭 저장
                 'afferent_coupling': ca,                                                       # 들어오는 결합도
                 'efferent_coupling': ce,                                                       # 나가는 결합도
-                'instability': instability                                                     # 불안정성 지수
+                'instability': ce / (ca + ce)                                                  # 불안정성 지수 (0~1, 1에 가까울수록 불안정)
             }
         return metrics                                                                          # 계산된 모든 메트릭 반환
     
-    def _calculate_quality_metrics(self, integrated_data: Dict, project_files: List[str],
+    def _calculate_quality_metrics(self, ast_analyses: List[FileAnalysis],
                                   progress_callback: ProgressCallback) -> List[QualityMetrics]:
-        """모든 엔티티에 대한 코드 품질 메트릭 계산"""
+        """AST 워커가 계산한 파일별 품질 메트릭을 취합 (재파싱 없음)"""
         quality_metrics = []                                                                    # 품질 메트릭 결과 리스트
 
         if not self.metrics_engine:                                                             # 메트릭 엔진이 없으면
             return quality_metrics                                                              # 빈 리스트 반환
-            
-        from .models import EntityType                                                          # EntityType 임포트
 
-        # 분석을 위한 소스 파일 읽기                                                             # 품질 메트릭 계산을 위해 원본 소스 코드 필요
-        source_cache = {}                                                                       # 파일 경로별 소스 코드 캐시
-        for file_path in project_files:                                                        # 모든 프로젝트 파일에 대해
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:                              # UTF-8로 파일 열기
-                    source_cache[file_path] = f.read()                                         # 파일 내용을 캐시에 저장
-            except:                                                                             # 파일 읽기 실패시
-                continue                                                                        # 해당 파일은 건너뛰고 계속
-
-        total_entities = (len(integrated_data.get('modules', [])) +                            # 총 엔티티 수 계산 (진행률 표시용)
-                         len(integrated_data.get('classes', [])))                             # 모듈과 클래스 수의 합
-        processed = 0                                                                           # 처리된 엔티티 수
-
-        # 모듈에 대한 메트릭 계산                                                               # 모듈 레벨 품질 분석
-        for module in integrated_data.get('modules', []):                                      # 모든 모듈에 대해
-            # 기존에는 ClassInfo를 객체로만 받았으나, 딕셔너리로 만들어 넘겨주는 레거시 코드가 있어 호환성을 위해 추가
-            file_path = module.file_path if hasattr(module, 'file_path') else module.get('file_path', '')
-            entity_id = module.id if hasattr(module, 'id') else module.get('id', 'unknown')
-
-            source_code = source_cache.get(file_path, "")                                     # 해당 모듈의 소스 코드 가져오기
-            if source_code:                                                                     # 소스 코드가 있으면
-                module_metrics = self.metrics_engine.analyze_module_quality(module, source_code)  # 모듈 품질 분석 수행
-
-                quality_metric = QualityMetrics(                                               # 품질 메트릭 객체 생성
-                    entity_id=entity_id,                                                       # 모듈 ID
-                    entity_type=EntityType.MODULE,                                            # 엔티티 타입 (모듈)
-                    cyclomatic_complexity=module_metrics.complexity.cyclomatic_complexity,    # 순환 복잡도
-                    cognitive_complexity=module_metrics.complexity.cognitive_complexity,      # 인지 복잡도
-                    nesting_depth=module_metrics.complexity.nesting_depth,                    # 중첩 깊이
-                    lines_of_code=module_metrics.complexity.lines_of_code,                    # 코드 라인 수
-                    maintainability_index=module_metrics.maintainability_index,               # 유지보수성 지수
-                    quality_grade=self.metrics_engine.get_quality_rating(module_metrics)      # 품질 등급
-                )
-                quality_metrics.append(quality_metric)                                        # 품질 메트릭 리스트에 추가
-
-            processed += 1                                                                     # 처리된 엔티티 수 증가
-            if processed % 10 == 0:                                                            # 10개마다 진행률 업데이트
-                progress = 85 + (processed / total_entities) * 10                             # 진행률 계산 (85%~95%)
-                progress_callback.update(f"Quality metrics: {processed}/{total_entities}", progress)  # 진행률 업데이트
-        # 클래스에 대한 메트릭 계산                                                             # 클래스 레벨 품질 분석
-        for class_info in integrated_data.get('classes', []):                                  # 모든 클래스에 대해
-            # 기존에는 ClassInfo를 객체로만 받았으나, 딕셔너리로 만들어 넘겨주는 레거시 코드가 있어 호환성을 위해 추가
-            file_path = class_info.file_path if hasattr(class_info, 'file_path') else class_info.get('file_path', '')
-            entity_id = class_info.id if hasattr(class_info, 'id') else class_info.get('id', 'unknown')
-
-            source_code = source_cache.get(file_path, "")                                     # 해당 클래스의 소스 코드 가져오기
-            if source_code:                                                                     # 소스 코드가 있으면
-                class_metrics = self.metrics_engine.analyze_class_quality(class_info, source_code)  # 클래스 품질 분석 수행
-
-                quality_metric = QualityMetrics(                                               # 품질 메트릭 객체 생성
-                    entity_id=entity_id,                                                       # 클래스 ID
-                    entity_type=EntityType.CLASS,                                             # 엔티티 타입 (클래스)
-                    cyclomatic_complexity=class_metrics.complexity.cyclomatic_complexity,     # 순환 복잡도
-                    cognitive_complexity=class_metrics.complexity.cognitive_complexity,       # 인지 복잡도
-                    nesting_depth=class_metrics.complexity.nesting_depth,                     # 중첩 깊이
-                    lines_of_code=class_metrics.complexity.lines_of_code,                     # 코드 라인 수
-                    maintainability_index=class_metrics.maintainability_index,                # 유지보수성 지수
-                    quality_grade=self.metrics_engine.get_quality_rating(class_metrics)       # 품질 등급
-                )
-                quality_metrics.append(quality_metric)                                        # 품질 메트릭 리스트에 추가
-
-            processed += 1                                                                     # 처리된 엔티티 수 증가
-            if processed % 10 == 0:                                                            # 10개마다 진행률 업데이트
-                progress = 85 + (processed / total_entities) * 10                             # 진행률 계산 (85%~95%)
-                progress_callback.update(f"Quality metrics: {processed}/{total_entities}", progress)  # 진행률 업데이트
-        self.logger.info(f"Calculated quality metrics for {len(quality_metrics)} entities")  # 계산된 메트릭 수 로그 출력
-        return quality_metrics                                                                  # 계산된 모든 품질 메트릭 반환
+        for analysis in ast_analyses:                                                           # 각 파일 분석 결과에 대해 (리스트 확장뿐이라 진행률 갱신 불필요)
+            if analysis and analysis.quality_metrics:                                           # 워커가 메트릭을 계산했으면
+                quality_metrics.extend(analysis.quality_metrics)                                # 모듈/클래스/메소드 메트릭 취합
+
+        self.logger.info(f"Collected quality metrics for {len(quality_metrics)} entities")    # 취합된 메트릭 수 로그 출력
+        return quality_metrics                                                                  # 취합된 모든 품질 메트릭 반환
+
+    def _summarize_quality_distributions(self, ast_analyses: List[FileAnalysis]) -> Dict[str, Any]:
+        """레벨별/패키지별 품질 메트릭 분포 (히스토그램, 백분위수, 등급 수, 최악 N개) 사전 계산"""
+        return compute_metric_distributions(                                                    # NumPy가 있으면 정확한 분포, 없으면 스트리밍 히스토그램
+            (analysis.module_info.name, analysis.quality_metrics)
+            for analysis in ast_analyses if analysis and analysis.quality_metrics
+        )
     
     def _assemble_result(self, project_path: str, integrated_data: Dict,
                         quality_metrics: List[QualityMetrics],
@@ -1088,6 +773,331 @@ class AnalyzerEngine:
 
         return result                                         # 완성된 분석 결과 반환
 
+    # === 증분 분석 경로 (캐시된 결과 + 변경 파일만 재분석) ===
+
+    def _perform_incremental_merge(self, project_path: str, cached_result: AnalysisResult,
+                                   changed_files: List[str], deleted_files: List[str],
+                                   progress_callback: ProgressCallback,
+                                   start_time: float = None,
+                                   module_graph: Optional[ModuleGraph] = None) -> AnalysisResult:
+        """변경/삭제 파일에서 나온 엔티티와 간선만 교체하고 영향받은 순환/메트릭만 재계산.
+
+        module_graph는 캐시된 결과의 모듈 import 그래프로, 바뀐 import 간선만 반영해 갱신됨
+        (pydeps 단계를 다시 실행하지 않음). cached_result와 module_graph는 캐시 메모리 계층과
+        서버가 공유하므로 수정하지 않음 - 바뀌는 그래프와 레코드는 복사본에 반영
+        """
+        if start_time is None:                                                              # 시작 시간이 없으면
+            start_time = time.time()                                                        # 현재 시간으로 설정
+        affected_paths = {normalize_path(p) for p in list(changed_files) + list(deleted_files)}  # 결과가 바뀌는 파일들
+
+        def is_affected(entity) -> bool:
+            return normalize_path(entity.file_path) in affected_paths
+
+        # 1단계: 변경된 파일만 AST 분석 (파일 내용 캐시 적용, pydeps 재실행 없음)
+        progress_callback.update("Analyzing changed files", 30)
+        fresh_analyses = self._run_ast_analysis(
+            [f for f in changed_files if os.path.exists(f)], progress_callback
+        )
+
+        # 2단계: 변경/삭제 파일에서 나온 엔티티 제거 후 새 분석 결과 삽입
+        progress_callback.update("Merging changed entities", 70)
+        graph = cached_result.dependency_graph
+        removed_modules = {m.id: m for m in graph.modules if is_affected(m)}                # 교체될 모듈 레코드
+        removed_ids: Set[str] = set()                                                       # 제거된 모든 엔티티 ID
+        kept: Dict[str, List] = {}                                                          # 레벨별로 유지되는 엔티티
+        for kind in ('modules', 'classes', 'methods', 'fields'):
+            entities = getattr(graph, kind)
+            kept[kind] = [e for e in entities if not is_affected(e)]
+            removed_ids.update(e.id for e in entities if is_affected(e))
+
+        fresh: Dict[str, List] = {'modules': [], 'classes': [], 'methods': [], 'fields': [], 'relationships': []}
+        for analysis in fresh_analyses:
+            module = analysis.module_info
+            previous = removed_modules.get(module.id)
+            if previous is not None:                                                        # pydeps에서 온 속성은 이전 레코드에서 유지
+                module.package_id = module.package_id or previous.package_id
+                module.display_label = module.display_label or previous.display_label
+                module.module_depth = module.module_depth or previous.module_depth
+                module.degree = module.degree or previous.degree
+            fresh['modules'].append(module)
+            fresh['classes'].extend(analysis.classes)
+            fresh['methods'].extend(analysis.methods)
+            fresh['fields'].extend(analysis.fields)
+            fresh['relationships'].extend(analysis.relationships)
+
+        fresh_ids = {e.id for kind in ('modules', 'classes', 'methods', 'fields') for e in fresh[kind]}
+        vanished_ids = removed_ids - fresh_ids                                              # 다시 생기지 않은 엔티티 (간선 끝점 정리용)
+        old_relationship_ids = {r.id for r in cached_result.relationships}
+        kept_relationships = [
+            r for r in cached_result.relationships
+            if not is_affected(r) and r.from_entity not in vanished_ids and r.to_entity not in vanished_ids
+        ]
+
+        self.canonicalizer = EntityCanonicalizer()                                          # 전체 분석과 같은 ID 기준 정규화
+        canonical = self.canonicalizer.canonicalize(
+            self._update_packages(graph.packages, set(removed_modules), fresh['modules']),
+            kept['modules'] + fresh['modules'], kept['classes'] + fresh['classes'],
+            kept['methods'] + fresh['methods'], kept['fields'] + fresh['fields'],
+            kept_relationships + fresh['relationships']
+        )
+        modules = canonical['modules']
+
+        # 3단계: 모듈 import 그래프 - 변경된 모듈과 해석 결과가 달라질 수 있는 모듈만 다시 해석
+        module_ids = {m.name: m.id for m in modules}
+        renamed = {m.name for m in graph.modules} ^ set(module_ids)                         # 추가/삭제된 모듈 이름
+        fresh_module_ids = {self.canonicalizer.resolve(m.id) for m in fresh['modules']}
+        reresolved = [m for m in modules if m.id in fresh_module_ids or imports_any(m, renamed)]
+        reresolved_ids = {m.id for m in reresolved}
+        project_module_ids = set(module_ids.values())
+        relationships = [
+            r for r in canonical['relationships']
+            if not (r.relationship_type == DependencyType.IMPORT
+                    and r.from_entity in reresolved_ids and r.to_entity in project_module_ids)
+        ]
+        for module in reresolved:
+            relationships.extend(module_import_edges(module, module_ids))
+        relationships = self.canonicalizer.canonicalize_relationships(relationships)
+
+        # 4단계: 바뀐 간선의 끝점에서 시작해 영향받은 SCC만 다시 탐지
+        new_relationship_ids = {r.id for r in relationships}
+        removed_relationships = [r for r in cached_result.relationships if r.id not in new_relationship_ids]
+        added_relationships = [r for r in relationships if r.id not in old_relationship_ids]
+        seeds = (removed_ids ^ fresh_ids) | reresolved_ids                                  # 추가/삭제된 엔티티
+        seeds.update(self._edited_entity_ids(graph, fresh, is_affected))                    # 내용(지문)이 바뀐 엔티티
+        for rel in removed_relationships + added_relationships:
+            seeds.add(rel.from_entity)
+            seeds.add(rel.to_entity)
+        if module_graph is None:                                                            # 그래프가 없는 예전 캐시는 캐시된 간선으로 한 번 구성
+            module_graph = ModuleGraph.from_relationships((m.id for m in graph.modules), cached_result.relationships)
+        else:                                                                               # 캐시(메모리 계층)가 가진 그래프는 복사해서 갱신
+            module_graph = module_graph.copy()
+        import_region = module_graph.apply_changes(                                         # 바뀐 import 간선만 그래프에 반영
+            [r for r in removed_relationships if r.relationship_type == DependencyType.IMPORT],
+            [r for r in added_relationships if r.relationship_type == DependencyType.IMPORT],
+            removed_modules=set(removed_modules) - fresh_module_ids,
+            added_modules=fresh_module_ids - set(removed_modules)
+        )
+        self.module_graph = module_graph
+        modules = self._apply_bacon_distances(modules, module_graph)
+        cycles = self._update_cycles(cached_result.cycles, canonical['classes'], canonical['methods'],
+                                     relationships, seeds, import_region)
+
+        # 5단계: 바뀐 엔티티의 메트릭만 갱신
+        progress_callback.update("Updating metrics", 85)
+        metrics = self._update_enhanced_metrics(
+            cached_result.metrics, canonical, relationships, removed_relationships,
+            added_relationships, removed_ids, fresh_ids
+        )
+        quality_metrics = []
+        if self.metrics_engine and self.options.enable_quality_metrics:
+            quality_metrics = self.canonicalizer.canonicalize_quality_metrics(
+                [m for m in cached_result.quality_metrics if m.entity_id not in removed_ids]
+                + [m for analysis in fresh_analyses for m in analysis.quality_metrics]
+            )
+            metrics['quality_distribution'] = self._distributions_from_metrics(
+                quality_metrics, modules, canonical['classes'], canonical['methods']
+            )
+
+        self.logger.info(f"Incremental merge: {len(fresh_analyses)} files re-analyzed, "
+                         f"{len(deleted_files)} deleted, {len(removed_relationships)} edges removed, "
+                         f"{len(added_relationships)} edges added")
+
+        integrated_data = {
+            'packages': canonical['packages'],
+            'modules': modules,
+            'classes': canonical['classes'],
+            'methods': canonical['methods'],
+            'fields': canonical['fields'],
+            'relationships': relationships,
+            'cycles': cycles,
+            'metrics': metrics
+        }
+        progress_callback.update("Assembling final results", 95)
+        return self._assemble_result(project_path, integrated_data, quality_metrics, start_time, progress_callback)
+
+    @staticmethod
+    def _edited_entity_ids(graph: DependencyGraph, fresh: Dict[str, List], is_affected) -> Set[str]:
+        """재분석 전후에 모두 있는 엔티티 중 의미 지문이 바뀌었거나 지문이 없는 엔티티 ID.
+
+        위치만 옮겨졌거나 주석/docstring만 바뀐 클래스/메소드는 지문이 같으므로 시드에서 빠짐
+        """
+        previous = {
+            e.id: e.fingerprint
+            for kind in ('classes', 'methods') for e in getattr(graph, kind) if is_affected(e)
+        }
+        edited = set()
+        for kind in ('modules', 'classes', 'methods', 'fields'):
+            for entity in fresh[kind]:
+                fingerprint = getattr(entity, 'fingerprint', None)                          # 모듈/필드는 지문이 없어 항상 바뀐 것으로 취급
+                if fingerprint is None or previous.get(entity.id) != fingerprint:
+                    edited.add(entity.id)
+        return edited
+
+    def _update_packages(self, packages: List[PackageInfo], removed_module_ids: Set[str],
+                         fresh_modules: List[ModuleInfo]) -> List[PackageInfo]:
+        """패키지 소속 갱신: 교체된 모듈을 빼고 새 모듈을 최상위 패키지에 넣은 뒤 빈 패키지 제거"""
+        by_name = {
+            p.name: replace(p, modules=[m for m in p.modules if m not in removed_module_ids])
+            for p in packages
+        }
+        if not packages:                                                                    # 패키지는 모듈 그래프 단계(pydeps)가 만든 경우에만 유지
+            return []
+        return self._assign_packages(by_name, fresh_modules)
+
+    def _assign_packages(self, by_name: Dict[str, PackageInfo], modules: List[ModuleInfo]) -> List[PackageInfo]:
+        """모듈을 최상위 패키지에 넣고 (없으면 생성) 모듈이 있는 패키지 목록 반환"""
+        for module in modules:
+            if '.' not in module.name:                                                      # 최상위 단일 모듈은 패키지 없음
+                continue
+            package_name = module.name.split('.')[0]                                        # pydeps와 같은 규칙: 최상위 이름
+            package = by_name.get(package_name)
+            if package is None:
+                package = by_name[package_name] = PackageInfo(
+                    id=create_package_id(package_name), name=package_name,
+                    path=self._package_root(module), modules=[]
+                )
+            if module.id not in package.modules:
+                package.modules.append(module.id)
+            module.package_id = module.package_id or package.id
+        return [p for p in by_name.values() if p.modules]
+
+    @staticmethod
+    def _package_root(module: ModuleInfo) -> str:
+        """모듈 파일 경로에서 최상위 패키지 디렉토리 경로 계산"""
+        if not module.file_path:
+            return ""
+        directory = Path(module.file_path).parent
+        levels_up = module.name.count('.') - (0 if module.file_path.endswith('__init__.py') else 1)
+        for _ in range(max(levels_up, 0)):
+            directory = directory.parent
+        return str(directory)
+
+    def _update_cycles(self, cached_cycles: List[CyclicDependency], classes: List[ClassInfo],
+                       methods: List[MethodInfo], relationships: List[Relationship],
+                       seeds: Set[str], import_region: Optional[Set[str]] = None) -> List[Dict]:
+        """시드를 지나는 SCC 영역만 다시 탐지하고 나머지 캐시된 순환은 그대로 유지"""
+        import_relationships = [r for r in relationships if r.relationship_type == DependencyType.IMPORT]
+        other_relationships = [r for r in relationships if r.relationship_type != DependencyType.IMPORT]
+        if import_region is None:                                                           # 모듈 그래프가 영역을 주지 않은 경우
+            import_region = self._cycle_region(import_relationships, seeds)                 # import 그래프에서 영향받는 노드
+        other_region = self._cycle_region(other_relationships, seeds)                       # 호출/상속 그래프에서 영향받는 노드
+
+        kept_cycles = []
+        for cycle in cached_cycles:
+            region = import_region if cycle.cycle_type == 'import' else other_region
+            if seeds.isdisjoint(cycle.entities) and region.isdisjoint(cycle.entities):      # 영향 영역 밖의 순환은 여전히 유효
+                kept_cycles.append({
+                    'id': cycle.id,
+                    'entities': list(cycle.entities),
+                    'cycle_type': cycle.cycle_type,
+                    'severity': cycle.severity,
+                    'description': cycle.description
+                })
+
+        recomputed = (
+            self._detect_detailed_cycles(classes, methods, [
+                r for r in other_relationships if r.from_entity in other_region and r.to_entity in other_region
+            ])
+            + self._detect_cycles_by_type([
+                r for r in import_relationships if r.from_entity in import_region and r.to_entity in import_region
+            ], 'import')
+        )
+        return self.canonicalizer.canonicalize_cycles(kept_cycles + recomputed)
+
+    @staticmethod
+    def _apply_bacon_distances(modules: List[ModuleInfo], module_graph: ModuleGraph) -> List[ModuleInfo]:
+        """모듈 그래프에서 계산한 bacon 거리(진입 모듈로부터의 import 단계 수)를 기록한 모듈 목록.
+
+        거리가 바뀐 모듈만 복사본으로 교체 (캐시된 결과의 레코드는 수정하지 않음)
+        """
+        return [
+            module if module.bacon_distance == module_graph.bacon.get(module.id)
+            else replace(module, bacon_distance=module_graph.bacon.get(module.id))
+            for module in modules
+        ]
+
+    def _cycle_region(self, relationships: List[Relationship], seeds: Set[str]) -> Set[str]:
+        """시드에서 도달 가능하면서 시드로 돌아올 수 있는 노드 집합.
+
+        시드를 포함하는 모든 SCC(와 그 SCC에 닿는 기존 SCC)는 이 집합 안에 있으므로
+        이 부분 그래프의 SCC만 다시 계산하면 됨
+        """
+        edges = self.entity_registry.edges(relationships)                                   # 정수 간선 배열에서 정방향/역방향 도달 가능성 계산
+        seed_ids = [self.entity_registry.intern(seed) for seed in seeds]
+        forward = edges.reachable(seed_ids)
+        backward = edges.reversed().reachable(seed_ids)
+        region = set(seeds)
+        region.update(self.entity_registry.string(node)
+                      for node in range(edges.node_count) if forward[node] and backward[node])
+        return region
+
+    # 이전 전체 분석 한 번의 값이라 증분 병합 결과로 넘기면 안 되는 메트릭 항목
+    # (cost_model: 그 실행의 계획/소요 시간, quality_distribution: 병합 후 다시 계산)
+    _PER_RUN_METRICS = frozenset({'cost_model', 'quality_distribution'})
+
+    def _update_enhanced_metrics(self, cached_metrics: Dict, canonical: Dict,
+                                 relationships: List[Relationship],
+                                 removed_relationships: List[Relationship],
+                                 added_relationships: List[Relationship],
+                                 removed_ids: Set[str], fresh_ids: Set[str]) -> Dict:
+        """캐시된 메트릭에서 바뀐 메소드의 복잡도와 바뀐 간선 끝점의 결합도만 갱신.
+
+        이전 실행 하나에만 해당하는 항목(비용 모델 예측/실측, 품질 분포 등)은 복사하지 않음
+        """
+        metrics = {key: value for key, value in (cached_metrics or {}).items()
+                   if key not in self._PER_RUN_METRICS}
+        metrics['entity_counts'] = {
+            'packages': len(canonical['packages']),
+            'modules': len(canonical['modules']),
+            'classes': len(canonical['classes']),
+            'methods': len(canonical['methods']),
+            'relationships': len(relationships)
+        }
+
+        complexity = {
+            entity_id: value for entity_id, value in metrics.get('complexity_metrics', {}).items()
+            if entity_id not in removed_ids
+        }
+        for method in canonical['methods']:
+            if method.id in fresh_ids and method.complexity:
+                complexity[method.id] = method.complexity
+        metrics['complexity_metrics'] = complexity
+
+        coupling = dict(metrics.get('coupling_metrics', {}))
+        degree_delta: Dict[str, List[int]] = {}                                              # 엔티티 -> [Ca 변화량, Ce 변화량]
+        for sign, rels in ((-1, removed_relationships), (1, added_relationships)):
+            for rel in rels:
+                degree_delta.setdefault(rel.to_entity, [0, 0])[0] += sign
+                degree_delta.setdefault(rel.from_entity, [0, 0])[1] += sign
+        for entity, (ca_delta, ce_delta) in degree_delta.items():
+            current = coupling.get(entity, {})
+            ca = current.get('afferent_coupling', 0) + ca_delta
+            ce = current.get('efferent_coupling', 0) + ce_delta
+            if ca + ce <= 0:                                                                # 더 이상 간선이 없는 엔티티
+                coupling.pop(entity, None)
+                continue
+            coupling[entity] = {
+                'afferent_coupling': ca,
+                'efferent_coupling': ce,
+                'instability': ce / (ca + ce)
+            }
+        metrics['coupling_metrics'] = coupling
+        metrics.setdefault('quality_metrics', {})
+        return metrics
+
+    def _distributions_from_metrics(self, quality_metrics: List[QualityMetrics], modules: List[ModuleInfo],
+                                    classes: List[ClassInfo], methods: List[MethodInfo]) -> Dict[str, Any]:
+        """엔티티별 메트릭을 소속 모듈로 묶어 분포 재계산 (파일 재파싱 없음)"""
+        module_of = {m.id: m.name for m in modules}
+        module_by_path = {normalize_path(m.file_path): m.name for m in modules if m.file_path}
+        for entity in list(classes) + list(methods):
+            module_of[entity.id] = module_by_path.get(normalize_path(entity.file_path), "")
+
+        grouped: Dict[str, List[QualityMetrics]] = {}
+        for metric in quality_metrics:
+            grouped.setdefault(module_of.get(metric.entity_id, ""), []).append(metric)
+        return compute_metric_distributions(grouped.items())
+
     # === 대규모 프로젝트 분석 경로 (>= 1000 파일) ===
 
     def _analyze_large_project(self, project_path: str, project_files: List[str],
@@ -1113,168 +1123,108 @@ class AnalyzerEngine:
                     self.logger.warning(f"Failed to analyze {file_path}: {e}")  # 경고 로그
             return batch_results                              # 배치 분석 결과 반환
 
-        # 스트리밍 분석 결과 처리
-        all_analyses = []                                     # 전체 분석 결과 누적
-        total_processed = 0                                   # 처리된 총 파일 수
-
-        for batch_result in self.large_project_analyzer.analyze_large_project(  # 대규모 프로젝트 분석기 실행
-            project_path, optimized_ast_analysis,             # 프로젝트 경로와 분석 함수
-            lambda msg, prog: progress_callback.update(f"Large project: {msg}", 15 + (prog * 0.6))  # 진행률 콜백
-        ):
-            all_analyses.extend(batch_result)                 # 배치 결과를 전체 결과에 합병
-            total_processed += len(batch_result)              # 처리된 파일 수 누적
-
-            # 주기적 진행률 업데이트
-            if total_processed % 500 == 0:                    # 500파일마다
-                progress_callback.update(f"Processed {total_processed}/{len(project_files)} files",  # 진행 상황 업데이트
-                                       15 + (total_processed / len(project_files)) * 60)
+        # 워커 결과를 도착하는 대로 배치 단위로 통합 테이블에 접어 넣음 (FileAnalysis를 모아두지 않음)
+        integrator = StreamingIntegrator(self.large_project_analyzer.memory_monitor,  # 메모리가 임계치를 넘으면 테이블(엔티티별 품질 메트릭 포함)을 세그먼트 파일로 내림
+                                         batch_size=self.large_project_analyzer.config.batch_size)
+        parallel = self._worker_count() > 1                   # 워커 프로세스 사용 여부
+        progress_callback.update("Analyzing files", 15)       # 진행률 15%에서 75%까지 (파일마다 카운터, 주기적 스냅샷)
+        progress_callback.set_totals(len(project_files), self._planned_bytes(project_files), end_progress=75)
+        with integrator:                                      # 종료 시 세그먼트 파일 삭제
+            for analysis in self.large_project_analyzer.analyze_large_project(  # 대규모 프로젝트 분석기 실행 (파일 단위로 결과 전달)
+                project_path, optimized_ast_analysis,         # 프로젝트 경로와 (단일 프로세스용) 배치 분석 함수
+                file_worker=self._file_worker() if parallel else None,  # 워커 프로세스용 단일 파일 진입점
+                files=project_files                           # 제외 패턴이 적용된 탐색 결과 그대로 사용
+            ):
+                self._advance_progress(progress_callback, analysis)
+                if not analysis:                              # 분석 실패한 파일은 건너뛰기
+                    continue
+                metadata = FileMetadata.from_analysis(analysis)  # 캐시 저장 시 파일을 다시 읽지 않도록 stat/해시 기록
+                if metadata is not None:
+                    self.file_metadata[analysis.file_path] = metadata
+                integrator.add(analysis)                      # 배치가 차면 인터닝 후 테이블에 통합
+
+            tables = integrator.tables()                      # 워커 종료 후 내려둔 배치를 다시 읽어 전체 테이블 구성 (이후 메모리는 전체 결과 크기, max_memory_mb는 워커 단계에만 적용)
+            self.logger.info(f"Large project pipeline: {integrator.get_stats()}")
 
         progress_callback.update("Completing large project analysis", 80)  # 대규모 프로젝트 분석 완료
 
         # 대규모 프로젝트를 위한 단순화된 통합 사용
-        integrated_data = self._integrate_large_project_data(all_analyses, progress_callback)
-
-        # 메모리 절약을 위해 매우 큰 프로젝트는 품질 메트릭 건너뛰기
-        quality_metrics = []                                  # 품질 메트릭 초기화
-        if self.metrics_engine and len(project_files) < 5000:  # 5천 파일 미만일 때만
-            progress_callback.update("Calculating quality metrics (subset)", 85)  # 품질 메트릭 계산 (샘플링)
-            # 품질 메트릭을 위해 샘플만 분석
-            sample_size = min(1000, len(all_analyses))        # 최대 1000개 샘플 크기
-            sample_analyses = all_analyses[:sample_size]      # 앞쪽 샘플 선택
-            quality_metrics = self._calculate_quality_metrics_sample(integrated_data, sample_analyses, progress_callback)
-
-        # 페이지네이션 지원으로 최종 결과 조립
-        progress_callback.update("Assembling results with pagination", 95)  # 페이지네이션으로 결과 조립
-        analysis_result = self._assemble_large_project_result(
+        integrated_data = self._integrate_large_project_data(tables, progress_callback)
+
+        # 워커가 계산한 엔티티별 품질 메트릭을 표준 경로와 같이 결과에 보관 (캐시에 함께 저장되어 증분 병합 가능)
+        quality_metrics: List[QualityMetrics] = []
+        if self.metrics_engine and self.options.enable_quality_metrics:
+            progress_callback.update("Summarizing quality metric distributions", 85)
+            quality_metrics = self.canonicalizer.canonicalize_quality_metrics(
+                [metric for _, metrics in tables['quality'] for metric in metrics]
+            )
+            integrated_data['metrics']['quality_distribution'] = compute_metric_distributions(tables['quality'])  # NumPy 정확한 분포
+
+        # 잘라내지 않은 전체 결과 조립 (서버는 커서 페이지네이션으로 나눠서 제공)
+        progress_callback.update("Assembling results", 95)   # 결과 조립
+        analysis_result = self._assemble_result(
             project_path, integrated_data, quality_metrics, start_time, progress_callback
         )
 
         return analysis_result                                # 대규모 프로젝트 분석 결과 반환
 
-    def _integrate_large_project_data(self, all_analyses: List[FileAnalysis],
+    def _integrate_large_project_data(self, tables: Dict[str, List],
                                      progress_callback: ProgressCallback) -> Dict:
-        """대규모 프로젝트를 위한 단순화된 데이터 통합"""
-        # 메모리 효율성을 위해 복잡한 관계 분석과 순환 검출 생략
-
-        packages = {}                                         # 패키지 정보 딕셔너리
-        modules = []                                          # 모듈 정보 리스트
-        classes = []                                          # 클래스 정보 리스트
-        methods = []                                          # 메서드 정보 리스트
-        fields = []                                           # 필드 정보 리스트
-        relationships = []                                    # 관계 정보 리스트 (단순화)
-
-        for analysis in all_analyses:                         # 각 파일 분석 결과에 대해
-            # 분석 결과를 데이터 구조로 변환 (단순화)
-            module_info = ModuleInfo(
-                id=create_module_id(analysis.file_path),      # 모듈 고유 ID 생성
-                name=Path(analysis.file_path).stem,           # 파일명에서 모듈명 추출
-                file_path=analysis.file_path,                 # 파일 전체 경로
-                classes=analysis.classes,                     # 클래스 목록 (이미 변환됨)
-                functions=analysis.functions,                 # 함수 목록
-                imports=analysis.imports,                     # 임포트 목록
-                loc=analysis.lines_of_code                    # 코드 라인 수
-            )
-            modules.append(module_info)                       # 모듈 목록에 추가
+        """대규모 프로젝트를 위한 단순화된 데이터 통합 (StreamingIntegrator가 만든 엔티티/관계 테이블 사용)"""
+        # pydeps 대신 워커의 import 정보로 패키지/모듈 그래프를 만들고, 비용이 큰 클래스/메서드 수준 순환 검출만 생략
 
-            # 클래스와 메서드 추가 (단순화)
-            classes.extend(analysis.classes)                 # 클래스 목록 확장
-            methods.extend(analysis.methods)                 # 메서드 목록 확장
-            fields.extend(analysis.fields)                   # 필드 목록 확장
+        # 표준 경로와 같은 ID 기준 정규화
+        self.canonicalizer = EntityCanonicalizer()
+        canonical = self.canonicalizer.canonicalize(
+            [], tables['modules'], tables['classes'], tables['methods'], tables['fields'], tables['relationships']
+        )
+        modules, classes = canonical['modules'], canonical['classes']
+        methods, fields = canonical['methods'], canonical['fields']
+        packages = self._assign_packages({}, modules)         # pydeps와 같은 규칙(최상위 이름)으로 패키지 구성
+
+        # 모듈 import 그래프 - 선형 시간 SCC로 import 순환까지 검출
+        progress_callback.update("Building module import graph", 82)
+        relationships = self.canonicalizer.canonicalize_relationships(
+            canonical['relationships'] + build_module_import_edges(modules)
+        )
+        self.module_graph = ModuleGraph.from_relationships((m.id for m in modules), relationships)  # 캐시와 함께 저장되는 모듈 그래프
+        modules = self._apply_bacon_distances(modules, self.module_graph)
+        cycles = self.canonicalizer.canonicalize_cycles(self._import_cycles(self.module_graph))
 
         return {
-            'packages': list(packages.values()),             # 패키지 목록
+            'packages': packages,                             # 패키지 목록
             'modules': modules,                               # 모듈 목록
             'classes': classes,                               # 클래스 목록
             'methods': methods,                               # 메서드 목록
             'fields': fields,                                 # 필드 목록
-            'relationships': relationships,                   # 관계 목록 (단순화됨)
-            'cycles': [],                                     # 대규모 프로젝트는 순환 검출 생략
+            'relationships': relationships,                   # AST 관계 + 모듈 import 관계
+            'cycles': cycles,                                 # 모듈 import 순환 (클래스/메서드 수준은 생략)
             'metrics': {                                      # 기본 메트릭 정보
                 'entity_counts': {                            # 엔티티 개수 통계
+                    'packages': len(packages),                # 패키지 수
                     'modules': len(modules),                  # 모듈 수
                     'classes': len(classes),                  # 클래스 수
                     'methods': len(methods),                  # 메서드 수
-                    'fields': len(fields)                     # 필드 수
+                    'fields': len(fields),                    # 필드 수
+                    'relationships': len(relationships)       # 관계 수
                 }
             }
         }
 
-    def _calculate_quality_metrics_sample(self, integrated_data: Dict,
-                                        sample_analyses: List[FileAnalysis],
-                                        progress_callback: ProgressCallback) -> List[QualityMetrics]:
-        """대규모 프로젝트를 위한 샘플 기반 품질 메트릭 계산"""
-        # 메모리와 시간 절약을 위해 전체가 아닌 샘플만 분석
-
-        if not self.metrics_engine:                          # 메트릭 엔진이 없으면
-            return []                                         # 빈 목록 반환
-
-        sample_metrics = []                                   # 샘플 메트릭 결과 저장
-
-        # 메모리와 시간 절약을 위해 하위 집합만 분석
-        for i, module in enumerate(integrated_data.get('modules', [])[:100]):  # 최대 100개 모듈만
-            try:
-                # 단순화된 품질 분석 수행
-                quality_metric = QualityMetrics(
-                    entity_id=module.id,                     # 모듈 고유 ID
-                    entity_type=EntityType.MODULE,           # 엔티티 타입 (모듈)
-                    cyclomatic_complexity=5,                 # 순환 복잡도 (단순화됨)
-                    lines_of_code=module.loc,                # 코드 라인 수
-                    quality_grade="B"                        # 기본 품질 등급
-                )
-                sample_metrics.append(quality_metric)        # 메트릭 목록에 추가
-
-            except Exception as e:                            # 메트릭 계산 실패 시
-                self.logger.warning(f"Failed to calculate metrics for {module.id}: {e}")  # 경고 로그
-                continue                                      # 다음 모듈로 계속
-
-        return sample_metrics                                 # 계산된 샘플 메트릭 반환
-
-    def _assemble_large_project_result(self, project_path: str, integrated_data: Dict,
-                                      quality_metrics: List[QualityMetrics],
-                                      start_time: float, progress_callback: ProgressCallback) -> AnalysisResult:
-        """페이지네이션을 지원하는 대규모 프로젝트 결과 조립"""
-        # 메모리 사용량 제한을 위해 결과 데이터에 제한을 두어 조립
-
-        end_time = time.time()                                # 분석 종료 시간 기록
-        duration = end_time - start_time                     # 총 분석 소요 시간 계산
-
-        # 프로젝트 정보 생성
-        project_info = ProjectInfo(
-            name=os.path.basename(project_path),             # 프로젝트 이름 (폴더명)
-            path=project_path,                                # 프로젝트 전체 경로
-            analyzed_at=datetime.now().isoformat(),          # 분석 완료 시각 (ISO 형식)
-            total_files=self.total_files,                    # 분석된 총 파일 수
-            analysis_duration_seconds=duration,              # 분석 소요 시간 (초)
-            python_version=f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",  # Python 버전
-            analysis_options=vars(self.options)              # 분석 옵션 설정값들
-        )
-
-        # 페이지네이션 정보를 포함한 의존성 그래프 생성
-        dependency_graph = DependencyGraph(
-            packages=integrated_data['packages'],            # 패키지 목록 (제한 없음)
-            modules=integrated_data['modules'][:1000],       # 모듈을 메모리에서 제한 (최대 1000개)
-            classes=integrated_data['classes'][:2000],       # 클래스 제한 (최대 2000개)
-            methods=integrated_data['methods'][:5000],       # 메서드 제한 (최대 5000개)
-            fields=integrated_data['fields'][:5000]          # 필드 제한 (최대 5000개)
-        )
-
-        # 최종 결과 생성
-        result = AnalysisResult(
-            analysis_id=self.current_analysis_id,            # 고유 분석 ID
-            project_info=project_info,                       # 프로젝트 기본 정보
-            dependency_graph=dependency_graph,               # 제한된 의존성 그래프
-            relationships=integrated_data['relationships'][:1000],  # 관계 제한 (최대 1000개)
-            quality_metrics=quality_metrics,                 # 품질 메트릭 (샘플링됨)
-            metrics=integrated_data['metrics'],              # 기본 메트릭 정보
-            cycles=integrated_data['cycles']                  # 순환 의존성 (대규모에서는 빈 목록)
-        )
-
-        # 대규모 프로젝트 분석 완료 로그
-        self.logger.info(f"Large project analysis completed in {duration:.2f} seconds")  # 분석 소요 시간
-        self.logger.info(f"Analyzed {len(integrated_data['modules'])} modules, "          # 전체 분석된 요소 수
-                        f"{len(integrated_data['classes'])} classes")
-
-        return result                                         # 대규모 프로젝트 분석 결과 반환
+    @staticmethod
+    def _import_cycles(module_graph: ModuleGraph) -> List[Dict]:
+        """모듈 그래프의 SCC를 순환 참조 딕셔너리로 변환 (_detect_cycles_by_type과 같은 형식)"""
+        cycles = []
+        for index, component in enumerate(module_graph.import_cycles()):
+            cycles.append({
+                'id': f"import_cycle_{index}",
+                'entities': list(component),
+                'cycle_type': 'import',
+                'severity': 'high' if len(component) > 3 else 'medium',
+                'metrics': {'length': len(component)},
+                'description': f"Import cycle involving {len(component)} entities"
+            })
+        return cycles
     
     # ========= 공통 로직 =========
 
@@ -1288,7 +1238,9 @@ class AnalyzerEngine:
             # 분석된 모든 파일의 메타데이터 생성
             file_metadata = {}                                # 파일 메타데이터 딕셔너리
             for file_path in project_files:                  # 각 분석된 파일에 대해
-                if os.path.exists(file_path):                 # 파일이 존재하면
+                if file_path in self.file_metadata:           # 워커가 이미 읽은 파일은 다시 읽지 않음
+                    file_metadata[file_path] = self.file_metadata[file_path]
+                elif os.path.exists(file_path):               # 분석되지 않은 파일만 직접 읽어서
                     file_metadata[file_path] = FileMetadata.from_file(file_path)  # 메타데이터 생성
 
             # 캐시 엔트리 생성
@@ -1298,7 +1250,9 @@ class AnalyzerEngine:
                 created_at=datetime.now(),                    # 캐시 생성 시간
                 expires_at=datetime.now() + timedelta(days=7),  # 캐시 만료 시간 (7일)
                 file_metadata=file_metadata,                  # 파일 메타데이터
-                analysis_result=analysis_result               # 분석 결과
+                analysis_result=analysis_result,              # 분석 결과
+                reverse_imports=build_reverse_import_graph(analysis_result),  # 무효화 계획용 역방향 import 그래프
+                module_graph=self.module_graph                # 증분 분석에서 이어서 갱신할 모듈 그래프
             )
 
             self.cache_manager.save_cache(cache)              # 캐시 매니저를 통해 저장
@@ -6,19 +6,24 @@ AST를 사용해서 Python 소스 코드를 상세하게 분석함.
 """
 
 import ast
+import copy
 import os
 import sys
 import logging
 from pathlib import Path
 from typing import List, Dict, Set, Optional, Tuple, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 
 from .models import (
     ModuleInfo, ClassInfo, MethodInfo, FieldInfo, ImportInfo,
-    DependencyType, Relationship, 
+    DependencyType, EntityType, Relationship, QualityMetrics,
     create_module_id, create_class_id, create_method_id, create_field_id,
     create_relationship_id
 )
+from .code_metrics import CodeMetricsEngine
+from .canonicalize import merge_field
+from .file_cache import FileAnalysisCache, content_digest, stat_signature
+from .fingerprint import EntityFingerprint, EntityMemo, FunctionRecord, fingerprint_entities
 
 logger = logging.getLogger(__name__)
 
@@ -34,12 +39,17 @@ class FileAnalysis:
     imports: List[ImportInfo]
     relationships: List[Relationship]
     parse_error: Optional[str] = None
+    quality_metrics: List[QualityMetrics] = field(default_factory=list)  # Module/class/method metrics
+    content_hash: Optional[str] = None  # BLAKE2 digest of the bytes that were analysed
+    file_stat: Optional[Tuple[int, int, int, int]] = None  # Stat signature taken before reading
 
 
 class SymbolTableBuilder(ast.NodeVisitor):
     """Builds symbol table by collecting class, method, field definitions"""
     
-    def __init__(self, file_path: str, module_name: str, enable_type_inference: bool = True):
+    def __init__(self, file_path: str, module_name: str, enable_type_inference: bool = True,
+                 fingerprints: Optional[Dict[ast.AST, EntityFingerprint]] = None,
+                 memo: Optional[EntityMemo] = None):
         self.file_path = file_path
         self.module_name = module_name
         self.module_id = create_module_id(module_name)
@@ -50,6 +60,7 @@ class SymbolTableBuilder(ast.NodeVisitor):
         self.methods: List[MethodInfo] = []
         self.fields: List[FieldInfo] = []
         self.imports: List[ImportInfo] = []
+        self.fields_by_id: Dict[str, FieldInfo] = {}  # One FieldInfo per field ID
         
         # Current context tracking
         self.current_class: Optional[ClassInfo] = None
@@ -58,6 +69,23 @@ class SymbolTableBuilder(ast.NodeVisitor):
         # Symbol tables for each scope
         self.symbol_tables: Dict[str, Set[str]] = {}
         
+        # AST node of every class/method, keyed by entity ID (used for metrics)
+        self.entity_nodes: Dict[str, ast.AST] = {}
+        # Class/method record of every definition node (used by the reference pass)
+        self.node_entities: Dict[ast.AST, Union[ClassInfo, MethodInfo]] = {}
+        
+        # Scope paths for line-independent IDs
+        self._scope_path: List[str] = []  # Enclosing classes and functions
+        self._function_path: List[str] = []  # Enclosing functions below the innermost class
+        self._occurrences: Dict[str, int] = {}  # Definitions seen per scope path
+        
+        # Per-function reuse: records replayed from the memo and records taken in this pass
+        self.fingerprints = fingerprints or {}
+        self.memo = memo
+        self.replayed: Dict[str, Tuple[FunctionRecord, int]] = {}  # method ID -> (record, line delta)
+        self.function_records: Dict[str, Tuple[Tuple[str, str, bool], FunctionRecord]] = {}
+        self._recording: Optional[FunctionRecord] = None
+        
     def visit_Import(self, node: ast.Import) -> None:
         """Visit import statement"""
         for alias in node.names:
@@ -67,27 +95,35 @@ class SymbolTableBuilder(ast.NodeVisitor):
                 line_number=node.lineno,
                 import_type="import"
             )
-            self.imports.append(import_info)
+            self._add_import(import_info)
         self.generic_visit(node)
     
     def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
         """Visit from...import statement"""
-        if node.module:  # Skip relative imports like "from . import"
+        if node.module or node.level:  # "from . import x" has no module but is still a project import
             for alias in node.names:
                 import_info = ImportInfo(
-                    module=node.module,
+                    module=node.module or "",
                     name=alias.name,
                     alias=alias.asname,
                     line_number=node.lineno,
                     import_type="from_import",
-                    is_relative=node.level > 0
+                    is_relative=node.level > 0,
+                    level=node.level
                 )
-                self.imports.append(import_info)
+                self._add_import(import_info)
         self.generic_visit(node)
     
+    def _add_import(self, import_info: ImportInfo) -> None:
+        self.imports.append(import_info)
+        if self._recording is not None:
+            self._recording.imports.append(import_info)
+    
     def visit_ClassDef(self, node: ast.ClassDef) -> None:
         """Visit class definition"""
-        class_id = create_class_id(self.module_id, node.name)
+        qualified_name = ".".join(self._scope_path + [node.name])
+        class_id = create_class_id(self.module_id, qualified_name,
+                                   self._next_occurrence(f"class:{qualified_name}"))
         
         # Extract base classes
         bases = []
@@ -121,20 +157,34 @@ class SymbolTableBuilder(ast.NodeVisitor):
             is_abstract=is_abstract,
             docstring=docstring
         )
+        fingerprint = self.fingerprints.get(node)
+        if fingerprint is not None:
+            class_info.fingerprint = fingerprint.semantic
         
         self.classes.append(class_info)
+        self.entity_nodes[class_id] = node
+        self.node_entities[node] = class_info
         
         # Set current class context
-        old_class = self.current_class
+        old_class, old_function_path = self.current_class, self._function_path
         self.current_class = class_info
         self.scope_stack.append(class_info)
+        self._scope_path.append(node.name)
+        self._function_path = []
         
         # Visit class body
         self.generic_visit(node)
         
         # Restore previous context
-        self.current_class = old_class
+        self.current_class, self._function_path = old_class, old_function_path
         self.scope_stack.pop()
+        self._scope_path.pop()
+    
+    def _next_occurrence(self, scope_path: str) -> int:
+        """1 for the first definition of a scope path, 2 for its first redefinition, ..."""
+        occurrence = self._occurrences.get(scope_path, 0) + 1
+        self._occurrences[scope_path] = occurrence
+        return occurrence
     
     def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
         """Visit function/method definition"""
@@ -148,13 +198,24 @@ class SymbolTableBuilder(ast.NodeVisitor):
         """Common logic for function/method definitions"""
         is_method = self.current_class is not None
         
-        # Create method ID
-        if is_method:
-            method_id = create_method_id(self.current_class.id, node.name, node.lineno)
-            class_id = self.current_class.id
-        else:
-            method_id = create_method_id(None, node.name, node.lineno)
-            class_id = None
+        # Create method ID from the scope path (stable when code above it moves)
+        qualified_name = ".".join(self._function_path + [node.name])
+        class_id = self.current_class.id if is_method else None
+        method_id = create_method_id(class_id, qualified_name, self.module_id,
+                                     self._next_occurrence(f"{class_id}:{qualified_name}"))
+        
+        # Functions of the module or of a top-level class without nested scopes
+        # are reused as a unit when an identical one was analysed before
+        fingerprint = self.fingerprints.get(node)
+        replayable = (fingerprint is not None and not fingerprint.has_nested_scope
+                      and (not self.scope_stack or (len(self.scope_stack) == 1 and is_method)))
+        record_key = (fingerprint.semantic, fingerprint.layout, is_method) if replayable else None
+        if replayable and self.memo is not None:
+            record = self.memo.lookup(fingerprint, is_method)
+            if record is not None:
+                self._replay_function(node, record, method_id, class_id, fingerprint)
+                self.function_records[method_id] = (record_key, record)
+                return
         
         # Extract arguments
         args = []
@@ -207,28 +268,73 @@ class SymbolTableBuilder(ast.NodeVisitor):
             is_class_method=is_class_method,
             is_property=is_property,
             complexity=complexity,
-            docstring=docstring
+            docstring=docstring,
+            fingerprint=fingerprint.semantic if fingerprint is not None else None
         )
         
         self.methods.append(method_info)
+        self.entity_nodes[method_id] = node
+        self.node_entities[node] = method_info
         
         # Add to current class
         if is_method and self.current_class:
             self.current_class.methods.append(method_id)
         
+        if replayable:
+            self._recording = FunctionRecord(line_number=node.lineno, method=method_info)
+            self.function_records[method_id] = (record_key, self._recording)
+        
         # Enter method scope
         self.scope_stack.append(method_info)
+        self._scope_path.append(node.name)
+        self._function_path.append(node.name)
         
         # Visit method body (to find calls)
         self.generic_visit(node)
         
         # Exit method scope
         self.scope_stack.pop()
+        self._scope_path.pop()
+        self._function_path.pop()
+        self._recording = None
+    
+    def _replay_function(self, node: Union[ast.FunctionDef, ast.AsyncFunctionDef], record: FunctionRecord,
+                         method_id: str, class_id: Optional[str], fingerprint: EntityFingerprint) -> None:
+        """Add a recorded function's method, fields and imports, moved to the node's position"""
+        delta = node.lineno - record.line_number
+        method_info = copy.deepcopy(record.method)
+        method_info.id = method_id
+        method_info.line_number = node.lineno
+        method_info.file_path = self.file_path
+        method_info.class_id = class_id
+        method_info.docstring = ast.get_docstring(node)  # Not part of the fingerprint
+        method_info.fingerprint = fingerprint.semantic
+        
+        self.methods.append(method_info)
+        self.entity_nodes[method_id] = node
+        self.node_entities[node] = method_info
+        if class_id is not None:
+            self.current_class.methods.append(method_id)
+        
+        self.scope_stack.append(method_info)
+        for field_info in record.fields:
+            self._add_field(replace(field_info, id=create_field_id(class_id, field_info.name), class_id=class_id,
+                                    line_number=field_info.line_number + delta, file_path=self.file_path))
+        self.scope_stack.pop()
+        for import_info in record.imports:
+            self.imports.append(replace(import_info, line_number=import_info.line_number + delta))
+        self.replayed[method_id] = (record, delta)
     
     def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
         """Visit annotated assignment (type hints)"""
-        if self.current_class and isinstance(node.target, ast.Name):
-            self._create_field(node.target.id, node.lineno, node.annotation, node.value)
+        if self.current_class:
+            target = node.target
+            if isinstance(target, ast.Name):
+                self._create_field(target.id, node.lineno, node.annotation, node.value)
+            elif (isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name)
+                  and target.value.id == 'self'):
+                # self.attribute: type = value
+                self._create_field(target.attr, node.lineno, node.annotation, node.value)
         self.generic_visit(node)
     
     def visit_Assign(self, node: ast.Assign) -> None:
@@ -282,7 +388,20 @@ class SymbolTableBuilder(ast.NodeVisitor):
             default_value=default_value,
             is_class_variable=is_class_variable
         )
+        if self._recording is not None:
+            self._recording.fields.append(replace(field_info))
+        self._add_field(field_info)
+    
+    def _add_field(self, field_info: FieldInfo) -> None:
+        field_id = field_info.id
         
+        # Repeated assignments to the same attribute describe one field
+        existing = self.fields_by_id.get(field_id)
+        if existing is not None:
+            merge_field(existing, field_info)
+            return
+        
+        self.fields_by_id[field_id] = field_info
         self.fields.append(field_info)
         
         # Add to current class
@@ -456,7 +575,11 @@ class ReferenceExtractor(ast.NodeVisitor):
     
     def visit_ClassDef(self, node: ast.ClassDef) -> None:
         """Visit class definition to extract inheritance relationships"""
-        class_id = create_class_id(self.symbol_table.module_id, node.name)
+        class_info = self.symbol_table.node_entities.get(node)
+        if class_info is None:
+            self.generic_visit(node)
+            return
+        class_id = class_info.id
         
         # Extract inheritance relationships
         for base in node.bases:
@@ -473,15 +596,10 @@ class ReferenceExtractor(ast.NodeVisitor):
                 )
                 self.relationships.append(relationship)
         
-        # Find corresponding class info and enter scope
-        class_info = next((c for c in self.symbol_table.classes if c.id == class_id), None)
-        if class_info:
-            self.scope_stack.append(class_info)
-        
+        # Enter the class scope
+        self.scope_stack.append(class_info)
         self.generic_visit(node)
-        
-        if class_info:
-            self.scope_stack.pop()
+        self.scope_stack.pop()
     
     def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
         """Visit function definition"""
@@ -493,28 +611,35 @@ class ReferenceExtractor(ast.NodeVisitor):
     
     def _visit_function_def(self, node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> None:
         """Common logic for function definitions"""
-        current_class = None
-        for scope in reversed(self.scope_stack):
-            if isinstance(scope, ClassInfo):
-                current_class = scope
-                break
-        
-        if current_class:
-            method_id = create_method_id(current_class.id, node.name, node.lineno)
-        else:
-            method_id = create_method_id(None, node.name, node.lineno)
+        method_info = self.symbol_table.node_entities.get(node)
+        if method_info is None:
+            self.generic_visit(node)
+            return
+        method_id = method_info.id
+        
+        replayed = self.symbol_table.replayed.get(method_id)
+        if replayed is not None:
+            record, delta = replayed
+            for rel in record.relationships:
+                self.relationships.append(replace(
+                    rel, id=create_relationship_id(method_id, rel.to_entity, rel.relationship_type),
+                    from_entity=method_id, line_number=rel.line_number + delta,
+                    file_path=self.symbol_table.file_path
+                ))
+            return
         
-        # Find corresponding method info
-        method_info = next((m for m in self.symbol_table.methods if m.id == method_id), None)
-        if method_info:
-            self.current_method = method_info
-            self.scope_stack.append(method_info)
+        # Enter the method scope
+        self.current_method = method_info
+        self.scope_stack.append(method_info)
         
+        first_relationship = len(self.relationships)
         self.generic_visit(node)
         
-        if method_info:
-            self.current_method = None
-            self.scope_stack.pop()
+        self.current_method = None
+        self.scope_stack.pop()
+        recorded = self.symbol_table.function_records.get(method_id)
+        if recorded is not None:
+            recorded[1].relationships = self.relationships[first_relationship:]
     
     def visit_Call(self, node: ast.Call) -> None:
         """Visit function/method call"""
@@ -577,24 +702,81 @@ class ReferenceExtractor(ast.NodeVisitor):
 class ASTAnalyzer:
     """Main AST analyzer class"""
     
-    def __init__(self, enable_type_inference: bool = True):
+    def __init__(self, enable_type_inference: bool = True, enable_quality_metrics: bool = True,
+                 file_cache: Optional[FileAnalysisCache] = None):
         self.logger = logging.getLogger(__name__)
         self.enable_type_inference = enable_type_inference
+        self.metrics_engine = CodeMetricsEngine() if enable_quality_metrics else None
+        self.file_cache = file_cache
+        self._package_prefixes: Dict[str, str] = {}
+    
+    def cache_options(self) -> Dict[str, bool]:
+        """Options that change worker output (part of the file cache key)"""
+        return {
+            'enable_type_inference': self.enable_type_inference,
+            'enable_quality_metrics': self.metrics_engine is not None
+        }
     
     def analyze_file(self, file_path: str) -> Optional[FileAnalysis]:
-        """Analyze a single Python file"""
+        """Analyze a single Python file, reusing a cached result for identical content"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            # Read raw bytes once: the cache key, the parser and the metric
+            # tokenizer all work on them (encoding declarations are honoured)
+            with open(file_path, 'rb') as f:
+                # Stat before reading: a write racing the read changes the
+                # signature, so the next change check hashes the file again
+                file_stat = stat_signature(os.fstat(f.fileno()))
                 source = f.read()
-            
+        except OSError as e:
+            self.logger.error(f"Error reading {file_path}: {e}")
+            return None
+        content_hash = content_digest(source)
+        
+        # Get module name from file path
+        module_name = self._get_module_name(file_path)
+        
+        cache_key = None
+        memo = None
+        if self.file_cache:
+            cache_key = self.file_cache.make_key(source, module_name, self.cache_options())
+            cached = self.file_cache.get(cache_key, file_path)
+            if cached is not None:
+                cached.content_hash, cached.file_stat = content_hash, file_stat
+                return cached
+            # Functions of the previous version of this file that are unchanged are replayed
+            memo = self.file_cache.get_memo(file_path, module_name, self.cache_options()) or EntityMemo()
+        
+        analysis = self.analyze_source(source, file_path, module_name, memo=memo)
+        if analysis is not None:
+            analysis.content_hash, analysis.file_stat = content_hash, file_stat
+        if analysis is not None and cache_key:
+            try:
+                self.file_cache.put(cache_key, analysis)
+                if analysis.parse_error is None:
+                    self.file_cache.put_memo(file_path, module_name, self.cache_options(), memo)
+            except OSError as e:
+                self.logger.warning(f"Could not cache analysis of {file_path}: {e}")
+        return analysis
+    
+    def analyze_source(self, source: Union[bytes, str], file_path: str,
+                       module_name: Optional[str] = None,
+                       memo: Optional[EntityMemo] = None) -> Optional[FileAnalysis]:
+        """Analyze Python source that was already read from ``file_path``.
+        
+        With a ``memo`` of an earlier version of the file, functions whose
+        fingerprints are unchanged are replayed rather than re-analysed; the
+        memo is then updated to describe this version.
+        """
+        if module_name is None:
+            module_name = self._get_module_name(file_path)
+        
+        try:
             # Parse the source code
             tree = ast.parse(source, filename=file_path)
             
-            # Get module name from file path
-            module_name = self._get_module_name(file_path)
-            
             # Build symbol table
-            symbol_builder = SymbolTableBuilder(file_path, module_name, self.enable_type_inference)
+            symbol_builder = SymbolTableBuilder(file_path, module_name, self.enable_type_inference,
+                                                fingerprints=fingerprint_entities(tree), memo=memo)
             symbol_builder.visit(tree)
             
             # Extract references
@@ -614,6 +796,29 @@ class ASTAnalyzer:
                 docstring=ast.get_docstring(tree)
             )
             
+            # Quality metrics reuse the tree we already hold instead of re-parsing later
+            quality_metrics = []
+            if self.metrics_engine:
+                quality_metrics = self.metrics_engine.analyze_file_entities(
+                    module_info, symbol_builder.classes, symbol_builder.methods,
+                    symbol_builder.entity_nodes, source,
+                    known_complexity={method_id: record.complexity
+                                      for method_id, (record, _) in symbol_builder.replayed.items()
+                                      if record.complexity is not None}
+                )
+            
+            if memo is not None:
+                for metric in quality_metrics:
+                    recorded = symbol_builder.function_records.get(metric.entity_id)
+                    if recorded is not None and metric.entity_type == EntityType.METHOD:
+                        recorded[1].complexity = (metric.cyclomatic_complexity, metric.cognitive_complexity,
+                                                  metric.nesting_depth)
+                memo.replace_records(
+                    {key: record for key, record in symbol_builder.function_records.values()},
+                    reused=len(symbol_builder.replayed),
+                    analysed=len(symbol_builder.function_records) - len(symbol_builder.replayed)
+                )
+            
             return FileAnalysis(
                 file_path=file_path,
                 module_info=module_info,
@@ -621,7 +826,8 @@ class ASTAnalyzer:
                 methods=symbol_builder.methods,
                 fields=symbol_builder.fields,
                 imports=symbol_builder.imports,
-                relationships=ref_extractor.relationships
+                relationships=ref_extractor.relationships,
+                quality_metrics=quality_metrics
             )
             
         except SyntaxError as e:
@@ -629,8 +835,8 @@ class ASTAnalyzer:
             return FileAnalysis(
                 file_path=file_path,
                 module_info=ModuleInfo(
-                    id=create_module_id(self._get_module_name(file_path)),
-                    name=self._get_module_name(file_path),
+                    id=create_module_id(module_name),
+                    name=module_name,
                     file_path=file_path
                 ),
                 classes=[],
@@ -638,7 +844,7 @@ class ASTAnalyzer:
                 fields=[],
                 imports=[],
                 relationships=[],
-                parse_error=str(e)
+                parse_error=f"SyntaxError: {e}"
             )
         except Exception as e:
             self.logger.error(f"Error analyzing {file_path}: {e}")
@@ -661,7 +867,7 @@ class ASTAnalyzer:
         return analyses
     
     def _get_module_name(self, file_path: str) -> str:
-        """Convert file path to module name"""
+        """Convert file path to dotted module name (walks up through __init__.py packages)"""
         path = Path(file_path)
         
         # Remove .py extension
@@ -670,24 +876,23 @@ class ASTAnalyzer:
         else:
             module_name = path.name
         
-        # Get parent directories for package structure
-        parts = path.parts[:-1]  # Exclude filename
-        
-        # Find the root (where setup.py, pyproject.toml, or __init__.py exists)
-        i = 0  # Initialize i to handle case where loop doesn't execute
-        for i, part in enumerate(reversed(parts)):
-            parent_path = Path(*parts[:len(parts)-i])
-            if (parent_path / 'setup.py').exists() or \
-               (parent_path / 'pyproject.toml').exists() or \
-               (parent_path / '__init__.py').exists():
-                break
-        
-        # Build module name from remaining path components
-        remaining_parts = parts[len(parts)-i:] if i < len(parts) else parts
-        if remaining_parts:
-            return '.'.join(remaining_parts + (module_name,))
-        else:
-            return module_name
+        package_prefix = self._get_package_prefix(path.parent)
+        if module_name == '__init__':
+            return package_prefix or module_name
+        return f"{package_prefix}.{module_name}" if package_prefix else module_name
+    
+    def _get_package_prefix(self, directory: Path) -> str:
+        """Dotted package name of a directory ('' outside packages), cached per directory"""
+        key = str(directory)
+        prefix = self._package_prefixes.get(key)
+        if prefix is None:
+            if (directory / '__init__.py').exists() and directory.parent != directory:
+                parent_prefix = self._get_package_prefix(directory.parent)
+                prefix = f"{parent_prefix}.{directory.name}" if parent_prefix else directory.name
+            else:
+                prefix = ''
+            self._package_prefixes[key] = prefix
+        return prefix
     
     def _find_python_files(self, project_path: str, 
                           exclude_patterns: List[str]) -> List[str]:
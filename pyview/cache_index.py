@@ -0,0 +1,278 @@
+"""
+PyView Cache Index
+
+SQLite index of the cached analysis results:
+- WAL journal, so several server processes can read and write the same cache
+- Per-entry blob sizes with a running total (no directory scans to enforce the size limit)
+- Per-file blobs of the file analysis cache, counted against the same size budget
+- Last-access timestamps for LRU eviction (blob accesses are recorded at most every few minutes)
+- Writers serialise on ``BEGIN IMMEDIATE``; one connection per process, guarded by a lock
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 2
+
+# Blob hits within this many seconds of the recorded access are not written: every worker
+# looks up blobs on a warm run, and a write per hit would serialise them on the writer lock
+BLOB_TOUCH_INTERVAL = 600.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS caches (
+    cache_id     TEXT PRIMARY KEY,
+    project_path TEXT NOT NULL,
+    created_at   TEXT NOT NULL,
+    expires_at   TEXT,
+    file_count   INTEGER NOT NULL DEFAULT 0,
+    size_bytes   INTEGER NOT NULL DEFAULT 0,
+    last_access  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS caches_last_access ON caches (last_access);
+CREATE TABLE IF NOT EXISTS totals (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals (name, value) VALUES ('size_bytes', 0);
+CREATE TABLE IF NOT EXISTS blobs (
+    path        TEXT PRIMARY KEY,
+    size_bytes  INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS blobs_last_access ON blobs (last_access);
+INSERT OR IGNORE INTO totals (name, value) VALUES ('blob_bytes', 0);
+"""
+
+
+class CacheIndex:
+    """Index rows of cached results, keyed by cache ID, and of per-file blobs, keyed by path"""
+
+    def __init__(self, db_path: Path, timeout: float = 30.0, blob_touch_interval: float = BLOB_TOUCH_INTERVAL):
+        self.db_path = Path(db_path)
+        self.timeout = timeout
+        self.blob_touch_interval = blob_touch_interval
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections must not cross a fork: reconnect in a child process
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(str(self.db_path), timeout=self.timeout,
+                                   isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction; ``BEGIN IMMEDIATE`` takes the database write lock up front"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _read(self, sql: str, params=()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._connection().execute(sql, params).fetchall()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+    # ----- entries -----
+
+    def get(self, cache_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._read("SELECT * FROM caches WHERE cache_id = ?", (cache_id,))
+        return dict(rows[0]) if rows else None
+
+    def put(self, cache_id: str, project_path: str, created_at: str, expires_at: Optional[str],
+            file_count: int, size_bytes: int) -> None:
+        """Insert or replace an entry, keeping the running size total in step"""
+        with self.transaction() as conn:
+            self._put(conn, cache_id, project_path, created_at, expires_at, file_count, size_bytes)
+
+    def _put(self, conn: sqlite3.Connection, cache_id: str, project_path: str, created_at: str,
+             expires_at: Optional[str], file_count: int, size_bytes: int) -> None:
+        previous = conn.execute("SELECT size_bytes FROM caches WHERE cache_id = ?", (cache_id,)).fetchone()
+        conn.execute(
+            "INSERT OR REPLACE INTO caches "
+            "(cache_id, project_path, created_at, expires_at, file_count, size_bytes, last_access) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (cache_id, project_path, created_at, expires_at, file_count, size_bytes, time.time())
+        )
+        delta = size_bytes - (previous["size_bytes"] if previous else 0)
+        conn.execute("UPDATE totals SET value = value + ? WHERE name = 'size_bytes'", (delta,))
+
+    def put_and_evict(self, cache_id: str, project_path: str, created_at: str,
+                      expires_at: Optional[str], file_count: int, size_bytes: int,
+                      max_total_bytes: int) -> Tuple[List[str], List[str]]:
+        """Record an entry, then evict least recently used others until under the budget.
+
+        Results and per-file blobs compete for the same budget. Both steps
+        happen in one transaction; returns the evicted cache IDs and blob
+        paths, whose files the caller deletes.
+        """
+        with self.transaction() as conn:
+            self._put(conn, cache_id, project_path, created_at, expires_at, file_count, size_bytes)
+            evicted: List[str] = []
+            evicted_blobs: List[str] = []
+            total = self._total(conn) + self._blob_total(conn)
+            while total > max_total_bytes:
+                victim = conn.execute(
+                    "SELECT 'cache' AS kind, cache_id AS id, size_bytes, last_access FROM caches WHERE cache_id != ? "
+                    "UNION ALL SELECT 'blob', path, size_bytes, last_access FROM blobs "
+                    "ORDER BY last_access LIMIT 1", (cache_id,)
+                ).fetchone()
+                if victim is None:
+                    break
+                if victim["kind"] == 'cache':
+                    self._delete(conn, victim["id"])
+                    evicted.append(victim["id"])
+                else:
+                    self._delete_blob(conn, victim["id"])
+                    evicted_blobs.append(victim["id"])
+                total -= victim["size_bytes"]
+            return evicted, evicted_blobs
+
+    def touch(self, cache_id: str) -> None:
+        """Record an access for LRU ordering"""
+        with self.transaction() as conn:
+            conn.execute("UPDATE caches SET last_access = ? WHERE cache_id = ?", (time.time(), cache_id))
+
+    def remove(self, cache_id: str) -> bool:
+        with self.transaction() as conn:
+            return self._delete(conn, cache_id)
+
+    def _delete(self, conn: sqlite3.Connection, cache_id: str) -> bool:
+        row = conn.execute("SELECT size_bytes FROM caches WHERE cache_id = ?", (cache_id,)).fetchone()
+        if row is None:
+            return False
+        conn.execute("DELETE FROM caches WHERE cache_id = ?", (cache_id,))
+        conn.execute("UPDATE totals SET value = value - ? WHERE name = 'size_bytes'", (row["size_bytes"],))
+        return True
+
+    def remove_expired(self, now_iso: str) -> List[str]:
+        """Delete entries whose expiry is before ``now_iso``; returns their IDs"""
+        with self.transaction() as conn:
+            expired = [row["cache_id"] for row in conn.execute(
+                "SELECT cache_id FROM caches WHERE expires_at IS NOT NULL AND expires_at < ?", (now_iso,)
+            )]
+            for cache_id in expired:
+                self._delete(conn, cache_id)
+            return expired
+
+    def clear(self) -> List[str]:
+        with self.transaction() as conn:
+            cache_ids = [row["cache_id"] for row in conn.execute("SELECT cache_id FROM caches")]
+            conn.execute("DELETE FROM caches")
+            conn.execute("UPDATE totals SET value = 0 WHERE name = 'size_bytes'")
+            return cache_ids
+
+    # ----- per-file blobs -----
+
+    def put_blob(self, path: str, size_bytes: int, max_total_bytes: Optional[int] = None) -> List[str]:
+        """Record a per-file blob, then evict least recently used blobs until under the budget.
+
+        Only blobs are evicted here (a file write never drops a whole
+        project result); returns the evicted paths, whose files the caller
+        deletes.
+        """
+        with self.transaction() as conn:
+            previous = conn.execute("SELECT size_bytes FROM blobs WHERE path = ?", (path,)).fetchone()
+            conn.execute("INSERT OR REPLACE INTO blobs (path, size_bytes, last_access) VALUES (?, ?, ?)",
+                         (path, size_bytes, time.time()))
+            delta = size_bytes - (previous["size_bytes"] if previous else 0)
+            conn.execute("UPDATE totals SET value = value + ? WHERE name = 'blob_bytes'", (delta,))
+            evicted = []
+            if max_total_bytes is None:
+                return evicted
+            total = self._total(conn) + self._blob_total(conn)
+            while total > max_total_bytes:
+                victim = conn.execute(
+                    "SELECT path, size_bytes FROM blobs WHERE path != ? ORDER BY last_access LIMIT 1", (path,)
+                ).fetchone()
+                if victim is None:
+                    break
+                self._delete_blob(conn, victim["path"])
+                evicted.append(victim["path"])
+                total -= victim["size_bytes"]
+            return evicted
+
+    def touch_blob(self, path: str) -> bool:
+        """Record a blob access unless the recorded one is recent; True if it was written.
+
+        The staleness check is a plain (WAL) read, so hits on recently used
+        blobs never take the write lock.
+        """
+        now = time.time()
+        cutoff = now - self.blob_touch_interval
+        rows = self._read("SELECT last_access FROM blobs WHERE path = ?", (path,))
+        if not rows or rows[0]['last_access'] >= cutoff:
+            return False
+        with self.transaction() as conn:
+            conn.execute("UPDATE blobs SET last_access = ? WHERE path = ? AND last_access < ?", (now, path, cutoff))
+        return True
+
+    def remove_blob(self, path: str) -> bool:
+        with self.transaction() as conn:
+            return self._delete_blob(conn, path)
+
+    def _delete_blob(self, conn: sqlite3.Connection, path: str) -> bool:
+        row = conn.execute("SELECT size_bytes FROM blobs WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return False
+        conn.execute("DELETE FROM blobs WHERE path = ?", (path,))
+        conn.execute("UPDATE totals SET value = value - ? WHERE name = 'blob_bytes'", (row["size_bytes"],))
+        return True
+
+    def clear_blobs(self) -> List[str]:
+        with self.transaction() as conn:
+            paths = [row["path"] for row in conn.execute("SELECT path FROM blobs")]
+            conn.execute("DELETE FROM blobs")
+            conn.execute("UPDATE totals SET value = 0 WHERE name = 'blob_bytes'")
+            return paths
+
+    # ----- accounting -----
+
+    @staticmethod
+    def _total(conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT value FROM totals WHERE name = 'size_bytes'").fetchone()["value"]
+
+    @staticmethod
+    def _blob_total(conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT value FROM totals WHERE name = 'blob_bytes'").fetchone()["value"]
+
+    def total_size(self) -> int:
+        return self._read("SELECT value FROM totals WHERE name = 'size_bytes'")[0]["value"]
+
+    def blob_total_size(self) -> int:
+        return self._read("SELECT value FROM totals WHERE name = 'blob_bytes'")[0]["value"]
+
+    def blob_count(self) -> int:
+        return self._read("SELECT COUNT(*) AS n FROM blobs")[0]["n"]
+
+    def entry_count(self) -> int:
+        return self._read("SELECT COUNT(*) AS n FROM caches")[0]["n"]
+
+    def entries(self) -> List[Dict[str, Any]]:
+        return [dict(row) for row in self._read("SELECT * FROM caches ORDER BY last_access DESC")]
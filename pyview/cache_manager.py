@@ -4,73 +4,103 @@ PyView Cache Management System
 Implements intelligent caching for incremental analysis:
 - File modification tracking
 - Partial analysis results caching
-- Dependency graph caching
-- Intelligent invalidation
+- Dependency graph caching (resolved reverse import graph per analysis)
+- Intelligent invalidation by import graph traversal
+- SQLite (WAL) index with LRU eviction, safe to share between processes
+- Bounded in-memory tier with approximate deep-size accounting
+- Per-file analysis cache (``files/``) sharing the index and the size budget
+- Results stored as memory-mapped columnar snapshots next to the pickled entry (with NumPy)
 """
 
 import os
 import json
 import hashlib
 import pickle
+import sys
+import threading
 import time
+import types
 from pathlib import Path
-from typing import Dict, Set, Optional, List, Any
-from dataclasses import dataclass, field
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Set, Optional, List, Any, Tuple, Callable
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta
+from enum import Enum
 
-from .models import AnalysisResult, ModuleInfo, ClassInfo, MethodInfo
+from .models import AnalysisResult, ModuleInfo, ClassInfo, MethodInfo, DependencyType
+from .file_cache import (FileAnalysisCache, analyzer_fingerprint, content_digest, file_digest,
+                         stat_signature, write_atomic)
+from .cache_index import CacheIndex
+from .module_graph import ModuleGraph
+from .snapshot import AnalysisSnapshot, write_snapshot, HAS_NUMPY
 
 
 @dataclass
 class FileMetadata:
-    """Metadata for cached files"""
+    """Metadata for cached files: a stat signature plus a BLAKE2 content digest"""
     file_path: str
-    last_modified: float
+    mtime_ns: int
     size: int
+    inode: int
+    ctime_ns: int
     checksum: str
-    analysis_version: str = "1.0"
+    analysis_version: str = "2.0"
+    
+    @property
+    def signature(self) -> Tuple[int, int, int, int]:
+        return (self.mtime_ns, self.size, self.inode, self.ctime_ns)
+    
+    @classmethod
+    def from_signature(cls, file_path: str, signature: Tuple[int, int, int, int],
+                       checksum: str) -> 'FileMetadata':
+        mtime_ns, size, inode, ctime_ns = signature
+        return cls(file_path=file_path, mtime_ns=mtime_ns, size=size,
+                   inode=inode, ctime_ns=ctime_ns, checksum=checksum)
     
     @classmethod
     def from_file(cls, file_path: str) -> 'FileMetadata':
-        """Create metadata from file"""
-        stat = os.stat(file_path)
-        
-        # Calculate checksum for content verification
+        """Create metadata from file (reads it; prefer ``from_analysis``)"""
         with open(file_path, 'rb') as f:
-            content = f.read()
-            checksum = hashlib.md5(content).hexdigest()
-        
-        return cls(
-            file_path=file_path,
-            last_modified=stat.st_mtime,
-            size=stat.st_size,
-            checksum=checksum
-        )
+            signature = stat_signature(os.fstat(f.fileno()))
+            checksum = content_digest(f.read())
+        return cls.from_signature(file_path, signature, checksum)
+    
+    @classmethod
+    def from_analysis(cls, analysis) -> Optional['FileMetadata']:
+        """Metadata from the stat and digest the AST worker took of the bytes it parsed"""
+        if not getattr(analysis, 'content_hash', None) or not getattr(analysis, 'file_stat', None):
+            return None
+        return cls.from_signature(analysis.file_path, analysis.file_stat, analysis.content_hash)
     
     def is_outdated(self) -> bool:
-        """Check if file has been modified"""
-        if not os.path.exists(self.file_path):
-            return True
-            
+        """Check if file has been modified (hashes only when the stat signature differs)"""
         try:
-            current_stat = os.stat(self.file_path)
-            
-            # Quick check: modification time and size
-            if (current_stat.st_mtime != self.last_modified or
-                current_stat.st_size != self.size):
-                return True
-                
-            # Deep check: content checksum
-            with open(self.file_path, 'rb') as f:
-                content = f.read()
-                current_checksum = hashlib.md5(content).hexdigest()
-                
-            return current_checksum != self.checksum
-            
-        except (OSError, IOError):
+            if stat_signature(os.stat(self.file_path)) == self.signature:
+                return False
+            return file_digest(self.file_path) != self.checksum
+        except OSError:
             return True
 
 
+def hash_files(file_paths: List[str], max_workers: Optional[int] = None) -> Dict[str, Optional[str]]:
+    """BLAKE2 digests of files, hashed in a thread pool (hashlib releases the GIL).
+
+    Unreadable files map to None.
+    """
+    def digest(file_path: str):
+        try:
+            return file_path, file_digest(file_path)
+        except OSError:
+            return file_path, None
+    
+    if len(file_paths) <= 1:
+        return dict(digest(path) for path in file_paths)
+    workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=min(workers, len(file_paths))) as executor:
+        return dict(executor.map(digest, file_paths))
+
+
 @dataclass
 class AnalysisCache:
     """Cache entry for analysis results"""
@@ -81,108 +111,250 @@ class AnalysisCache:
     file_metadata: Dict[str, FileMetadata] = field(default_factory=dict)
     analysis_result: Optional[AnalysisResult] = None
     partial_results: Dict[str, Any] = field(default_factory=dict)  # File-level caches
-    dependencies: Set[str] = field(default_factory=set)  # Files this cache depends on
+    reverse_imports: Dict[str, List[str]] = field(default_factory=dict)  # File -> files that import it
+    module_graph: Optional[ModuleGraph] = None  # Module import graph of analysis_result (spliced on merge)
+    result_id: Optional[str] = None  # analysis_id of the result stored as a snapshot blob
+    snapshot: Optional[AnalysisSnapshot] = field(default=None, repr=False, compare=False)  # Open snapshot (not pickled)
+    
+    def load_result(self) -> Optional[AnalysisResult]:
+        """The analysis result, rebuilt from the snapshot on first use"""
+        if self.analysis_result is None and self.snapshot is not None:
+            self.analysis_result = self.snapshot.to_analysis_result()
+        return self.analysis_result
+
+
+def build_reverse_import_graph(analysis_result: Optional[AnalysisResult]) -> Dict[str, List[str]]:
+    """Map each project file to the files importing it, from the resolved module import edges"""
+    if analysis_result is None:
+        return {}
+
+    module_paths = {
+        module.id: module.file_path
+        for module in analysis_result.dependency_graph.modules if module.file_path
+    }
+    reverse: Dict[str, Set[str]] = {}
+    for rel in analysis_result.relationships:
+        if rel.relationship_type != DependencyType.IMPORT:
+            continue
+        importer = module_paths.get(rel.from_entity)
+        imported = module_paths.get(rel.to_entity)
+        if importer and imported and importer != imported:
+            reverse.setdefault(imported, set()).add(importer)
+    return {path: sorted(importers) for path, importers in reverse.items()}
+
+
+# Containers longer than this are sized from an evenly spaced sample of their items
+_SIZE_SAMPLE = 256
+# Objects counted shallowly: scalars, and shared code/type objects that are not part of the data
+_LEAF_TYPES = (str, bytes, bytearray, int, float, complex, bool, type(None), type, types.ModuleType,
+               types.FunctionType, types.BuiltinFunctionType, Enum)
+
+
+def estimate_size(obj: Any) -> int:
+    """Approximate deep size of an object graph in bytes.
+
+    Follows containers, instance ``__dict__`` and ``__slots__``; each object
+    is counted once. Long lists are extrapolated from a sample, which keeps
+    sizing a million-entity result to a few milliseconds.
+    """
+    seen: Set[int] = set()
+    total = 0
+    stack: List[Tuple[Any, float]] = [(obj, 1.0)]
+    while stack:
+        current, weight = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current) * weight
+        if isinstance(current, _LEAF_TYPES):
+            continue
+        if isinstance(current, dict):
+            items = [value for pair in current.items() for value in pair]
+        elif isinstance(current, (list, tuple, set, frozenset, deque)):
+            items = list(current)
+        else:
+            items = list(getattr(current, '__dict__', {}).values())
+            for slot in getattr(type(current), '__slots__', ()):
+                if hasattr(current, slot):
+                    items.append(getattr(current, slot))
+        if len(items) > _SIZE_SAMPLE:
+            step = len(items) / _SIZE_SAMPLE
+            scale = weight * len(items) / _SIZE_SAMPLE
+            stack.extend((items[int(i * step)], scale) for i in range(_SIZE_SAMPLE))
+        else:
+            stack.extend((item, weight) for item in items)
+    return int(total)
+
+
+class MemoryCacheTier:
+    """Byte-bounded LRU of loaded AnalysisCache objects"""
+
+    def __init__(self, max_bytes: int, sizer: Callable[[Any], int] = estimate_size):
+        self.max_bytes = max_bytes
+        self.sizer = sizer
+        self._entries: 'OrderedDict[str, Tuple[Any, int]]' = OrderedDict()
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str, is_valid: Optional[Callable[[Any], bool]] = None):
+        """Cached value (most recently used from now on), or None.
+
+        A value failing ``is_valid`` is dropped and counted as a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and is_valid is not None and not is_valid(entry[0]):
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value: Any) -> bool:
+        """Store a value, evicting least recently used ones; False if it exceeds the budget"""
+        size = self.sizer(value)
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes:
+                return False
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+            return True
+
+    def pop(self, key: str, default=None):
+        with self._lock:
+            entry = self._remove(key)
+            return entry[0] if entry is not None else default
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'size_mb': self.current_bytes / (1024 * 1024),
+            'max_size_mb': self.max_bytes / (1024 * 1024),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
 
 
 class CacheManager:
     """Manages analysis caching and invalidation"""
     
-    def __init__(self, cache_dir: Optional[str] = None, max_cache_size_mb: int = 500):
+    def __init__(self, cache_dir: Optional[str] = None, max_cache_size_mb: int = 500,
+                 invalidation_depth: Optional[int] = 1, memory_cache_mb: int = 256):
         self.cache_dir = Path(cache_dir or os.path.expanduser("~/.pyview_cache"))
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
+        # How far importers of a changed file are re-analysed: 0 = none,
+        # 1 = direct importers, None = all transitive importers
+        self.invalidation_depth = invalidation_depth
+        self.hash_workers: Optional[int] = None  # Thread pool size for change checks (None = auto)
+        
+        # Index of cached results (sizes, expiry, last access) shared by all processes
+        self.index = CacheIndex(self.cache_dir / "cache_index.db")
+        
+        # Per-file analysis cache, shared by projects; its blobs count against the same budget
+        self.file_cache = FileAnalysisCache(str(self.cache_dir / "files"), self.index)
         self.max_cache_size = max_cache_size_mb * 1024 * 1024  # Convert to bytes
-        self.cache_index_file = self.cache_dir / "cache_index.json"
         
-        # In-memory cache for frequently used data
-        self.memory_cache: Dict[str, AnalysisCache] = {}
+        # Bounded in-memory tier for frequently used results
+        self.memory_cache = MemoryCacheTier(memory_cache_mb * 1024 * 1024)
         
-        # Load existing cache index
-        self.cache_index = self._load_cache_index()
+        self._migrate_json_index()
         
         # Clean up old caches on startup
         self._cleanup_expired_caches()
     
-    def _load_cache_index(self) -> Dict[str, Dict]:
-        """Load cache index from disk"""
-        if not self.cache_index_file.exists():
-            return {}
-            
+    @property
+    def max_cache_size(self) -> int:
+        return self._max_cache_size
+    
+    @max_cache_size.setter
+    def max_cache_size(self, size_bytes: int):
+        self._max_cache_size = size_bytes
+        self.file_cache.max_size_bytes = size_bytes
+    
+    def _blob_path(self, cache_id: str) -> Path:
+        return self.cache_dir / f"{cache_id}.pkl"
+    
+    def _snapshot_path(self, cache_id: str) -> Path:
+        return self.cache_dir / f"{cache_id}.snap"
+    
+    def _migrate_json_index(self):
+        """Import entries of the old cache_index.json, then drop it"""
+        legacy_index = self.cache_dir / "cache_index.json"
+        if not legacy_index.exists():
+            return
         try:
-            with open(self.cache_index_file, 'r') as f:
-                return json.load(f)
+            with open(legacy_index, 'r') as f:
+                entries = json.load(f)
         except (json.JSONDecodeError, IOError):
-            return {}
-    
-    def _save_cache_index(self):
-        """Save cache index to disk"""
+            entries = {}
+        for cache_id, info in entries.items():
+            blob = self._blob_path(cache_id)
+            if blob.exists() and self.index.get(cache_id) is None:
+                self.index.put(cache_id, info.get('project_path', ''), info.get('created_at', ''),
+                               info.get('expires_at'), info.get('file_count', 0), blob.stat().st_size)
         try:
-            with open(self.cache_index_file, 'w') as f:
-                json.dump(self.cache_index, f, indent=2, default=str)
-        except IOError:
+            legacy_index.unlink()
+        except OSError:
             pass
     
     def _cleanup_expired_caches(self):
         """Remove expired cache entries"""
-        now = datetime.now()
-        expired_keys = []
-        
-        for cache_id, cache_info in self.cache_index.items():
-            expires_at = cache_info.get('expires_at')
-            if expires_at and datetime.fromisoformat(expires_at) < now:
-                expired_keys.append(cache_id)
-        
-        for key in expired_keys:
-            self._remove_cache(key)
+        for cache_id in self.index.remove_expired(datetime.now().isoformat()):
+            self._discard(cache_id)
+    
+    def _discard(self, cache_id: str):
+        """Drop the blob and memory copy of an entry already removed from the index"""
+        self.memory_cache.pop(cache_id, None)
+        for path in (self._blob_path(cache_id), self._snapshot_path(cache_id)):
+            try:
+                path.unlink()
+            except OSError:
+                pass
     
     def _remove_cache(self, cache_id: str):
         """Remove a cache entry completely"""
-        # Remove from index
-        if cache_id in self.cache_index:
-            del self.cache_index[cache_id]
-        
-        # Remove from memory
-        if cache_id in self.memory_cache:
-            del self.memory_cache[cache_id]
-        
-        # Remove cache files
-        cache_file = self.cache_dir / f"{cache_id}.pkl"
-        if cache_file.exists():
-            cache_file.unlink()
-        
-        self._save_cache_index()
-    
-    def _ensure_cache_size_limit(self):
-        """Ensure cache doesn't exceed size limit"""
-        total_size = 0
-        cache_files = []
-        
-        for cache_file in self.cache_dir.glob("*.pkl"):
-            size = cache_file.stat().st_size
-            total_size += size
-            cache_files.append((cache_file, size, cache_file.stat().st_mtime))
-        
-        if total_size <= self.max_cache_size:
-            return
-        
-        # Sort by last access time (oldest first)
-        cache_files.sort(key=lambda x: x[2])
-        
-        # Remove oldest caches until we're under the limit
-        for cache_file, size, _ in cache_files:
-            if total_size <= self.max_cache_size:
-                break
-                
-            cache_id = cache_file.stem
-            self._remove_cache(cache_id)
-            total_size -= size
+        self.index.remove(cache_id)
+        self._discard(cache_id)
     
     def generate_cache_key(self, project_path: str, options: Dict[str, Any]) -> str:
         """Generate a unique cache key for project + options"""
         # Create a deterministic hash of project path + options
         cache_data = {
             'project_path': os.path.abspath(project_path),
-            'options': sorted(options.items()) if isinstance(options, dict) else str(options)
+            'options': sorted(options.items()) if isinstance(options, dict) else str(options),
+            'analyzer': analyzer_fingerprint()  # results of an older analyzer are never reused
         }
         
         cache_str = json.dumps(cache_data, sort_keys=True)
@@ -190,78 +362,142 @@ class CacheManager:
     
     def get_cache(self, cache_id: str) -> Optional[AnalysisCache]:
         """Retrieve cached analysis results"""
-        # Check memory cache first
-        if cache_id in self.memory_cache:
-            return self.memory_cache[cache_id]
-        
-        # Check if cache exists in index
-        if cache_id not in self.cache_index:
+        entry = self.index.get(cache_id)
+        if entry is None:
+            # Evicted or invalidated, possibly by another process
+            self.memory_cache.pop(cache_id, None)
             return None
         
-        cache_file = self.cache_dir / f"{cache_id}.pkl"
-        if not cache_file.exists():
-            # Clean up stale index entry
-            del self.cache_index[cache_id]
-            self._save_cache_index()
-            return None
+        # Memory copy is valid while it is the version the index points at
+        cached = self.memory_cache.get(
+            cache_id, is_valid=lambda cache: cache.created_at.isoformat() == entry['created_at']
+        )
+        if cached is not None:
+            self.index.touch(cache_id)
+            return cached
         
         try:
-            with open(cache_file, 'rb') as f:
+            with open(self._blob_path(cache_id), 'rb') as f:
                 cache_data = pickle.load(f)
-            
-            # Add to memory cache for fast access
-            self.memory_cache[cache_id] = cache_data
-            return cache_data
-            
-        except (pickle.PickleError, IOError):
+        except FileNotFoundError:
+            # Clean up stale index entry
+            self._remove_cache(cache_id)
+            return None
+        except (pickle.PickleError, EOFError, AttributeError, ImportError, IOError):
             # Corrupted cache, remove it
             self._remove_cache(cache_id)
             return None
+        
+        if cache_data.result_id is not None and cache_data.analysis_result is None:
+            # The result stays in the mapped snapshot until load_result() needs it
+            try:
+                snapshot = AnalysisSnapshot(self._snapshot_path(cache_id))
+            except ImportError:
+                # Written by a process with NumPy; leave it to that process
+                return None
+            except (OSError, ValueError):
+                self._remove_cache(cache_id)
+                return None
+            if snapshot.analysis_id != cache_data.result_id:
+                # Another process is replacing this entry
+                snapshot.close()
+                return None
+            cache_data.snapshot = snapshot
+        
+        self.index.touch(cache_id)
+        # Add to memory cache for fast access
+        self.memory_cache.put(cache_id, cache_data)
+        return cache_data
     
     def save_cache(self, cache: AnalysisCache):
-        """Save analysis results to cache"""
-        cache_file = self.cache_dir / f"{cache.cache_id}.pkl"
-        
+        """Save analysis results to cache.
+
+        With NumPy the result is written as a columnar snapshot and the
+        pickled entry keeps only its ID; an entry that was loaded from a
+        snapshot keeps that file (results are never modified in place).
+        """
+        snapshot_path = self._snapshot_path(cache.cache_id)
+        stored = cache
         try:
-            # Ensure we don't exceed cache size
-            self._ensure_cache_size_limit()
-            
-            # Save to disk
-            with open(cache_file, 'wb') as f:
-                pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
-            
-            # Update index
-            self.cache_index[cache.cache_id] = {
-                'project_path': cache.project_path,
-                'created_at': cache.created_at.isoformat(),
-                'expires_at': cache.expires_at.isoformat() if cache.expires_at else None,
-                'file_count': len(cache.file_metadata)
-            }
-            
-            # Add to memory cache
-            self.memory_cache[cache.cache_id] = cache
-            
-            self._save_cache_index()
-            
-        except (pickle.PickleError, IOError):
-            # Failed to save, clean up
-            if cache_file.exists():
-                cache_file.unlink()
+            if cache.snapshot is not None and cache.snapshot.path == snapshot_path:
+                stored = replace(cache, analysis_result=None, snapshot=None, result_id=cache.snapshot.analysis_id)
+            elif HAS_NUMPY and cache.analysis_result is not None:
+                write_snapshot(cache.analysis_result, snapshot_path)  # Written first: readers check result_id
+                stored = replace(cache, analysis_result=None, snapshot=None,
+                                 result_id=cache.analysis_result.analysis_id)
+            else:
+                stored = replace(cache, snapshot=None, result_id=None)
+            payload = pickle.dumps(stored, protocol=pickle.HIGHEST_PROTOCOL)
+            write_atomic(self._blob_path(cache.cache_id), payload)
+            blob_size = len(payload)
+            if stored.result_id is not None:
+                blob_size += snapshot_path.stat().st_size
+            elif snapshot_path.exists():
+                snapshot_path.unlink()
+        except (pickle.PickleError, TypeError, AttributeError, ValueError, IOError):
+            # Failed to save; the previous blob (if any) is left intact
+            return
+        
+        # Record the entry and evict least recently used ones in the same transaction
+        evicted, evicted_blobs = self.index.put_and_evict(
+            cache.cache_id,
+            cache.project_path,
+            cache.created_at.isoformat(),
+            cache.expires_at.isoformat() if cache.expires_at else None,
+            len(cache.file_metadata),
+            blob_size,
+            self.max_cache_size
+        )
+        for cache_id in evicted:
+            self._discard(cache_id)
+        self.file_cache.discard_blobs(evicted_blobs)
+        
+        # Add to memory cache
+        self.memory_cache.put(cache.cache_id, cache)
     
     def check_incremental_validity(self, cache: AnalysisCache, 
-                                  current_files: List[str]) -> Dict[str, bool]:
-        """Check which files need re-analysis"""
+                                  current_files: List[str],
+                                  touched: Optional[List[str]] = None) -> Dict[str, bool]:
+        """Check which files need re-analysis.
+
+        Files whose stat signature matches are valid without being read; the
+        rest are hashed in parallel. Files that were touched but whose content
+        is unchanged stay valid, get their recorded signature refreshed and
+        are appended to ``touched``.
+        """
         validity = {}
         current_files_set = set(current_files)
+        suspects = []
         
         # Check cached files
         for file_path, metadata in cache.file_metadata.items():
             if file_path not in current_files_set:
                 # File was deleted
                 validity[file_path] = False
+                continue
+            try:
+                signature = stat_signature(os.stat(file_path))
+            except OSError:
+                validity[file_path] = False
+                continue
+            if signature == metadata.signature:
+                validity[file_path] = True
             else:
-                # Check if file was modified
-                validity[file_path] = not metadata.is_outdated()
+                suspects.append((file_path, signature))
+        
+        # Stat changed: compare content digests
+        digests = hash_files([file_path for file_path, _ in suspects], self.hash_workers)
+        for file_path, signature in suspects:
+            metadata = cache.file_metadata[file_path]
+            unchanged = digests.get(file_path) == metadata.checksum
+            validity[file_path] = unchanged
+            if unchanged:
+                mtime_ns, size, inode, ctime_ns = signature
+                cache.file_metadata[file_path] = replace(
+                    metadata, mtime_ns=mtime_ns, size=size, inode=inode, ctime_ns=ctime_ns
+                )
+                if touched is not None:
+                    touched.append(file_path)
         
         # Check for new files
         for file_path in current_files:
@@ -272,8 +508,14 @@ class CacheManager:
     
     def get_incremental_analysis_plan(self, cache: AnalysisCache, 
                                      current_files: List[str]) -> Dict[str, List[str]]:
-        """Generate incremental analysis plan"""
-        validity = self.check_incremental_validity(cache, current_files)
+        """Generate incremental analysis plan.
+
+        Importers of outdated files are found by walking the cached reverse
+        import graph up to ``invalidation_depth`` levels; no file contents
+        are read.
+        """
+        touched: List[str] = []
+        validity = self.check_incremental_validity(cache, current_files, touched)
         
         # Files that need re-analysis
         outdated_files = [f for f, valid in validity.items() if not valid]
@@ -281,36 +523,43 @@ class CacheManager:
         # Files that can be reused
         valid_files = [f for f, valid in validity.items() if valid]
         
-        # Files that depend on outdated files (need re-analysis)
-        dependent_files = set()
-        for outdated_file in outdated_files:
-            # Find files that import or depend on this file
-            for file_path in cache.dependencies:
-                if self._has_dependency(file_path, outdated_file, cache):
-                    dependent_files.add(file_path)
+        # Files that import outdated files (need re-analysis)
+        dependent_files = self.find_dependents(cache, outdated_files, self.invalidation_depth)
+        dependent_files &= set(valid_files)
         
         # Remove dependent files from valid list
         truly_valid = [f for f in valid_files if f not in dependent_files]
-        needs_reanalysis = list(set(outdated_files + list(dependent_files)))
+        needs_reanalysis = list(set(outdated_files) | dependent_files)
         
         return {
             'reuse': truly_valid,
             'reanalyze': needs_reanalysis,
+            'dependents': sorted(dependent_files),
+            'touched': touched,
             'new': [f for f in current_files if f not in cache.file_metadata]
         }
     
-    def _has_dependency(self, file1: str, file2: str, cache: AnalysisCache) -> bool:
-        """Check if file1 depends on file2 (simplified)"""
-        # This is a simplified dependency check
-        # In a real implementation, you'd check import relationships
-        try:
-            with open(file1, 'r') as f:
-                content = f.read()
-                # Simple check: does file1 import file2?
-                module_name = Path(file2).stem
-                return f"import {module_name}" in content or f"from {module_name}" in content
-        except:
-            return False
+    @staticmethod
+    def find_dependents(cache: AnalysisCache, changed_files: List[str],
+                        depth: Optional[int] = 1) -> Set[str]:
+        """Files importing any of ``changed_files`` within ``depth`` hops (None = transitive)"""
+        reverse_imports = getattr(cache, 'reverse_imports', None) or {}
+        if depth == 0 or not reverse_imports:
+            return set()
+        
+        seen = set(changed_files)
+        dependents: Set[str] = set()
+        queue = deque((path, 0) for path in changed_files)
+        while queue:
+            path, distance = queue.popleft()
+            if depth is not None and distance >= depth:
+                continue
+            for importer in reverse_imports.get(path, ()):
+                if importer not in seen:
+                    seen.add(importer)
+                    dependents.add(importer)
+                    queue.append((importer, distance + 1))
+        return dependents
     
     def invalidate_cache(self, cache_id: str):
         """Manually invalidate a cache"""
@@ -318,27 +567,20 @@ class CacheManager:
     
     def clear_all_caches(self):
         """Clear all caches"""
-        for cache_file in self.cache_dir.glob("*.pkl"):
-            cache_file.unlink()
-        
-        self.cache_index.clear()
+        for cache_id in self.index.clear():
+            self._discard(cache_id)
         self.memory_cache.clear()
-        self._save_cache_index()
+        self.file_cache.clear()
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        total_size = 0
-        cache_count = 0
-        
-        for cache_file in self.cache_dir.glob("*.pkl"):
-            total_size += cache_file.stat().st_size
-            cache_count += 1
-        
         return {
-            'cache_count': cache_count,
-            'total_size_mb': total_size / (1024 * 1024),
+            'cache_count': self.index.entry_count(),
+            'total_size_mb': self.index.total_size() / (1024 * 1024),
             'max_size_mb': self.max_cache_size / (1024 * 1024),
             'memory_cache_count': len(self.memory_cache),
+            'memory_cache': self.memory_cache.get_stats(),
+            'file_cache': self.file_cache.get_stats(),
             'cache_dir': str(self.cache_dir)
         }
 
@@ -364,38 +606,65 @@ class IncrementalAnalyzer:
         return cache_id
     
     def perform_incremental_analysis(self, project_path: str, current_files: List[str],
-                                   cache_id: str, full_analyzer_func: callable) -> AnalysisResult:
-        """Perform incremental analysis"""
+                                   cache_id: str, full_analyzer_func: callable,
+                                   merge_func: Optional[callable] = None,
+                                   analyzed_metadata: Optional[Dict[str, FileMetadata]] = None,
+                                   module_graph_func: Optional[callable] = None) -> AnalysisResult:
+        """Perform incremental analysis.
+
+        ``merge_func(cached_result, changed_files, deleted_files, module_graph)``
+        replaces the entities and edges of changed/deleted files in the cached
+        result and splices the import changes into a copy of the cached module
+        graph; without it (or when most files
+        changed) the full analyzer is used instead.
+        ``module_graph_func()`` returns the module graph behind the result the
+        analyzer just produced; it is stored with the updated cache.
+        ``analyzed_metadata`` is filled by the analyzer with metadata of the files
+        it read, so re-analysed files are not read again to record them.
+        """
         cache = self.cache_manager.get_cache(cache_id)
-        if not cache:
+        cached_result = cache.load_result() if cache else None
+        if cached_result is None:
             # Fallback to full analysis
             return full_analyzer_func(project_path, current_files)
         
         # Get incremental analysis plan
         plan = self.cache_manager.get_incremental_analysis_plan(cache, current_files)
         
-        reuse_files = plan['reuse']
-        reanalyze_files = plan['reanalyze'] + plan['new']
+        current_set = set(current_files)
+        changed_files = sorted(f for f in set(plan['reanalyze']) | set(plan['new']) if f in current_set)
+        deleted_files = sorted(f for f in cache.file_metadata if f not in current_set)
         
         print(f"🔄 Incremental Analysis Plan:")
-        print(f"  📁 Reusing: {len(reuse_files)} files")
-        print(f"  🔄 Re-analyzing: {len(reanalyze_files)} files")
+        print(f"  📁 Reusing: {len(plan['reuse'])} files")
+        print(f"  🔄 Re-analyzing: {len(changed_files)} files ({len(plan['dependents'])} importers of changed files)")
+        print(f"  🗑️ Deleted: {len(deleted_files)} files")
+        
+        if not changed_files and not deleted_files:
+            # Nothing changed, use cached result
+            if plan['touched']:
+                # Keep the refreshed stat signatures so touched files are not hashed again
+                self.cache_manager.save_cache(cache)
+            return cached_result
         
-        if len(reanalyze_files) / len(current_files) > 0.7:
+        module_graph = None
+        if merge_func is None or len(changed_files) > 0.7 * max(len(current_files), 1):
             # If more than 70% needs re-analysis, just do full analysis
             print("⚡ Too many changes, performing full analysis")
-            return full_analyzer_func(project_path, current_files)
-        
-        # Perform partial analysis only on changed files
-        if reanalyze_files:
-            # This would call the AST analyzer only on changed files
-            partial_result = full_analyzer_func(project_path, reanalyze_files)
-            
-            # Merge with cached results
-            merged_result = self._merge_analysis_results(cache.analysis_result, partial_result)
+            merged_result = full_analyzer_func(project_path, current_files)
         else:
-            # Nothing changed, use cached result
-            merged_result = cache.analysis_result
+            # Re-analyse only changed files and splice them into the cached result
+            module_graph = getattr(cache, 'module_graph', None)
+            if module_graph is None:
+                # Caches written before module graphs were stored
+                module_graph = ModuleGraph.from_relationships(
+                    (m.id for m in cached_result.dependency_graph.modules),
+                    cached_result.relationships
+                )
+            merged_result = merge_func(cached_result, changed_files, deleted_files, module_graph)
+        if module_graph_func is not None:
+            # Graph of the full run, or the spliced copy from the merge
+            module_graph = module_graph_func()
         
         # Update cache with new results
         updated_cache = AnalysisCache(
@@ -403,28 +672,22 @@ class IncrementalAnalyzer:
             project_path=project_path,
             created_at=datetime.now(),
             expires_at=datetime.now() + timedelta(days=7),
-            analysis_result=merged_result
+            analysis_result=merged_result,
+            reverse_imports=build_reverse_import_graph(merged_result),
+            module_graph=module_graph
         )
         
-        # Update file metadata
+        # Update file metadata (unchanged files keep their recorded metadata)
+        changed_set = set(changed_files)
+        analyzed_metadata = analyzed_metadata if analyzed_metadata is not None else {}
         for file_path in current_files:
-            if os.path.exists(file_path):
+            if file_path not in changed_set and file_path in cache.file_metadata:
+                updated_cache.file_metadata[file_path] = cache.file_metadata[file_path]
+            elif file_path in analyzed_metadata:
+                updated_cache.file_metadata[file_path] = analyzed_metadata[file_path]
+            elif os.path.exists(file_path):
                 updated_cache.file_metadata[file_path] = FileMetadata.from_file(file_path)
         
         self.cache_manager.save_cache(updated_cache)
         
         return merged_result
-    
-    def _merge_analysis_results(self, cached_result: AnalysisResult, 
-                              partial_result: AnalysisResult) -> AnalysisResult:
-        """Merge cached results with new partial analysis"""
-        # This is a simplified merge - in practice, you'd need sophisticated merging logic
-        
-        # Start with cached result
-        merged = cached_result
-        
-        # Update with new analysis data
-        # This would involve complex logic to update modules, classes, methods
-        # while preserving relationships and avoiding duplicates
-        
-        return merged
\ No newline at end of file
@@ -0,0 +1,344 @@
+"""
+PyView Entity Canonicalization
+
+Merges duplicate entities and edges once, keyed by entity ID:
+- Modules that describe the same file under different names are aliased to one ID
+  (including pathless pydeps records named after a target file, e.g. "cache_index.py")
+- Classes, methods and fields sharing an ID are merged with fixed rules
+- Relationships are rewritten through module aliases and merged by relationship ID
+- Cycles are deduplicated by their type and entity set
+"""
+
+import logging
+import os
+from dataclasses import replace
+from typing import Dict, List, Optional, Any, Iterable, Set, Tuple, TypeVar
+
+from .models import (
+    PackageInfo, ModuleInfo, ClassInfo, MethodInfo, FieldInfo, ImportInfo,
+    Relationship, QualityMetrics, create_relationship_id
+)
+
+T = TypeVar('T')
+
+SEVERITY_ORDER = {"low": 0, "medium": 1, "high": 2}
+
+
+def _union(first: List[T], second: Iterable[T]) -> List[T]:
+    """Order-preserving union of two lists"""
+    result = list(first)
+    seen = set(result)
+    for item in second:
+        if item not in seen:
+            seen.add(item)
+            result.append(item)
+    return result
+
+
+def _import_key(imp: ImportInfo) -> Tuple:
+    return (imp.module, imp.name, imp.alias, imp.line_number, imp.import_type, imp.is_relative, imp.level)
+
+
+def normalize_path(file_path: Optional[str]) -> Optional[str]:
+    """Path key used to recognise two records of the same file"""
+    if not file_path:
+        return None
+    return os.path.normcase(os.path.abspath(file_path))
+
+
+def merge_field(existing: FieldInfo, other: FieldInfo) -> FieldInfo:
+    """Merge a repeated field definition into the first one (in place).
+
+    The earliest line wins, the first known annotation/default/docstring is
+    kept, and a field assigned inside ``__init__`` anywhere is an instance
+    variable.
+    """
+    existing.line_number = min(existing.line_number, other.line_number)
+    existing.type_annotation = existing.type_annotation or other.type_annotation
+    if existing.default_value is None:
+        existing.default_value = other.default_value
+    existing.is_class_variable = existing.is_class_variable and other.is_class_variable
+    existing.docstring = existing.docstring or other.docstring
+    return existing
+
+
+def merge_method(existing: MethodInfo, other: MethodInfo) -> MethodInfo:
+    """Merge a repeated method record into the first one (in place)"""
+    existing.decorators = _union(existing.decorators, other.decorators)
+    existing.calls = _union(existing.calls, other.calls)
+    existing.return_annotation = existing.return_annotation or other.return_annotation
+    existing.docstring = existing.docstring or other.docstring
+    existing.complexity = max(existing.complexity, other.complexity)
+    return existing
+
+
+def merge_class(existing: ClassInfo, other: ClassInfo) -> ClassInfo:
+    """Merge a repeated class record into the first one (in place)"""
+    existing.bases = _union(existing.bases, other.bases)
+    existing.methods = _union(existing.methods, other.methods)
+    existing.fields = _union(existing.fields, other.fields)
+    existing.decorators = _union(existing.decorators, other.decorators)
+    existing.is_abstract = existing.is_abstract or other.is_abstract
+    existing.docstring = existing.docstring or other.docstring
+    return existing
+
+
+def merge_module(existing: ModuleInfo, other: ModuleInfo) -> ModuleInfo:
+    """Merge another record of the same module into the canonical one (in place)"""
+    existing.file_path = existing.file_path or other.file_path
+    existing.package_id = existing.package_id or other.package_id
+    existing.classes = _union(existing.classes, other.classes)
+    existing.functions = _union(existing.functions, other.functions)
+
+    seen = {_import_key(imp) for imp in existing.imports}
+    added = []
+    for imp in other.imports:
+        key = _import_key(imp)
+        if key not in seen:
+            seen.add(key)
+            added.append(imp)
+    if added:
+        existing.imports = existing.imports + added
+
+    existing.loc = max(existing.loc, other.loc)
+    existing.docstring = existing.docstring or other.docstring
+    existing.display_label = existing.display_label or other.display_label
+    existing.module_depth = existing.module_depth or other.module_depth
+    existing.degree = max(existing.degree, other.degree)
+    if existing.bacon_distance is None:
+        existing.bacon_distance = other.bacon_distance
+    return existing
+
+
+def _sort_key(entity) -> Tuple:
+    return (entity.file_path or "", entity.line_number, entity.id)
+
+
+class EntityCanonicalizer:
+    """ID-keyed merge stage run once after pydeps and AST results are combined.
+
+    Input order does not matter: entities are merged in a fixed sort order
+    and returned sorted, so parallel completion order cannot change results.
+    Input records are never modified: a record that is merged into or
+    rewritten is copied first, so entities of a cached result can be passed
+    in directly.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.module_aliases: Dict[str, str] = {}  # alias module ID -> canonical module ID
+        self.file_named_modules: Set[str] = set()  # aliased pydeps records named "x.py" (not real modules)
+        self.duplicates_removed: Dict[str, int] = {}
+
+    def resolve(self, entity_id: str) -> str:
+        """Canonical ID for an entity ID (only module IDs can be aliased)"""
+        return self.module_aliases.get(entity_id, entity_id)
+
+    def canonicalize(self, packages: List[PackageInfo], modules: List[ModuleInfo],
+                     classes: List[ClassInfo], methods: List[MethodInfo],
+                     fields: List[FieldInfo],
+                     relationships: List[Relationship]) -> Dict[str, Any]:
+        """Merge duplicate entities and edges; returns the integrated-data layout"""
+        canonical_modules = self._canonicalize_modules(modules, classes)
+        canonical_classes = self._merge_by_id('classes', classes, merge_class)
+        canonical_methods = self._merge_by_id('methods', methods, merge_method)
+        canonical_fields = self._merge_by_id('fields', fields, merge_field)
+
+        for index, class_info in enumerate(canonical_classes):
+            module_id = self.resolve(class_info.module_id)
+            if module_id != class_info.module_id:
+                canonical_classes[index] = replace(class_info, module_id=module_id)
+
+        result = {
+            'packages': self._canonicalize_packages(packages),
+            'modules': canonical_modules,
+            'classes': canonical_classes,
+            'methods': canonical_methods,
+            'fields': canonical_fields,
+            'relationships': self.canonicalize_relationships(relationships),
+        }
+
+        removed = sum(self.duplicates_removed.values())
+        if removed:
+            self.logger.info(f"Canonicalization merged {removed} duplicate records: {self.duplicates_removed}")
+        return result
+
+    def _count(self, kind: str, removed: int):
+        if removed:
+            self.duplicates_removed[kind] = self.duplicates_removed.get(kind, 0) + removed
+
+    @staticmethod
+    def _merge_target(merged: Dict[str, T], key: str, copied: Set[str]) -> T:
+        """Record at ``key`` that may be merged into (copied on first use)"""
+        if key not in copied:
+            merged[key] = replace(merged[key])
+            copied.add(key)
+        return merged[key]
+
+    def _merge_by_id(self, kind: str, entities: List[T], merge) -> List[T]:
+        merged: Dict[str, T] = {}
+        copied: Set[str] = set()
+        for entity in sorted(entities, key=_sort_key):
+            if entity.id not in merged:
+                merged[entity.id] = entity
+            else:
+                merge(self._merge_target(merged, entity.id, copied), entity)
+        self._count(kind, len(entities) - len(merged))
+        return list(merged.values())
+
+    def _canonicalize_modules(self, modules: List[ModuleInfo],
+                              classes: List[ClassInfo]) -> List[ModuleInfo]:
+        """Merge module records by ID, then alias records of the same file.
+
+        The canonical record of a file is, in order of preference: the one
+        whose ID its classes carry, one with AST detail (loc/classes/functions),
+        then the smallest ID.
+        """
+        by_id: Dict[str, ModuleInfo] = {}
+        copied: Set[str] = set()
+        for module in sorted(modules, key=lambda m: m.id):
+            if module.id not in by_id:
+                by_id[module.id] = module
+            else:
+                merge_module(self._merge_target(by_id, module.id, copied), module)
+        self._count('modules', len(modules) - len(by_id))
+
+        referenced = {class_info.module_id for class_info in classes}
+
+        def preference(module: ModuleInfo) -> Tuple:
+            has_detail = bool(module.loc or module.classes or module.functions)
+            return (module.id not in referenced, not has_detail, module.id)
+
+        by_path: Dict[str, List[ModuleInfo]] = {}
+        file_named: List[ModuleInfo] = []
+        canonical: List[ModuleInfo] = []
+        for module in by_id.values():
+            path_key = normalize_path(module.file_path)
+            if path_key is not None:
+                by_path.setdefault(path_key, []).append(module)
+            elif module.name.endswith('.py'):
+                file_named.append(module)
+            else:
+                canonical.append(module)
+
+        # pydeps names a target it treats as a file after the file and gives it no path;
+        # its record belongs to the module of the file with that name (if only one has it)
+        by_file_name: Dict[str, List[str]] = {}
+        for path_key in by_path:
+            by_file_name.setdefault(os.path.basename(path_key), []).append(path_key)
+        for module in file_named:
+            file_name = os.path.normcase(os.path.basename(module.name.replace('\\', '/')))
+            matches = by_file_name.get(file_name, [])
+            if len(matches) != 1:
+                canonical.append(module)
+                continue
+            by_path[matches[0]].append(replace(module, package_id=None, display_label=None))  # package/label came from the file name
+            self.file_named_modules.add(module.id)
+
+        for group in by_path.values():
+            group.sort(key=preference)
+            target = group[0]
+            if len(group) > 1:
+                target = self._merge_target(by_id, target.id, copied)
+            for alias in group[1:]:
+                merge_module(target, alias)
+                self.module_aliases[alias.id] = target.id
+            canonical.append(target)
+            self._count('modules', len(group) - 1)
+
+        canonical.sort(key=lambda m: m.id)
+        return canonical
+
+    def _canonicalize_packages(self, packages: List[PackageInfo]) -> List[PackageInfo]:
+        """Merge packages by ID; packages made up only of file-named pydeps records are dropped"""
+        if self.file_named_modules:
+            packages = [replace(p, modules=[m for m in p.modules if m not in self.file_named_modules])
+                        for p in packages]
+            packages = [p for p in packages if p.modules or p.sub_packages]
+        merged: Dict[str, PackageInfo] = {}
+        for package in sorted(packages, key=lambda p: p.id):
+            existing = merged.get(package.id)
+            if existing is None:
+                merged[package.id] = package
+            else:
+                merged[package.id] = replace(
+                    existing,
+                    modules=_union(existing.modules, package.modules),
+                    sub_packages=_union(existing.sub_packages, package.sub_packages),
+                    path=existing.path or package.path
+                )
+        self._count('packages', len(packages) - len(merged))
+
+        return [replace(package, modules=_union([], (self.resolve(m) for m in package.modules)))
+                for package in merged.values()]
+
+    def canonicalize_relationships(self, relationships: List[Relationship]) -> List[Relationship]:
+        """Rewrite endpoints through module aliases and merge edges by ID.
+
+        The first edge (by file and line) is kept and the strongest strength
+        wins. Self-loops created purely by aliasing are dropped.
+        """
+        merged: Dict[str, Relationship] = {}
+        copied: Set[str] = set()
+        dropped = 0
+        for rel in sorted(relationships, key=lambda r: (r.file_path or "", r.line_number, r.id)):
+            from_entity = self.resolve(rel.from_entity)
+            to_entity = self.resolve(rel.to_entity)
+            if from_entity == to_entity and rel.from_entity != rel.to_entity:
+                dropped += 1
+                continue
+            if from_entity != rel.from_entity or to_entity != rel.to_entity:
+                rel = replace(rel, from_entity=from_entity, to_entity=to_entity,
+                              id=create_relationship_id(from_entity, to_entity, rel.relationship_type))
+
+            if rel.id not in merged:
+                merged[rel.id] = rel
+            else:
+                existing = self._merge_target(merged, rel.id, copied)
+                existing.strength = max(existing.strength, rel.strength)
+                existing.context = existing.context or rel.context
+        self._count('relationships', len(relationships) - len(merged) - dropped)
+        self._count('alias_self_loops', dropped)
+        return sorted(merged.values(), key=lambda r: r.id)
+
+    def canonicalize_cycles(self, cycles: List[Dict]) -> List[Dict]:
+        """Deduplicate cycles by (type, entity set); the most severe report wins"""
+        merged: Dict[Tuple, Dict] = {}
+        for cycle in cycles:
+            entities = _union([], (self.resolve(e) for e in cycle.get('entities', [])))
+            if len(entities) < 2 and len(cycle.get('entities', [])) >= 2:
+                continue  # collapsed into a single module by aliasing
+            cycle = dict(cycle, entities=entities)
+            key = (cycle.get('cycle_type'), frozenset(entities))
+
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = cycle
+            elif (SEVERITY_ORDER.get(cycle.get('severity'), 1)
+                  > SEVERITY_ORDER.get(existing.get('severity'), 1)):
+                merged[key] = cycle
+        self._count('cycles', len(cycles) - len(merged))
+
+        # Detectors number their cycles independently; keep IDs unique
+        used_ids = set()
+        for cycle in merged.values():
+            cycle_id = cycle.get('id')
+            if cycle_id in used_ids:
+                suffix = 1
+                while f"{cycle_id}_{suffix}" in used_ids:
+                    suffix += 1
+                cycle['id'] = cycle_id = f"{cycle_id}_{suffix}"
+            used_ids.add(cycle_id)
+        return list(merged.values())
+
+    def canonicalize_quality_metrics(self, metrics: List[QualityMetrics]) -> List[QualityMetrics]:
+        """One metric per entity ID (first wins), with module IDs resolved"""
+        merged: Dict[str, QualityMetrics] = {}
+        for metric in metrics:
+            entity_id = self.resolve(metric.entity_id)
+            if entity_id != metric.entity_id:
+                metric = replace(metric, entity_id=entity_id)
+            if metric.entity_id not in merged:
+                merged[metric.entity_id] = metric
+        self._count('quality_metrics', len(metrics) - len(merged))
+        return list(merged.values())
@@ -3,16 +3,24 @@ PyView Code Quality Metrics
 
 Implements code quality metrics including:
 - Cyclomatic Complexity
+- Physical / source / comment / blank / logical line counts
+- Halstead measures
 - Maintainability Index
 """
 
 import ast
+import bisect
+import io
+import keyword
+import tokenize
 from dataclasses import dataclass, field
-from typing import Dict, List, Set, Optional, Any
+from itertools import accumulate
+from typing import Dict, List, Set, Optional, Any, Union, Tuple
 from pathlib import Path
 import math
 
-from .models import MethodInfo, ClassInfo, ModuleInfo
+from .models import MethodInfo, ClassInfo, ModuleInfo, EntityType
+from .models import QualityMetrics as EntityQualityMetrics
 
 
 @dataclass
@@ -21,8 +29,12 @@ class ComplexityMetrics:
     cyclomatic_complexity: int = 1  # Base complexity
     cognitive_complexity: int = 0   # Cognitive complexity (how hard to understand)
     nesting_depth: int = 0          # Maximum nesting depth
-    lines_of_code: int = 0         # Physical lines
-    logical_lines: int = 0         # Logical lines of code
+    lines_of_code: int = 0         # Source lines (lines holding code)
+    logical_lines: int = 0         # Logical lines of code (statements)
+    comment_lines: int = 0         # Lines holding a comment
+    blank_lines: int = 0           # Lines with neither code nor comment
+    halstead_volume: float = 0.0
+    halstead_difficulty: float = 0.0
 
 
 @dataclass
@@ -32,6 +44,176 @@ class QualityMetrics:
     maintainability_index: float = 0.0
 
 
+@dataclass
+class LineMetrics:
+    """Line counts for a span of source lines"""
+    physical_lines: int = 0
+    source_lines: int = 0
+    comment_lines: int = 0
+    blank_lines: int = 0
+    logical_lines: int = 0
+
+
+@dataclass
+class HalsteadMetrics:
+    """Halstead operator/operand counts for a span of tokens"""
+    distinct_operators: int = 0   # n1
+    distinct_operands: int = 0    # n2
+    total_operators: int = 0      # N1
+    total_operands: int = 0       # N2
+
+    @property
+    def vocabulary(self) -> int:
+        return self.distinct_operators + self.distinct_operands
+
+    @property
+    def length(self) -> int:
+        return self.total_operators + self.total_operands
+
+    @property
+    def volume(self) -> float:
+        if self.vocabulary < 2:
+            return 0.0
+        return self.length * math.log2(self.vocabulary)
+
+    @property
+    def difficulty(self) -> float:
+        if self.distinct_operands == 0:
+            return 0.0
+        return (self.distinct_operators / 2) * (self.total_operands / self.distinct_operands)
+
+    @property
+    def effort(self) -> float:
+        return self.difficulty * self.volume
+
+
+# Tokens that carry no code of their own
+_LAYOUT_TOKENS = {
+    tokenize.ENCODING, tokenize.NL, tokenize.NEWLINE, tokenize.INDENT,
+    tokenize.DEDENT, tokenize.COMMENT, tokenize.ENDMARKER
+}
+# Literal operand tokens (f-string pieces are tokenized separately from 3.12)
+_LITERAL_TOKENS = {tokenize.NUMBER, tokenize.STRING}
+if hasattr(tokenize, 'FSTRING_MIDDLE'):
+    _LITERAL_TOKENS.add(tokenize.FSTRING_MIDDLE)
+# Closing brackets are counted together with their opening bracket
+_CLOSING_BRACKETS = {')', ']', '}'}
+
+
+class TokenStream:
+    """One tokenize pass over a file, queryable by line span.
+
+    Per-line code/comment/statement flags are kept as prefix sums and
+    Halstead tokens are kept in line order, so metrics for any function,
+    class or module span cost a couple of bisects instead of re-scanning
+    the source text.
+    """
+
+    def __init__(self, source: Union[bytes, str]):
+        if isinstance(source, str):
+            source = source.encode('utf-8')
+
+        self.physical_lines = len(source.splitlines())
+        size = self.physical_lines + 2
+        code = [0] * size
+        comment = [0] * size
+        occupied = [0] * size
+        statements = [0] * size
+
+        self._token_rows: List[int] = []
+        self._token_text: List[str] = []
+        self._token_is_operator: List[bool] = []
+
+        for tok in tokenize.tokenize(io.BytesIO(source).readline):
+            tok_type = tok.type
+            row = tok.start[0]
+            if row >= size:
+                continue
+            if tok_type == tokenize.COMMENT:
+                comment[row] = occupied[row] = 1
+                continue
+            if tok_type == tokenize.NEWLINE:
+                statements[row] += 1
+                continue
+            if tok_type in _LAYOUT_TOKENS or tok_type == tokenize.ERRORTOKEN:
+                continue
+
+            for line in range(row, min(tok.end[0], size - 1) + 1):
+                code[line] = occupied[line] = 1
+
+            text = tok.string
+            if tok_type == tokenize.OP:
+                if text in _CLOSING_BRACKETS:
+                    continue
+                if text == ';':
+                    statements[row] += 1
+                is_operator = True
+            elif tok_type == tokenize.NAME:
+                is_operator = keyword.iskeyword(text)
+            elif tok_type in _LITERAL_TOKENS:
+                is_operator = False
+            else:
+                continue
+
+            self._token_rows.append(row)
+            self._token_text.append(text)
+            self._token_is_operator.append(is_operator)
+
+        self._code = list(accumulate(code))
+        self._comment = list(accumulate(comment))
+        self._occupied = list(accumulate(occupied))
+        self._statements = list(accumulate(statements))
+
+    @classmethod
+    def try_build(cls, source: Union[bytes, str]) -> Optional['TokenStream']:
+        """Tokenize the source, or return None if it cannot be tokenized"""
+        try:
+            return cls(source)
+        except (tokenize.TokenError, SyntaxError, UnicodeDecodeError):
+            return None
+
+    def _clamp(self, start: int, end: int):
+        return max(1, start), min(self.physical_lines, end)
+
+    def line_metrics(self, start: int = 1, end: Optional[int] = None) -> LineMetrics:
+        """Line counts for the inclusive 1-based line span [start, end]"""
+        start, end = self._clamp(start, self.physical_lines if end is None else end)
+        if end < start:
+            return LineMetrics()
+
+        physical = end - start + 1
+        return LineMetrics(
+            physical_lines=physical,
+            source_lines=self._code[end] - self._code[start - 1],
+            comment_lines=self._comment[end] - self._comment[start - 1],
+            blank_lines=physical - (self._occupied[end] - self._occupied[start - 1]),
+            logical_lines=self._statements[end] - self._statements[start - 1]
+        )
+
+    def halstead(self, start: int = 1, end: Optional[int] = None) -> HalsteadMetrics:
+        """Halstead counts for tokens starting inside [start, end]"""
+        start, end = self._clamp(start, self.physical_lines if end is None else end)
+        low = bisect.bisect_left(self._token_rows, start)
+        high = bisect.bisect_right(self._token_rows, end)
+
+        operators: Set[str] = set()
+        operands: Set[str] = set()
+        total_operators = 0
+        for i in range(low, high):
+            if self._token_is_operator[i]:
+                operators.add(self._token_text[i])
+                total_operators += 1
+            else:
+                operands.add(self._token_text[i])
+
+        return HalsteadMetrics(
+            distinct_operators=len(operators),
+            distinct_operands=len(operands),
+            total_operators=total_operators,
+            total_operands=(high - low) - total_operators
+        )
+
+
 class ComplexityAnalyzer(ast.NodeVisitor):
     """AST visitor to calculate cyclomatic and cognitive complexity"""
 
@@ -98,225 +280,198 @@ class CodeMetricsEngine:
     def __init__(self):
         pass
         
+    def analyze_function_node(self, node: ast.AST,
+                              tokens: Optional[TokenStream] = None) -> ComplexityMetrics:
+        """Analyze complexity metrics for an already parsed function node"""
+        analyzer = ComplexityAnalyzer()
+        analyzer.visit(node)
+        
+        complexity = ComplexityMetrics(
+            cyclomatic_complexity=analyzer.complexity,
+            cognitive_complexity=analyzer.cognitive_complexity,
+            nesting_depth=analyzer.max_nesting_depth
+        )
+        return self._apply_span(complexity, node, tokens)
+    
+    def analyze_file_entities(self, module_info: ModuleInfo, classes: List[ClassInfo],
+                              methods: List[MethodInfo],
+                              entity_nodes: Dict[str, ast.AST],
+                              source: Union[bytes, str, None] = None,
+                              known_complexity: Optional[Dict[str, Tuple[int, int, int]]] = None
+                              ) -> List[EntityQualityMetrics]:
+        """Calculate module, class and method metrics from one parsed file.
+        
+        Runs inside the AST worker on the tree it already built; ``source`` is
+        the same text that was parsed and is tokenized once for line counts and
+        Halstead measures. Without it, spans fall back to physical line counts.
+        ``known_complexity`` holds (cyclomatic, cognitive, nesting) of methods
+        replayed from an earlier analysis; only their spans are re-measured.
+        """
+        tokens = TokenStream.try_build(source) if source is not None else None
+        results: List[EntityQualityMetrics] = []
+        method_metrics: Dict[str, ComplexityMetrics] = {}
+        
+        # Method / function level
+        for method in methods:
+            node = entity_nodes.get(method.id)
+            if node is None:
+                continue
+            known = known_complexity.get(method.id) if known_complexity else None
+            if known is not None:
+                complexity = self._apply_span(ComplexityMetrics(
+                    cyclomatic_complexity=known[0], cognitive_complexity=known[1], nesting_depth=known[2]
+                ), node, tokens)
+            else:
+                complexity = self.analyze_function_node(node, tokens)
+            method_metrics[method.id] = complexity
+            results.append(self._to_entity_metrics(method.id, EntityType.METHOD, complexity))
+        
+        # Class level: complexity averaged over the class's own methods,
+        # line counts and Halstead measures over the class body
+        for class_info in classes:
+            node = entity_nodes.get(class_info.id)
+            if node is None:
+                continue
+            members = [method_metrics[m] for m in class_info.methods
+                       if isinstance(m, str) and m in method_metrics]
+            complexity = self._apply_span(self._aggregate_complexity(members), node, tokens)
+            results.append(self._to_entity_metrics(class_info.id, EntityType.CLASS, complexity))
+        
+        # Module level: every function and method in the file, whole-file span
+        module_complexity = self._aggregate_complexity(list(method_metrics.values()))
+        if tokens is not None:
+            self._apply_lines(module_complexity, tokens, 1, tokens.physical_lines)
+        else:
+            module_complexity.lines_of_code = module_info.loc
+        results.append(self._to_entity_metrics(module_info.id, EntityType.MODULE, module_complexity))
+        
+        return results
+    
+    def _apply_span(self, complexity: ComplexityMetrics, node: ast.AST,
+                    tokens: Optional[TokenStream]) -> ComplexityMetrics:
+        """Fill line counts and Halstead measures for a node's line span"""
+        start = node.lineno
+        end = getattr(node, 'end_lineno', None) or start
+        if tokens is None:
+            complexity.lines_of_code = end - start + 1
+            return complexity
+        return self._apply_lines(complexity, tokens, start, end)
+    
+    def _apply_lines(self, complexity: ComplexityMetrics, tokens: TokenStream,
+                     start: int, end: int) -> ComplexityMetrics:
+        lines = tokens.line_metrics(start, end)
+        halstead = tokens.halstead(start, end)
+        complexity.lines_of_code = lines.source_lines
+        complexity.logical_lines = lines.logical_lines
+        complexity.comment_lines = lines.comment_lines
+        complexity.blank_lines = lines.blank_lines
+        complexity.halstead_volume = halstead.volume
+        complexity.halstead_difficulty = halstead.difficulty
+        return complexity
+    
+    def _aggregate_complexity(self, members: List[ComplexityMetrics]) -> ComplexityMetrics:
+        """Average complexity / summed LOC over a group of functions"""
+        if not members:
+            return ComplexityMetrics()
+        
+        count = len(members)
+        return ComplexityMetrics(
+            cyclomatic_complexity=int(sum(m.cyclomatic_complexity for m in members) / count),
+            cognitive_complexity=sum(m.cognitive_complexity for m in members) // count,
+            nesting_depth=max(m.nesting_depth for m in members),
+            lines_of_code=sum(m.lines_of_code for m in members)
+        )
+    
+    def maintainability_index(self, complexity: ComplexityMetrics) -> float:
+        """MI = 171 - 5.2 * ln(Halstead Volume) - 0.23 * CC - 16.2 * ln(SLOC), floored at 0"""
+        volume_term = 5.2 * math.log(complexity.halstead_volume) if complexity.halstead_volume > 1 else 0.0
+        lines_of_code = max(1, complexity.lines_of_code)
+        return max(0.0, 171 - volume_term - 0.23 * complexity.cyclomatic_complexity
+                   - 16.2 * math.log(lines_of_code))
+    
+    def _to_entity_metrics(self, entity_id: str, entity_type: EntityType,
+                           complexity: ComplexityMetrics) -> EntityQualityMetrics:
+        """Convert complexity metrics into the per-entity result model"""
+        maintainability_index = self.maintainability_index(complexity)
+        metrics = QualityMetrics(complexity=complexity, maintainability_index=maintainability_index)
+        
+        return EntityQualityMetrics(
+            entity_id=entity_id,
+            entity_type=entity_type,
+            cyclomatic_complexity=complexity.cyclomatic_complexity,
+            cognitive_complexity=complexity.cognitive_complexity,
+            nesting_depth=complexity.nesting_depth,
+            lines_of_code=complexity.lines_of_code,
+            logical_lines=complexity.logical_lines,
+            comment_lines=complexity.comment_lines,
+            blank_lines=complexity.blank_lines,
+            halstead_volume=complexity.halstead_volume,
+            halstead_difficulty=complexity.halstead_difficulty,
+            maintainability_index=maintainability_index,
+            quality_grade=self.get_quality_rating(metrics)
+        )
+        
     def analyze_method_complexity(self, method: MethodInfo, source_code: str) -> ComplexityMetrics:
         """Analyze complexity metrics for a method"""
         try:
-            # Parse just the method's AST node
             tree = ast.parse(source_code)
-
-            # Find the method node
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef) and node.name == method.name:
-                    analyzer = ComplexityAnalyzer()
-                    analyzer.visit(node)
-
-                    # Count lines of code
-                    lines = source_code.split('\n')
-                    physical_lines = len([line for line in lines if line.strip()])
-                    logical_lines = len([line for line in lines
-                                       if line.strip() and not line.strip().startswith('#')])
-
-                    return ComplexityMetrics(
-                        cyclomatic_complexity=analyzer.complexity,
-                        cognitive_complexity=analyzer.cognitive_complexity,
-                        nesting_depth=analyzer.max_nesting_depth,
-                        lines_of_code=physical_lines,
-                        logical_lines=logical_lines
-                    )
-
-        except Exception as e:
-            # Return default metrics if parsing fails
-            pass
-
+        except SyntaxError:
+            return ComplexityMetrics()
+        
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == method.name:
+                return self.analyze_function_node(node, TokenStream.try_build(source_code))
+        
         return ComplexityMetrics()
     
     def analyze_class_quality(self, class_info: ClassInfo, module_source: str) -> QualityMetrics:
         """Analyze quality metrics for a class"""
-        # class_info가 객체인 경우와 딕셔너리인 경우 둘 다 처리하기 위해 추가
-        if isinstance(class_info, (str, dict)):
-            class_name = class_info.get('name') if isinstance(class_info, dict) else str(class_info)
-            return self._analyze_class_from_source(class_name, module_source)
-
-        try:
-            # 메서드가 String ID이면 skip(아직 오류 발생. 수정 필요)
-            if class_info.methods and isinstance(class_info.methods[0], str):
-                return self._analyze_class_from_source(class_info.name, module_source)
-        except Exception as e:
-            print(f"ERROR in analyze_class_quality (type check): {e}, class_info type: {type(class_info)}")
-            return self._analyze_class_from_source(getattr(class_info, 'name', 'Unknown'), module_source)
-
-        # Calculate average complexity for class methods
-        total_complexity = 0
-        total_loc = 0
-        method_count = 0
-
-        for method in class_info.methods:
-            try:
-                method_metrics = self.analyze_method_complexity(method, module_source)
-                total_complexity += method_metrics.cyclomatic_complexity
-                total_loc += method_metrics.lines_of_code
-                method_count += 1
-            except:
-                continue
-
-        avg_complexity = total_complexity / method_count if method_count > 0 else 1
-
-        # Calculate Maintainability Index (simplified version)
-        # MI = 171 - 5.2 * ln(Halstead Volume) - 0.23 * (Cyclomatic Complexity) - 16.2 * ln(Lines of Code)
-        # Using simplified approximation
-        lines_of_code = max(1, total_loc if total_loc > 0 else 10)
-        maintainability_index = max(0, 171 - 0.23 * avg_complexity - 16.2 * math.log(lines_of_code))
-
-        return QualityMetrics(
-            complexity=ComplexityMetrics(
-                cyclomatic_complexity=int(avg_complexity),
-                lines_of_code=total_loc
-            ),
-            maintainability_index=maintainability_index
-        )
+        # class_info가 객체인 경우와 딕셔너리인 경우 둘 다 처리
+        if isinstance(class_info, dict):
+            class_name = class_info.get('name')
+        elif isinstance(class_info, str):
+            class_name = class_info
+        else:
+            class_name = getattr(class_info, 'name', None)
+        return self._analyze_class_from_source(class_name, module_source)
 
     def _analyze_class_from_source(self, class_name: str, module_source: str) -> QualityMetrics:
         """Analyze quality metrics for a class by parsing source code"""
         try:
-            # 코드 파싱
             tree = ast.parse(module_source)
-
-            # 클래스 정의들 순회하며 찾음
-            for node in ast.walk(tree):
-                # 클래스 이름이 일치하면 내부 메서드 분석
-                if isinstance(node, ast.ClassDef) and node.name == class_name:
-                    total_complexity = 0
-                    total_cognitive = 0
-                    total_loc = 0
-                    method_count = 0
-                    max_nesting = 0
-
-                    # 메서드 각각 반영해 복잡도 직접 계산(ComplexityAnalyzer)
-                    for item in node.body:
-                        if isinstance(item, ast.FunctionDef):
-                            analyzer = ComplexityAnalyzer()
-                            analyzer.visit(item)
-
-                            total_complexity += analyzer.complexity
-                            total_cognitive += analyzer.cognitive_complexity
-                            max_nesting = max(max_nesting, analyzer.max_nesting_depth)
-
-                            # Count lines for this method
-                            if hasattr(item, 'lineno') and hasattr(item, 'end_lineno'):
-                                method_lines = item.end_lineno - item.lineno + 1
-                                total_loc += method_lines
-
-                            method_count += 1
-
-                    # 퍙군 복잡도 계산
-                    avg_complexity = total_complexity / method_count if method_count > 0 else 1
-                    lines_of_code = max(1, total_loc if total_loc > 0 else 10)
-
-                    # 유지보수성 지수 계산, 현재는 대략적인 복잡도만 추정. 수정 필요
-                    maintainability_index = max(0, 171 - 0.23 * avg_complexity - 16.2 * math.log(lines_of_code))
-
-                    return QualityMetrics(
-                        complexity=ComplexityMetrics(
-                            cyclomatic_complexity=int(avg_complexity),
-                            cognitive_complexity=total_cognitive // method_count if method_count > 0 else 0,
-                            nesting_depth=max_nesting,
-                            lines_of_code=total_loc
-                        ),
-                        maintainability_index=maintainability_index
-                    )
-
-            # 클래스 못 찾았을 경우 LOC를 이용해 대략적인 복잡도 추정
-            # (MI \approx 171 - 0.23C - 16.2\ln(LOC))
-            lines = module_source.split('\n')
-            loc = len([line for line in lines if line.strip()])
-            complexity = max(1, loc // 10)
-            maintainability = max(0, 171 - 0.23 * complexity - 16.2 * math.log(max(1, loc)))
-
-            return QualityMetrics(
-                complexity=ComplexityMetrics(
-                    cyclomatic_complexity=complexity,
-                    lines_of_code=loc
-                ),
-                maintainability_index=maintainability
-            )
-
-        except Exception as e:
-            # exception 시에도 LOC 이용해 계산. 임시 로직.
-            lines = module_source.split('\n')
-            loc = len([line for line in lines if line.strip()])
-            complexity = max(1, loc // 10)
-            maintainability = max(0, 171 - 0.23 * complexity - 16.2 * math.log(max(1, loc)))
-
-            return QualityMetrics(
-                complexity=ComplexityMetrics(
-                    cyclomatic_complexity=complexity,
-                    lines_of_code=loc
-                ),
-                maintainability_index=maintainability
-            )
+        except SyntaxError:
+            return QualityMetrics()
+        
+        tokens = TokenStream.try_build(module_source)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ClassDef) and node.name == class_name:
+                members = [self.analyze_function_node(item, tokens) for item in node.body
+                           if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))]
+                complexity = self._apply_span(self._aggregate_complexity(members), node, tokens)
+                return QualityMetrics(complexity=complexity,
+                                      maintainability_index=self.maintainability_index(complexity))
+        
+        # 클래스를 찾지 못한 경우 추정치 대신 빈 메트릭 반환
+        return QualityMetrics()
 
     def analyze_module_quality(self, module_info: ModuleInfo, source_code: str) -> QualityMetrics:
         """Analyze quality metrics for a module"""
-        # module_info가 객체인 경우와 딕셔너리인 경우 둘 다 다루기 위해 사용
-        if isinstance(module_info, (str, dict)):
-            lines_of_code = len(source_code.split('\n'))
-            complexity = max(1, lines_of_code // 20)
-            maintainability_index = max(0, 171 - 0.23 * complexity - 16.2 * math.log(max(1, lines_of_code)))
-            return QualityMetrics(
-                complexity=ComplexityMetrics(cyclomatic_complexity=complexity, lines_of_code=lines_of_code),
-                maintainability_index=maintainability_index
-            )
-
         try:
-            # 클래스가 String Id이면 skip. 수정 필요
-            if module_info.classes and isinstance(module_info.classes[0], str):
-                # Return default metrics based on module size
-                lines_of_code = len(source_code.split('\n'))
-                complexity = max(1, lines_of_code // 20)  # Rough estimate
-                maintainability_index = max(0, 171 - 0.23 * complexity - 16.2 * math.log(max(1, lines_of_code)))
-                return QualityMetrics(
-                    complexity=ComplexityMetrics(cyclomatic_complexity=complexity, lines_of_code=lines_of_code),
-                    maintainability_index=maintainability_index
-                )
-        except Exception as e:
-            # 에러 메시지 띄우지만 일단 LOC 이용한 단순한 계산만 수행. 임시 코드
-            print(f"ERROR in analyze_module_quality (type check): {e}, module_info type: {type(module_info)}")
-            lines_of_code = len(source_code.split('\n'))
-            complexity = max(1, lines_of_code // 20)
-            return QualityMetrics(
-                complexity=ComplexityMetrics(cyclomatic_complexity=complexity, lines_of_code=lines_of_code),
-                maintainability_index=70.0
-            )
-
-        total_complexity = 0
-        total_loc = 0
-        class_count = 0
-
-        # Aggregate metrics from all classes in module
-        for class_info in module_info.classes:
-            if isinstance(class_info, str):
-                continue  # Skip string IDs
-            class_metrics = self.analyze_class_quality(class_info, source_code)
-            total_complexity += class_metrics.complexity.cyclomatic_complexity
-            total_loc += class_metrics.complexity.lines_of_code
-            class_count += 1
-
-        if class_count > 0:
-            avg_complexity = total_complexity / class_count
+            tree = ast.parse(source_code)
+        except SyntaxError:
+            return QualityMetrics()
+        
+        tokens = TokenStream.try_build(source_code)
+        members = [self.analyze_function_node(node, tokens) for node in ast.walk(tree)
+                   if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))]
+        complexity = self._aggregate_complexity(members)
+        if tokens is not None:
+            self._apply_lines(complexity, tokens, 1, tokens.physical_lines)
         else:
-            avg_complexity = 1
-
-        # Module-level maintainability
-        lines_of_code = len(source_code.split('\n'))
-        maintainability_index = max(0, 171 - 0.23 * avg_complexity - 16.2 * math.log(max(1, lines_of_code)))
-
-        return QualityMetrics(
-            complexity=ComplexityMetrics(
-                cyclomatic_complexity=int(avg_complexity),
-                lines_of_code=total_loc if class_count > 0 else lines_of_code
-            ),
-            maintainability_index=maintainability_index
-        )
+            complexity.lines_of_code = len(source_code.splitlines())
+        
+        return QualityMetrics(complexity=complexity,
+                              maintainability_index=self.maintainability_index(complexity))
     
     def get_quality_rating(self, metrics: QualityMetrics) -> str:
         """Get a quality rating based on metrics"""
@@ -0,0 +1,232 @@
+"""
+PyView Analysis Cost Model
+
+Predicts the time and memory of a full analysis before it runs:
+- Discovery manifest: file count, total bytes and the file-size distribution
+- Sampled parse of a few dozen files spread over the size distribution,
+  measuring parse time (fixed cost per file + cost per KB), entities per KB
+  and result memory per KB
+- Plan: standard or large-project (streaming) path, worker count and batch size
+- Predicted and actual numbers are stored side by side in the result so the
+  coefficients below can be tuned against real runs
+"""
+
+import os
+import time
+from dataclasses import dataclass, asdict, field
+from typing import Dict, List, Optional, Any, Tuple
+
+from .ast_analyzer import ASTAnalyzer
+from .cache_manager import estimate_size
+
+# Tunable coefficients (compare result.metrics['cost_model'] predicted vs actual)
+WORKER_BASELINE_MB = 50.0          # Interpreter + pyview imports of one worker process
+STANDARD_RESIDENT_FACTOR = 2.0     # Standard path holds per-file analyses and the integrated graph
+STREAMING_RESIDENT_FACTOR = 1.0    # Large-project path holds only the interned tables
+INTEGRATION_SECONDS_PER_ENTITY = 2e-6
+PARALLEL_EFFICIENCY = 0.85
+MIN_PARALLEL_SECONDS = 1.0         # Less CPU work than this is faster without worker start-up
+SECONDS_PER_WORKER = 0.5           # Do not start workers that would get less work than this
+TARGET_MEMORY_RATIO = 0.7          # Share of the budget a plan may use (same as the scheduler's resume ratio)
+TARGET_BATCH_BYTES = 8 * 1024 * 1024
+MIN_BATCH_SIZE, MAX_BATCH_SIZE = 10, 1000
+
+_MB = 1024 * 1024
+
+
+def count_entities(analysis) -> int:
+    """Module + classes + methods + fields + relationships of one FileAnalysis"""
+    return 1 + len(analysis.classes) + len(analysis.methods) + len(analysis.fields) + len(analysis.relationships)
+
+
+@dataclass
+class ProjectManifest:
+    """Size distribution of the discovered files"""
+    file_count: int
+    total_bytes: int
+    median_bytes: int = 0
+    p90_bytes: int = 0
+    p99_bytes: int = 0
+    max_bytes: int = 0
+
+    @classmethod
+    def from_sizes(cls, sizes: List[int]) -> 'ProjectManifest':
+        ordered = sorted(sizes)
+        if not ordered:
+            return cls(file_count=0, total_bytes=0)
+
+        def quantile(q: float) -> int:
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+        return cls(file_count=len(ordered), total_bytes=sum(ordered), median_bytes=quantile(0.5),
+                   p90_bytes=quantile(0.9), p99_bytes=quantile(0.99), max_bytes=ordered[-1])
+
+
+@dataclass
+class SampleProfile:
+    """Per-file and per-KB costs measured on a sample of files"""
+    files: int
+    seconds_per_file: float
+    seconds_per_kb: float
+    entities_per_kb: float
+    memory_per_kb: float  # Bytes of FileAnalysis objects per KB of source
+    failures: int = 0
+
+    @classmethod
+    def prior(cls) -> 'SampleProfile':
+        """Coefficients used before (or without) sampling, measured on typical projects"""
+        return cls(files=0, seconds_per_file=0.0005, seconds_per_kb=0.005, entities_per_kb=18.0,
+                   memory_per_kb=7 * 1024.0)
+
+
+@dataclass
+class AnalysisPlan:
+    """How to run one analysis, with what the model expects it to cost"""
+    strategy: str  # "standard" or "large"
+    workers: int
+    batch_size: int
+    predicted_seconds: float
+    predicted_memory_mb: float
+    predicted_entities: int
+    manifest: ProjectManifest
+    profile: SampleProfile
+    planning_seconds: float = 0.0
+    reasons: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class CostModel:
+    """Builds an AnalysisPlan from the discovered files and a sampled parse"""
+
+    def __init__(self, max_memory_mb: int = 1024, max_workers: Optional[int] = None, sample_size: int = 32,
+                 enable_type_inference: bool = True, enable_quality_metrics: bool = True):
+        self.max_memory_mb = max_memory_mb
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.sample_size = sample_size
+        self.enable_type_inference = enable_type_inference
+        self.enable_quality_metrics = enable_quality_metrics
+
+    @staticmethod
+    def file_sizes(files: List[str]) -> List[Tuple[str, int]]:
+        sizes = []
+        for path in files:
+            try:
+                sizes.append((path, os.path.getsize(path)))
+            except OSError:
+                continue
+        return sizes
+
+    def sample(self, sizes: List[Tuple[str, int]]) -> List[Tuple[str, int]]:
+        """Files at evenly spaced ranks of the size distribution (smallest and largest included)"""
+        ordered = sorted(sizes, key=lambda item: item[1])
+        if len(ordered) <= self.sample_size:
+            return ordered
+        last = len(ordered) - 1
+        ranks = sorted({round(i * last / (self.sample_size - 1)) for i in range(self.sample_size)})
+        return [ordered[rank] for rank in ranks]
+
+    def profile(self, sample: List[Tuple[str, int]]) -> SampleProfile:
+        """Parse the sample (without the file cache, so timings are real) and fit the costs"""
+        if not sample:
+            return SampleProfile.prior()
+        analyzer = ASTAnalyzer(enable_type_inference=self.enable_type_inference,
+                               enable_quality_metrics=self.enable_quality_metrics)
+        points: List[Tuple[float, float]] = []  # (KB, seconds)
+        entities = 0
+        memory = 0
+        total_kb = 0.0
+        failures = 0
+        for path, size in sample:
+            started = time.perf_counter()
+            try:
+                analysis = analyzer.analyze_file(path)
+            except Exception:
+                analysis = None
+            elapsed = time.perf_counter() - started
+            if analysis is None:
+                failures += 1
+                continue
+            kb = size / 1024
+            points.append((kb, elapsed))
+            entities += count_entities(analysis)
+            memory += estimate_size(analysis)
+            total_kb += kb
+        if not points or total_kb <= 0:
+            return SampleProfile.prior()
+
+        seconds_per_file, seconds_per_kb = self._fit_line(points)
+        return SampleProfile(files=len(points), seconds_per_file=seconds_per_file, seconds_per_kb=seconds_per_kb,
+                             entities_per_kb=entities / total_kb, memory_per_kb=memory / total_kb,
+                             failures=failures)
+
+    @staticmethod
+    def _fit_line(points: List[Tuple[float, float]]) -> Tuple[float, float]:
+        """Least-squares seconds = a + b * KB, with both terms kept non-negative"""
+        count = len(points)
+        mean_x = sum(x for x, _ in points) / count
+        mean_y = sum(y for _, y in points) / count
+        spread = sum((x - mean_x) ** 2 for x, _ in points)
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / spread if spread else 0.0
+        if slope <= 0:
+            return 0.0, mean_y / mean_x if mean_x else 0.0
+        intercept = mean_y - slope * mean_x
+        if intercept < 0:
+            return 0.0, sum(y for _, y in points) / sum(x for x, _ in points)
+        return intercept, slope
+
+    def plan(self, files: List[str]) -> AnalysisPlan:
+        """Stat every file, sample a few, and choose the strategy, workers and batch size"""
+        started = time.perf_counter()
+        sizes = self.file_sizes(files)
+        manifest = ProjectManifest.from_sizes([size for _, size in sizes])
+        # A project no larger than the sample would be parsed twice; plan it from the prior
+        profile = self.profile(self.sample(sizes)) if len(sizes) > self.sample_size else SampleProfile.prior()
+        plan = self.predict(manifest, profile)
+        plan.planning_seconds = time.perf_counter() - started
+        return plan
+
+    def predict(self, manifest: ProjectManifest, profile: SampleProfile) -> AnalysisPlan:
+        """Plan for a manifest given measured (or prior) per-file costs"""
+        total_kb = manifest.total_bytes / 1024
+        cpu_seconds = profile.seconds_per_file * manifest.file_count + profile.seconds_per_kb * total_kb
+        entities = int(manifest.file_count + profile.entities_per_kb * total_kb)
+        result_mb = profile.memory_per_kb * total_kb / _MB
+        budget_mb = self.max_memory_mb * TARGET_MEMORY_RATIO
+        reasons = []
+
+        # One busy worker: interpreter baseline plus the result of the largest file it may hold
+        worker_mb = WORKER_BASELINE_MB + profile.memory_per_kb * (manifest.max_bytes / 1024) / _MB
+
+        strategy = "standard"
+        resident_mb = result_mb * STANDARD_RESIDENT_FACTOR
+        if resident_mb + worker_mb > budget_mb:
+            strategy = "large"
+            resident_mb = result_mb * STREAMING_RESIDENT_FACTOR
+            reasons.append(f"standard path needs ~{result_mb * STANDARD_RESIDENT_FACTOR:.0f} MB "
+                           f"of a {budget_mb:.0f} MB budget")
+
+        if cpu_seconds < MIN_PARALLEL_SECONDS:
+            workers = 1
+            reasons.append(f"~{cpu_seconds:.2f}s of parsing does not pay for worker start-up")
+        else:
+            workers = min(self.max_workers, max(1, int(cpu_seconds / SECONDS_PER_WORKER)))
+            affordable = int((budget_mb - resident_mb) // worker_mb) if worker_mb else workers
+            if affordable < workers:
+                workers = max(1, affordable)
+                reasons.append(f"memory allows {workers} workers of ~{worker_mb:.0f} MB")
+
+        bytes_per_file = profile.memory_per_kb * (manifest.total_bytes / manifest.file_count / 1024) \
+            if manifest.file_count else 0
+        batch_size = (int(TARGET_BATCH_BYTES / bytes_per_file) if bytes_per_file else MAX_BATCH_SIZE)
+        batch_size = max(MIN_BATCH_SIZE, min(MAX_BATCH_SIZE, batch_size))
+
+        efficiency = PARALLEL_EFFICIENCY if workers > 1 else 1.0
+        seconds = cpu_seconds / (workers * efficiency) + entities * INTEGRATION_SECONDS_PER_ENTITY
+        memory_mb = resident_mb + (workers * worker_mb if workers > 1 else 0.0)
+
+        return AnalysisPlan(strategy=strategy, workers=workers, batch_size=batch_size,
+                            predicted_seconds=seconds, predicted_memory_mb=memory_mb,
+                            predicted_entities=entities, manifest=manifest, profile=profile,
+                            reasons=reasons)
@@ -0,0 +1,283 @@
+"""
+PyView Entity Registry
+
+Dense integer IDs for entity ID strings, used by joins and graph algorithms:
+- One string table per analysis: each entity ID (and any other string that
+  takes part in a join) is stored once and referred to by its index
+- Relationships become parallel integer arrays (source, target, edge index)
+  with a CSR adjacency, so degree counts and cycle searches index lists
+  instead of hashing long strings
+- Strings are rendered back only when results are built for the API
+"""
+
+from array import array
+from itertools import accumulate
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .models import Relationship
+
+_SEVERITY_RANK = {"low": 0, "medium": 1, "high": 2}
+
+_entity_id = attrgetter('id')
+_from_entity = attrgetter('from_entity')
+_to_entity = attrgetter('to_entity')
+
+
+class EntityRegistry:
+    """String table mapping entity IDs to dense integers (0, 1, 2, ...)"""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._ids
+
+    def intern(self, value: str) -> int:
+        """Integer ID of ``value``, assigning the next one on first sight"""
+        index = self._ids.get(value)
+        if index is None:
+            index = self._ids[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def get(self, value: str) -> Optional[int]:
+        return self._ids.get(value)
+
+    def string(self, index: int) -> str:
+        return self.strings[index]
+
+    def render(self, indexes: Iterable[int]) -> List[str]:
+        strings = self.strings
+        return [strings[index] for index in indexes]
+
+    def register(self, *entity_lists: Iterable) -> None:
+        """Assign IDs to entities in the given order (e.g. packages, modules, classes, methods, fields)"""
+        for entities in entity_lists:
+            self.intern_all(map(_entity_id, entities))
+
+    def intern_all(self, values: Iterable[str]) -> array:
+        """Integer IDs of ``values`` in order; unseen values get new IDs (in first-seen order)"""
+        values = values if isinstance(values, list) else list(values)
+        ids = self._ids
+        missing = [value for value in dict.fromkeys(values) if value not in ids]
+        for value in missing:
+            ids[value] = len(self.strings)
+            self.strings.append(value)
+        return array('l', map(ids.__getitem__, values))
+
+    def edges(self, relationships: Sequence[Relationship]) -> 'EdgeTable':
+        return EdgeTable(self, relationships)
+
+
+class EdgeTable:
+    """Relationships as integer (source, target) arrays over an EntityRegistry"""
+
+    def __init__(self, registry: EntityRegistry, relationships: Sequence[Relationship],
+                 _arrays: Optional[Tuple[array, array]] = None):
+        self.registry = registry
+        self.relationships = relationships
+        if _arrays is None:
+            _arrays = (registry.intern_all(list(map(_from_entity, relationships))),
+                       registry.intern_all(list(map(_to_entity, relationships))))
+        self.sources, self.targets = _arrays
+        self.node_count = len(registry)
+        self._adjacency: Optional[Tuple[array, array, array]] = None
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    def degrees(self) -> Tuple[List[int], List[int]]:
+        """(in-degree, out-degree) per node, counting every relationship"""
+        in_degree = [0] * self.node_count
+        out_degree = [0] * self.node_count
+        for source in self.sources:
+            out_degree[source] += 1
+        for target in self.targets:
+            in_degree[target] += 1
+        return in_degree, out_degree
+
+    def adjacency(self) -> Tuple[array, array, array]:
+        """CSR adjacency: successors of ``n`` are ``targets[offsets[n]:offsets[n + 1]]``.
+
+        Edges keep relationship order within a source; ``edge_index`` maps
+        each position back to its relationship. Built with a stable sort, so
+        no per-edge Python loop runs.
+        """
+        if self._adjacency is None:
+            order = sorted(range(len(self.sources)), key=self.sources.__getitem__)
+            _, out_degree = self.degrees()
+            offsets = array('l', accumulate(out_degree, initial=0))
+            targets = array('l', map(self.targets.__getitem__, order))
+            self._adjacency = (offsets, targets, array('l', order))
+        return self._adjacency
+
+    def subset(self, indexes: Sequence[int]) -> 'EdgeTable':
+        """The relationships at ``indexes``, reusing their integer IDs (no string hashing)"""
+        relationships = self.relationships
+        return EdgeTable(self.registry, [relationships[index] for index in indexes],
+                         (array('l', map(self.sources.__getitem__, indexes)),
+                          array('l', map(self.targets.__getitem__, indexes))))
+
+    def reversed(self) -> 'EdgeTable':
+        """The same relationships with every edge pointing the other way"""
+        return EdgeTable(self.registry, self.relationships, (self.targets, self.sources))
+
+    def reachable(self, seeds: Iterable[int]) -> List[bool]:
+        """Nodes reachable from ``seeds`` (seeds included), as a membership list"""
+        offsets, targets, _ = self.adjacency()
+        seen = [False] * self.node_count
+        stack = []
+        for seed in seeds:
+            if seed < self.node_count and not seen[seed]:
+                seen[seed] = True
+                stack.append(seed)
+        while stack:
+            node = stack.pop()
+            for position in range(offsets[node], offsets[node + 1]):
+                successor = targets[position]
+                if not seen[successor]:
+                    seen[successor] = True
+                    stack.append(successor)
+        return seen
+
+    def edge(self, source: int, target: int) -> Optional[Relationship]:
+        """First relationship from ``source`` to ``target``"""
+        offsets, targets, edge_index = self.adjacency()
+        for position in range(offsets[source], offsets[source + 1]):
+            if targets[position] == target:
+                return self.relationships[edge_index[position]]
+        return None
+
+    def strongly_connected_components(self) -> List[List[int]]:
+        """Tarjan's algorithm without recursion; only components of two or more nodes are returned"""
+        offsets, targets, _ = self.adjacency()
+        count = self.node_count
+        index_of = [-1] * count
+        low = [0] * count
+        on_stack = [False] * count
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+
+        for root in range(count):
+            if index_of[root] != -1 or offsets[root] == offsets[root + 1]:
+                continue
+            work = [(root, offsets[root])]
+            index_of[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            while work:
+                node, position = work[-1]
+                if position < offsets[node + 1]:
+                    work[-1] = (node, position + 1)
+                    successor = targets[position]
+                    if index_of[successor] == -1:
+                        index_of[successor] = low[successor] = counter
+                        counter += 1
+                        stack.append(successor)
+                        on_stack[successor] = True
+                        work.append((successor, offsets[successor]))
+                    elif on_stack[successor] and index_of[successor] < low[node]:
+                        low[node] = index_of[successor]
+                    continue
+                work.pop()
+                if work and low[node] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[node]
+                if low[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1:
+                        component.reverse()  # Discovery order: consecutive members tend to share an edge
+                        components.append(component)
+        return components
+
+    def first_cycles(self) -> List[List[int]]:
+        """For each start node, the first cycle met by a depth-first walk (closed: last == first).
+
+        Nodes whose walk finished without a cycle can reach none, so later
+        walks skip them; every node is expanded at most once per walk.
+        """
+        offsets, targets, _ = self.adjacency()
+        acyclic = [False] * self.node_count
+        cycles: List[List[int]] = []
+        for start in range(self.node_count):
+            if offsets[start] == offsets[start + 1] or acyclic[start]:
+                continue
+            path = [start]
+            position_in_path = {start: 0}
+            cursors = [offsets[start]]
+            found = None
+            while path and found is None:
+                node = path[-1]
+                cursor = cursors[-1]
+                if cursor == offsets[node + 1]:
+                    acyclic[node] = True
+                    path.pop()
+                    cursors.pop()
+                    del position_in_path[node]
+                    continue
+                cursors[-1] = cursor + 1
+                successor = targets[cursor]
+                if successor in position_in_path:
+                    found = path[position_in_path[successor]:] + [successor]
+                elif not acyclic[successor] and offsets[successor] != offsets[successor + 1]:
+                    position_in_path[successor] = len(path)
+                    path.append(successor)
+                    cursors.append(offsets[successor])
+            if found is not None:
+                cycles.append(found)
+        return cycles
+
+
+class CycleMembership:
+    """Which serialized cycle each entity belongs to, with partners rendered on demand.
+
+    Replaces a per-entity copy of every partner list (quadratic in the cycle
+    size) with one integer per entity; the most severe cycle wins.
+    """
+
+    def __init__(self, cycles: Sequence[Dict]):
+        self.registry = EntityRegistry()
+        self.cycles = cycles
+        self._members: List[List[int]] = []
+        self._cycle_of: Dict[int, int] = {}
+        for cycle_index, cycle in enumerate(cycles):
+            members = [self.registry.intern(entity) for entity in cycle.get("entities", [])]
+            self._members.append(members)
+            rank = _SEVERITY_RANK.get(cycle.get("severity", "medium"), 1)
+            for member in members:
+                current = self._cycle_of.get(member)
+                if current is None or rank > _SEVERITY_RANK.get(cycles[current].get("severity", "medium"), 1):
+                    self._cycle_of[member] = cycle_index
+
+    def __contains__(self, entity_id: str) -> bool:
+        index = self.registry.get(entity_id)
+        return index is not None and index in self._cycle_of
+
+    def get(self, entity_id: str, default=None) -> Optional[Dict]:
+        """``{"severity", "cycle_type", "partners"}`` of the entity's cycle, or ``default``"""
+        index = self.registry.get(entity_id)
+        cycle_index = self._cycle_of.get(index) if index is not None else None
+        if cycle_index is None:
+            return default
+        cycle = self.cycles[cycle_index]
+        return {
+            "severity": cycle.get("severity", "medium"),
+            "cycle_type": cycle.get("cycle_type", cycle.get("relationship_type", "import")),
+            "partners": self.registry.render(member for member in self._members[cycle_index] if member != index)
+        }
+
+    def severity(self, entity_id: str) -> Optional[str]:
+        info = self.get(entity_id)
+        return info["severity"] if info else None
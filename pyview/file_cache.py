@@ -0,0 +1,360 @@
+"""
+PyView Content-Addressed File Analysis Cache
+
+Caches per-file AST worker output independently of where the file lives:
+- Keyed by BLAKE2 of file bytes + analyzer fingerprint + module name + options
+- Shared by every project, checkout and branch on the machine
+- Atomic temp-and-rename writes, safe for concurrent worker processes
+- Zip bundles for exporting / importing a warm cache (e.g. on CI runners);
+  bundles hold pickles, so only import bundles from a trusted source
+- Per-file entity memos (function records of the last analysed version) for partial re-analysis
+- Blob sizes and access times recorded in the SQLite cache index, with LRU
+  eviction against the cache manager's size budget
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+import shutil
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+from .cache_index import CacheIndex
+
+logger = logging.getLogger(__name__)
+
+# Bump when the FileAnalysis layout changes in a way the source fingerprint cannot see
+ANALYZER_VERSION = "3"
+
+# Modules whose code determines what the AST worker produces
+_FINGERPRINT_MODULES = ("ast_analyzer.py", "code_metrics.py", "models.py", "canonicalize.py", "fingerprint.py")
+
+_BUNDLE_MANIFEST = "manifest.json"
+_OBJECT_SUFFIX = ".pkl"
+
+_fingerprint: Optional[str] = None
+
+_DIGEST_SIZE = 20
+_READ_CHUNK = 1 << 20
+
+# The only member names a bundle may contain besides its manifest
+_BUNDLE_ENTRY = re.compile(rf"objects/([0-9a-f]{{{2 * _DIGEST_SIZE}}}){re.escape(_OBJECT_SUFFIX)}")
+
+
+def content_digest(data: bytes) -> str:
+    """BLAKE2 digest of file contents (the same digest ``file_digest`` computes)"""
+    return hashlib.blake2b(data, digest_size=_DIGEST_SIZE).hexdigest()
+
+
+def file_digest(file_path: str) -> str:
+    """BLAKE2 digest of a file, read in chunks"""
+    digest = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_READ_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stat_signature(stat_result: os.stat_result) -> Tuple[int, int, int, int]:
+    """(mtime_ns, size, inode, ctime_ns): any edit, truncation or atomic replace changes it"""
+    return (stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino, stat_result.st_ctime_ns)
+
+
+def analyzer_fingerprint() -> str:
+    """Fingerprint of the analyzer implementation (computed once per process).
+
+    Covers the analyzer version, the Python minor version (the ``ast`` module
+    differs between releases) and the source of the modules that shape
+    worker output, so editing the analyzer never serves stale entries.
+    """
+    global _fingerprint
+    if _fingerprint is None:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{ANALYZER_VERSION}|{sys.version_info.major}.{sys.version_info.minor}".encode())
+        package_dir = Path(__file__).parent
+        for name in _FINGERPRINT_MODULES:
+            try:
+                digest.update((package_dir / name).read_bytes())
+            except OSError:
+                digest.update(name.encode())
+        _fingerprint = digest.hexdigest()
+    return _fingerprint
+
+
+def write_atomic(path: Path, payload: bytes):
+    """Write a file via temp-and-rename so readers never see a partial file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def rebind_file_path(analysis, file_path: str):
+    """Point a cached FileAnalysis (and all of its entities) at ``file_path``"""
+    if analysis.file_path == file_path:
+        return analysis
+
+    analysis.file_path = file_path
+    analysis.module_info.file_path = file_path
+    for group in (analysis.classes, analysis.methods, analysis.fields, analysis.relationships):
+        for entity in group:
+            entity.file_path = file_path
+    return analysis
+
+
+class FileAnalysisCache:
+    """Content-addressed store of per-file analysis results.
+
+    Every object and memo written is recorded in ``index`` (the cache
+    manager's index when owned by a CacheManager, otherwise one in the cache
+    directory); once the index total exceeds ``max_size_bytes`` the least
+    recently used blobs are deleted.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, index: Optional[CacheIndex] = None,
+                 max_size_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir or os.path.expanduser("~/.pyview_cache/files"))
+        self.objects_dir = self.cache_dir / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.memos_dir = self.cache_dir / "memos"
+        self.index = index or CacheIndex(self.cache_dir / "index.db")
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, source: bytes, module_name: str, options: Dict[str, Any]) -> str:
+        """Cache key for one file's bytes analysed under a module name and options.
+
+        The module name is part of the key because entity IDs embed it; the
+        file path is not, so the same file in another checkout still hits.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(analyzer_fingerprint().encode())
+        digest.update(json.dumps(options, sort_keys=True, default=str).encode())
+        digest.update(b"\0")
+        digest.update(module_name.encode())
+        digest.update(b"\0")
+        digest.update(source)
+        return digest.hexdigest()
+
+    def _object_path(self, key: str) -> Path:
+        return self.objects_dir / key[:2] / f"{key}{_OBJECT_SUFFIX}"
+
+    def get(self, key: str, file_path: Optional[str] = None):
+        """Load a cached FileAnalysis, rebound to ``file_path``; None on miss"""
+        object_path = self._object_path(key)
+        try:
+            with open(object_path, 'rb') as f:
+                analysis = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (pickle.PickleError, EOFError, AttributeError, ImportError, OSError) as e:
+            logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+            self._discard(object_path)
+            self.misses += 1
+            return None
+
+        self.index.touch_blob(str(object_path))
+        self.hits += 1
+        return rebind_file_path(analysis, file_path) if file_path else analysis
+
+    def put(self, key: str, analysis) -> bool:
+        """Store a FileAnalysis; entries are immutable so existing keys are kept"""
+        object_path = self._object_path(key)
+        if object_path.exists():
+            return False
+        try:
+            payload = pickle.dumps(analysis, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PickleError, TypeError, AttributeError) as e:
+            logger.warning(f"Cannot cache analysis of {getattr(analysis, 'file_path', key)}: {e}")
+            return False
+        self._store(object_path, payload)
+        return True
+
+    def _store(self, path: Path, payload: bytes):
+        """Write a blob and record it in the index, deleting whatever it evicts"""
+        write_atomic(path, payload)
+        self.discard_blobs(self.index.put_blob(str(path), len(payload), self.max_size_bytes))
+
+    def _memo_path(self, file_path: str, module_name: str, options: Dict[str, Any]) -> Path:
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(analyzer_fingerprint().encode())
+        digest.update(json.dumps(options, sort_keys=True, default=str).encode())
+        digest.update(b"\0")
+        digest.update(module_name.encode())
+        digest.update(b"\0")
+        digest.update(os.path.abspath(file_path).encode())
+        key = digest.hexdigest()
+        return self.memos_dir / key[:2] / f"{key}{_OBJECT_SUFFIX}"
+
+    def get_memo(self, file_path: str, module_name: str, options: Dict[str, Any]):
+        """EntityMemo of the last analysed version of a file, or None.
+
+        Unlike objects, memos are keyed by location and overwritten: they only
+        serve as a source of reusable per-function results, each validated by
+        its fingerprint.
+        """
+        memo_path = self._memo_path(file_path, module_name, options)
+        try:
+            with open(memo_path, 'rb') as f:
+                memo = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (pickle.PickleError, EOFError, AttributeError, ImportError, OSError) as e:
+            logger.warning(f"Dropping unreadable entity memo of {file_path}: {e}")
+            self._discard(memo_path)
+            return None
+        self.index.touch_blob(str(memo_path))
+        return memo
+
+    def put_memo(self, file_path: str, module_name: str, options: Dict[str, Any], memo) -> None:
+        try:
+            payload = pickle.dumps(memo, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PickleError, TypeError, AttributeError) as e:
+            logger.warning(f"Cannot store entity memo of {file_path}: {e}")
+            return
+        self._store(self._memo_path(file_path, module_name, options), payload)
+
+    def _discard(self, path: Path):
+        self.index.remove_blob(str(path))
+        self.discard_blobs([str(path)])
+
+    @staticmethod
+    def discard_blobs(paths: Iterable[str]):
+        """Delete blob files already removed from the index (e.g. evicted)"""
+        for path in paths:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        """Delete every object and memo, including ones written before they were indexed"""
+        self.index.clear_blobs()
+        for directory in (self.objects_dir, self.memos_dir):
+            shutil.rmtree(directory, ignore_errors=True)
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+
+    def iter_keys(self) -> Iterable[str]:
+        for object_path in self.objects_dir.glob(f"*/*{_OBJECT_SUFFIX}"):
+            yield object_path.stem
+
+    def export_bundle(self, bundle_path: str, keys: Optional[Iterable[str]] = None) -> int:
+        """Write cache entries (all by default) into a zip bundle; returns the entry count"""
+        count = 0
+        with zipfile.ZipFile(bundle_path, 'w', compression=zipfile.ZIP_DEFLATED) as bundle:
+            for key in (keys if keys is not None else self.iter_keys()):
+                object_path = self._object_path(key)
+                if object_path.exists():
+                    bundle.write(object_path, f"objects/{key}{_OBJECT_SUFFIX}")
+                    count += 1
+            bundle.writestr(_BUNDLE_MANIFEST, json.dumps({
+                'analyzer_fingerprint': analyzer_fingerprint(),
+                'entries': count
+            }))
+        return count
+
+    def import_bundle(self, bundle_path: str) -> int:
+        """Add the entries of a zip bundle that are not cached yet; returns the count added.
+
+        Entries are pickles, which can run arbitrary code when they are
+        loaded: only import bundles from a trusted source, such as your own
+        CI. The whole bundle is checked before anything is written (its
+        manifest must name this analyzer's fingerprint and every member must
+        be an object entry), so a rejected bundle raises ValueError and
+        leaves the cache untouched.
+        """
+        added = 0
+        with zipfile.ZipFile(bundle_path, 'r') as bundle:
+            for name, key in self._bundle_entries(bundle):
+                object_path = self._object_path(key)
+                if object_path.exists():
+                    continue
+                self._store(object_path, bundle.read(name))
+                added += 1
+        return added
+
+    @staticmethod
+    def _bundle_entries(bundle: zipfile.ZipFile) -> List[Tuple[str, str]]:
+        """(member name, key) of every object in a bundle, after validating the whole bundle"""
+        try:
+            manifest = json.loads(bundle.read(_BUNDLE_MANIFEST))
+        except KeyError:
+            raise ValueError(f"{bundle.filename} is not a cache bundle (no {_BUNDLE_MANIFEST})")
+        except ValueError as e:
+            raise ValueError(f"{bundle.filename} has an unreadable manifest: {e}")
+        if not isinstance(manifest, dict) or manifest.get('analyzer_fingerprint') != analyzer_fingerprint():
+            raise ValueError(f"{bundle.filename} was built by a different analyzer version")
+
+        entries = []
+        for name in bundle.namelist():
+            if name == _BUNDLE_MANIFEST:
+                continue
+            match = _BUNDLE_ENTRY.fullmatch(name)
+            if match is None:
+                raise ValueError(f"{bundle.filename} contains an unexpected member {name!r}")
+            entries.append((name, match.group(1)))
+        if manifest.get('entries') != len(entries):
+            raise ValueError(f"{bundle.filename} lists {manifest.get('entries')} entries but holds {len(entries)}")
+        return entries
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'entry_count': self.index.blob_count(),
+            'total_size_mb': self.index.blob_total_size() / (1024 * 1024),
+            'hits': self.hits,
+            'misses': self.misses,
+            'cache_dir': str(self.cache_dir)
+        }
+
+
+def main(argv=None) -> int:
+    """Export / import cache bundles: python -m pyview.file_cache {export,import} BUNDLE
+
+    Bundles hold pickles: only import bundles from a trusted source.
+    """
+    from .cache_manager import CacheManager
+
+    parser = argparse.ArgumentParser(description="PyView per-file analysis cache bundles "
+                                                 "(import only bundles from a trusted source)")
+    parser.add_argument("command", choices=["export", "import", "stats"])
+    parser.add_argument("bundle", nargs="?", help="Path of the zip bundle")
+    parser.add_argument("--cache-dir", default=None, help="PyView cache directory (default ~/.pyview_cache)")
+    args = parser.parse_args(argv)
+
+    cache = CacheManager(args.cache_dir).file_cache
+    if args.command == "stats":
+        print(json.dumps(cache.get_stats(), indent=2))
+        return 0
+    if not args.bundle:
+        parser.error("bundle path is required")
+    if args.command == "export":
+        print(f"📦 Exported {cache.export_bundle(args.bundle)} cache entries to {args.bundle}")
+    else:
+        try:
+            added = cache.import_bundle(args.bundle)
+        except ValueError as e:
+            print(f"❌ Bundle rejected: {e}", file=sys.stderr)
+            return 1
+        print(f"📥 Imported {added} cache entries from {args.bundle}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
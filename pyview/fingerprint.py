@@ -0,0 +1,142 @@
+"""
+PyView Entity Fingerprints
+
+Per-class / per-function hashes used to skip work on cosmetic edits:
+- Semantic fingerprint: normalised AST of the entity (positions, comments and
+  docstrings ignored); equal fingerprints mean the entity means the same thing
+- Layout fingerprint: line offsets of every node relative to its parent, so an
+  entity that only moved up or down the file can reuse position-dependent
+  results after shifting them by one delta
+- One Merkle-style pass over the tree hashes every node exactly once
+"""
+
+import ast
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Any
+
+from .models import MethodInfo, FieldInfo, ImportInfo, Relationship
+
+_DIGEST_SIZE = 16
+_SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+_DOCSTRING_OWNERS = (ast.Module, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+@dataclass(frozen=True)
+class EntityFingerprint:
+    """Fingerprints of one class or function node"""
+    semantic: str
+    layout: str
+    has_nested_scope: bool  # Contains a nested def/class (not replayable as one unit)
+
+
+def _docstring_node(node: ast.AST) -> Optional[ast.AST]:
+    if isinstance(node, _DOCSTRING_OWNERS) and node.body:
+        first = node.body[0]
+        if (isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant)
+                and isinstance(first.value.value, str)):
+            return first
+    return None
+
+
+def fingerprint_entities(tree: ast.AST) -> Dict[ast.AST, EntityFingerprint]:
+    """Fingerprints of every class and function node in a parsed tree"""
+    semantic: Dict[int, bytes] = {}
+    layout: Dict[int, bytes] = {}
+    nested: Dict[int, bool] = {}
+    results: Dict[ast.AST, EntityFingerprint] = {}
+
+    # Iterative post-order: deeply nested expressions must not hit the recursion limit.
+    # A node's layout covers its own height and its children's offsets from its
+    # first line, never its own position, so moving an entity keeps its layout.
+    lines: Dict[int, int] = {}
+    stack: List[Tuple[ast.AST, int, bool]] = [(tree, getattr(tree, 'lineno', 0), False)]
+    blake2b = hashlib.blake2b
+    while stack:
+        node, parent_line, expanded = stack.pop()
+        line = getattr(node, 'lineno', parent_line)
+        skipped = _docstring_node(node)
+        if not expanded:
+            lines[id(node)] = line
+            stack.append((node, parent_line, True))
+            for name in node._fields:
+                value = getattr(node, name, None)
+                if isinstance(value, list):
+                    stack.extend((item, line, False) for item in value
+                                 if isinstance(item, ast.AST) and item is not skipped)
+                elif isinstance(value, ast.AST):
+                    stack.append((value, line, False))
+            continue
+
+        semantic_parts = [type(node).__name__.encode()]
+        layout_parts = []
+        if hasattr(node, 'lineno'):
+            layout_parts.append(b"%d" % ((getattr(node, 'end_lineno', None) or line) - line))
+        contains_scope = False
+        for name in node._fields:
+            value = getattr(node, name, None)
+            semantic_parts.append(b"\x00" + name.encode())
+            if isinstance(value, list):
+                semantic_parts.append(b"[%d]" % len(value))
+                items = value
+            else:
+                items = (value,)
+            for item in items:
+                if isinstance(item, ast.AST):
+                    if item is skipped:
+                        continue
+                    key = id(item)
+                    semantic_parts.append(semantic[key])
+                    layout_parts.append(b"@%d" % (lines[key] - line))
+                    layout_parts.append(layout[key])
+                    contains_scope = contains_scope or nested[key] or isinstance(item, _SCOPE_NODES)
+                else:
+                    semantic_parts.append(repr(item).encode())
+
+        key = id(node)
+        semantic[key] = blake2b(b"".join(semantic_parts), digest_size=_DIGEST_SIZE).digest()
+        layout[key] = blake2b(b"".join(layout_parts), digest_size=_DIGEST_SIZE).digest()
+        nested[key] = contains_scope
+        if isinstance(node, _SCOPE_NODES):
+            results[node] = EntityFingerprint(semantic[key].hex(), layout[key].hex(), contains_scope)
+    return results
+
+
+@dataclass
+class FunctionRecord:
+    """Everything the AST worker produced for one function, replayable at a new position.
+
+    Line numbers are those of the version the record was taken from; replay
+    shifts them by the distance the function moved.
+    """
+    line_number: int
+    method: MethodInfo
+    fields: List[FieldInfo] = field(default_factory=list)  # Field definitions in visit order (before merging)
+    imports: List[ImportInfo] = field(default_factory=list)
+    relationships: List[Relationship] = field(default_factory=list)
+    complexity: Optional[Tuple[int, int, int]] = None  # (cyclomatic, cognitive, nesting) for quality metrics
+
+
+@dataclass
+class EntityMemo:
+    """Function records of the last analysed version of one module.
+
+    Keyed by (semantic fingerprint, layout fingerprint, defined in a class):
+    a function that only moved is replayed instead of re-analysed. The memo
+    is rewritten on each analysis so it always describes the latest version.
+    """
+    records: Dict[Tuple[str, str, bool], FunctionRecord] = field(default_factory=dict)
+    reused: int = 0
+    analysed: int = 0
+
+    def lookup(self, fingerprint: EntityFingerprint, in_class: bool) -> Optional[FunctionRecord]:
+        return self.records.get((fingerprint.semantic, fingerprint.layout, in_class))
+
+    def replace_records(self, records: Dict[Tuple[str, str, bool], FunctionRecord],
+                        reused: int, analysed: int) -> None:
+        self.records = records
+        self.reused = reused
+        self.analysed = analysed
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {'records': self.records, 'reused': 0, 'analysed': 0}
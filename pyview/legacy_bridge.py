@@ -369,11 +369,11 @@ class LegacyBridge:
             all_relationships.extend(analysis.relationships)
         
         # Add modules that were only found by AST analysis
+        # (their relationships were already added above)
         for ast_name, analysis in ast_map.items():
             if ast_name not in module_map:
                 # This module was not found by pydeps, add it
                 merged_modules.append(analysis.module_info)
-                all_relationships.extend(analysis.relationships)
         
         return packages, merged_modules, all_relationships
     
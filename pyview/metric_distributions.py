@@ -0,0 +1,324 @@
+"""
+PyView Quality Metric Distributions
+
+Summarises per-entity quality metrics into dashboard-ready distributions:
+- Per level (module / class / method) and per top-level package
+- Fixed-bin histograms with bounded memory
+- Percentiles, min/max/mean, grade counts and worst-N entity lists
+- Exact NumPy summaries at analysis completion, streaming histograms otherwise
+"""
+
+import bisect
+import heapq
+import math
+from typing import Dict, List, Any, Iterable, Tuple
+
+from .models import QualityMetrics
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+# Bucket for modules that are not inside a package
+ROOT_PACKAGE = "<root>"
+
+# Fixed histogram bin edges (lower bounds; the last bin is open-ended)
+METRIC_BINS: Dict[str, List[float]] = {
+    'cyclomatic_complexity': [0, 2, 3, 4, 5, 6, 8, 10, 15, 20, 30, 50, 100],
+    'cognitive_complexity': [0, 1, 2, 5, 10, 15, 20, 30, 50, 100],
+    'nesting_depth': [0, 1, 2, 3, 4, 5, 6, 8, 10],
+    'lines_of_code': [0, 10, 25, 50, 100, 200, 500, 1000, 2000, 5000],
+    'maintainability_index': [0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100, 120, 140, 160],
+}
+
+PERCENTILES = (50, 90, 95, 99)
+GRADES = ("A", "B", "C", "D", "F")
+LEVELS = ("module", "class", "method")
+
+# Length of the per-level "worst entities" lists
+WORST_N = 20
+
+
+def package_of(module_name: str) -> str:
+    """Top-level package of a module name (same rule as the pydeps bridge)"""
+    if not module_name or '.' not in module_name:
+        return ROOT_PACKAGE
+    return module_name.split('.', 1)[0]
+
+
+def _worst_entry(metric: QualityMetrics) -> Dict[str, Any]:
+    return {
+        'entity_id': metric.entity_id,
+        'maintainability_index': float(metric.maintainability_index),
+        'cyclomatic_complexity': int(metric.cyclomatic_complexity),
+        'lines_of_code': int(metric.lines_of_code),
+        'quality_grade': metric.quality_grade
+    }
+
+
+def _worst_key(metric: QualityMetrics) -> Tuple[float, int, str]:
+    """Sort key for worst-first order: lowest MI, then highest complexity"""
+    return (metric.maintainability_index, -metric.cyclomatic_complexity, metric.entity_id)
+
+
+class _MetricHistogram:
+    """Fixed-bin histogram with running min/max/sum for one metric"""
+
+    __slots__ = ('edges', 'counts', 'count', 'total', 'minimum', 'maximum')
+
+    def __init__(self, edges: List[float]):
+        self.edges = edges
+        self.counts = [0] * len(edges)
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float):
+        index = max(0, bisect.bisect_right(self.edges, value) - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other: '_MetricHistogram'):
+        for i, c in enumerate(other.counts):
+            self.counts[i] += c
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def percentile(self, q: float) -> float:
+        """Estimate a percentile by linear interpolation inside the matching bin"""
+        if self.count == 0:
+            return 0.0
+        rank = (q / 100.0) * self.count
+        cumulative = 0
+        for i, c in enumerate(self.counts):
+            if c and cumulative + c >= rank:
+                low = max(self.edges[i], self.minimum)
+                high = self.edges[i + 1] if i + 1 < len(self.edges) else self.maximum
+                high = min(high, self.maximum)
+                fraction = (rank - cumulative) / c
+                return float(low + (high - low) * fraction)
+            cumulative += c
+        return float(self.maximum)
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.count == 0:
+            summary = {'min': 0.0, 'max': 0.0, 'mean': 0.0}
+        else:
+            summary = {'min': float(self.minimum), 'max': float(self.maximum),
+                       'mean': self.total / self.count}
+        for q in PERCENTILES:
+            summary[f'p{q}'] = self.percentile(q)
+        summary['histogram'] = {'edges': list(self.edges), 'counts': list(self.counts)}
+        return summary
+
+
+class _LevelSummary:
+    """Histograms and grade counts for one (package, level) bucket"""
+
+    __slots__ = ('count', 'grades', 'metrics', 'worst', 'worst_n')
+
+    def __init__(self, worst_n: int = WORST_N):
+        self.count = 0
+        self.grades = {grade: 0 for grade in GRADES}
+        self.metrics = {name: _MetricHistogram(edges) for name, edges in METRIC_BINS.items()}
+        # Bounded heap whose top is the *best* retained entity, so it is evicted first
+        self.worst: List[Tuple[Tuple[float, int, str], Dict[str, Any]]] = []
+        self.worst_n = worst_n
+
+    def add(self, metric: QualityMetrics):
+        self.count += 1
+        self.grades[metric.quality_grade] = self.grades.get(metric.quality_grade, 0) + 1
+        for name, histogram in self.metrics.items():
+            histogram.add(getattr(metric, name))
+        if self.worst_n:
+            mi, neg_cc, entity_id = _worst_key(metric)
+            self._push_worst((-mi, -neg_cc, entity_id), metric)
+
+    def _push_worst(self, heap_key, metric_or_entry):
+        if len(self.worst) < self.worst_n:
+            entry = metric_or_entry if isinstance(metric_or_entry, dict) else _worst_entry(metric_or_entry)
+            heapq.heappush(self.worst, (heap_key, entry))
+        elif heap_key > self.worst[0][0]:
+            entry = metric_or_entry if isinstance(metric_or_entry, dict) else _worst_entry(metric_or_entry)
+            heapq.heapreplace(self.worst, (heap_key, entry))
+
+    def merge(self, other: '_LevelSummary'):
+        self.count += other.count
+        for grade, c in other.grades.items():
+            self.grades[grade] = self.grades.get(grade, 0) + c
+        for name, histogram in self.metrics.items():
+            histogram.merge(other.metrics[name])
+        for heap_key, entry in other.worst:
+            self._push_worst(heap_key, entry)
+
+    def to_dict(self, include_worst: bool = False) -> Dict[str, Any]:
+        summary = {
+            'count': self.count,
+            'grades': dict(self.grades),
+            'metrics': {name: h.to_dict() for name, h in self.metrics.items()}
+        }
+        if include_worst:
+            summary['worst'] = [entry for _, entry in sorted(self.worst, reverse=True)]
+        return summary
+
+
+class StreamingMetricsAggregator:
+    """Folds per-entity metrics into per-package/per-level distributions.
+
+    Memory is bounded by packages x levels x bins, independent of how many
+    entities are streamed through it, so it can run alongside the large
+    project workers.
+    """
+
+    def __init__(self, worst_n: int = WORST_N):
+        self.packages: Dict[str, Dict[str, _LevelSummary]] = {}
+        self.entity_count = 0
+        self.worst_n = worst_n
+
+    def add(self, metric: QualityMetrics, package: str = ROOT_PACKAGE):
+        """Add one entity metric to its package/level bucket"""
+        level = metric.entity_type.value
+        levels = self.packages.setdefault(package, {})
+        if level not in levels:
+            # Worst-N lists are only reported per level, not per package
+            levels[level] = _LevelSummary(worst_n=self.worst_n)
+        levels[level].add(metric)
+        self.entity_count += 1
+
+    def add_file(self, module_name: str, metrics: Iterable[QualityMetrics]):
+        """Add every metric produced for one file"""
+        package = package_of(module_name)
+        for metric in metrics:
+            self.add(metric, package)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to the distribution format stored in AnalysisResult.metrics"""
+        overall: Dict[str, _LevelSummary] = {}
+        for levels in self.packages.values():
+            for level, summary in levels.items():
+                if level not in overall:
+                    overall[level] = _LevelSummary(worst_n=self.worst_n)
+                overall[level].merge(summary)
+
+        return {
+            'entity_count': self.entity_count,
+            'method': 'histogram',
+            'levels': {level: summary.to_dict(include_worst=True) for level, summary in overall.items()},
+            'packages': {
+                package: {level: summary.to_dict() for level, summary in levels.items()}
+                for package, levels in sorted(self.packages.items())
+            }
+        }
+
+
+def _summarize_values(values, edges: List[float]) -> Dict[str, Any]:
+    """Exact min/max/mean/percentiles plus fixed-bin histogram for one metric column"""
+    bin_index = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, len(edges) - 1)
+    summary = {
+        'min': float(values.min()),
+        'max': float(values.max()),
+        'mean': float(values.mean())
+    }
+    for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        summary[f'p{q}'] = float(value)
+    summary['histogram'] = {
+        'edges': list(edges),
+        'counts': np.bincount(bin_index, minlength=len(edges)).tolist()
+    }
+    return summary
+
+
+def _summarize_group(columns: Dict[str, Any], grade_codes, rows) -> Dict[str, Any]:
+    grade_counts = np.bincount(grade_codes[rows], minlength=len(GRADES) + 1)
+    grades = {grade: int(grade_counts[i]) for i, grade in enumerate(GRADES)}
+    if grade_counts[len(GRADES)]:
+        grades['?'] = int(grade_counts[len(GRADES)])
+    return {
+        'count': int(len(rows)),
+        'grades': grades,
+        'metrics': {name: _summarize_values(column[rows], METRIC_BINS[name])
+                    for name, column in columns.items()}
+    }
+
+
+def compute_metric_distributions(file_metrics: Iterable[Tuple[str, List[QualityMetrics]]],
+                                 worst_n: int = WORST_N) -> Dict[str, Any]:
+    """Summarise all entity metrics of an analysis into dashboard distributions.
+
+    ``file_metrics`` yields ``(module_name, metrics)`` per analysed file. With
+    NumPy the summaries are exact (true percentiles); without it the metrics are
+    folded through :class:`StreamingMetricsAggregator` and percentiles are
+    histogram estimates. Both produce the same layout.
+    """
+    if not HAS_NUMPY:
+        aggregator = StreamingMetricsAggregator(worst_n=worst_n)
+        for module_name, metrics in file_metrics:
+            aggregator.add_file(module_name, metrics)
+        return aggregator.to_dict()
+
+    collected: List[QualityMetrics] = []
+    packages: List[str] = []
+    for module_name, metrics in file_metrics:
+        package = package_of(module_name)
+        for metric in metrics:
+            collected.append(metric)
+            packages.append(package)
+
+    if not collected:
+        return {'entity_count': 0, 'method': 'exact', 'levels': {}, 'packages': {}}
+
+    columns = {
+        name: np.fromiter((getattr(m, name) for m in collected), dtype=np.float64, count=len(collected))
+        for name in METRIC_BINS
+    }
+    grade_index = {grade: i for i, grade in enumerate(GRADES)}
+    grade_codes = np.fromiter((grade_index.get(m.quality_grade, len(GRADES)) for m in collected),
+                              dtype=np.int64, count=len(collected))
+    level_names = sorted({m.entity_type.value for m in collected})
+    level_index = {level: i for i, level in enumerate(level_names)}
+    level_codes = np.fromiter((level_index[m.entity_type.value] for m in collected),
+                              dtype=np.int64, count=len(collected))
+    package_names, package_codes = np.unique(np.array(packages), return_inverse=True)
+
+    # Worst-first order: lowest MI, ties broken by highest complexity
+    worst_order = np.lexsort((-columns['cyclomatic_complexity'], columns['maintainability_index']))
+
+    levels: Dict[str, Dict[str, Any]] = {}
+    for level, code in level_index.items():
+        rows = np.flatnonzero(level_codes == code)
+        summary = _summarize_group(columns, grade_codes, rows)
+        if worst_n:
+            in_level = worst_order[level_codes[worst_order] == code][:worst_n]
+            summary['worst'] = [_worst_entry(collected[i]) for i in in_level]
+        levels[level] = summary
+
+    # One sort groups every (package, level) bucket into a contiguous slice
+    group_keys = package_codes.astype(np.int64) * len(level_names) + level_codes
+    order = np.argsort(group_keys, kind='stable')
+    sorted_keys = group_keys[order]
+    boundaries = np.flatnonzero(np.diff(sorted_keys)) + 1
+
+    package_summaries: Dict[str, Dict[str, Any]] = {}
+    for rows in np.split(order, boundaries):
+        key = int(group_keys[rows[0]])
+        package = str(package_names[key // len(level_names)])
+        level = level_names[key % len(level_names)]
+        package_summaries.setdefault(package, {})[level] = _summarize_group(columns, grade_codes, rows)
+
+    return {
+        'entity_count': len(collected),
+        'method': 'exact',
+        'levels': levels,
+        'packages': dict(sorted(package_summaries.items()))
+    }
@@ -5,12 +5,17 @@ PyView의 5단계 의존성 분석을 위한 데이터 구조 정의:
 패키지 → 모듈 → 클래스 → 메소드 → 필드
 """
 
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any, Set
+from dataclasses import dataclass, field, fields
+from typing import List, Optional, Dict, Any, Set, Callable, Collection, Iterable, Iterator, Sequence
 from enum import Enum
+from itertools import chain
 import json
+import operator
+import sys
 from datetime import datetime
 
+from .serialization import encode_json
+
 
 class DependencyType(Enum):
     """엔티티 간의 의존성 종류"""
@@ -30,8 +35,151 @@ class EntityType(Enum):
     METHOD = "method"
     FIELD = "field"
 
+
+class _EmptyList(list):
+    """슬롯에 저장되는 공유 빈 리스트 (속성 접근으로는 노출되지 않으므로 변경되지 않음)"""
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("shared empty list cannot be modified")
+
+    append = extend = insert = remove = pop = clear = sort = reverse = _immutable
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+
+    def __reduce__(self):
+        return (_empty_list, ())
+
+
+EMPTY_LIST: List[Any] = _EmptyList()
+
+
+def _empty_list() -> List[Any]:
+    return EMPTY_LIST
+
+
+class _PendingList(list):
+    """EMPTY_LIST를 가진 리스트 필드를 읽을 때 받는 빈 리스트 (copy-on-write).
+
+    처음 변경될 때 자신을 엔티티 슬롯에 넣어 엔티티 고유의 리스트가 됨.
+    그 전까지 엔티티는 EMPTY_LIST를 공유하므로 빈 리스트 필드마다 객체가 생기지 않음
+    """
+    __slots__ = ('_owner', '_slot')
+
+    def __init__(self, iterable=(), owner=None, slot=None):
+        super().__init__(iterable)
+        self._owner = owner
+        self._slot = slot
+
+    def _adopt(self):
+        owner, self._owner = self._owner, None
+        if owner is not None and self._slot.__get__(owner) is EMPTY_LIST:
+            self._slot.__set__(owner, self)
+
+    def __reduce__(self):
+        return (_empty_list, ()) if self._owner is not None else (list, (list(self),))
+
+
+def _adopting(name: str):
+    method = getattr(list, name)
+
+    def mutate(self, *args):
+        self._adopt()
+        return method(self, *args)
+    mutate.__name__ = name
+    return mutate
+
+
+for _name in ('append', 'extend', 'insert', 'remove', 'pop', 'clear', 'sort', 'reverse',
+              '__setitem__', '__delitem__', '__iadd__', '__imul__'):
+    setattr(_PendingList, _name, _adopting(_name))
+
+
+class _ListSlot:
+    """리스트 필드 슬롯 디스크립터: 저장된 EMPTY_LIST 대신 _PendingList를 돌려줌"""
+    __slots__ = ('slot',)
+
+    def __init__(self, slot):
+        self.slot = slot
+
+    def __get__(self, entity, owner=None):
+        if entity is None:
+            return self
+        value = self.slot.__get__(entity, owner)
+        return _PendingList(owner=entity, slot=self.slot) if value is EMPTY_LIST else value
+
+    def __set__(self, entity, value):
+        if value.__class__ is _PendingList and value._owner is not None:  # 다른 엔티티의 변경 전 빈 리스트 (replace 등)
+            value = EMPTY_LIST
+        self.slot.__set__(entity, value)
+
+    def __delete__(self, entity):
+        self.slot.__delete__(entity)
+
+
+# 인터닝하지 않는 자유 텍스트 필드 (거의 반복되지 않아 인터닝 테이블만 커짐)
+_FREE_TEXT_FIELDS = frozenset({"docstring", "body_text", "default_value", "context", "fingerprint"})
+
+
+def _restore_entity(cls, values):
+    """언피클: 위치 순서 값으로 엔티티 복원, ID/경로/이름 문자열과 리스트 원소 문자열은 인터닝하고
+    빈 리스트는 공유 센티널(EMPTY_LIST)로 대체 (읽으면 처음 변경 시 엔티티 고유 리스트가 되는 빈 리스트)"""
+    intern = sys.intern
+    entity = cls.__new__(cls)
+    for setter, kind, value in zip(cls._slot_setters, cls._slot_kinds, values):
+        if kind == 1 and value.__class__ is str:
+            value = intern(value)
+        elif kind == 2 and value.__class__ is list:
+            value = [intern(item) if item.__class__ is str else item for item in value] if value else EMPTY_LIST
+        setter(entity, value)
+    return entity
+
+
+class CompactEntity:
+    """대량으로 생기는 엔티티의 공통 베이스 (슬롯 + 위치 기반 피클링)
+
+    ``compact`` 데코레이터로 만든 클래스는 인스턴스 ``__dict__`` 없이 슬롯에 필드를 저장하고,
+    필드 이름 없이 값 튜플로 피클링됨. 워커 결과나 캐시에서 복원될 때 ID·파일 경로·이름 같은
+    문자열은 ``sys.intern``으로 프로세스 전체에서 한 벌만 유지되고, 빈 리스트 필드는 ``EMPTY_LIST``를
+    공유함 (읽으면 빈 리스트가 반환되고 처음 변경할 때 엔티티 고유의 리스트가 됨).
+    """
+    __slots__ = ()
+    _slot_values = staticmethod(lambda entity: ())
+    _slot_setters: tuple = ()
+    _slot_kinds: tuple = ()
+
+    def __reduce__(self):
+        return (_restore_entity, (type(self), self._slot_values(self)))
+
+
+def compact(cls):
+    """dataclass를 슬롯 클래스로 다시 만듦 (Python 3.8 호환, dataclass(slots=True)와 같은 방식)"""
+    names = tuple(spec.name for spec in fields(cls))
+    namespace = {key: value for key, value in cls.__dict__.items()
+                 if key not in names and key not in ('__dict__', '__weakref__')}
+    namespace['__slots__'] = names
+    slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted.__qualname__ = cls.__qualname__
+
+    kinds = []
+    for spec in fields(slotted):
+        if spec.name in _FREE_TEXT_FIELDS:
+            kinds.append(0)
+        elif getattr(spec.default_factory, '__name__', None) == 'list':  # 리스트 필드 (문자열 원소 인터닝)
+            kinds.append(2)
+        else:
+            kinds.append(1)                                               # 문자열이면 인터닝
+    slotted._slot_values = staticmethod(operator.attrgetter(*names))                # 필드 값 튜플 (C 구현)
+    slotted._slot_setters = tuple(slotted.__dict__[name].__set__ for name in names)
+    slotted._slot_kinds = tuple(kinds)
+    for name, kind in zip(names, kinds):
+        if kind == 2:                                                     # 공유 빈 리스트를 copy-on-write로 노출
+            setattr(slotted, name, _ListSlot(slotted.__dict__[name]))
+    return slotted
+
+
+@compact
 @dataclass
-class ImportInfo:
+class ImportInfo(CompactEntity):
     """import 문에 대한 정보"""
     module: str
     name: Optional[str] = None
@@ -39,10 +187,12 @@ class ImportInfo:
     line_number: int = 0
     import_type: str = "import"  # "import" 또는 "from_import"
     is_relative: bool = False
+    level: int = 0  # 상대 import 깊이 ("from .. import x" 이면 2)
 
 
+@compact
 @dataclass
-class FieldInfo:
+class FieldInfo(CompactEntity):
     """클래스 필드/어트리뷰트 정보"""
     id: str
     name: str
@@ -55,8 +205,9 @@ class FieldInfo:
     docstring: Optional[str] = None
 
 
+@compact
 @dataclass
-class MethodInfo:
+class MethodInfo(CompactEntity):
     """Information about a method or function"""
     id: str
     name: str
@@ -74,10 +225,12 @@ class MethodInfo:
     complexity: int = 1  # Cyclomatic complexity
     body_text: str = ""  # Method body source code for analysis
     docstring: Optional[str] = None
+    fingerprint: Optional[str] = None  # AST hash ignoring positions, comments and docstrings
 
 
+@compact
 @dataclass
-class ClassInfo:
+class ClassInfo(CompactEntity):
     """Information about a class definition"""
     id: str
     name: str
@@ -90,6 +243,7 @@ class ClassInfo:
     decorators: List[str] = field(default_factory=list)
     is_abstract: bool = False
     docstring: Optional[str] = None
+    fingerprint: Optional[str] = None  # AST hash ignoring positions, comments and docstrings
 
 
 @dataclass
@@ -108,6 +262,7 @@ class ModuleInfo:
     display_label: Optional[str] = None  # Visualization label from pydeps
     module_depth: int = 0  # Module hierarchy depth
     degree: int = 0  # Total connectivity degree (in + out)
+    bacon_distance: Optional[int] = None  # Import hops from the nearest entry module (None if unreachable)
 
 
 @dataclass
@@ -122,8 +277,9 @@ class PackageInfo:
     version: Optional[str] = None
 
 
+@compact
 @dataclass
-class Relationship:
+class Relationship(CompactEntity):
     """A dependency relationship between two entities"""
     id: str
     from_entity: str  # Entity ID
@@ -144,6 +300,11 @@ class QualityMetrics:
     cognitive_complexity: int = 0
     nesting_depth: int = 0
     lines_of_code: int = 0
+    logical_lines: int = 0
+    comment_lines: int = 0
+    blank_lines: int = 0
+    halstead_volume: float = 0.0
+    halstead_difficulty: float = 0.0
     maintainability_index: float = 100.0
     quality_grade: str = "A"    # A, B, C, D, F
 
@@ -160,6 +321,52 @@ class CyclicDependency:
     metrics: Optional[Dict[str, Any]] = None  # Cycle metrics (length, strength, etc.)
 
 
+def _lists_unchanged(lists: tuple, snapshot: tuple) -> bool:
+    """True if every list is the same object with the same length as when ``snapshot`` was taken"""
+    return all(current is seen and len(current) == length
+               for current, (seen, length) in zip(lists, snapshot))
+
+
+class _GraphIndex:
+    """Entity positions by ID and children by parent ID, for one state of the graph lists"""
+
+    def __init__(self, lists: tuple):
+        self.lists = lists
+        self.snapshot = tuple((entities, len(entities)) for entities in lists)
+        self.positions: Dict[str, tuple] = {}                     # ID -> (level, position); earlier levels win
+        for level in range(len(lists) - 1, -1, -1):
+            self.positions.update((entity.id, (level, position)) for position, entity in enumerate(lists[level]))
+        self._children: Optional[Dict[str, List[str]]] = None
+
+    def children(self) -> Dict[str, List[str]]:
+        """Parent ID -> child IDs in graph order (built on first use)"""
+        if self._children is None:
+            packages, modules, classes, methods, fields = self.lists
+            parent_of: Dict[str, str] = {}
+            for package in packages:
+                for sub_package in package.sub_packages:
+                    parent_of.setdefault(sub_package, package.id)
+            for module in modules:
+                if module.package_id:
+                    parent_of.setdefault(module.id, module.package_id)
+                for member in module.classes + module.functions:
+                    parent_of.setdefault(getattr(member, 'id', member), module.id)
+            for class_info in classes:
+                parent_of.setdefault(class_info.id, class_info.module_id)
+            for entity in chain(methods, fields):
+                if entity.class_id:
+                    parent_of.setdefault(entity.id, entity.class_id)
+
+            children: Dict[str, List[str]] = {}
+            for entities in self.lists:
+                for entity in entities:
+                    parent = parent_of.get(entity.id)
+                    if parent is not None:
+                        children.setdefault(parent, []).append(entity.id)
+            self._children = children
+        return self._children
+
+
 @dataclass
 class DependencyGraph:
     """The complete dependency graph structure"""
@@ -169,63 +376,71 @@ class DependencyGraph:
     methods: List[MethodInfo] = field(default_factory=list)
     fields: List[FieldInfo] = field(default_factory=list)
     
-    # Quick lookup maps
-    _packages_map: Dict[str, PackageInfo] = field(default_factory=dict, init=False)
-    _modules_map: Dict[str, ModuleInfo] = field(default_factory=dict, init=False)
-    _classes_map: Dict[str, ClassInfo] = field(default_factory=dict, init=False)
-    _methods_map: Dict[str, MethodInfo] = field(default_factory=dict, init=False)
-    _fields_map: Dict[str, FieldInfo] = field(default_factory=dict, init=False)
-
-    def __post_init__(self):
-        """Build lookup maps after initialization"""
-        self._build_lookup_maps()
-
-    def _build_lookup_maps(self):
-        """Build internal lookup maps for fast access"""
-        self._packages_map = {pkg.id: pkg for pkg in self.packages}
-        self._modules_map = {mod.id: mod for mod in self.modules}
-        self._classes_map = {cls.id: cls for cls in self.classes}
-        self._methods_map = {meth.id: meth for meth in self.methods}
-        self._fields_map = {field.id: field for field in self.fields}
+    # Quick lookup index, built on first use and rebuilt when a list is replaced or resized
+    _index: Optional[_GraphIndex] = field(default=None, init=False, repr=False, compare=False)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_index', None)  # Derived data; never pickled into caches
+        return state
+
+    def _lists(self) -> tuple:
+        return (self.packages, self.modules, self.classes, self.methods, self.fields)
+
+    def _current_index(self) -> _GraphIndex:
+        lists = self._lists()
+        index = self._index
+        if index is None or not _lists_unchanged(lists, index.snapshot):
+            index = self._index = _GraphIndex(lists)
+        return index
+
+    def invalidate_index(self):
+        """Drop the lookup index (needed only after replacing list items in place)"""
+        self._index = None
 
     def get_entity(self, entity_id: str) -> Optional[Any]:
         """Get any entity by its ID"""
-        if entity_id in self._packages_map:
-            return self._packages_map[entity_id]
-        elif entity_id in self._modules_map:
-            return self._modules_map[entity_id]
-        elif entity_id in self._classes_map:
-            return self._classes_map[entity_id]
-        elif entity_id in self._methods_map:
-            return self._methods_map[entity_id]
-        elif entity_id in self._fields_map:
-            return self._fields_map[entity_id]
-        return None
+        index = self._current_index()
+        location = index.positions.get(entity_id)
+        if location is None:
+            return None
+        level, position = location
+        return index.lists[level][position]
+
+    def get_children(self, entity_id: str) -> List[Any]:
+        """Direct children of an entity: modules of a package, classes and functions of a module, members of a class"""
+        index = self._current_index()
+        return [self.get_entity(child) for child in index.children().get(entity_id, ())]
+
+    def _add(self, level: int, entity):
+        lists = self._lists()
+        index = self._index
+        current = index is not None and _lists_unchanged(lists, index.snapshot)
+        lists[level].append(entity)
+        if current and entity.id not in index.positions:                # Keep a current index current
+            index.positions[entity.id] = (level, len(lists[level]) - 1)
+            index.snapshot = tuple((entities, len(entities)) for entities in lists)
+            index._children = None
 
     def add_package(self, package: PackageInfo):
         """Add a package to the graph"""
-        self.packages.append(package)
-        self._packages_map[package.id] = package
+        self._add(0, package)
 
     def add_module(self, module: ModuleInfo):
         """Add a module to the graph"""
-        self.modules.append(module)
-        self._modules_map[module.id] = module
+        self._add(1, module)
 
     def add_class(self, class_info: ClassInfo):
         """Add a class to the graph"""
-        self.classes.append(class_info)
-        self._classes_map[class_info.id] = class_info
+        self._add(2, class_info)
 
     def add_method(self, method: MethodInfo):
         """Add a method to the graph"""
-        self.methods.append(method)
-        self._methods_map[method.id] = method
+        self._add(3, method)
 
     def add_field(self, field_info: FieldInfo):
         """Add a field to the graph"""
-        self.fields.append(field_info)
-        self._fields_map[field_info.id] = field_info
+        self._add(4, field_info)
 
 
 @dataclass
@@ -240,6 +455,102 @@ class ProjectInfo:
     analysis_options: Dict[str, Any] = field(default_factory=dict)
 
 
+_from_entity = operator.attrgetter('from_entity')
+_to_entity = operator.attrgetter('to_entity')
+_relationship_type = operator.attrgetter('relationship_type')
+
+
+class RelationshipIndex:
+    """Relationship positions by source, target and type, for O(degree) queries.
+
+    Works on model relationships and, given item getters, on their
+    serialized dicts. It describes one state of the list: ``is_current``
+    is false once the list has been replaced or resized.
+    """
+
+    def __init__(self, relationships: Sequence, source: Callable = _from_entity,
+                 target: Callable = _to_entity, kind: Callable = _relationship_type):
+        self.relationships = relationships
+        self.length = len(relationships)
+        self._source, self._target, self._kind = source, target, kind
+        self.by_source: Dict[Any, List[int]] = {}
+        self.by_target: Dict[Any, List[int]] = {}
+        self.by_type: Dict[Any, List[int]] = {}
+        for index, key in ((self.by_source, source), (self.by_target, target), (self.by_type, kind)):
+            get = index.get
+            for position, value in enumerate(map(key, relationships)):
+                positions = get(value)
+                if positions is None:
+                    index[value] = [position]
+                else:
+                    positions.append(position)
+
+    def is_current(self, relationships: Sequence) -> bool:
+        return relationships is self.relationships and len(relationships) == self.length
+
+    def _select(self, positions, types=None) -> List[Any]:
+        relationships = self.relationships
+        if types is None:
+            return [relationships[position] for position in positions]
+        kind = self._kind
+        return [rel for rel in map(relationships.__getitem__, positions) if kind(rel) in types]
+
+    def outgoing(self, entity_id: str, types: Optional[Collection] = None) -> List[Any]:
+        return self._select(self.by_source.get(entity_id, ()), types)
+
+    def incoming(self, entity_id: str, types: Optional[Collection] = None) -> List[Any]:
+        return self._select(self.by_target.get(entity_id, ()), types)
+
+    def touching(self, entity_id: str, types: Optional[Collection] = None) -> List[Any]:
+        """Relationships with the entity at either end, in list order"""
+        positions = set(self.by_source.get(entity_id, ())).union(self.by_target.get(entity_id, ()))
+        return self._select(sorted(positions), types)
+
+    def of_type(self, kind: Any) -> List[Any]:
+        return self._select(self.by_type.get(kind, ()))
+
+    def neighbours(self, entity_id: str, types: Optional[Collection] = None,
+                   direction: str = "both") -> Iterator[str]:
+        """Entity IDs one hop away ("out": dependencies, "in": dependents, "both")"""
+        if direction != "in":
+            yield from map(self._target, self.outgoing(entity_id, types))
+        if direction != "out":
+            yield from map(self._source, self.incoming(entity_id, types))
+
+    def distances(self, seeds: Iterable[str], depth: int = 1, types: Optional[Collection] = None,
+                  direction: str = "both") -> Dict[str, int]:
+        """Breadth-first hop counts from ``seeds`` (distance 0), up to ``depth`` hops"""
+        if direction not in ("out", "in", "both"):
+            raise ValueError(f"Unknown direction: {direction}")
+        distance = {seed: 0 for seed in seeds}
+        frontier = list(distance)
+        for step in range(1, depth + 1):
+            reached = []
+            for node in frontier:
+                for neighbour in self.neighbours(node, types, direction):
+                    if neighbour not in distance:
+                        distance[neighbour] = step
+                        reached.append(neighbour)
+            if not reached:
+                break
+            frontier = reached
+        return distance
+
+    def between(self, entity_ids: Collection[str], types: Optional[Collection] = None) -> List[Any]:
+        """Relationships with both ends in ``entity_ids``, in list order"""
+        relationships, target = self.relationships, self._target
+        positions = sorted(position for entity_id in entity_ids for position in self.by_source.get(entity_id, ())
+                           if target(relationships[position]) in entity_ids)
+        return self._select(positions, types)
+
+
+def _dependency_types(types: Optional[Iterable]) -> Optional[frozenset]:
+    """Relationship type filter from DependencyType members or their values ("import", "call", ...)"""
+    if types is None:
+        return None
+    return frozenset(kind if isinstance(kind, DependencyType) else DependencyType(kind) for kind in types)
+
+
 @dataclass
 class AnalysisResult:
     """Complete analysis result for a Python project"""
@@ -254,15 +565,25 @@ class AnalysisResult:
     # Analysis metadata
     warnings: List[str] = field(default_factory=list)
     errors: List[str] = field(default_factory=list)
+
+    # Relationship index, built on first query and rebuilt when the list is replaced or resized
+    _relationship_index: Optional[RelationshipIndex] = field(default=None, init=False, repr=False, compare=False)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_relationship_index', None)  # Derived data; never pickled into caches
+        return state
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
         def _convert_dataclass(obj):
             if hasattr(obj, '__dataclass_fields__'):
                 result = {}
-                for key, value in obj.__dict__.items():
+                for spec in fields(obj):  # Slotted entities have no __dict__
+                    key = spec.name
                     if key.startswith('_'):  # Skip private attributes
                         continue
+                    value = getattr(obj, key)
                     if isinstance(value, list):
                         result[key] = [_convert_dataclass(item) for item in value]
                     elif isinstance(value, dict):
@@ -279,8 +600,10 @@ class AnalysisResult:
         
         return _convert_dataclass(self)
     
-    def to_json(self, indent: int = 2) -> str:
-        """Convert to JSON string"""
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Convert to JSON string (``indent=None``: compact, encoded from the models without a dict copy)"""
+        if indent is None:
+            return encode_json(self).decode()
         return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
     
     def get_entity_count(self) -> Dict[str, int]:
@@ -295,14 +618,63 @@ class AnalysisResult:
             "cycles": len(self.cycles)
         }
     
+    def relationship_index(self) -> RelationshipIndex:
+        """Relationships by source, target and type (see ``RelationshipIndex``)"""
+        index = self._relationship_index
+        if index is None or not index.is_current(self.relationships):
+            index = self._relationship_index = RelationshipIndex(self.relationships)
+        return index
+
+    def invalidate_indexes(self):
+        """Drop the lookup indexes (needed only after replacing list items in place)"""
+        self._relationship_index = None
+        self.dependency_graph.invalidate_index()
+
     def get_relationships_by_type(self, rel_type: DependencyType) -> List[Relationship]:
         """Get relationships of a specific type"""
-        return [rel for rel in self.relationships if rel.relationship_type == rel_type]
+        return self.relationship_index().of_type(rel_type)
     
     def get_entity_relationships(self, entity_id: str) -> List[Relationship]:
         """Get all relationships involving a specific entity"""
-        return [rel for rel in self.relationships 
-                if rel.from_entity == entity_id or rel.to_entity == entity_id]
+        return self.relationship_index().touching(entity_id)
+
+    def get_entity(self, entity_id: str) -> Optional[Any]:
+        """Get any entity by its ID"""
+        return self.dependency_graph.get_entity(entity_id)
+
+    def neighborhood(self, entity_id: str, depth: int = 1, types: Optional[Iterable] = None,
+                     direction: str = "both") -> 'AnalysisResult':
+        """Entities within ``depth`` hops of ``entity_id`` and the relationships among them.
+
+        ``types`` limits the relationship types followed (and kept);
+        ``direction`` is "out" (dependencies), "in" (dependents) or "both".
+        Cost grows with the neighbourhood and its degrees, not the project.
+        """
+        index = self.relationship_index()
+        types = _dependency_types(types)
+        entity_ids = set(index.distances([entity_id], depth, types, direction))
+        return self._restricted(entity_ids, index.between(entity_ids, types))
+
+    def subgraph(self, predicate: Callable[[Any], bool]) -> 'AnalysisResult':
+        """Entities for which ``predicate(entity)`` is true and the relationships among them"""
+        entity_ids = {entity.id for entity in chain(*self.dependency_graph._lists()) if predicate(entity)}
+        return self._restricted(entity_ids, self.relationship_index().between(entity_ids))
+
+    def _restricted(self, entity_ids: Set[str], relationships: List[Relationship]) -> 'AnalysisResult':
+        """A result over ``entity_ids`` in graph order; project-wide metrics are not carried over"""
+        index = self.dependency_graph._current_index()
+        lists: tuple = ([], [], [], [], [])
+        for level, position in sorted(index.positions[entity_id] for entity_id in entity_ids
+                                      if entity_id in index.positions):
+            lists[level].append(index.lists[level][position])
+        return AnalysisResult(
+            analysis_id=self.analysis_id,
+            project_info=self.project_info,
+            dependency_graph=DependencyGraph(*lists),
+            relationships=relationships,
+            quality_metrics=[metric for metric in self.quality_metrics if metric.entity_id in entity_ids],
+            cycles=[cycle for cycle in self.cycles if entity_ids.issuperset(cycle.entities)]
+        )
 
 
 def create_package_id(package_path: str) -> str:
@@ -320,18 +692,34 @@ def create_module_id(module_path: str) -> str:
     return f"mod:{module_name}"
 
 
-def create_class_id(module_id: str, class_name: str) -> str:
-    """Create a unique class ID"""
-    return f"cls:{module_id}:{class_name}"
+def _with_occurrence(entity_id: str, occurrence: int) -> str:
+    # Only a redefinition in the same scope gets a discriminator, so IDs stay
+    # unchanged when code above the entity is edited
+    return entity_id if occurrence <= 1 else f"{entity_id}#{occurrence}"
+
+
+def create_class_id(module_id: str, class_name: str, occurrence: int = 1) -> str:
+    """Create a unique class ID.
+
+    ``class_name`` is the dotted scope path for nested classes (``Outer.Inner``);
+    ``occurrence`` numbers repeated definitions of the same path in one module.
+    """
+    return _with_occurrence(f"cls:{module_id}:{class_name}", occurrence)
+
 
+def create_method_id(class_id: Optional[str], method_name: str, module_id: Optional[str] = None,
+                     occurrence: int = 1) -> str:
+    """Create a unique method ID from its scope path (line numbers are not part of it).
 
-def create_method_id(class_id: Optional[str], method_name: str, line_number: int = 0) -> str:
-    """Create a unique method ID"""
+    ``method_name`` is the dotted path of enclosing functions below the class
+    or module (``outer.inner``); module-level functions are qualified by
+    ``module_id`` so equally named functions of different modules do not collide.
+    """
     if class_id:
-        return f"meth:{class_id}:{method_name}:{line_number}"
-    else:
-        # Module-level function
-        return f"func:{method_name}:{line_number}"
+        return _with_occurrence(f"meth:{class_id}:{method_name}", occurrence)
+    # Module-level function
+    scope = f"{module_id}:" if module_id else ""
+    return _with_occurrence(f"func:{scope}{method_name}", occurrence)
 
 
 def create_field_id(class_id: str, field_name: str) -> str:
@@ -0,0 +1,308 @@
+"""
+PyView Module Import Graph
+
+Resolves AST import statements to project modules:
+- Absolute and relative imports are resolved against the project's module names
+- ``from pkg import mod`` resolves to the submodule when it is a project module
+- Importing a submodule also depends on its parent packages (their ``__init__`` runs)
+- One import edge per (importer, imported) module pair, from the first import line
+- Resolution is per module, so incremental runs only re-resolve affected modules
+- ``ModuleGraph`` keeps the resolved graph with the cache: edge changes are spliced
+  in and bacon distances / import SCCs are updated only where they can change
+"""
+
+import heapq
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import ModuleInfo, ImportInfo, Relationship, DependencyType, create_relationship_id
+
+
+def _is_package_module(module: ModuleInfo) -> bool:
+    return bool(module.file_path) and module.file_path.endswith("__init__.py")
+
+
+def _longest_known_prefix(dotted: str, module_names: Set[str]) -> Optional[str]:
+    parts = dotted.split(".")
+    for end in range(len(parts), 0, -1):
+        candidate = ".".join(parts[:end])
+        if candidate in module_names:
+            return candidate
+    return None
+
+
+def _absolute_base(importer: ModuleInfo, imp: ImportInfo) -> Optional[str]:
+    """Absolute dotted module named by an import (relative imports anchored at the importer)"""
+    if not imp.is_relative:
+        return imp.module
+
+    level = imp.level or 1
+    package_parts = importer.name.split(".")
+    if not _is_package_module(importer):
+        package_parts = package_parts[:-1]
+    if level > 1:
+        if level - 1 > len(package_parts):
+            return None
+        package_parts = package_parts[:len(package_parts) - (level - 1)]
+    module = (imp.module or "").lstrip(".")
+    return ".".join(part for part in package_parts + ([module] if module else []) if part) or None
+
+
+def resolve_import(importer: ModuleInfo, imp: ImportInfo, module_names: Set[str]) -> Optional[str]:
+    """Project module an import statement depends on, or None for external imports"""
+    base = _absolute_base(importer, imp)
+    if not base:
+        return None
+
+    if imp.import_type == "from_import" and imp.name and imp.name != "*":
+        submodule = f"{base}.{imp.name}"
+        if submodule in module_names:
+            return submodule
+    return _longest_known_prefix(base, module_names)
+
+
+def module_import_edges(module: ModuleInfo, module_ids: Dict[str, str]) -> List[Relationship]:
+    """Import edges from one module to the project modules it imports.
+
+    ``module_ids`` maps every project module name to its canonical module ID.
+    """
+    module_names = module_ids.keys()
+    targets: Dict[str, int] = {}
+    for imp in sorted(module.imports or [], key=lambda i: i.line_number):
+        target = resolve_import(module, imp, module_names)
+        while target:
+            if target != module.name and target not in targets:
+                targets[target] = imp.line_number
+            target = _longest_known_prefix(target.rpartition(".")[0], module_names) if "." in target else None
+
+    return [
+        Relationship(
+            id=create_relationship_id(module.id, module_ids[target], DependencyType.IMPORT),
+            from_entity=module.id,
+            to_entity=module_ids[target],
+            relationship_type=DependencyType.IMPORT,
+            line_number=line_number,
+            file_path=module.file_path,
+            strength=1.0
+        )
+        for target, line_number in targets.items()
+    ]
+
+
+def build_module_import_edges(modules: Iterable[ModuleInfo],
+                              module_ids: Optional[Dict[str, str]] = None) -> List[Relationship]:
+    """Import edges between all given project modules"""
+    modules = list(modules)
+    if module_ids is None:
+        module_ids = {module.name: module.id for module in modules}
+    edges: List[Relationship] = []
+    for module in modules:
+        edges.extend(module_import_edges(module, module_ids))
+    return edges
+
+
+def imports_any(module: ModuleInfo, module_names: Set[str]) -> bool:
+    """Whether any import of the module could resolve to one of ``module_names``.
+
+    Used to find unchanged modules whose resolution changes when modules are
+    added or removed; a prefix match is enough to be conservative.
+    """
+    if not module_names:
+        return False
+    for imp in module.imports or []:
+        base = _absolute_base(module, imp)
+        if not base:
+            continue
+        candidates = [base]
+        if imp.name:
+            candidates.append(f"{base}.{imp.name}")
+        for candidate in candidates:
+            parts = candidate.split(".")
+            if any(".".join(parts[:end]) in module_names for end in range(1, len(parts) + 1)):
+                return True
+    return False
+
+
+@dataclass
+class ModuleGraph:
+    """Module import graph with bacon distances and import cycles (SCCs).
+
+    Bacon distance is the number of import hops from the nearest entry module
+    (a module no other module imports); modules reachable only from inside an
+    import cycle have none. ``apply_changes`` splices in the import edges
+    that changed and recomputes both only for the affected region.
+    """
+    imports: Dict[str, Set[str]] = field(default_factory=dict)  # Module ID -> imported module IDs
+    imported_by: Dict[str, Set[str]] = field(default_factory=dict)  # Module ID -> importer IDs
+    bacon: Dict[str, int] = field(default_factory=dict)
+    components: Dict[str, Tuple[str, ...]] = field(default_factory=dict)  # Member -> sorted SCC (size > 1 only)
+
+    @classmethod
+    def build(cls, module_ids: Iterable[str], import_relationships: Iterable[Relationship]) -> 'ModuleGraph':
+        graph = cls()
+        for module_id in module_ids:
+            graph._add_node(module_id)
+        for rel in import_relationships:
+            graph._add_edge(rel.from_entity, rel.to_entity)
+        graph._update_bacon(set(graph.imports))
+        graph._update_components(set(graph.imports))
+        return graph
+
+    @classmethod
+    def from_relationships(cls, module_ids: Iterable[str], relationships: Iterable[Relationship]) -> 'ModuleGraph':
+        """Graph of the import edges among any relationships (e.g. a cached result)"""
+        return cls.build(module_ids, (r for r in relationships if r.relationship_type == DependencyType.IMPORT))
+
+    def copy(self) -> 'ModuleGraph':
+        """Independent copy, e.g. of a cached graph before ``apply_changes``"""
+        return ModuleGraph(
+            imports={module_id: set(targets) for module_id, targets in self.imports.items()},
+            imported_by={module_id: set(importers) for module_id, importers in self.imported_by.items()},
+            bacon=dict(self.bacon),
+            components=dict(self.components)
+        )
+
+    def _add_node(self, module_id: str):
+        self.imports.setdefault(module_id, set())
+        self.imported_by.setdefault(module_id, set())
+
+    def _add_edge(self, importer: str, imported: str):
+        self._add_node(importer)
+        self._add_node(imported)
+        self.imports[importer].add(imported)
+        self.imported_by[imported].add(importer)
+
+    def apply_changes(self, removed: Iterable[Relationship], added: Iterable[Relationship],
+                      removed_modules: Iterable[str] = (), added_modules: Iterable[str] = ()) -> Set[str]:
+        """Splice in changed import edges and modules.
+
+        Returns the modules whose import cycle membership was recomputed;
+        cycles outside this region are unchanged.
+        """
+        seeds: Set[str] = set()
+        for rel in removed:
+            self.imports.get(rel.from_entity, set()).discard(rel.to_entity)
+            self.imported_by.get(rel.to_entity, set()).discard(rel.from_entity)
+            seeds.update((rel.from_entity, rel.to_entity))
+        for module_id in removed_modules:
+            if module_id not in self.imports:
+                continue
+            for target in self.imports.pop(module_id):
+                self.imported_by[target].discard(module_id)
+                seeds.add(target)
+            for importer in self.imported_by.pop(module_id):
+                self.imports[importer].discard(module_id)
+                seeds.add(importer)
+            self.bacon.pop(module_id, None)
+            seeds.add(module_id)
+        for module_id in added_modules:
+            self._add_node(module_id)
+            seeds.add(module_id)
+        for rel in added:
+            self._add_edge(rel.from_entity, rel.to_entity)
+            seeds.update((rel.from_entity, rel.to_entity))
+
+        self._update_bacon(self._reachable(seeds & self.imports.keys(), self.imports))
+        return self._update_components(seeds)
+
+    @staticmethod
+    def _reachable(seeds: Set[str], adjacency: Dict[str, Set[str]]) -> Set[str]:
+        seen = set(seeds)
+        stack = list(seeds)
+        while stack:
+            for neighbor in adjacency.get(stack.pop(), ()):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+        return seen
+
+    def _update_bacon(self, region: Set[str]):
+        """Recompute distances of a region closed under imports, from its boundary.
+
+        A module outside the region cannot have a shortest path through it,
+        so their distances are the fixed starting points of the search.
+        """
+        for module_id in region:
+            self.bacon.pop(module_id, None)
+        queue = []
+        for module_id in region:
+            importers = self.imported_by[module_id]
+            if not importers:
+                queue.append((0, module_id))
+                continue
+            known = [self.bacon[i] for i in importers if i not in region and i in self.bacon]
+            if known:
+                queue.append((min(known) + 1, module_id))
+        heapq.heapify(queue)
+        while queue:
+            distance, module_id = heapq.heappop(queue)
+            if module_id in self.bacon:
+                continue
+            self.bacon[module_id] = distance
+            for target in self.imports[module_id]:
+                if target not in self.bacon:
+                    heapq.heappush(queue, (distance + 1, target))
+
+    def _update_components(self, seeds: Set[str]) -> Set[str]:
+        """Recompute SCCs that may contain a seed; returns the recomputed modules.
+
+        A new SCC through a seed lies where the seeds reach and are reached
+        from; an old SCC through a seed can only split into parts of itself.
+        """
+        seeds = {s for s in seeds if s in self.imports or s in self.components}
+        live_seeds = seeds & self.imports.keys()
+        region = self._reachable(live_seeds, self.imports) & self._reachable(live_seeds, self.imported_by)
+        for seed in seeds:
+            region.update(self.components.get(seed, ()))
+        for module_id in region:
+            self.components.pop(module_id, None)
+        region &= self.imports.keys()
+
+        # Iterative Tarjan restricted to the region
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        for root in sorted(region):
+            if root in index:
+                continue
+            work = [(root, iter(sorted(self.imports[root] & region)))]
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, neighbors = work[-1]
+                advanced = False
+                for neighbor in neighbors:
+                    if neighbor not in index:
+                        index[neighbor] = lowlink[neighbor] = len(index)
+                        stack.append(neighbor)
+                        on_stack.add(neighbor)
+                        work.append((neighbor, iter(sorted(self.imports[neighbor] & region))))
+                        advanced = True
+                        break
+                    if neighbor in on_stack:
+                        lowlink[node] = min(lowlink[node], index[neighbor])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        members.append(member)
+                        if member == node:
+                            break
+                    if len(members) > 1:
+                        component = tuple(sorted(members))
+                        for member in members:
+                            self.components[member] = component
+        return region
+
+    def import_cycles(self) -> List[Tuple[str, ...]]:
+        """Every import cycle as the sorted module IDs of its SCC"""
+        return sorted(set(self.components.values()))
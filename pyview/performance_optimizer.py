@@ -4,75 +4,186 @@ PyView Performance Optimization
 Implements performance optimizations for large codebases:
 - Memory-efficient processing
 - Streaming analysis
-- Parallel processing
-- Result pagination
+- Parallel processing with a bounded, largest-first, memory-throttled scheduler
+- Memory budget over the whole worker process tree, with an adaptive worker count
+- Cursor pagination of complete results (no truncation)
 - Progressive loading
 """
 
+import base64
 import os
 import sys
 import gc
+import pickle
 import psutil
 import time
 import asyncio
-from typing import List, Dict, Iterator, Optional, Callable, Any, Generator
+from bisect import bisect_right
+from collections import deque
+from typing import List, Dict, Iterator, Optional, Callable, Any, Generator, Sequence, Tuple, Union
 from dataclasses import dataclass
 from pathlib import Path
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 import threading
 from queue import Queue
 import json
 
-from .models import AnalysisResult, ModuleInfo, ClassInfo, MethodInfo
+from .models import AnalysisResult, ModuleInfo, ClassInfo, MethodInfo, EntityType
+from .cost_model import CostModel, ProjectManifest, SampleProfile
+from .serialization import decode_json, encode_json
+from .snapshot import AnalysisSnapshot
 
 
 @dataclass
 class PerformanceConfig:
     """Performance optimization configuration"""
-    max_memory_mb: int = 1024  # Maximum memory usage
+    max_memory_mb: int = 1024  # Memory budget while files are analyzed (throttling / spill threshold)
     max_workers: int = None    # Number of worker processes
     batch_size: int = 100      # Files per batch
     enable_streaming: bool = True  # Stream results instead of loading all
     enable_gc: bool = True     # Aggressive garbage collection
     max_file_size_mb: int = 10  # Skip files larger than this
     enable_progress: bool = True  # Enable progress reporting
+    max_in_flight: Optional[int] = None  # Submitted but unfinished tasks (default: 2 per worker)
+    resume_memory_ratio: float = 0.7  # Throttled submission resumes below this share of max_memory_mb
+    max_memory_pause: float = 30.0  # Seconds to wait for memory before submitting one task anyway
+    adaptive_workers: bool = True  # Grow/shrink running tasks between min_workers and max_workers to fit the budget
+    min_workers: int = 1
+    max_tasks_per_child: Optional[int] = None  # Recycle worker processes after this many tasks (Python 3.11+, spawned workers)
+    count_worker_memory: bool = True  # Budget covers worker processes, not just this one
+    use_uss: bool = False  # Measure unique set size (slower, excludes pages shared with the parent)
 
 
 class MemoryMonitor:
-    """Monitors memory usage during analysis"""
+    """Monitors memory usage of this process and its worker processes.
     
-    def __init__(self, max_memory_mb: int):
+    Usage is the sum over the whole process tree (RSS, or USS which leaves
+    out pages shared with the parent), sampled at most every
+    ``sample_interval`` seconds because walking the tree is not free.
+    """
+    
+    def __init__(self, max_memory_mb: int, include_children: bool = True, use_uss: bool = False,
+                 sample_interval: float = 0.1):
         self.max_memory_bytes = max_memory_mb * 1024 * 1024
         self.process = psutil.Process()
         self.peak_memory = 0
+        self.include_children = include_children
+        self.use_uss = use_uss
+        self.sample_interval = sample_interval
+        self._sampled_at = float('-inf')
+        self._parent_memory = 0
+        self._worker_memory: List[int] = []
+    
+    def _process_memory(self, process: psutil.Process) -> int:
+        if self.use_uss:
+            return process.memory_full_info().uss
+        return process.memory_info().rss
+    
+    def _sample(self):
+        now = time.monotonic()
+        if now - self._sampled_at < self.sample_interval:
+            return
+        self._sampled_at = now
+        self._parent_memory = self._process_memory(self.process)
+        workers = []
+        if self.include_children:
+            for child in self.process.children(recursive=True):
+                try:
+                    workers.append(self._process_memory(child))
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    continue  # Worker exited (or was recycled) while we walked the tree
+        self._worker_memory = workers
+        self.peak_memory = max(self.peak_memory, self._parent_memory + sum(workers))
         
     def get_memory_usage(self) -> int:
-        """Get current memory usage in bytes"""
-        memory_info = self.process.memory_info()
-        current_memory = memory_info.rss
-        self.peak_memory = max(self.peak_memory, current_memory)
-        return current_memory
+        """Get current memory usage of the process tree in bytes"""
+        self._sample()
+        return self._parent_memory + sum(self._worker_memory)
+    
+    def get_parent_memory(self) -> int:
+        """Memory of this process alone in bytes"""
+        self._sample()
+        return self._parent_memory
+    
+    def get_worker_memory(self) -> List[int]:
+        """Memory of each live worker (child) process in bytes"""
+        self._sample()
+        return list(self._worker_memory)
         
     def is_memory_critical(self) -> bool:
         """Check if memory usage is approaching limit"""
-        current = self.get_memory_usage()
-        return current > (self.max_memory_bytes * 0.8)  # 80% threshold
+        return self.usage_ratio() > 0.8  # 80% threshold
+    
+    def usage_ratio(self) -> float:
+        """Current memory usage as a share of the limit"""
+        return self.get_memory_usage() / self.max_memory_bytes
         
     def force_garbage_collection(self):
-        """Force garbage collection to free memory"""
+        """Force garbage collection to free memory (the next reading is taken fresh)"""
         gc.collect()
+        self._sampled_at = float('-inf')
         
     def get_memory_stats(self) -> Dict[str, Any]:
         """Get memory statistics"""
         current = self.get_memory_usage()
         return {
             'current_mb': current / (1024 * 1024),
+            'parent_mb': self._parent_memory / (1024 * 1024),
+            'workers': len(self._worker_memory),
+            'worker_mb': sum(self._worker_memory) / (1024 * 1024),
             'peak_mb': self.peak_memory / (1024 * 1024),
             'limit_mb': self.max_memory_bytes / (1024 * 1024),
             'usage_percent': (current / self.max_memory_bytes) * 100
         }
 
 
+class WorkerController:
+    """Number of tasks allowed to run at once, sized from the memory budget.
+    
+    The footprint of one busy worker is the largest worker process measured
+    (rises immediately, decays slowly), and the controller keeps
+    ``parent + active * footprint`` under ``target_ratio`` of the budget.
+    It grows one worker per update so every step is measured before the
+    next, and shrinks at once. Without worker processes to measure it grows
+    while total usage stays below the target.
+    """
+    
+    def __init__(self, memory_monitor: MemoryMonitor, min_workers: int, max_workers: int,
+                 target_ratio: float = 0.7, decay: float = 0.1):
+        self.memory_monitor = memory_monitor
+        self.min_workers = max(1, min(min_workers, max_workers))
+        self.max_workers = max_workers
+        self.target_ratio = target_ratio
+        self.decay = decay
+        self.active = self.min_workers
+        self.footprint = 0.0
+        self.adjustments = 0
+    
+    def update(self) -> int:
+        """Re-measure and return the new active worker count"""
+        workers = self.memory_monitor.get_worker_memory()
+        if workers:
+            sample = max(workers)
+            if sample > self.footprint:
+                self.footprint = float(sample)
+            else:
+                self.footprint += (sample - self.footprint) * self.decay
+        
+        budget = self.memory_monitor.max_memory_bytes * self.target_ratio
+        if self.footprint:
+            target = int((budget - self.memory_monitor.get_parent_memory()) // self.footprint)
+        elif self.memory_monitor.get_memory_usage() < budget:
+            target = self.active + 1
+        else:
+            target = self.active
+        target = max(self.min_workers, min(self.max_workers, target))
+        
+        if target != self.active:
+            self.adjustments += 1
+            self.active = self.active + 1 if target > self.active else target
+        return self.active
+
+
 class StreamingProcessor:
     """Processes files in streaming fashion to minimize memory usage"""
     
@@ -135,15 +246,55 @@ class StreamingProcessor:
                 continue
 
 
+def file_size(task: Any) -> int:
+    """Size of a file task in bytes (0 when it cannot be read); the default scheduling weight"""
+    try:
+        return os.path.getsize(task)
+    except (OSError, TypeError, ValueError):
+        return 0
+
+
+def ensure_picklable(worker_func: Callable):
+    """Fail fast when a worker cannot be sent to a process pool.
+
+    Nested functions, lambdas and bound methods of unpicklable objects only
+    fail inside the pool, once per task; top-level functions (and
+    ``functools.partial`` of them) are fine.
+    """
+    try:
+        pickle.dumps(worker_func)
+    except (pickle.PicklingError, AttributeError, TypeError) as e:
+        raise TypeError(f"Worker {worker_func!r} cannot be pickled for a process pool; "
+                        f"use a module-level function: {e}") from e
+
+
 class ParallelAnalyzer:
-    """Handles parallel processing with memory management"""
+    """Bounded-window parallel scheduler with memory-aware backpressure.
+
+    - At most ``max_in_flight`` tasks are submitted and unfinished at a time
+    - Largest tasks are submitted first, so no big file starts last and
+      stretches the tail of the run
+    - When memory is critical, submission pauses until usage drops below
+      ``resume_memory_ratio`` (running tasks keep completing meanwhile)
+    - With ``adaptive_workers``, a WorkerController resizes the number of
+      running tasks after every completion from measured worker memory
+    """
     
-    def __init__(self, config: PerformanceConfig):
+    def __init__(self, config: PerformanceConfig, memory_monitor: Optional[MemoryMonitor] = None,
+                 executor_factory: Optional[Callable[[int], Any]] = None):
         self.config = config
-        self.memory_monitor = MemoryMonitor(config.max_memory_mb)
+        self.memory_monitor = memory_monitor or MemoryMonitor(
+            config.max_memory_mb, include_children=config.count_worker_memory, use_uss=config.use_uss
+        )
+        self.executor_factory = executor_factory or self._process_pool
         
         # Determine optimal worker count
-        if config.max_workers is None:
+        if config.max_workers is not None:
+            self.max_workers = config.max_workers
+        elif config.adaptive_workers:
+            # Every core is the ceiling; the controller backs off when memory is short
+            self.max_workers = os.cpu_count() or 1
+        else:
             cpu_count = os.cpu_count() or 1
             # Use fewer workers for memory-constrained environments
             memory_gb = psutil.virtual_memory().total / (1024**3)
@@ -153,73 +304,114 @@ class ParallelAnalyzer:
                 self.max_workers = min(4, cpu_count)
             else:
                 self.max_workers = min(8, cpu_count)
-        else:
-            self.max_workers = config.max_workers
-            
-        print(f"🚀 Using {self.max_workers} workers for parallel processing")
+        self.max_in_flight = max(1, config.max_in_flight or self.max_workers * 2)
         
-    def process_parallel(self, tasks: List[Any], 
-                        worker_func: Callable,
-                        progress_callback: Optional[Callable] = None) -> List[Any]:
-        """Process tasks in parallel with memory management"""
+        # Scheduling statistics of the last run
+        self.peak_in_flight = 0
+        self.peak_active_workers = 0
+        self.worker_adjustments = 0
+        self.memory_pauses = 0
+        self.failed_tasks = 0
         
-        results = []
-        completed = 0
+        print(f"🚀 Using {'up to ' if config.adaptive_workers else ''}{self.max_workers} workers for parallel processing")
+    
+    def _process_pool(self, workers: int) -> ProcessPoolExecutor:
+        if self.config.max_tasks_per_child and sys.version_info >= (3, 11):
+            return ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=self.config.max_tasks_per_child)
+        return ProcessPoolExecutor(max_workers=workers)
+    
+    def iter_parallel(self, tasks: List[Any], worker_func: Callable,
+                      progress_callback: Optional[Callable] = None,
+                      task_size: Callable[[Any], int] = file_size) -> Iterator[Tuple[int, Any]]:
+        """Run ``worker_func`` over tasks, yielding ``(task index, result)`` as tasks complete.
+        
+        Failed tasks are reported and skipped. The window is refilled after
+        every completion, so a slow consumer also slows submission. With
+        ``adaptive_workers`` the window is the controller's active worker
+        count: a process pool only starts a worker when a task has no idle
+        one, so queued tasks would otherwise grow the pool past it.
+        """
         total_tasks = len(tasks)
+        order = sorted(range(total_tasks), key=lambda i: task_size(tasks[i]), reverse=True)
+        pending = deque(order)
+        in_flight: Dict[Any, int] = {}
+        completed = 0
+        self.peak_in_flight = self.memory_pauses = self.failed_tasks = 0
+        controller = (WorkerController(self.memory_monitor, self.config.min_workers, self.max_workers,
+                                       self.config.resume_memory_ratio)
+                      if self.config.adaptive_workers else None)
+        window = min(self.max_in_flight, controller.active) if controller else self.max_in_flight
+        self.peak_active_workers = window
+        paused = False
         
-        # Use ProcessPoolExecutor for CPU-bound tasks
-        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit tasks in chunks to avoid overwhelming memory
-            chunk_size = max(1, total_tasks // (self.max_workers * 2))
-            
-            future_to_task = {}
-            pending_tasks = tasks.copy()
-            
-            # Initial batch submission
-            initial_batch = pending_tasks[:chunk_size * self.max_workers]
-            pending_tasks = pending_tasks[chunk_size * self.max_workers:]
+        with self.executor_factory(self.max_workers) as executor:
+            if isinstance(executor, ProcessPoolExecutor):
+                ensure_picklable(worker_func)
             
-            for task in initial_batch:
-                future = executor.submit(worker_func, task)
-                future_to_task[future] = task
+            while pending or in_flight:
+                # Fill the window unless memory says otherwise
+                while pending and len(in_flight) < window:
+                    if paused:
+                        if self.memory_monitor.usage_ratio() >= self.config.resume_memory_ratio:
+                            break
+                        paused = False
+                    elif self.memory_monitor.is_memory_critical():
+                        paused = True
+                        self.memory_pauses += 1
+                        print("🧹 Memory critical, pausing new task submission...")
+                        self.memory_monitor.force_garbage_collection()
+                        break
+                    index = pending.popleft()
+                    in_flight[executor.submit(worker_func, tasks[index])] = index
+                self.peak_in_flight = max(self.peak_in_flight, len(in_flight))
                 
-            # Process completed tasks and submit new ones
-            while future_to_task:
-                # Check memory usage
-                if self.memory_monitor.is_memory_critical():
-                    print("🧹 Memory critical, pausing new task submission...")
-                    self.memory_monitor.force_garbage_collection()
-                    
-                # Wait for at least one task to complete
-                for future in as_completed(future_to_task, timeout=1):
+                if not in_flight:
+                    # Paused with nothing running: only freed memory can unblock us
+                    self._wait_for_memory()
+                    paused = False
+                    index = pending.popleft()
+                    in_flight[executor.submit(worker_func, tasks[index])] = index
+                    self.peak_in_flight = max(self.peak_in_flight, 1)
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                if controller:
+                    window = min(self.max_in_flight, controller.update())
+                    self.peak_active_workers = max(self.peak_active_workers, window)
+                    self.worker_adjustments = controller.adjustments
+                for future in done:
+                    index = in_flight.pop(future)
+                    completed += 1
                     try:
                         result = future.result()
-                        results.append(result)
-                        completed += 1
-                        
-                        if progress_callback and self.config.enable_progress:
-                            progress = (completed / total_tasks) * 100
-                            progress_callback(f"Completed {completed}/{total_tasks} tasks", progress)
-                            
                     except Exception as e:
+                        self.failed_tasks += 1
                         print(f"⚠️  Task failed: {e}")
-                        
+                        continue
                     finally:
-                        # Remove completed future
-                        del future_to_task[future]
-                        
-                        # Submit new task if available and memory allows
-                        if (pending_tasks and 
-                            not self.memory_monitor.is_memory_critical() and
-                            len(future_to_task) < self.max_workers * 2):
-                            
-                            new_task = pending_tasks.pop(0)
-                            new_future = executor.submit(worker_func, new_task)
-                            future_to_task[new_future] = new_task
-                            
-                    break  # Process one future at a time
-                    
-        return results
+                        if progress_callback and self.config.enable_progress:
+                            progress = (completed / total_tasks) * 100
+                            progress_callback(f"Completed {completed}/{total_tasks} tasks", progress)
+                    yield index, result
+    
+    def _wait_for_memory(self):
+        """Block until memory drops below the resume ratio, or give up after max_memory_pause"""
+        deadline = time.monotonic() + self.config.max_memory_pause
+        delay = 0.05
+        while time.monotonic() < deadline:
+            self.memory_monitor.force_garbage_collection()
+            if self.memory_monitor.usage_ratio() < self.config.resume_memory_ratio:
+                return
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+        print("⚠️  Memory still high, submitting one task to keep making progress")
+    
+    def process_parallel(self, tasks: List[Any], 
+                        worker_func: Callable,
+                        progress_callback: Optional[Callable] = None,
+                        task_size: Callable[[Any], int] = file_size) -> List[Any]:
+        """Process tasks in parallel; results are returned in task order (failed tasks omitted)"""
+        results: Dict[int, Any] = dict(self.iter_parallel(tasks, worker_func, progress_callback, task_size))
+        return [results[index] for index in sorted(results)]
 
 
 class LargeProjectAnalyzer:
@@ -267,8 +459,11 @@ class LargeProjectAnalyzer:
         if len(python_files) > 10000:
             complexity = "very_high"
             
-        # Estimate memory requirements
-        estimated_memory_mb = (total_size / (1024 * 1024)) * 2  # Rough estimate
+        # Estimate memory requirements from the cost model's per-KB coefficients
+        estimate = CostModel(self.config.max_memory_mb, self.config.max_workers).predict(
+            ProjectManifest.from_sizes([size for _, size in python_files]), SampleProfile.prior()
+        )
+        estimated_memory_mb = estimate.predicted_memory_mb
         
         return {
             'total_files': len(python_files),
@@ -281,9 +476,17 @@ class LargeProjectAnalyzer:
         }
         
     def analyze_large_project(self, project_path: str, 
-                             analyzer_func: Callable,
-                             progress_callback: Optional[Callable] = None) -> Iterator[Any]:
-        """Analyze large project with optimizations"""
+                             analyzer_func: Optional[Callable] = None,
+                             progress_callback: Optional[Callable] = None,
+                             file_worker: Optional[Callable[[str], Any]] = None,
+                             files: Optional[List[str]] = None) -> Iterator[Any]:
+        """Analyze large project with optimizations.
+        
+        ``file_worker`` is a picklable single-file entry point run on the
+        parallel scheduler; without it, ``analyzer_func`` analyses batches of
+        files in this process. ``files`` defaults to every Python file found
+        under ``project_path``.
+        """
         
         # First, estimate project size
         project_stats = self.estimate_project_size(project_path)
@@ -298,40 +501,30 @@ class LargeProjectAnalyzer:
             print("⚠️  Large project detected, using streaming analysis...")
             
         # Get file list
-        python_files = []
-        for root, dirs, files in os.walk(project_path):
-            dirs[:] = [d for d in dirs if d not in {
-                '__pycache__', '.git', '.venv', 'venv', 'env'
-            }]
-            
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    python_files.append(file_path)
+        python_files = files
+        if python_files is None:
+            python_files = []
+            for root, dirs, filenames in os.walk(project_path):
+                dirs[:] = [d for d in dirs if d not in {
+                    '__pycache__', '.git', '.venv', 'venv', 'env'
+                }]
+                
+                for file in filenames:
+                    if file.endswith('.py'):
+                        file_path = os.path.join(root, file)
+                        python_files.append(file_path)
         
-        # Use streaming processor for large projects
-        if len(python_files) > 1000:
+        if file_worker is not None:
+            # Worker processes, results streamed back as they complete
+            print("⚡ Using scheduled parallel analysis...")
+            for _, result in self.parallel_analyzer.iter_parallel(python_files, file_worker, progress_callback):
+                yield result
+        else:
+            # In-process batches for memory efficiency
             print("🌊 Using streaming analysis for memory efficiency...")
-            
-            def batch_analyzer(file_batch):
-                return analyzer_func(file_batch)
-                
             yield from self.streaming_processor.process_files_streaming(
-                python_files, batch_analyzer, progress_callback
+                python_files, analyzer_func, progress_callback
             )
-        else:
-            # Regular parallel processing for smaller projects
-            print("⚡ Using standard parallel analysis...")
-            
-            def file_analyzer(file_path):
-                return analyzer_func([file_path])[0]  # Assume single result
-                
-            results = self.parallel_analyzer.process_parallel(
-                python_files, file_analyzer, progress_callback
-            )
-            
-            for result in results:
-                yield result
                 
         # Print final memory statistics
         memory_stats = self.memory_monitor.get_memory_stats()
@@ -341,59 +534,203 @@ class LargeProjectAnalyzer:
         print(f"  Usage: {memory_stats['usage_percent']:.1f}%")
 
 
-class ResultPaginator:
-    """Handles pagination of large result sets"""
+class InvalidCursorError(ValueError):
+    """A cursor that was not issued for this result"""
+
+
+# Entity types in page order, with the result list each one comes from
+ENTITY_LISTS = (
+    ("package", "packages"), ("module", "modules"), ("class", "classes"),
+    ("method", "methods"), ("field", "fields"), ("relationship", "relationships"),
+)
+
+
+def _dict_value(item: Dict[str, Any], name: str) -> Any:
+    return item.get(name)
+
+
+def _attr_value(item: Any, name: str) -> Any:
+    return getattr(item, name, None)
+
+
+def _result_entries(results: Any, value: Callable[[Any, str], Any]) -> Iterator[Tuple[str, List[Tuple]]]:
+    """(type, [(id, name, package, entity), ...]) for every list of a result or its dict"""
+    graph = value(results, 'dependency_graph') or {}
+    
+    package_of: Dict[str, Optional[str]] = {}  # Entity ID -> package ID
+    module_by_path: Dict[str, Optional[str]] = {}  # File path -> package ID
+    for package in value(graph, 'packages') or []:
+        package_of[value(package, 'id')] = value(package, 'id')
+    for module in value(graph, 'modules') or []:
+        package_of[value(module, 'id')] = value(module, 'package_id')
+        if value(module, 'file_path'):
+            module_by_path[value(module, 'file_path')] = value(module, 'package_id')
+    for class_info in value(graph, 'classes') or []:
+        package_of[value(class_info, 'id')] = package_of.get(value(class_info, 'module_id'))
+    
+    def resolve_package(entity_type: str, entity: Any) -> Optional[str]:
+        if entity_type == 'relationship':
+            return package_of.get(value(entity, 'from_entity'))
+        if value(entity, 'id') in package_of:
+            return package_of[value(entity, 'id')]
+        owner = value(entity, 'class_id')
+        if owner in package_of:
+            return package_of[owner]
+        return module_by_path.get(value(entity, 'file_path'))
+    
+    for entity_type, list_name in ENTITY_LISTS:
+        source = value(results if entity_type == 'relationship' else graph, list_name) or []
+        yield entity_type, [(value(entity, 'id'), value(entity, 'name'), resolve_package(entity_type, entity), entity)
+                            for entity in source]
+
+
+def _snapshot_entries(snapshot: AnalysisSnapshot) -> Iterator[Tuple[str, List[Tuple]]]:
+    """Same entries read from the snapshot columns; rows stand in for entities until a page needs them"""
+    table = snapshot.entity_table
+    owners = snapshot.package_rows()
+    string = snapshot.string
+    
+    def package_of(row: int) -> Optional[str]:
+        owner = int(owners[row])
+        return string(table['id'][owner]) if owner >= 0 else None
+    
+    for entity_type, _ in ENTITY_LISTS[:-1]:
+        yield entity_type, [(string(table['id'][row]), string(table['name'][row]), package_of(row), int(row))
+                            for row in snapshot.rows(EntityType(entity_type))]
+    # Like the model index, a relationship belongs to the package of a package/module/class source
+    owning_kinds = {EntityType.PACKAGE, EntityType.MODULE, EntityType.CLASS}
+    edges = snapshot.edge_table
+    relationships = []
+    for index in range(snapshot.edge_count):
+        source = int(edges['src'][index])
+        package = package_of(source) if source >= 0 and snapshot.entity_kind(source) in owning_kinds else None
+        relationships.append((string(edges['id'][index]), None, package, index))
+    yield 'relationship', relationships
+
+
+class CursorPaginator:
+    """Index-backed cursor pagination over every entity of one result.
     
-    def __init__(self, page_size: int = 100):
+    Built once per result, either the AnalysisResult itself (rows are the
+    model entities; only the returned page is serialized), an
+    AnalysisSnapshot (rows are snapshot rows; only the returned page is
+    materialised) or a dict in the
+    ``AnalysisResult.to_dict()`` layout: all entities
+    and relationships are ordered by (type, ID), and each row gets its type,
+    its package and a lower-cased search key. The rows matching a filter
+    (type, package, text) are computed once and kept for the following
+    pages. A cursor names the last row returned, so pages never shift or
+    repeat while a client walks them.
+    """
+    
+    def __init__(self, results: Union[AnalysisResult, AnalysisSnapshot, Dict[str, Any]], page_size: int = 100,
+                 max_page_size: int = 1000, cached_filters: int = 32):
         self.page_size = page_size
+        self.max_page_size = max_page_size
+        self.cached_filters = cached_filters
+        self._serialized = isinstance(results, dict)
+        self._snapshot = results if isinstance(results, AnalysisSnapshot) else None
+        if self._snapshot is not None:
+            self._token = str(results.analysis_id or '')[:8]
+            entries = _snapshot_entries(results)
+        else:
+            value = _dict_value if self._serialized else _attr_value
+            self._token = str((value(results, 'analysis_id') or ''))[:8]
+            entries = _result_entries(results, value)
         
-    def paginate_results(self, results: List[Any], page: int = 1) -> Dict[str, Any]:
-        """Paginate results for memory-efficient display"""
-        total_results = len(results)
-        total_pages = (total_results + self.page_size - 1) // self.page_size
-        
-        start_idx = (page - 1) * self.page_size
-        end_idx = min(start_idx + self.page_size, total_results)
-        
-        page_results = results[start_idx:end_idx]
-        
-        return {
-            'results': page_results,
-            'pagination': {
-                'current_page': page,
-                'total_pages': total_pages,
-                'total_results': total_results,
-                'page_size': self.page_size,
-                'has_next': page < total_pages,
-                'has_previous': page > 1
-            }
-        }
-        
-    def create_result_summary(self, results: List[Any]) -> Dict[str, Any]:
-        """Create summary statistics without loading all results"""
-        
-        # Sample results for statistics (don't load everything)
-        sample_size = min(1000, len(results))
-        sample = results[:sample_size] if len(results) > sample_size else results
-        
-        # Basic statistics
-        entity_types = {}
-        complexity_stats = []
-        
-        for result in sample:
-            entity_type = getattr(result, 'type', 'unknown')
-            entity_types[entity_type] = entity_types.get(entity_type, 0) + 1
+        self._rows: List[Any] = []
+        self._row_types: List[str] = []
+        self._row_packages: List[Optional[str]] = []
+        self._search_keys: List[str] = []
+        self._by_type: Dict[str, List[int]] = {}
+        self._by_package: Dict[Optional[str], List[int]] = {}
+        for entity_type, source in entries:
+            rows = self._by_type.setdefault(entity_type, [])
+            for entity_id, name, package, entity in sorted(source, key=lambda entry: entry[0] or ''):
+                row = len(self._rows)
+                self._rows.append(entity)
+                self._row_types.append(entity_type)
+                self._row_packages.append(package)
+                self._search_keys.append(f"{name or ''}\0{entity_id or ''}".lower())
+                rows.append(row)
+                self._by_package.setdefault(package, []).append(row)
+        self._matches: Dict[Tuple, Tuple[Sequence[int], Dict[str, int]]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    def counts(self) -> Dict[str, int]:
+        """Number of rows of every type"""
+        return {entity_type: len(rows) for entity_type, rows in self._by_type.items()}
+    
+    def _matching_rows(self, entity_type: Optional[str], package: Optional[str],
+                       text: Optional[str]) -> Tuple[Sequence[int], Dict[str, int]]:
+        """Rows matching a filter (ascending) and their count per type"""
+        key = (entity_type, package, text)
+        match = self._matches.pop(key, None)
+        if match is None:
+            if entity_type is not None and package is not None:
+                rows = [r for r in self._by_type.get(entity_type, ()) if self._row_packages[r] == package]
+            elif entity_type is not None:
+                rows = self._by_type.get(entity_type, [])
+            elif package is not None:
+                rows = self._by_package.get(package, [])
+            else:
+                rows = range(len(self._rows))
+            if text:
+                needle = text.lower()
+                rows = [r for r in rows if needle in self._search_keys[r]]
             
-            complexity = getattr(result, 'complexity', 0)
-            if complexity:
-                complexity_stats.append(complexity)
-                
-        avg_complexity = sum(complexity_stats) / len(complexity_stats) if complexity_stats else 0
+            type_counts: Dict[str, int] = {}
+            if entity_type is not None:
+                type_counts[entity_type] = len(rows)
+            elif not text and package is None:
+                type_counts = self.counts()
+            else:
+                for row in rows:
+                    row_type = self._row_types[row]
+                    type_counts[row_type] = type_counts.get(row_type, 0) + 1
+            match = (rows, type_counts)
+        self._matches[key] = match  # Most recently used filters are kept
+        while len(self._matches) > self.cached_filters:
+            del self._matches[next(iter(self._matches))]
+        return match
+    
+    def encode_cursor(self, row: int) -> str:
+        return base64.urlsafe_b64encode(f"{self._token}:{row}".encode()).decode().rstrip("=")
+    
+    def decode_cursor(self, cursor: str) -> int:
+        try:
+            token, row = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode().rsplit(":", 1)
+            row = int(row)
+        except (ValueError, UnicodeDecodeError):
+            raise InvalidCursorError(f"Malformed cursor: {cursor!r}")
+        if token != self._token or not 0 <= row < len(self._rows):
+            raise InvalidCursorError("Cursor does not belong to this result")
+        return row
+    
+    def page(self, entity_type: Optional[str] = None, package: Optional[str] = None,
+             text: Optional[str] = None, cursor: Optional[str] = None,
+             limit: Optional[int] = None) -> Dict[str, Any]:
+        """One page of rows matching every given filter, after ``cursor`` (from the start if None)"""
+        if entity_type is not None and entity_type not in self._by_type:
+            raise ValueError(f"Unknown entity type: {entity_type}")
+        limit = max(1, min(limit or self.page_size, self.max_page_size))
+        rows, type_counts = self._matching_rows(entity_type, package, text or None)
+        start = bisect_right(rows, self.decode_cursor(cursor)) if cursor else 0
+        selected = rows[start:start + limit]
+        has_more = start + limit < len(rows)
+        items = [self._rows[row] for row in selected]
+        if self._snapshot is not None:
+            items = [self._snapshot.relationship(item) if self._row_types[row] == 'relationship'
+                     else self._snapshot.entity(item) for item, row in zip(items, selected)]
+        if not self._serialized:
+            items = decode_json(encode_json(items))  # Model entities: serialize this page only
         
         return {
-            'total_results': len(results),
-            'sample_size': sample_size,
-            'entity_types': entity_types,
-            'avg_complexity': avg_complexity,
-            'is_sampled': len(results) > sample_size
-        }
\ No newline at end of file
+            'items': [dict(item, entity_type=self._row_types[row]) for item, row in zip(items, selected)],
+            'total': len(rows),
+            'counts': dict(type_counts),
+            'limit': limit,
+            'next_cursor': self.encode_cursor(selected[-1]) if has_more else None
+        }
@@ -0,0 +1,220 @@
+"""
+PyView Large-Project Pipeline
+
+Folds per-file analyses into integrated tables while workers are still running:
+- Entity / edge tables filled batch by batch as worker results arrive
+- Repeated strings (IDs, file paths, type names, call targets) interned so
+  every entity of a file shares one copy instead of one per unpickled result
+- Folded batches spilled to an append-only segment file on disk whenever
+  memory is critical, and read back once the workers are gone
+
+Spilling bounds the parent's memory while workers run, not the peak of the
+whole analysis: the integrated result holds every entity, so once the tables
+are drained the parent holds the full result (plus one spilled batch while it
+is being read back) regardless of ``max_memory_mb``.
+"""
+
+import gc
+import os
+import pickle
+import struct
+import tempfile
+from dataclasses import fields as dataclass_fields
+from typing import Dict, List, Optional, Any, Iterator
+
+_LENGTH = struct.Struct("<Q")
+
+# Free-text fields that are almost never repeated (interning them only grows the table)
+_UNSHARED_FIELDS = {"docstring", "body_text", "default_value"}
+
+TABLES = ("modules", "classes", "methods", "fields", "relationships", "quality")
+
+
+class SegmentFile:
+    """Append-only file of length-prefixed pickled records, deleted on close"""
+
+    def __init__(self, directory: Optional[str] = None):
+        fd, self.path = tempfile.mkstemp(prefix="pyview-segment-", suffix=".seg", dir=directory)
+        self._file = os.fdopen(fd, 'w+b')
+        self.records = 0
+        self.bytes_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.records
+
+    def append(self, record: Any) -> int:
+        """Write one record at the end of the file; returns its offset"""
+        payload = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        offset = self._file.seek(0, os.SEEK_END)
+        self._file.write(_LENGTH.pack(len(payload)))
+        self._file.write(payload)
+        self.records += 1
+        self.bytes_written += _LENGTH.size + len(payload)
+        return offset
+
+    def read(self, offset: int) -> Any:
+        self._file.flush()
+        self._file.seek(offset)
+        (length,) = _LENGTH.unpack(self._file.read(_LENGTH.size))
+        return pickle.loads(self._file.read(length))
+
+    def __iter__(self) -> Iterator[Any]:
+        """Records in write order (one record in memory at a time)"""
+        self._file.flush()
+        offset = 0
+        while offset < self.bytes_written:
+            self._file.seek(offset)
+            (length,) = _LENGTH.unpack(self._file.read(_LENGTH.size))
+            yield pickle.loads(self._file.read(length))
+            offset += _LENGTH.size + length
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+class StringInterner:
+    """Per-run string table: equal strings are replaced by one shared object"""
+
+    def __init__(self):
+        self._strings: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __call__(self, value):
+        if isinstance(value, str):
+            return self._strings.setdefault(value, value)
+        return value
+
+    def intern_entity(self, entity):
+        """Intern the string and list-of-string fields of a dataclass entity in place"""
+        for spec in dataclass_fields(entity):
+            if spec.name in _UNSHARED_FIELDS:
+                continue
+            value = getattr(entity, spec.name)
+            if isinstance(value, str):
+                setattr(entity, spec.name, self._strings.setdefault(value, value))
+            elif isinstance(value, list) and value and isinstance(value[0], str):
+                value[:] = [self(item) for item in value]
+        return entity
+
+
+class StreamingIntegrator:
+    """Integrates worker results into entity/edge tables, spilling under memory pressure.
+
+    Analyses are buffered into batches of ``batch_size`` files. Each full
+    batch is interned and folded into the resident tables; when the memory
+    monitor reports critical usage, the resident tables are appended to the
+    segment file and released. ``tables()`` replays spilled batches followed
+    by the resident ones, so results come back in arrival order.
+
+    While analyses are being added, the parent holds at most the tables folded
+    since the last spill plus one pending batch. ``tables()`` returns every
+    entity, so its result is as large as the unspilled tables would have been;
+    spilling only moves that cost past the point where the worker pool is gone.
+    """
+
+    def __init__(self, memory_monitor=None, batch_size: int = 100, spill_dir: Optional[str] = None):
+        self.memory_monitor = memory_monitor
+        self.batch_size = max(1, batch_size)
+        self.spill_dir = spill_dir
+        self.intern = StringInterner()
+        self.segment: Optional[SegmentFile] = None
+        self.files = 0
+        self.spilled_batches = 0
+        self.spilled_bytes = 0
+        self._pending: List[Any] = []
+        self._resident: Dict[str, List] = {name: [] for name in TABLES}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add(self, analysis) -> None:
+        """Queue one FileAnalysis; full batches are folded immediately"""
+        self._pending.append(analysis)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Fold the pending batch and spill the resident tables if memory is critical"""
+        if self._pending:
+            self._fold(self._pending)
+            self._pending = []
+        if self.memory_monitor is not None and self.memory_monitor.is_memory_critical():
+            self.spill()
+
+    def _fold(self, analyses: List[Any]) -> None:
+        intern_entity = self.intern.intern_entity
+        tables = self._resident
+        for analysis in analyses:
+            module_info = intern_entity(analysis.module_info)
+            tables['modules'].append(module_info)
+            tables['classes'].extend(intern_entity(c) for c in analysis.classes)
+            tables['methods'].extend(intern_entity(m) for m in analysis.methods)
+            tables['fields'].extend(intern_entity(f) for f in analysis.fields)
+            tables['relationships'].extend(intern_entity(r) for r in analysis.relationships)
+            if analysis.quality_metrics:
+                tables['quality'].append((module_info.name, [intern_entity(q) for q in analysis.quality_metrics]))
+            self.files += 1
+
+    def spill(self) -> None:
+        """Move the resident tables to the segment file"""
+        if not any(self._resident.values()):
+            return
+        if self.segment is None:
+            self.segment = SegmentFile(self.spill_dir)
+        offset = self.segment.append(self._resident)
+        self.spilled_bytes += self.segment.bytes_written - offset
+        self._resident = {name: [] for name in TABLES}
+        self.spilled_batches += 1
+        gc.collect()
+
+    def tables(self) -> Dict[str, List]:
+        """Drain every folded table: spilled batches (re-interned on load), then resident ones
+
+        Segment records are read one at a time, but the returned tables hold
+        every entity of the run in memory.
+        """
+        self.flush()
+        merged: Dict[str, List] = {name: [] for name in TABLES}
+        intern_entity = self.intern.intern_entity
+        for batch in (self.segment or ()):
+            for name in TABLES:
+                if name == 'quality':
+                    merged[name].extend((self.intern(module), [intern_entity(q) for q in metrics])
+                                        for module, metrics in batch[name])
+                else:
+                    merged[name].extend(intern_entity(entity) for entity in batch[name])
+        self.close()
+        for name in TABLES:
+            merged[name].extend(self._resident[name])
+        self._resident = {name: [] for name in TABLES}
+        return merged
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'files': self.files,
+            'interned_strings': len(self.intern),
+            'spilled_batches': self.spilled_batches,
+            'spilled_bytes': self.spilled_bytes
+        }
+
+    def close(self):
+        if self.segment is not None:
+            self.segment.close()
+            self.segment = None
@@ -0,0 +1,123 @@
+"""
+PyView Progress Channel
+
+Coalesced progress reporting for long analyses:
+- Per-file progress is a counter increment (files, bytes, failures) in the
+  loop that collects worker results; nothing is sent per file
+- Snapshots are emitted at a fixed maximum rate (10 Hz by default) and on
+  every stage change, so reporting cost does not grow with the file count
+- A snapshot carries files and bytes done/total, per-stage timings,
+  throughput and an ETA for the current stage
+"""
+
+import time
+from typing import Callable, Dict, List, Optional, Any
+
+DEFAULT_RATE_HZ = 10.0
+
+
+class ProgressChannel:
+    """Stage changes plus per-file counters, delivered to ``callback`` as snapshots.
+
+    ``update()`` starts a stage and always emits. ``set_totals()`` gives the
+    current stage a file (and optionally byte) total and the progress value
+    it ends at; ``advance()`` then only bumps counters and emits when the
+    rate interval has passed. The final counts of a counted stage are kept
+    in its ``stage_timings`` entry. Counters are updated by the single
+    thread that collects results, so they need no locking.
+    """
+
+    def __init__(self, callback: Callable[[dict], None], rate_hz: float = DEFAULT_RATE_HZ,
+                 clock: Callable[[], float] = time.monotonic):
+        self.callback = callback
+        self.interval = 1.0 / rate_hz if rate_hz > 0 else 0.0
+        self.clock = clock
+        self.started = clock()
+        self.emitted = 0
+        self.stage: Optional[str] = None
+        self.stage_started = self.started
+        self.stage_timings: List[Dict[str, Any]] = []
+        self.progress = 0.0
+        self._details: Dict[str, Any] = {}
+        self._next_emit = 0.0
+        self._start_progress = self._end_progress = 0.0
+        self.files_done = self.bytes_done = self.failed_files = 0
+        self.files_total: Optional[int] = None
+        self.bytes_total: Optional[int] = None
+
+    def update(self, stage: str, progress: float, **kwargs):
+        """Enter ``stage`` at ``progress`` (0-100) and emit a snapshot; extra kwargs ride along"""
+        now = self.clock()
+        if stage != self.stage:
+            if self.stage is not None:
+                timing = {'stage': self.stage, 'seconds': now - self.stage_started}
+                if self.files_total is not None:
+                    timing.update(files=self.files_done, bytes=self.bytes_done, failed=self.failed_files)
+                self.stage_timings.append(timing)
+            self.stage, self.stage_started = stage, now
+            self.files_done = self.bytes_done = self.failed_files = 0
+            self.files_total = self.bytes_total = None
+        self.progress = self._start_progress = self._end_progress = progress
+        self._details = kwargs
+        self.emit(now)
+
+    def set_totals(self, files: int, bytes_total: Optional[int] = None, end_progress: Optional[float] = None):
+        """Count ``files`` (and ``bytes_total`` bytes) for the current stage, ending at ``end_progress``; emits"""
+        self.files_total = files
+        self.bytes_total = bytes_total or None
+        if end_progress is not None:
+            self._end_progress = end_progress
+        self.emit()
+
+    def advance(self, files: int = 1, bytes_done: int = 0, failed: int = 0):
+        """Count finished files; emits only when the rate interval has passed"""
+        self.files_done += files
+        self.bytes_done += bytes_done
+        self.failed_files += failed
+        now = self.clock()
+        if now >= self._next_emit:
+            self.emit(now)
+
+    def emit(self, now: Optional[float] = None):
+        now = self.clock() if now is None else now
+        self._next_emit = now + self.interval
+        self.emitted += 1
+        self.callback(self.snapshot(now))
+
+    def _fraction(self) -> Optional[float]:
+        if self.bytes_total:
+            return min(1.0, self.bytes_done / self.bytes_total)
+        if self.files_total:
+            return min(1.0, self.files_done / self.files_total)
+        return None
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Current state as a plain dict (safe to hand to another thread or serialize)"""
+        now = self.clock() if now is None else now
+        stage_elapsed = now - self.stage_started
+        fraction = self._fraction()
+        if fraction is not None:
+            self.progress = self._start_progress + (self._end_progress - self._start_progress) * fraction
+
+        files_per_second = self.files_done / stage_elapsed if stage_elapsed > 0 else 0.0
+        bytes_per_second = self.bytes_done / stage_elapsed if stage_elapsed > 0 else 0.0
+        eta = None
+        if fraction is not None and 0 < fraction < 1 and stage_elapsed > 0:
+            eta = stage_elapsed * (1 - fraction) / fraction
+
+        return {
+            'stage': self.stage,
+            'progress': self.progress,
+            'files_done': self.files_done,
+            'files_total': self.files_total,
+            'bytes_done': self.bytes_done,
+            'bytes_total': self.bytes_total,
+            'failed_files': self.failed_files,
+            'elapsed_seconds': now - self.started,
+            'stage_seconds': stage_elapsed,
+            'files_per_second': files_per_second,
+            'bytes_per_second': bytes_per_second,
+            'eta_seconds': eta,
+            'stage_timings': list(self.stage_timings),
+            **self._details
+        }
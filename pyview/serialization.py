@@ -0,0 +1,136 @@
+"""
+PyView Result Serialization
+
+Compact encoders for analysis results, written straight from the models:
+- JSON is produced as a stream of byte chunks; entity lists are encoded in
+  batches, so no dict copy of the whole result is ever built
+- orjson is used when installed (entities are encoded natively in C),
+  otherwise the standard library encoder with a per-object hook
+- MessagePack is available when ``msgpack`` is installed
+- Output has no indentation; the layout matches ``AnalysisResult.to_dict()``
+  (private fields skipped, enums as their values)
+"""
+
+import json
+from dataclasses import fields
+from enum import Enum
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    msgpack = None
+    HAS_MSGPACK = False
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Entities per encoder call: large enough to stay in C, small enough to keep chunks short
+DEFAULT_BATCH_SIZE = 1000
+
+_public_fields_cache: Dict[type, Optional[Tuple[Tuple[str, ...], bool]]] = {}
+
+
+def _public_fields(cls: type) -> Optional[Tuple[Tuple[str, ...], bool]]:
+    """(public field names, has private fields) of a dataclass type, or None for other types"""
+    try:
+        return _public_fields_cache[cls]
+    except KeyError:
+        pass
+    info = None
+    if hasattr(cls, '__dataclass_fields__'):
+        names = tuple(spec.name for spec in fields(cls))
+        public = tuple(name for name in names if not name.startswith('_'))
+        info = (public, len(public) != len(names))
+    _public_fields_cache[cls] = info
+    return info
+
+
+def _default(obj: Any) -> Any:
+    """Encoder hook: enums become their values, dataclasses a shallow dict of public fields"""
+    if isinstance(obj, Enum):
+        return obj.value
+    info = _public_fields(type(obj))
+    if info is not None:
+        return {name: getattr(obj, name) for name in info[0]}
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+if HAS_ORJSON:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+    _ORJSON_FILTERED = _ORJSON_OPTIONS | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def _dumps(value: Any, filtered: bool = False) -> bytes:
+        return orjson.dumps(value, default=_default, option=_ORJSON_FILTERED if filtered else _ORJSON_OPTIONS)
+
+    def decode_json(data) -> Any:
+        return orjson.loads(data)
+else:
+    _json_encoder = json.JSONEncoder(default=_default, ensure_ascii=False, separators=(',', ':'))
+
+    def _dumps(value: Any, filtered: bool = False) -> bytes:
+        return _json_encoder.encode(value).encode()
+
+    def decode_json(data) -> Any:
+        return json.loads(data)
+
+
+def iter_json(value: Any, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[bytes]:
+    """Encode ``value`` (an AnalysisResult, any model or plain data) as JSON byte chunks.
+
+    Dataclasses are written field by field and their list fields in
+    batches of ``batch_size`` items; everything else goes to the encoder
+    in one call.
+    """
+    info = _public_fields(type(value))
+    if info is None:
+        yield _dumps(value)
+        return
+    separator = b'{'
+    for name in info[0]:
+        yield separator + _dumps(name) + b':'
+        separator = b','
+        member = getattr(value, name)
+        if isinstance(member, list):
+            yield from _iter_list(member, batch_size)
+        elif _public_fields(type(member)) is not None:
+            yield from iter_json(member, batch_size)
+        else:
+            yield _dumps(member)
+    yield b'}' if separator == b',' else b'{}'
+
+
+def _iter_list(items: list, batch_size: int) -> Iterator[bytes]:
+    if not items:
+        yield b'[]'
+        return
+    info = _public_fields(type(items[0]))
+    filtered = info is not None and info[1]  # Entities with private fields go through the hook
+    separator = b'['
+    for start in range(0, len(items), batch_size):
+        chunk = _dumps(items[start:start + batch_size], filtered)
+        yield separator + chunk[1:-1]
+        separator = b','
+    yield b']'
+
+
+def encode_json(value: Any, batch_size: int = DEFAULT_BATCH_SIZE) -> bytes:
+    """The whole JSON document as bytes (chunks from ``iter_json`` joined once)"""
+    return b''.join(iter_json(value, batch_size))
+
+
+def encode_msgpack(value: Any) -> bytes:
+    """MessagePack encoding with the same layout as the JSON output"""
+    if not HAS_MSGPACK:
+        raise ImportError("MessagePack output requires msgpack (pip install msgpack)")
+    return msgpack.packb(value, default=_default, use_bin_type=True)
@@ -0,0 +1,544 @@
+"""
+PyView Columnar Analysis Snapshots
+
+On-disk format for AnalysisResult that opens without unpickling the object graph:
+- Entity table (kind, id, name, file, line, parent) and edge table (src, dst, type, weight)
+  as fixed-width NumPy records, memory-mapped so server processes share the pages
+- One shared, deduplicated string table
+- Remaining entity fields as per-entity JSON records, decoded only when touched
+- Optional zlib / lzma compression per section (compressed sections are read on first use)
+- Lazy accessors rebuild dataclasses only for the entities a caller asks for
+"""
+
+import hashlib
+import json
+import lzma
+import mmap
+import struct
+import zlib
+from dataclasses import fields as dataclass_fields, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterator, Union
+
+from .models import (
+    AnalysisResult, ProjectInfo, DependencyGraph, PackageInfo, ModuleInfo, ClassInfo,
+    MethodInfo, FieldInfo, ImportInfo, Relationship, QualityMetrics, CyclicDependency,
+    DependencyType, EntityType
+)
+from .file_cache import write_atomic
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+MAGIC = b"PYVSNAP1"
+FORMAT_VERSION = 1
+_ALIGN = 64
+
+# String index meaning "None"
+NO_STRING = 0xFFFFFFFF
+
+# Entity kinds in table order; EXTERNAL rows stand for edge / metric endpoints outside the graph
+KINDS = (EntityType.PACKAGE, EntityType.MODULE, EntityType.CLASS, EntityType.METHOD, EntityType.FIELD)
+EXTERNAL = len(KINDS)
+_KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+_KIND_CLASSES = (PackageInfo, ModuleInfo, ClassInfo, MethodInfo, FieldInfo)
+_GRAPH_LISTS = ("packages", "modules", "classes", "methods", "fields")
+
+# Row is part of its DependencyGraph list (otherwise only nested in a parent or external)
+FLAG_LISTED = 1
+
+_DEPENDENCY_TYPES = tuple(DependencyType)
+_DEPENDENCY_CODES = {dep_type: code for code, dep_type in enumerate(_DEPENDENCY_TYPES)}
+
+# Fields stored in columns rather than in the JSON records
+_COLUMN_FIELDS = {"id", "name", "file_path", "path", "line_number"}
+
+_QUALITY_INT_FIELDS = ("cyclomatic_complexity", "cognitive_complexity", "nesting_depth", "lines_of_code",
+                       "logical_lines", "comment_lines", "blank_lines")
+_QUALITY_FLOAT_FIELDS = ("halstead_volume", "halstead_difficulty", "maintainability_index")
+
+COMPRESSION_CODECS = {
+    None: (lambda data: data, lambda data: data),
+    "zlib": (lambda data: zlib.compress(data, 6), zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+
+def _dtypes() -> Dict[str, Any]:
+    return {
+        'entities': np.dtype([('kind', 'u1'), ('flags', 'u1'), ('line', '<i4'), ('id', '<u4'),
+                              ('name', '<u4'), ('file', '<u4'), ('parent', '<i4')]),
+        'edges': np.dtype([('src', '<i4'), ('dst', '<i4'), ('type', 'u1'), ('line', '<i4'),
+                           ('weight', '<f8'), ('id', '<u4'), ('file', '<u4'), ('context', '<u4')]),
+        'quality': np.dtype([('entity', '<i4'), ('entity_type', 'u1')]
+                            + [(name, '<i4') for name in _QUALITY_INT_FIELDS]
+                            + [(name, '<f8') for name in _QUALITY_FLOAT_FIELDS]
+                            + [('grade', '<u4')]),
+        'id_hash': np.dtype('<u8'),
+        'id_order': np.dtype('<i4'),
+        'string_offsets': np.dtype('<u8'),
+        'string_data': np.dtype('u1'),
+        'record_offsets': np.dtype('<u8'),
+        'record_data': np.dtype('u1'),
+        'meta': np.dtype('u1'),
+    }
+
+
+def _require_numpy():
+    if not HAS_NUMPY:
+        raise ImportError("Analysis snapshots require NumPy (pip install numpy)")
+
+
+def _id_hash(entity_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(entity_id.encode(), digest_size=8).digest(), 'little')
+
+
+class _StringTable:
+    """Deduplicating string interner for the writer"""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return NO_STRING
+        position = self.index.get(value)
+        if position is None:
+            position = self.index[value] = len(self.strings)
+            self.strings.append(value)
+        return position
+
+    def encode(self):
+        encoded = [s.encode('utf-8', 'surrogatepass') for s in self.strings]
+        offsets = np.zeros(len(encoded) + 1, dtype='<u8')
+        if encoded:
+            np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return offsets, np.frombuffer(b"".join(encoded), dtype='u1')
+
+
+def _entity_record(entity) -> Dict[str, Any]:
+    """Fields of an entity that are not stored in columns.
+
+    Member lists (module.classes, class.methods, ...) hold entity IDs, as
+    the analyzer produces them; nested dataclasses are stored by ID.
+    """
+    record = {}
+    for f in dataclass_fields(entity):
+        if f.name in _COLUMN_FIELDS or f.name.startswith('_'):
+            continue
+        value = getattr(entity, f.name)
+        if f.name == "imports":
+            value = [asdict(imp) for imp in value]
+        elif isinstance(value, list):
+            value = [getattr(item, 'id', item) for item in value]
+        record[f.name] = value
+    return record
+
+
+def write_snapshot(result: AnalysisResult, path: Union[str, Path], compression: Optional[str] = None) -> int:
+    """Write an AnalysisResult as a columnar snapshot; returns the file size in bytes.
+
+    ``compression`` is None, "zlib" or "lzma". Uncompressed snapshots are
+    memory-mapped on open; compressed ones trade open time for size.
+    """
+    _require_numpy()
+    if compression not in COMPRESSION_CODECS:
+        raise ValueError(f"Unknown snapshot compression: {compression}")
+
+    strings = _StringTable()
+    graph = result.dependency_graph
+    rows: List[list] = []
+    records: List[bytes] = []
+    row_of: Dict[str, int] = {}
+
+    def add_row(entity, kind: int, listed: bool) -> int:
+        row = len(rows)
+        if kind == EXTERNAL:
+            entity_id, name, file_path, line = entity, None, None, 0
+            records.append(b"null")
+        else:
+            entity_id = entity.id
+            name = entity.name
+            file_path = entity.path if kind == _KIND_CODES[EntityType.PACKAGE] else entity.file_path
+            line = getattr(entity, "line_number", 0) or 0
+            records.append(json.dumps(_entity_record(entity), ensure_ascii=False, default=str).encode())
+        rows.append([kind, FLAG_LISTED if listed else 0, line, strings.add(entity_id),
+                     strings.add(name), strings.add(file_path), -1])
+        row_of.setdefault(entity_id, row)
+        return row
+
+    def row_for_id(entity_id: Optional[str]) -> int:
+        if entity_id is None:
+            return -1
+        row = row_of.get(entity_id)
+        return row if row is not None else add_row(entity_id, EXTERNAL, False)
+
+    for code, list_name in enumerate(_GRAPH_LISTS):
+        for entity in getattr(graph, list_name):
+            add_row(entity, code, True)
+
+    # Parent: package of a module, module of a class or function, class of a method or field
+    def set_parent(member, parent_row: int):
+        row = row_of.get(getattr(member, 'id', member))
+        if row is not None and rows[row][6] < 0:
+            rows[row][6] = parent_row
+
+    for module in graph.modules:
+        if module.package_id in row_of:
+            rows[row_of[module.id]][6] = row_of[module.package_id]
+        for member in module.classes + module.functions:
+            set_parent(member, row_of[module.id])
+    for entity in graph.classes:
+        set_parent(entity, row_of.get(entity.module_id, -1))
+    module_rows = {module.file_path: row_of[module.id] for module in graph.modules if module.file_path}
+    for entity in graph.methods + graph.fields:
+        if entity.class_id in row_of:
+            set_parent(entity, row_of[entity.class_id])
+        elif entity.file_path in module_rows:  # Functions not listed in their module
+            set_parent(entity, module_rows[entity.file_path])
+
+    dtypes = _dtypes()
+    edges = np.zeros(len(result.relationships), dtype=dtypes['edges'])
+    for i, rel in enumerate(result.relationships):
+        edges[i] = (row_for_id(rel.from_entity), row_for_id(rel.to_entity),
+                    _DEPENDENCY_CODES[rel.relationship_type], rel.line_number or 0, rel.strength,
+                    strings.add(rel.id), strings.add(rel.file_path), strings.add(rel.context))
+
+    quality = np.zeros(len(result.quality_metrics), dtype=dtypes['quality'])
+    for i, metric in enumerate(result.quality_metrics):
+        quality[i] = ((row_for_id(metric.entity_id), list(EntityType).index(metric.entity_type))
+                      + tuple(getattr(metric, name) for name in _QUALITY_INT_FIELDS)
+                      + tuple(getattr(metric, name) for name in _QUALITY_FLOAT_FIELDS)
+                      + (strings.add(metric.quality_grade),))
+
+    # Built last: edges and metrics may add external rows
+    entities = np.array([tuple(row) for row in rows], dtype=dtypes['entities'])
+
+    # Hash index for id -> row lookups without building a dict on open
+    hashes = np.array([_id_hash(strings.strings[id_index]) for id_index in entities['id']], dtype='<u8')
+    id_order = np.argsort(hashes, kind='stable').astype('<i4')
+
+    record_offsets = np.zeros(len(records) + 1, dtype='<u8')
+    if records:
+        np.cumsum([len(record) for record in records], out=record_offsets[1:])
+
+    string_offsets, string_data = strings.encode()
+    meta = {
+        'analysis_id': result.analysis_id,
+        'project_info': asdict(result.project_info),
+        'metrics': result.metrics,
+        'cycles': [asdict(cycle) for cycle in result.cycles],
+        'warnings': result.warnings,
+        'errors': result.errors,
+    }
+
+    sections = {
+        'entities': entities,
+        'edges': edges,
+        'quality': quality,
+        'id_hash': hashes[id_order],
+        'id_order': id_order,
+        'string_offsets': string_offsets,
+        'string_data': string_data,
+        'record_offsets': record_offsets,
+        'record_data': np.frombuffer(b"".join(records), dtype='u1'),
+        'meta': np.frombuffer(json.dumps(meta, ensure_ascii=False, default=str).encode(), dtype='u1'),
+    }
+    return _write_sections(Path(path), sections, compression)
+
+
+def _write_sections(path: Path, sections: Dict[str, Any], compression: Optional[str]) -> int:
+    compress = COMPRESSION_CODECS[compression][0]
+    payloads = {name: compress(array.tobytes()) for name, array in sections.items()}
+
+    def build_header(offsets):
+        return json.dumps({
+            'version': FORMAT_VERSION,
+            'compression': compression,
+            'sections': {name: {'offset': offsets.get(name, 0), 'length': len(payloads[name]),
+                                'count': int(len(sections[name]))}
+                         for name in sections}
+        }).encode()
+
+    # Header size depends on the offsets; lay out until they stop moving
+    offsets: Dict[str, int] = {}
+    while True:
+        header = build_header(offsets)
+        position = len(MAGIC) + 8 + len(header)
+        layout = {}
+        for name, payload in payloads.items():
+            position = -(-position // _ALIGN) * _ALIGN
+            layout[name] = position
+            position += len(payload)
+        if layout == offsets:
+            break
+        offsets = layout
+
+    buffer = bytearray(position)
+    buffer[:len(MAGIC)] = MAGIC
+    buffer[len(MAGIC):len(MAGIC) + 8] = struct.pack('<Q', len(header))
+    buffer[len(MAGIC) + 8:len(MAGIC) + 8 + len(header)] = header
+    for name, payload in payloads.items():
+        buffer[offsets[name]:offsets[name] + len(payload)] = payload
+    write_atomic(path, bytes(buffer))
+    return len(buffer)
+
+
+class AnalysisSnapshot:
+    """Read-only, lazily materialised view of a snapshot file"""
+
+    def __init__(self, path: Union[str, Path]):
+        _require_numpy()
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Not a PyView snapshot: {self.path}")
+        (header_length,) = struct.unpack('<Q', self._mmap[len(MAGIC):len(MAGIC) + 8])
+        header = json.loads(self._mmap[len(MAGIC) + 8:len(MAGIC) + 8 + header_length])
+        if header.get('version') != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"Unsupported snapshot version {header.get('version')}: {self.path}")
+
+        self.compression = header['compression']
+        self._sections = header['sections']
+        self._dtypes = _dtypes()
+        self._arrays: Dict[str, Any] = {}
+        self._strings: Dict[int, str] = {}
+        self._entities: Dict[int, Any] = {}
+        self._meta: Optional[Dict[str, Any]] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._arrays.clear()
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # arrays handed out to callers still reference the mapping
+
+    # ----- raw sections -----
+
+    def _array(self, name: str):
+        array = self._arrays.get(name)
+        if array is None:
+            section = self._sections[name]
+            dtype = self._dtypes[name]
+            if section['count'] == 0:
+                array = np.zeros(0, dtype=dtype)
+            elif self.compression is None:
+                array = np.frombuffer(self._mmap, dtype=dtype, count=section['count'], offset=section['offset'])
+            else:
+                raw = self._mmap[section['offset']:section['offset'] + section['length']]
+                array = np.frombuffer(COMPRESSION_CODECS[self.compression][1](raw), dtype=dtype)
+            self._arrays[name] = array
+        return array
+
+    @property
+    def entity_table(self):
+        """Structured array: kind, flags, line, id, name, file, parent"""
+        return self._array('entities')
+
+    @property
+    def edge_table(self):
+        """Structured array: src, dst, type, line, weight, id, file, context"""
+        return self._array('edges')
+
+    @property
+    def quality_table(self):
+        return self._array('quality')
+
+    @property
+    def entity_count(self) -> int:
+        return self._sections['entities']['count']
+
+    @property
+    def edge_count(self) -> int:
+        return self._sections['edges']['count']
+
+    def string(self, index: int) -> Optional[str]:
+        index = int(index)
+        if index == NO_STRING:
+            return None
+        value = self._strings.get(index)
+        if value is None:
+            offsets = self._array('string_offsets')
+            data = self._array('string_data')
+            value = data[int(offsets[index]):int(offsets[index + 1])].tobytes().decode('utf-8', 'surrogatepass')
+            self._strings[index] = value
+        return value
+
+    def _meta_value(self, key: str):
+        if self._meta is None:
+            self._meta = json.loads(self._array('meta').tobytes())
+        return self._meta[key]
+
+    # ----- entities -----
+
+    def index_of(self, entity_id: str) -> Optional[int]:
+        """Row of an entity ID (graph entities before external endpoints), or None"""
+        hashes = self._array('id_hash')
+        order = self._array('id_order')
+        target = np.uint64(_id_hash(entity_id))
+        position = int(np.searchsorted(hashes, target, side='left'))
+        table = self.entity_table
+        while position < len(hashes) and hashes[position] == target:
+            row = int(order[position])
+            if self.string(table['id'][row]) == entity_id:
+                return row
+            position += 1
+        return None
+
+    def entity_id(self, row: int) -> Optional[str]:
+        return self.string(self.entity_table['id'][row]) if row >= 0 else None
+
+    def entity_kind(self, row: int) -> Optional[EntityType]:
+        kind = int(self.entity_table['kind'][row])
+        return KINDS[kind] if kind < EXTERNAL else None
+
+    def entity(self, key: Union[int, str]):
+        """Dataclass for an entity row or ID (memoised; None for unknown or external IDs)"""
+        row = self.index_of(key) if isinstance(key, str) else int(key)
+        if row is None:
+            return None
+        entity = self._entities.get(row)
+        if entity is None:
+            entity = self._build_entity(row)
+            if entity is not None:
+                self._entities[row] = entity
+        return entity
+
+    def _build_entity(self, row: int):
+        entry = self.entity_table[row]
+        kind = int(entry['kind'])
+        if kind == EXTERNAL:
+            return None
+        offsets = self._array('record_offsets')
+        record = json.loads(self._array('record_data')[int(offsets[row]):int(offsets[row + 1])].tobytes())
+        record['id'] = self.string(entry['id'])
+        record['name'] = self.string(entry['name'])
+        cls = _KIND_CLASSES[kind]
+        if cls is PackageInfo:
+            record['path'] = self.string(entry['file'])
+        else:
+            record['file_path'] = self.string(entry['file'])
+            if cls is not ModuleInfo:
+                record['line_number'] = int(entry['line'])
+        if cls is ModuleInfo:
+            record['imports'] = [ImportInfo(**imp) for imp in record.get('imports', [])]
+        return cls(**record)
+
+    def parent(self, row: int) -> Optional[int]:
+        parent = int(self.entity_table['parent'][row])
+        return parent if parent >= 0 else None
+
+    def children(self, row: int) -> List[int]:
+        """Rows whose parent is ``row`` (vectorised scan of the parent column)"""
+        return [int(child) for child in np.flatnonzero(self.entity_table['parent'] == row)]
+
+    def rows(self, kind: EntityType, listed_only: bool = True):
+        """Rows of one kind in graph order, without building any entity"""
+        table = self.entity_table
+        mask = table['kind'] == _KIND_CODES[kind]
+        if listed_only:
+            mask &= (table['flags'] & FLAG_LISTED) != 0
+        return np.flatnonzero(mask)
+
+    def entities(self, kind: EntityType, listed_only: bool = True) -> Iterator[Any]:
+        """Materialise entities of one kind in graph order"""
+        for row in self.rows(kind, listed_only):
+            yield self.entity(int(row))
+
+    def package_rows(self):
+        """Row of the package owning every row (-1 if none), following the parent column"""
+        table = self.entity_table
+        kinds = table['kind']
+        parents = table['parent'].astype(np.int64)
+        package = _KIND_CODES[EntityType.PACKAGE]
+        owners = np.where(kinds == package, np.arange(len(table)), -1)
+        ancestors = parents
+        for _ in KINDS:  # method -> class -> module -> package at most
+            pending = (owners < 0) & (ancestors >= 0)
+            if not pending.any():
+                break
+            safe = np.maximum(ancestors, 0)
+            found = pending & (kinds[safe] == package)
+            owners[found] = ancestors[found]
+            ancestors = np.where(pending & ~found, parents[safe], -1)
+        return owners
+
+    # ----- edges and metrics -----
+
+    def relationship(self, index: int) -> Relationship:
+        edge = self.edge_table[index]
+        return Relationship(
+            id=self.string(edge['id']),
+            from_entity=self.entity_id(int(edge['src'])),
+            to_entity=self.entity_id(int(edge['dst'])),
+            relationship_type=_DEPENDENCY_TYPES[int(edge['type'])],
+            line_number=int(edge['line']),
+            file_path=self.string(edge['file']),
+            strength=float(edge['weight']),
+            context=self.string(edge['context'])
+        )
+
+    def relationships_of(self, entity_id: str) -> List[Relationship]:
+        """Relationships with the entity at either end (vectorised over the edge table)"""
+        row = self.index_of(entity_id)
+        if row is None:
+            return []
+        edges = self.edge_table
+        return [self.relationship(int(i)) for i in np.flatnonzero((edges['src'] == row) | (edges['dst'] == row))]
+
+    def quality_metric(self, index: int) -> QualityMetrics:
+        entry = self.quality_table[index]
+        values = {name: int(entry[name]) for name in _QUALITY_INT_FIELDS}
+        values.update({name: float(entry[name]) for name in _QUALITY_FLOAT_FIELDS})
+        return QualityMetrics(entity_id=self.entity_id(int(entry['entity'])),
+                              entity_type=list(EntityType)[int(entry['entity_type'])],
+                              quality_grade=self.string(entry['grade']), **values)
+
+    # ----- whole result -----
+
+    @property
+    def analysis_id(self) -> str:
+        return self._meta_value('analysis_id')
+
+    @property
+    def project_info(self) -> ProjectInfo:
+        return ProjectInfo(**self._meta_value('project_info'))
+
+    @property
+    def metrics(self) -> Optional[Dict[str, Any]]:
+        return self._meta_value('metrics')
+
+    @property
+    def cycles(self) -> List[CyclicDependency]:
+        return [CyclicDependency(**cycle) for cycle in self._meta_value('cycles')]
+
+    def to_analysis_result(self) -> AnalysisResult:
+        """Materialise the complete AnalysisResult"""
+        graph = DependencyGraph(**{list_name: list(self.entities(kind))
+                                   for kind, list_name in zip(KINDS, _GRAPH_LISTS)})
+        return AnalysisResult(
+            analysis_id=self.analysis_id,
+            project_info=self.project_info,
+            dependency_graph=graph,
+            relationships=[self.relationship(i) for i in range(self.edge_count)],
+            quality_metrics=[self.quality_metric(i) for i in range(self._sections['quality']['count'])],
+            metrics=self.metrics,
+            cycles=self.cycles,
+            warnings=self._meta_value('warnings'),
+            errors=self._meta_value('errors')
+        )
+
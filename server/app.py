@@ -6,17 +6,19 @@ Python 의존성 시각화 인터랙티브 서버
 import os
 import sys
 import asyncio
+import tempfile
 import uuid
 from datetime import datetime
+from enum import Enum
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Any, Dict, Optional, List
 import json
 
 # Debug 설정
 DEBUG_MODE = os.getenv('PYVIEW_DEBUG', 'false').lower() == 'true'
 
 import uvicorn
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
@@ -29,7 +31,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 try:
     from pyview.analyzer_engine import AnalyzerEngine
-    from pyview.models import AnalysisResult
+    from pyview.cache_manager import CacheManager
+    from pyview.models import AnalysisResult, DependencyType, RelationshipIndex
+    from pyview.performance_optimizer import CursorPaginator, ENTITY_LISTS
+    from pyview.snapshot import AnalysisSnapshot, write_snapshot, HAS_NUMPY
+    from pyview.entity_registry import CycleMembership
+    from pyview.serialization import (encode_json, decode_json, encode_msgpack, HAS_MSGPACK,
+                                      JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE)
 except ImportError as e:
     print(f"pyview 모듈 import 에러: {e}")
     print("pyview 패키지가 설치되어 있거나 Python path에 있는지 확인하세요")
@@ -54,6 +62,47 @@ app.add_middleware(
 analyses: Dict[str, Dict] = {}
 active_connections: Dict[str, List[WebSocket]] = {}
 
+# Shared by all analyses so the bounded memory tier and its counters span requests
+_cache_manager: Optional[CacheManager] = None
+
+def get_cache_manager() -> CacheManager:
+    global _cache_manager
+    if _cache_manager is None:
+        _cache_manager = CacheManager(
+            cache_dir=os.getenv('PYVIEW_CACHE_DIR'),
+            memory_cache_mb=int(os.getenv('PYVIEW_MEMORY_CACHE_MB', '256'))
+        )
+    return _cache_manager
+
+# 완료된 엔진 결과의 열 단위 스냅샷 (프로세스 동안만 유지, 분석 삭제 시 제거)
+_snapshot_dir: Optional[str] = None
+
+def write_result_snapshot(analysis_id: str, result: AnalysisResult) -> Optional[AnalysisSnapshot]:
+    """결과를 스냅샷으로 기록하고 mmap으로 열기 (NumPy가 없거나 기록 실패 시 None - 모델 결과로 제공)"""
+    global _snapshot_dir
+    if not HAS_NUMPY:
+        return None
+    if _snapshot_dir is None:
+        _snapshot_dir = tempfile.mkdtemp(prefix="pyview-snapshots-")
+    path = Path(_snapshot_dir) / f"{analysis_id}.snap"
+    try:
+        write_snapshot(result, path)
+        return AnalysisSnapshot(path)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Could not write result snapshot: {e}")
+        return None
+
+def discard_result_snapshot(record: Dict):
+    """레코드의 스냅샷을 닫고 파일 삭제"""
+    snapshot = record.pop("snapshot", None)
+    if snapshot is None:
+        return
+    snapshot.close()
+    try:
+        snapshot.path.unlink()
+    except OSError:
+        pass
+
 # Request/Response models
 class AnalysisOptions(BaseModel):
     max_depth: int = 10
@@ -129,6 +178,13 @@ class QualityMetricsResponse(BaseModel):
     cycle_type: Optional[str] = None
 
 # 순환 참조 관련 모델들
+class EntityPageResponse(BaseModel):
+    items: List[Dict[str, Any]]
+    total: int
+    counts: Dict[str, int]
+    limit: int
+    next_cursor: Optional[str] = None
+
 class CyclePath(BaseModel):
     nodes: List[str]
     relationship_type: str  # 'import' or 'call'
@@ -155,38 +211,68 @@ class CycleDetectionResponse(BaseModel):
     total_cycles: int
     cycle_statistics: Dict[str, int]
 
-def check_entity_in_cycles(entity_id: str, analysis_results: Dict) -> tuple[bool, Optional[str]]:
+def result_value(item: Any, name: str, default: Any = None) -> Any:
+    """결과 항목의 필드 값: 엔진 결과는 모델 객체(AnalysisResult 및 엔티티), 데모/오류 결과는 dict.
+    Enum은 직렬화된 값과 같도록 .value로 반환"""
+    if item is None:
+        return default
+    value = item.get(name, default) if isinstance(item, dict) else getattr(item, name, default)
+    return value.value if isinstance(value, Enum) else value
+
+def result_entities(results: Any, list_name: str) -> List[Any]:
+    """dependency_graph의 엔티티 목록 (modules, classes, methods, ...)"""
+    return result_value(result_value(results, "dependency_graph"), list_name) or []
+
+def check_entity_in_cycles(entity_id: str, analysis_results: Any) -> tuple[bool, Optional[str]]:
     """엔티티가 순환 참조에 포함되어 있는지 확인"""
-    cycles = analysis_results.get("cycles", [])
+    cycles = result_value(analysis_results, "cycles") or []
     
     for cycle in cycles:
-        if entity_id in cycle.get("entities", []):
-            severity = cycle.get("severity", "medium")
+        if entity_id in (result_value(cycle, "entities") or []):
+            severity = result_value(cycle, "severity", "medium")
             return True, severity
     
     return False, None
 
-def build_cycle_entity_map(analysis_results: Dict) -> Dict[str, Dict]:
-    """순환 참조에 포함된 모든 엔티티의 상세 정보 맵 생성"""
-    cycle_map = {}
-    cycles = analysis_results.get("cycles", [])
-    
-    for cycle in cycles:
-        severity = cycle.get("severity", "medium")
-        cycle_type = cycle.get("relationship_type", "import")
-        entities = cycle.get("entities", [])
-        
-        for entity_id in entities:
-            # 더 높은 심각도로 업데이트
-            if entity_id not in cycle_map or severity == "high":
-                cycle_map[entity_id] = {
-                    "severity": severity,
-                    "partners": [e for e in entities if e != entity_id],
-                    "cycle_type": cycle_type
-                }
-    
+def build_cycle_entity_map(analysis_results: Any) -> CycleMembership:
+    """순환 참조에 포함된 엔티티 → 순환 번호 (정수) 맵 생성, 상대 엔티티 목록은 응답 만들 때만 문자열로 렌더링"""
+    cycles = result_value(analysis_results, "cycles") or []
+    return CycleMembership([cycle if isinstance(cycle, dict) else
+                            {"entities": cycle.entities, "severity": cycle.severity, "cycle_type": cycle.cycle_type}
+                            for cycle in cycles])
+
+def get_cycle_entity_map(record: Dict) -> CycleMembership:
+    """분석 레코드에 캐시된 순환 참조 맵 반환 (결과당 한 번만 생성)"""
+    cycle_map = record.get("cycle_map")
+    if cycle_map is None:
+        cycle_map = build_cycle_entity_map(record.get("results"))
+        record["cycle_map"] = cycle_map
     return cycle_map
 
+def get_result_paginator(record: Dict) -> CursorPaginator:
+    """분석 레코드에 캐시된 커서 페이지네이터 반환 (결과당 한 번만 인덱싱,
+    스냅샷이 있으면 열에서 인덱싱하고 페이지의 엔티티만 복원, 모델 결과는 페이지만 직렬화)"""
+    paginator = record.get("paginator")
+    if paginator is None:
+        paginator = CursorPaginator(record.get("snapshot") or record.get("results") or {})
+        record["paginator"] = paginator
+    return paginator
+
+def get_relationship_index(record: Dict) -> RelationshipIndex:
+    """관계 인덱스 반환: 모델 결과는 AnalysisResult가 지연 생성해 들고 있는 인덱스,
+    데모/오류 dict 결과는 레코드에 캐시된 인덱스 (직렬화된 관계 dict의 출발/도착/종류별 위치)"""
+    results = record.get("results")
+    if isinstance(results, AnalysisResult):
+        return results.relationship_index()
+    index = record.get("relationship_index")
+    if index is None:
+        index = RelationshipIndex((results or {}).get("relationships") or [],
+                                  source=lambda rel: rel.get("from_entity"),
+                                  target=lambda rel: rel.get("to_entity"),
+                                  kind=lambda rel: rel.get("relationship_type"))
+        record["relationship_index"] = index
+    return index
+
 def create_analysis_record(analysis_id: str, request: AnalysisRequest) -> Dict:
     """Create a new analysis record"""
     now = datetime.now().isoformat()
@@ -203,7 +289,9 @@ def create_analysis_record(analysis_id: str, request: AnalysisRequest) -> Dict:
     }
 
 def update_analysis_status(analysis_id: str, status: str, progress: float = None, 
-                          message: str = None, error: str = None, results = None):
+                          message: str = None, error: str = None, results = None,
+                          encoded_results: Optional[bytes] = None,
+                          snapshot: Optional[AnalysisSnapshot] = None):
     """Update analysis status"""
     if analysis_id not in analyses:
         return
@@ -219,22 +307,39 @@ def update_analysis_status(analysis_id: str, status: str, progress: float = None
     if error is not None:
         record["error"] = error
     if results is not None:
+        # 엔진 결과는 AnalysisResult 모델 그대로 보관 (파생 엔드포인트는 모델과 지연 인덱스 사용)
         record["results"] = results
+        # 결과는 분석당 한 번만 인코딩해 두고 /results 요청마다 그대로 전송
+        record["results_json"] = encoded_results if encoded_results is not None else encode_json(results)
+        record.pop("results_msgpack", None)
+        record.pop("cycle_map", None)
+        record.pop("paginator", None)
+        record.pop("relationship_index", None)
+        discard_result_snapshot(record)
+        if snapshot is not None:
+            record["snapshot"] = snapshot  # /entities 페이지와 엔티티 조회는 스냅샷에서 지연 복원
 
 async def send_progress_update(analysis_id: str, stage: str, progress: float, 
-                              message: str, current_file: str = None):
-    """Send progress update via WebSocket"""
+                              message: str, current_file: str = None, snapshot: Optional[Dict] = None):
+    """Send progress update via WebSocket (snapshot: coalesced engine progress with real file/byte counts)"""
     if analysis_id not in active_connections:
         return
     
+    snapshot = snapshot or {}
     update = {
         "analysis_id": analysis_id,
         "stage": stage,
         "progress": progress,
         "message": message,
         "current_file": current_file,
-        "files_processed": int(progress * 100),
-        "total_files": 100
+        "files_processed": snapshot.get("files_done"),
+        "total_files": snapshot.get("files_total"),
+        "bytes_processed": snapshot.get("bytes_done"),
+        "total_bytes": snapshot.get("bytes_total"),
+        "failed_files": snapshot.get("failed_files"),
+        "files_per_second": snapshot.get("files_per_second"),
+        "eta_seconds": snapshot.get("eta_seconds"),
+        "stage_timings": snapshot.get("stage_timings")
     }
     
     # Send to all connected WebSocket clients for this analysis
@@ -363,22 +468,26 @@ async def run_analysis_task(analysis_id: str, request: AnalysisRequest):
             )
             
             # Create analyzer engine with options
-            engine = AnalyzerEngine(options)
+            engine = AnalyzerEngine(options, cache_manager=get_cache_manager() if options.enable_caching else None)
             
-            # Create progress callback that converts sync to async
-            def sync_progress_callback(data: dict):
-                stage = data.get('stage', 'processing')
+            # 엔진은 executor 스레드에서 실행: 합쳐진 스냅샷(최대 10Hz)을 이벤트 루프로 넘겨서 전송
+            loop = asyncio.get_running_loop()
+
+            def publish_progress(data: dict):
+                stage = data.get('stage') or 'processing'
                 progress = data.get('progress', 0) / 100.0  # Convert to 0-1 range
                 message = data.get('message', stage)
-                current_file = data.get('current_file')
-                
-                # We can't await in sync callback, so we'll schedule it
+                update_analysis_status(analysis_id, "running", progress, message)
                 asyncio.create_task(
-                    send_progress_update(analysis_id, stage, progress, message, current_file)
+                    send_progress_update(analysis_id, stage, progress, message, data.get('current_file'), data)
                 )
-                update_analysis_status(analysis_id, "running", progress, message)
+
+            def sync_progress_callback(data: dict):
+                loop.call_soon_threadsafe(publish_progress, data)
             
             progress_callback = ProgressCallback(sync_progress_callback)
+            encoded_results = None  # JSON bytes of an engine result, encoded once below
+            snapshot = None  # Columnar snapshot of an engine result, for entity pages and lookups
             
             # Check if this is a request for complex demo data
             project_path_str = str(project_path).lower()
@@ -426,19 +535,23 @@ async def run_analysis_task(analysis_id: str, request: AnalysisRequest):
                     await send_progress_update(analysis_id, "processing", 0.65, "Processing AST and dependencies")
                     await asyncio.sleep(0.2)
 
-                    # Run the actual analysis using the analyzer engine
-                    result = engine.analyze_project(str(project_path), progress_callback)
+                    # Run the actual analysis off the event loop so status/WebSocket requests keep being served
+                    result = await loop.run_in_executor(None, engine.analyze_project, str(project_path),
+                                                        progress_callback)
 
                     await send_progress_update(analysis_id, "finalizing", 0.95, "Finalizing analysis results")
                     await asyncio.sleep(0.1)
                     print(f"Analysis completed successfully")
                     
-                    # Convert AnalysisResult to dictionary format
-                    if hasattr(result, 'to_dict'):
-                        results = result.to_dict()
-                        modules_count = len(results.get('dependency_graph', {}).get('modules', []))
-                        classes_count = len(results.get('dependency_graph', {}).get('classes', []))
-                        print(f"Converted result to dict: {modules_count} modules, {classes_count} classes found")
+                    # Encode the AnalysisResult once (streamed from the models, off the event loop);
+                    # the model itself is kept for the search/metrics/paging endpoints
+                    if isinstance(result, AnalysisResult):
+                        encoded_results = await loop.run_in_executor(None, encode_json, result)
+                        snapshot = await loop.run_in_executor(None, write_result_snapshot, analysis_id, result)
+                        results = result
+                        modules_count = len(result.dependency_graph.modules)
+                        classes_count = len(result.dependency_graph.classes)
+                        print(f"Encoded result: {modules_count} modules, {classes_count} classes found")
                     else:
                         # If the result doesn't have to_dict, try to extract data manually
                         packages = getattr(result, 'packages', [])
@@ -493,7 +606,8 @@ async def run_analysis_task(analysis_id: str, request: AnalysisRequest):
                         "dependencies": []
                     }
             
-            update_analysis_status(analysis_id, "completed", 1.0, "Analysis completed successfully", results=results)
+            update_analysis_status(analysis_id, "completed", 1.0, "Analysis completed successfully", results=results,
+                                   encoded_results=encoded_results, snapshot=snapshot)
             await send_progress_update(analysis_id, "completed", 1.0, "Analysis completed successfully")
             
         except Exception as e:
@@ -618,16 +732,107 @@ async def get_analysis_status(analysis_id: str):
     return AnalysisStatusResponse(**record)
 
 @app.get("/api/analysis/{analysis_id}/results")
-async def get_analysis_results(analysis_id: str):
-    """Get analysis results"""
+async def get_analysis_results(analysis_id: str, request: Request):
+    """Get analysis results (JSON, or MessagePack when requested via Accept and msgpack is installed)"""
     if analysis_id not in analyses:
         raise HTTPException(status_code=404, detail="Analysis not found")
     
     record = analyses[analysis_id]
     if record["status"] != "completed":
         raise HTTPException(status_code=400, detail="Analysis not completed")
-    
-    return record["results"]
+
+    if HAS_MSGPACK and MSGPACK_MEDIA_TYPE in request.headers.get("accept", ""):
+        if record.get("results_msgpack") is None:
+            record["results_msgpack"] = encode_msgpack(record["results"])
+        return Response(content=record["results_msgpack"], media_type=MSGPACK_MEDIA_TYPE)
+    encoded = record.get("results_json")
+    if encoded is None:
+        encoded = record["results_json"] = encode_json(record["results"])
+    return Response(content=encoded, media_type=JSON_MEDIA_TYPE)
+
+def get_completed_record(analysis_id: str) -> Dict:
+    if analysis_id not in analyses:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    record = analyses[analysis_id]
+    if record["status"] != "completed":
+        raise HTTPException(status_code=400, detail="Analysis not completed")
+    return record
+
+@app.get("/api/analysis/{analysis_id}/entities", response_model=EntityPageResponse)
+async def get_analysis_entities(analysis_id: str, type: Optional[str] = None, package: Optional[str] = None,
+                                q: Optional[str] = None, cursor: Optional[str] = None, limit: int = 100):
+    """One page of the complete result, filtered by entity type, package ID and name/ID text"""
+    paginator = get_result_paginator(get_completed_record(analysis_id))
+    try:
+        return paginator.page(entity_type=type, package=package, text=q, cursor=cursor, limit=limit)
+    except ValueError as e:  # Unknown type or a cursor from another result
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/analysis/{analysis_id}/entity")
+async def get_analysis_entity(analysis_id: str, entity_id: str):
+    """One entity by ID; with a snapshot only this entity is rebuilt"""
+    record = get_completed_record(analysis_id)
+    snapshot = record.get("snapshot")
+    entity, entity_type = None, None
+    if snapshot is not None:
+        row = snapshot.index_of(entity_id)
+        kind = snapshot.entity_kind(row) if row is not None else None
+        if kind is not None:
+            entity, entity_type = snapshot.entity(row), kind.value
+    else:
+        # 스냅샷이 없는 결과 (NumPy 없음, 데모/오류 dict): 엔티티 목록에서 검색
+        results = record.get("results")
+        for list_type, list_name in ENTITY_LISTS[:-1]:
+            entity = next((item for item in result_entities(results, list_name)
+                           if result_value(item, "id") == entity_id), None)
+            if entity is not None:
+                entity_type = list_type
+                break
+    if entity is None:
+        raise HTTPException(status_code=404, detail="Entity not found")
+    return dict(decode_json(encode_json(entity)), entity_type=entity_type)
+
+@app.get("/api/analysis/{analysis_id}/neighborhood")
+async def get_entity_neighborhood(analysis_id: str, entity_id: str, depth: int = 1,
+                                  types: Optional[str] = None, direction: str = "both"):
+    """Entities within ``depth`` hops of an entity and the relationships among them.
+
+    ``types`` is a comma-separated list of relationship types to follow
+    (e.g. "import,call"); ``direction`` is "out", "in" or "both".
+    """
+    record = get_completed_record(analysis_id)
+    index = get_relationship_index(record)
+    is_model = isinstance(record.get("results"), AnalysisResult)
+    type_filter = {kind.strip() for kind in types.split(",") if kind.strip()} if types else None
+    try:
+        if is_model and type_filter is not None:
+            type_filter = {DependencyType(kind) for kind in type_filter}  # 모델 관계의 종류는 Enum
+        distances = index.distances([entity_id], max(0, depth), type_filter, direction)
+    except ValueError as e:  # Unknown direction or relationship type
+        raise HTTPException(status_code=400, detail=str(e))
+    relationships = index.between(set(distances), type_filter)
+    return {
+        "entity_id": entity_id,
+        "depth": depth,
+        "entities": [{"id": node, "distance": distance} for node, distance in distances.items()],
+        "relationships": decode_json(encode_json(relationships)) if is_model else relationships
+    }
+
+@app.get("/api/analysis/{analysis_id}/summary")
+async def get_analysis_summary(analysis_id: str):
+    """Entity counts of the complete result, without the entity arrays"""
+    record = get_completed_record(analysis_id)
+    results = record.get("results") or {}
+    project_info = result_value(results, "project_info")
+    return {
+        "analysis_id": analysis_id,
+        "project_info": project_info if project_info is None or isinstance(project_info, dict)
+                        else decode_json(encode_json(project_info)),
+        "counts": get_result_paginator(record).counts(),
+        "cycles": len(result_value(results, "cycles") or []),
+        "metrics": {key: value for key, value in (result_value(results, "metrics") or {}).items()
+                    if key != "coupling_metrics"}
+    }
 
 @app.get("/api/analyses", response_model=List[AnalysisStatusResponse])
 async def get_all_analyses():
@@ -640,6 +845,7 @@ async def delete_analysis(analysis_id: str):
     if analysis_id not in analyses:
         raise HTTPException(status_code=404, detail="Analysis not found")
     
+    discard_result_snapshot(analyses[analysis_id])
     del analyses[analysis_id]
     if analysis_id in active_connections:
         del active_connections[analysis_id]
@@ -669,59 +875,59 @@ async def search_entities(request: SearchRequest):
             if not analysis_results:
                 continue
             
-            # 순환 참조 맵 생성
-            cycle_map = build_cycle_entity_map(analysis_results)
+            # 순환 참조 맵 (레코드에 캐시됨)
+            cycle_map = get_cycle_entity_map(analysis_record)
                 
             # Search in modules
-            for module in analysis_results.get("dependency_graph", {}).get("modules", []):
-                if query_lower in module.get("name", "").lower():
-                    module_id = module.get("id", module.get("name", ""))
+            for module in result_entities(analysis_results, "modules"):
+                if query_lower in result_value(module, "name", "").lower():
+                    module_id = result_value(module, "id", result_value(module, "name", ""))
                     is_in_cycle = module_id in cycle_map
-                    cycle_severity = cycle_map.get(module_id)
+                    cycle_severity = cycle_map.severity(module_id)
                     
                     results.append(SearchResult(
-                        name=module.get("name", ""),
+                        name=result_value(module, "name", ""),
                         entity_type="module",
-                        module_path=module.get("name", ""),
-                        file_path=module.get("file_path", ""),
+                        module_path=result_value(module, "name", ""),
+                        file_path=result_value(module, "file_path", ""),
                         line_number=1,
-                        description=f"Module: {module.get('name', '')}",
+                        description=f"Module: {result_value(module, 'name', '')}",
                         is_in_cycle=is_in_cycle,
                         cycle_severity=cycle_severity
                     ))
             
             # Search in classes
-            for cls in analysis_results.get("dependency_graph", {}).get("classes", []):
-                if query_lower in cls.get("name", "").lower():
-                    class_id = cls.get("id", cls.get("name", ""))
+            for cls in result_entities(analysis_results, "classes"):
+                if query_lower in result_value(cls, "name", "").lower():
+                    class_id = result_value(cls, "id", result_value(cls, "name", ""))
                     is_in_cycle = class_id in cycle_map
-                    cycle_severity = cycle_map.get(class_id)
+                    cycle_severity = cycle_map.severity(class_id)
                     
                     results.append(SearchResult(
-                        name=cls.get("name", ""),
+                        name=result_value(cls, "name", ""),
                         entity_type="class",
-                        module_path=cls.get("module", ""),
-                        file_path=cls.get("file_path", ""),
-                        line_number=cls.get("line_number", 1),
-                        description=f"Class: {cls.get('name', '')} in {cls.get('module', '')}",
+                        module_path=result_value(cls, "module", ""),
+                        file_path=result_value(cls, "file_path", ""),
+                        line_number=result_value(cls, "line_number", 1),
+                        description=f"Class: {result_value(cls, 'name', '')} in {result_value(cls, 'module', '')}",
                         is_in_cycle=is_in_cycle,
                         cycle_severity=cycle_severity
                     ))
             
             # Search in methods
-            for method in analysis_results.get("dependency_graph", {}).get("methods", []):
-                if query_lower in method.get("name", "").lower():
-                    method_id = method.get("id", method.get("name", ""))
+            for method in result_entities(analysis_results, "methods"):
+                if query_lower in result_value(method, "name", "").lower():
+                    method_id = result_value(method, "id", result_value(method, "name", ""))
                     is_in_cycle = method_id in cycle_map
-                    cycle_severity = cycle_map.get(method_id)
+                    cycle_severity = cycle_map.severity(method_id)
                     
                     results.append(SearchResult(
-                        name=method.get("name", ""),
+                        name=result_value(method, "name", ""),
                         entity_type="method",
-                        module_path=method.get("class_name", ""),
-                        file_path=method.get("file_path", ""),
-                        line_number=method.get("line_number", 1),
-                        description=f"Method: {method.get('name', '')} in {method.get('class_name', '')}",
+                        module_path=result_value(method, "class_name", ""),
+                        file_path=result_value(method, "file_path", ""),
+                        line_number=result_value(method, "line_number", 1),
+                        description=f"Method: {result_value(method, 'name', '')} in {result_value(method, 'class_name', '')}",
                         is_in_cycle=is_in_cycle,
                         cycle_severity=cycle_severity
                     ))
@@ -749,125 +955,71 @@ async def get_quality_metrics(analysis_id: str):
     
     quality_metrics = []
     
-    # 순환 참조 맵 생성
-    cycle_map = build_cycle_entity_map(analysis_results)
+    # 순환 참조 맵 (레코드에 캐시됨)
+    cycle_map = get_cycle_entity_map(record)
     
     # Extract quality metrics from actual analysis results
-    actual_metrics = analysis_results.get("quality_metrics", [])
+    actual_metrics = result_value(analysis_results, "quality_metrics") or []
+    coupling = (result_value(analysis_results, "metrics") or {}).get("coupling_metrics", {})
     if actual_metrics:
         # Use actual quality metrics if available
         print(f"✅ Using {len(actual_metrics)} actual quality metrics from analysis engine")
         for metric in actual_metrics:
-            entity_id = metric.get("entity_id", "unknown")
+            entity_id = result_value(metric, "entity_id", "unknown")
             is_in_cycle = entity_id in cycle_map
             cycle_info = cycle_map.get(entity_id, {})
 
             # Get coupling metrics from analysis results
-            coupling_metrics = analysis_results.get("metrics", {}).get("coupling_metrics", {}).get(entity_id, {})
+            coupling_metrics = coupling.get(entity_id, {})
 
             quality_metrics.append(QualityMetricsResponse(
                 entity_id=entity_id,
-                entity_type=metric.get("entity_type", "module"),
-                cyclomatic_complexity=metric.get("cyclomatic_complexity", 0),
-                lines_of_code=metric.get("lines_of_code", 0),
+                entity_type=result_value(metric, "entity_type", "module"),
+                cyclomatic_complexity=result_value(metric, "cyclomatic_complexity", 0),
+                lines_of_code=result_value(metric, "lines_of_code", 0),
                 afferent_coupling=coupling_metrics.get("afferent_coupling", 0),
                 efferent_coupling=coupling_metrics.get("efferent_coupling", 0),
                 instability=coupling_metrics.get("instability", 0.0),
-                maintainability_index=metric.get("maintainability_index", 0.0),
+                maintainability_index=result_value(metric, "maintainability_index", 0.0),
                 technical_debt_ratio=0.0,  # TODO: Calculate from complexity metrics
-                quality_grade=metric.get("quality_grade", "C"),
+                quality_grade=result_value(metric, "quality_grade", "C"),
                 is_in_cycle=is_in_cycle,
                 cycle_severity=cycle_info.get("severity"),
                 cycle_partners=cycle_info.get("partners", []),
                 cycle_type=cycle_info.get("cycle_type")
             ))
     else:
-        # Fallback: Generate basic quality metrics from modules and classes
-        print("⚠️  WARNING: Quality metrics engine disabled or failed. Generating fallback dummy metrics.")
-        dependency_graph = analysis_results.get("dependency_graph", {})
-        
-        # Add metrics for modules
-        for module in dependency_graph.get("modules", []):
-            entity_id = module.get("id", module.get("name", "unknown"))
-            is_in_cycle = entity_id in cycle_map
-            cycle_info = cycle_map.get(entity_id, {})
-            
-            quality_metrics.append(QualityMetricsResponse(
-                entity_id=entity_id,
-                entity_type="module",
-                cyclomatic_complexity=module.get("complexity", 5),
-                lines_of_code=module.get("loc", 100),
-                afferent_coupling=len(module.get("dependencies", [])),
-                efferent_coupling=len([dep for dep in analysis_results.get("relationships", []) 
-                                    if dep.get("from_entity") == module.get("id")]),
-                instability=0.5,
-                maintainability_index=75.0,
-                technical_debt_ratio=0.1,
-                quality_grade="B",
-                is_in_cycle=is_in_cycle,
-                cycle_severity=cycle_info.get("severity"),
-                cycle_partners=cycle_info.get("partners", []),
-                cycle_type=cycle_info.get("cycle_type")
-            ))
-        
-        # Add metrics for classes (limit to first 50 for pagination testing)
-        for cls in dependency_graph.get("classes", [])[:50]:
-            entity_id = cls.get("id", cls.get("name", "unknown"))
-            is_in_cycle = entity_id in cycle_map
-            cycle_info = cycle_map.get(entity_id, {})
-            
-            quality_metrics.append(QualityMetricsResponse(
-                entity_id=entity_id,
-                entity_type="class",
-                cyclomatic_complexity=len(cls.get("methods", [])) * 2,
-                lines_of_code=len(cls.get("methods", [])) * 15,
-                afferent_coupling=1,
-                efferent_coupling=len(cls.get("methods", [])),
-                instability=0.6,
-                maintainability_index=70.0,
-                technical_debt_ratio=0.15,
-                quality_grade="B",
-                is_in_cycle=is_in_cycle,
-                cycle_severity=cycle_info.get("severity"),
-                cycle_partners=cycle_info.get("partners", []),
-                cycle_type=cycle_info.get("cycle_type")
-            ))
+        # 품질 메트릭 엔진이 꺼져 있었으면 빈 목록 (임의 값으로 채우지 않음)
+        print("⚠️  No quality metrics in this analysis (metrics engine disabled)")
     
-    # Remove duplicates based on entity_id
-    seen_entity_ids = set()
-    deduplicated_metrics = []
-    duplicates_removed = 0
-
-    for metric in quality_metrics:
-        if metric.entity_id not in seen_entity_ids:
-            seen_entity_ids.add(metric.entity_id)
-            deduplicated_metrics.append(metric)
-        else:
-            duplicates_removed += 1
-            print(f"REMOVED DUPLICATE: entity_id={metric.entity_id}, type={metric.entity_type}")
+    # Entities are canonicalized (one record per ID) by the analysis engine
+    return quality_metrics
 
-    if duplicates_removed > 0:
-        print(f"Quality Metrics: Removed {duplicates_removed} duplicate entries")
-        print(f"Final count: {len(deduplicated_metrics)} unique entities")
-
-    return deduplicated_metrics
+@app.get("/api/analysis/{analysis_id}/quality-distributions")
+async def get_quality_distributions(analysis_id: str):
+    """Get precomputed per-level / per-package quality metric distributions"""
+    if analysis_id not in analyses:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    
+    record = analyses[analysis_id]
+    if record["status"] != "completed":
+        raise HTTPException(status_code=400, detail="Analysis not completed")
+    
+    distributions = (result_value(record.get("results"), "metrics") or {}).get("quality_distribution")
+    if distributions is None:
+        raise HTTPException(status_code=404, detail="Quality distributions not available for this analysis")
+    
+    return distributions
 
 @app.get("/api/cache/stats")
 async def get_cache_stats():
-    """Get cache statistics"""
-    # This would integrate with the actual CacheManager
-    return {
-        "cache_count": 5,
-        "total_size_mb": 12.5,
-        "max_size_mb": 500.0,
-        "memory_cache_count": 2,
-        "cache_dir": "~/.pyview_cache"
-    }
+    """Get cache statistics (disk index and bounded memory tier)"""
+    return get_cache_manager().get_cache_stats()
 
 @app.delete("/api/cache")
 async def clear_cache():
     """Clear all analysis caches"""
-    # This would call cache_manager.clear_all_caches()
+    get_cache_manager().clear_all_caches()
     return {"message": "Cache cleared successfully"}
 
 @app.websocket("/ws/progress/{analysis_id}")
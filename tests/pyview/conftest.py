@@ -0,0 +1,62 @@
+"""
+Shared fixtures for PyView tests
+"""
+
+import os
+
+import pytest
+
+from pyview.analyzer_engine import AnalyzerEngine, AnalysisOptions
+from pyview.legacy_bridge import LegacyBridge
+
+
+# Small package with inheritance, a module-level function and cross-module imports
+SHOP_PROJECT = {
+    "shop/__init__.py": "",
+    "shop/models.py": '''
+class Item:
+    """Something to sell"""
+    price: float = 0.0
+
+    def __init__(self, name):
+        self.name = name
+
+class Book(Item):
+    def title(self):
+        return self.name.title()
+''',
+    "shop/cart.py": '''
+from shop.models import Item, Book
+
+def total(items):
+    return sum(item.price for item in items if item)
+
+class Cart:
+    def add(self, item: Item):
+        self.items = [item, Book("x")]
+''',
+}
+
+
+@pytest.fixture
+def shop_project(tmp_path):
+    """Directory holding SHOP_PROJECT"""
+    project_dir = tmp_path / "project"
+    for relative_path, content in SHOP_PROJECT.items():
+        path = project_dir / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return str(project_dir)
+
+
+@pytest.fixture
+def analyze_shop(shop_project, monkeypatch):
+    """Uncached, single-worker analysis of SHOP_PROJECT without pydeps"""
+    def unavailable(*args, **kwargs):
+        raise RuntimeError("pydeps disabled for this test")
+    monkeypatch.setattr(LegacyBridge, "analyze_with_pydeps", unavailable)
+
+    def analyze():
+        engine = AnalyzerEngine(AnalysisOptions(enable_caching=False, max_workers=1))
+        return engine.analyze_project(shop_project)
+    return analyze
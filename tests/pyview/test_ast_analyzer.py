@@ -147,7 +147,138 @@ def complex_function(x):
         # Complex function should have higher complexity
         complex_func = next(m for m in analysis.methods if m.name == "complex_function")
         assert complex_func.complexity > 5  # Should be around 8-10
+
+    def test_quality_metrics_computed_in_worker_pass(self):
+        """Test module/class/method quality metrics come back with the FileAnalysis"""
+        content = '''
+class Calculator:
+    def add(self, a, b):
+        return a + b
+
+    def divide(self, a, b):
+        if b == 0:
+            for _ in range(3):
+                if a:
+                    return None
+        return a / b
+
+def helper():
+    return 1
+        '''
+
+        file_path = self.create_temp_file(content)
+        analysis = self.analyzer.analyze_file(file_path)
+
+        metrics_by_id = {m.entity_id: m for m in analysis.quality_metrics}
+        entity_types = {m.entity_type.value for m in analysis.quality_metrics}
+        assert entity_types == {"module", "class", "method"}
+
+        # One metric per method/function, per class and for the module itself
+        assert len(analysis.quality_metrics) == len(analysis.methods) + len(analysis.classes) + 1
+        assert analysis.module_info.id in metrics_by_id
+
+        divide = next(m for m in analysis.methods if m.name == "divide")
+        divide_metrics = metrics_by_id[divide.id]
+        assert divide_metrics.cyclomatic_complexity == 4
+        assert divide_metrics.nesting_depth == 3
+        assert divide_metrics.lines_of_code == 6
+        assert divide_metrics.logical_lines == 6
+        assert divide_metrics.halstead_volume > 0
+
+        # Class lines cover the class body, including its header line
+        cls = analysis.classes[0]
+        assert metrics_by_id[cls.id].nesting_depth == 3
+        assert metrics_by_id[cls.id].lines_of_code == 9
+        assert metrics_by_id[cls.id].blank_lines == 1
+
+    def test_quality_metrics_disabled(self):
+        """Test metrics are skipped when the analyzer is built without them"""
+        file_path = self.create_temp_file("def f():\n    return 1\n")
+        analysis = ASTAnalyzer(enable_quality_metrics=False).analyze_file(file_path)
+
+        assert analysis.quality_metrics == []
     
+    def test_repeated_field_assignment(self):
+        """Test re-assigning an attribute yields one field"""
+        content = '''
+class Counter:
+    def __init__(self):
+        self.count = 0
+
+    def increment(self):
+        self.count = self.count + 1
+
+    def reset(self):
+        self.count = 0
+        '''
+
+        file_path = self.create_temp_file(content)
+        analysis = self.analyzer.analyze_file(file_path)
+
+        count_fields = [f for f in analysis.fields if f.name == "count"]
+        assert len(count_fields) == 1
+        assert count_fields[0].line_number == 4
+        assert count_fields[0].is_class_variable is False
+        assert analysis.classes[0].fields.count(count_fields[0].id) == 1
+
+    def test_entity_ids_follow_scope_path(self):
+        """Test IDs are built from the scope path and survive edits above the entity"""
+        content = '''
+class Store:
+    class Entry:
+        pass
+
+    def get(self):
+        def fallback():
+            return None
+        return fallback()
+
+    @property
+    def size(self):
+        return 0
+
+    @size.setter
+    def size(self, value):
+        pass
+
+
+def main():
+    return Store().get()
+'''
+        analysis = self.analyzer.analyze_source(content, "/project/store.py", "store")
+        moved = self.analyzer.analyze_source("import os\n\n" + content, "/project/store.py", "store")
+
+        method_ids = [m.id for m in analysis.methods]
+        assert method_ids == [
+            "meth:cls:mod:store:Store:get",
+            "meth:cls:mod:store:Store:get.fallback",
+            "meth:cls:mod:store:Store:size",
+            "meth:cls:mod:store:Store:size#2",
+            "func:mod:store:main",
+        ]
+        assert [c.id for c in analysis.classes] == ["cls:mod:store:Store", "cls:mod:store:Store.Entry"]
+        assert [m.id for m in moved.methods] == method_ids
+        assert [r.id for r in moved.relationships] == [r.id for r in analysis.relationships]
+        assert moved.methods[0].line_number == analysis.methods[0].line_number + 2
+
+    def test_module_name_follows_packages(self):
+        """Test module names are dotted through __init__.py packages"""
+        temp_dir = tempfile.mkdtemp()
+        package_dir = os.path.join(temp_dir, "app", "core")
+        os.makedirs(package_dir)
+        for init_dir in (os.path.join(temp_dir, "app"), package_dir):
+            open(os.path.join(init_dir, "__init__.py"), 'w').close()
+        module_path = os.path.join(package_dir, "models.py")
+        with open(module_path, 'w') as f:
+            f.write("x = 1\n")
+
+        assert self.analyzer.analyze_file(module_path).module_info.name == "app.core.models"
+        assert self.analyzer.analyze_file(os.path.join(package_dir, "__init__.py")).module_info.name == "app.core"
+
+        # Files outside any package keep their bare name
+        script_path = self.create_temp_file("x = 1\n", "script.py")
+        assert self.analyzer.analyze_file(script_path).module_info.name == "script"
+
     def test_decorator_analysis(self):
         """Test analysis of decorators"""
         content = '''
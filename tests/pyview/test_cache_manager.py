@@ -0,0 +1,325 @@
+"""
+Tests for PyView cache manager change detection
+"""
+
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+import pytest
+
+from pyview import cache_manager
+from pyview.ast_analyzer import ASTAnalyzer
+from pyview.cache_manager import (
+    CacheManager, AnalysisCache, FileMetadata, MemoryCacheTier, estimate_size, hash_files
+)
+from pyview.file_cache import content_digest
+from pyview.snapshot import HAS_NUMPY
+
+
+class TestFileMetadata:
+    """Stat-first change detection"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_dir, "module.py")
+        with open(self.file_path, 'w') as f:
+            f.write("x = 1\n")
+
+    def count_hashes(self, monkeypatch):
+        calls = []
+        real_digest = cache_manager.file_digest
+
+        def counting_digest(path):
+            calls.append(path)
+            return real_digest(path)
+
+        monkeypatch.setattr(cache_manager, "file_digest", counting_digest)
+        return calls
+
+    def test_matching_stat_is_not_hashed(self, monkeypatch):
+        """Test an untouched file is valid without reading it"""
+        metadata = FileMetadata.from_file(self.file_path)
+        calls = self.count_hashes(monkeypatch)
+
+        assert metadata.is_outdated() is False
+        assert calls == []
+
+    def test_touched_file_with_same_content(self, monkeypatch):
+        """Test a new mtime triggers a hash but identical content is not outdated"""
+        metadata = FileMetadata.from_file(self.file_path)
+        os.utime(self.file_path, ns=(metadata.mtime_ns + 10**9, metadata.mtime_ns + 10**9))
+        calls = self.count_hashes(monkeypatch)
+
+        assert metadata.is_outdated() is False
+        assert calls == [self.file_path]
+
+    def test_modified_and_deleted_files(self):
+        """Test content changes and deletions are outdated"""
+        metadata = FileMetadata.from_file(self.file_path)
+        with open(self.file_path, 'w') as f:
+            f.write("x = 2\n")
+        assert metadata.is_outdated() is True
+
+        os.remove(self.file_path)
+        assert metadata.is_outdated() is True
+
+    def test_metadata_from_worker_bytes(self):
+        """Test the AST worker's digest and stat equal a direct read of the file"""
+        analysis = ASTAnalyzer().analyze_file(self.file_path)
+        metadata = FileMetadata.from_analysis(analysis)
+
+        assert metadata == FileMetadata.from_file(self.file_path)
+        assert metadata.checksum == content_digest(b"x = 1\n")
+
+    def test_hash_files_in_parallel(self):
+        """Test the thread-pooled digests match and unreadable files map to None"""
+        paths = []
+        for i in range(5):
+            path = os.path.join(self.temp_dir, f"m{i}.py")
+            with open(path, 'wb') as f:
+                f.write(b"v = %d\n" % i)
+            paths.append(path)
+        missing = os.path.join(self.temp_dir, "missing.py")
+
+        digests = hash_files(paths + [missing], max_workers=3)
+
+        assert digests[missing] is None
+        assert all(digests[path] == content_digest(b"v = %d\n" % i) for i, path in enumerate(paths))
+
+
+class TestIncrementalValidity:
+    """Validity checks hash only files whose stat changed"""
+
+    def test_touched_files_are_refreshed(self, monkeypatch):
+        """Test touched-but-identical files stay valid and are not hashed twice"""
+        temp_dir = tempfile.mkdtemp()
+        manager = CacheManager(os.path.join(temp_dir, "cache"))
+        files = []
+        for name in ("a.py", "b.py", "c.py"):
+            path = os.path.join(temp_dir, name)
+            with open(path, 'w') as f:
+                f.write(f"NAME = '{name}'\n")
+            files.append(path)
+        cache = AnalysisCache(cache_id="test", project_path=temp_dir, created_at=datetime.now(),
+                              expires_at=None,
+                              file_metadata={path: FileMetadata.from_file(path) for path in files})
+
+        stat = os.stat(files[0])
+        os.utime(files[0], ns=(stat.st_mtime_ns + 10**9, stat.st_mtime_ns + 10**9))
+        with open(files[1], 'a') as f:
+            f.write("# edited\n")
+
+        hashed = []
+        real_hash_files = cache_manager.hash_files
+        monkeypatch.setattr(cache_manager, "hash_files",
+                            lambda paths, workers=None: hashed.extend(paths) or real_hash_files(paths, workers))
+
+        plan = manager.get_incremental_analysis_plan(cache, files)
+        assert sorted(hashed) == sorted(files[:2])
+        assert plan['touched'] == [files[0]]
+        assert plan['reanalyze'] == [files[1]]
+
+        hashed.clear()
+        manager.get_incremental_analysis_plan(cache, files)
+        assert hashed == [files[1]]
+
+
+class TestCacheIndex:
+    """SQLite-backed index: LRU eviction, corruption handling and sharing between managers"""
+
+    def setup_method(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def make_cache(self, cache_id, padding=0):
+        return AnalysisCache(cache_id=cache_id, project_path=f"/project/{cache_id}", created_at=datetime.now(),
+                             expires_at=None, file_metadata={},
+                             reverse_imports={"pad": ["x" * padding]} if padding else {})
+
+    def test_save_and_get_round_trip(self):
+        """Test a saved cache is read back and accounted for in the stats"""
+        manager = CacheManager(self.cache_dir)
+        manager.save_cache(self.make_cache("one"))
+
+        fresh = CacheManager(self.cache_dir)
+        assert fresh.get_cache("one").project_path == "/project/one"
+        stats = fresh.get_cache_stats()
+        assert stats['cache_count'] == 1
+        assert stats['total_size_mb'] * 1024 * 1024 == os.path.getsize(os.path.join(self.cache_dir, "one.pkl"))
+
+    def test_least_recently_used_is_evicted(self):
+        """Test saving past the size limit evicts the entry accessed longest ago"""
+        manager = CacheManager(self.cache_dir)
+        manager.save_cache(self.make_cache("a", padding=4000))
+        manager.save_cache(self.make_cache("b", padding=4000))
+        manager.get_cache("a")
+        manager.max_cache_size = 9000
+
+        manager.save_cache(self.make_cache("c", padding=4000))
+
+        assert manager.get_cache("b") is None
+        assert not os.path.exists(os.path.join(self.cache_dir, "b.pkl"))
+        assert manager.get_cache("a") is not None and manager.get_cache("c") is not None
+        assert manager.index.total_size() == sum(
+            os.path.getsize(os.path.join(self.cache_dir, f"{cache_id}.pkl")) for cache_id in ("a", "c"))
+
+    def test_corrupt_and_missing_blobs(self):
+        """Test unreadable or vanished blobs are dropped from the index"""
+        CacheManager(self.cache_dir).save_cache(self.make_cache("corrupt"))
+        CacheManager(self.cache_dir).save_cache(self.make_cache("missing"))
+        with open(os.path.join(self.cache_dir, "corrupt.pkl"), 'wb') as f:
+            f.write(b"\x80\x05truncated")
+        os.remove(os.path.join(self.cache_dir, "missing.pkl"))
+
+        manager = CacheManager(self.cache_dir)
+        assert manager.get_cache("corrupt") is None
+        assert manager.get_cache("missing") is None
+        assert manager.get_cache_stats()['cache_count'] == 0
+        assert manager.index.total_size() == 0
+
+    def test_managers_share_one_directory(self):
+        """Test updates and invalidations by one manager are seen by another"""
+        first = CacheManager(self.cache_dir)
+        second = CacheManager(self.cache_dir)
+        first.save_cache(self.make_cache("shared"))
+        assert second.get_cache("shared") is not None
+
+        updated = self.make_cache("shared")
+        updated.project_path = "/project/updated"
+        first.save_cache(updated)
+        assert second.get_cache("shared").project_path == "/project/updated"
+
+        first.invalidate_cache("shared")
+        assert second.get_cache("shared") is None
+
+    def test_json_index_is_migrated(self):
+        """Test entries of a legacy cache_index.json are imported into the database"""
+        CacheManager(self.cache_dir).save_cache(self.make_cache("legacy"))
+        os.remove(os.path.join(self.cache_dir, "cache_index.db"))
+        with open(os.path.join(self.cache_dir, "cache_index.json"), 'w') as f:
+            json.dump({"legacy": {"project_path": "/project/legacy", "created_at": "2024-01-01T00:00:00",
+                                  "expires_at": None, "file_count": 0}}, f)
+
+        manager = CacheManager(self.cache_dir)
+        assert manager.get_cache("legacy") is not None
+        assert not os.path.exists(os.path.join(self.cache_dir, "cache_index.json"))
+
+
+@pytest.mark.skipif(not HAS_NUMPY, reason="snapshots require NumPy")
+class TestSnapshotBlobs:
+    """Results are stored as columnar snapshots and materialised on demand"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, analyze_shop, tmp_path):
+        self.cache_dir = str(tmp_path / "cache")
+        self.result = analyze_shop()
+
+    def path(self, name):
+        return os.path.join(self.cache_dir, name)
+
+    def save(self):
+        CacheManager(self.cache_dir).save_cache(AnalysisCache(
+            cache_id="shop", project_path="/project/shop", created_at=datetime.now(), expires_at=None,
+            file_metadata={}, analysis_result=self.result))
+
+    def test_result_is_loaded_lazily_from_snapshot(self):
+        """Test the pickled entry leaves the result in a snapshot read back on first use"""
+        self.save()
+        manager = CacheManager(self.cache_dir)
+        cache = manager.get_cache("shop")
+
+        assert cache.analysis_result is None and cache.result_id == self.result.analysis_id
+        assert cache.snapshot.entity_count >= len(self.result.dependency_graph.classes)
+        assert manager.index.total_size() == os.path.getsize(self.path("shop.pkl")) + os.path.getsize(
+            self.path("shop.snap"))
+        assert cache.load_result().to_json() == self.result.to_json()
+
+        manager.invalidate_cache("shop")
+        assert not os.path.exists(self.path("shop.pkl")) and not os.path.exists(self.path("shop.snap"))
+
+    def test_resaving_a_loaded_entry_keeps_its_snapshot(self):
+        """Test saving an entry read from disk rewrites only the pickled part"""
+        self.save()
+        written = os.stat(self.path("shop.snap")).st_ino
+        manager = CacheManager(self.cache_dir)
+        cache = manager.get_cache("shop")
+        cache.project_path = "/project/moved"
+        manager.save_cache(cache)
+
+        assert os.stat(self.path("shop.snap")).st_ino == written
+        reloaded = CacheManager(self.cache_dir).get_cache("shop")
+        assert reloaded.project_path == "/project/moved"
+        assert reloaded.load_result().to_json() == self.result.to_json()
+
+    def test_missing_or_foreign_snapshot_is_a_miss(self):
+        """Test an entry whose snapshot vanished or belongs to another result is not served"""
+        self.save()
+        with open(self.path("shop.pkl"), 'rb') as f:
+            older_entry = f.read()
+        self.result.analysis_id = "other-run"
+        self.save()
+        with open(self.path("shop.pkl"), 'wb') as f:
+            f.write(older_entry)
+        assert CacheManager(self.cache_dir).get_cache("shop") is None
+
+        os.remove(self.path("shop.snap"))
+        manager = CacheManager(self.cache_dir)
+        assert manager.get_cache("shop") is None
+        assert manager.get_cache_stats()['cache_count'] == 0
+
+
+class TestMemoryCacheTier:
+    """Byte-bounded LRU tier in front of the disk cache"""
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        """Test the byte budget evicts the least recently used entries and counts it"""
+        tier = MemoryCacheTier(max_bytes=100, sizer=len)
+        tier.put("a", "x" * 40)
+        tier.put("b", "y" * 40)
+        assert tier.get("a") is not None
+
+        tier.put("c", "z" * 40)
+
+        assert "b" not in tier and "a" in tier and "c" in tier
+        assert tier.current_bytes == 80
+        assert tier.get("b") is None
+        assert (tier.hits, tier.misses, tier.evictions) == (1, 1, 1)
+
+    def test_oversized_and_invalid_entries(self):
+        """Test values over the budget are not kept and stale values count as misses"""
+        tier = MemoryCacheTier(max_bytes=10, sizer=len)
+        assert tier.put("big", "x" * 11) is False
+        assert len(tier) == 0 and tier.current_bytes == 0
+
+        tier.put("v", "old")
+        assert tier.get("v", is_valid=lambda value: value == "new") is None
+        assert "v" not in tier and tier.misses == 1
+
+    def test_estimate_size_follows_object_graph(self):
+        """Test deep sizes grow with contents and sampled lists stay close to exact"""
+        small = AnalysisCache(cache_id="s", project_path="/p", created_at=datetime.now(), expires_at=None,
+                              file_metadata={})
+        large = AnalysisCache(cache_id="l", project_path="/p", created_at=datetime.now(), expires_at=None,
+                              file_metadata={}, reverse_imports={f"f{i}": [f"importer-{i}"] for i in range(100)})
+        assert estimate_size(large) > estimate_size(small)
+
+        items = [f"value-{i:06d}" for i in range(10000)]
+        exact = sys.getsizeof(items) + sum(sys.getsizeof(item) for item in items)
+        assert abs(estimate_size(items) - exact) < exact * 0.05
+
+    def test_manager_reports_tier_counters(self):
+        """Test get_cache_stats exposes the memory tier and clear_all_caches empties it"""
+        manager = CacheManager(tempfile.mkdtemp(), memory_cache_mb=1)
+        manager.save_cache(AnalysisCache(cache_id="one", project_path="/p", created_at=datetime.now(),
+                                         expires_at=None, file_metadata={}))
+        manager.get_cache("one")
+        manager.get_cache("one")
+
+        stats = manager.get_cache_stats()['memory_cache']
+        assert stats['entries'] == 1 and stats['hits'] == 2
+        assert 0 < stats['size_mb'] <= stats['max_size_mb'] == 1
+
+        manager.clear_all_caches()
+        assert manager.get_cache_stats()['memory_cache']['entries'] == 0
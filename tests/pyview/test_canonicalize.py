@@ -0,0 +1,139 @@
+"""
+Tests for PyView entity canonicalization
+"""
+
+import pytest
+
+from pyview.canonicalize import EntityCanonicalizer
+from pyview.models import (
+    PackageInfo, ModuleInfo, ClassInfo, FieldInfo, Relationship, DependencyType, QualityMetrics,
+    EntityType, create_relationship_id
+)
+
+
+def make_rel(from_entity: str, to_entity: str, line_number: int = 0,
+             strength: float = 1.0) -> Relationship:
+    return Relationship(
+        id=create_relationship_id(from_entity, to_entity, DependencyType.IMPORT),
+        from_entity=from_entity,
+        to_entity=to_entity,
+        relationship_type=DependencyType.IMPORT,
+        line_number=line_number,
+        file_path="/proj/pkg/a.py",
+        strength=strength
+    )
+
+
+class TestEntityCanonicalizer:
+    """Test ID-keyed merging of entities and edges"""
+
+    def setup_method(self):
+        self.canonicalizer = EntityCanonicalizer()
+
+    def canonicalize(self, modules=(), classes=(), fields=(), relationships=()):
+        return self.canonicalizer.canonicalize(
+            [], list(modules), list(classes), [], list(fields), list(relationships)
+        )
+
+    def test_same_file_modules_are_aliased(self):
+        """Test pydeps and AST records of one file collapse onto the AST module"""
+        pydeps_module = ModuleInfo(id="mod:pkg.a", name="pkg.a", file_path="/proj/pkg/a.py",
+                                   display_label="pkg.a", degree=3)
+        ast_module = ModuleInfo(id="mod:a", name="a", file_path="/proj/pkg/./a.py",
+                                classes=["cls:mod:a:A"], loc=40)
+        cls = ClassInfo(id="cls:mod:a:A", name="A", module_id="mod:a", line_number=1,
+                        file_path="/proj/pkg/a.py")
+
+        result = self.canonicalize(
+            modules=[pydeps_module, ast_module], classes=[cls],
+            relationships=[make_rel("mod:pkg.b", "mod:pkg.a"), make_rel("mod:pkg.b", "mod:a")]
+        )
+
+        assert [m.id for m in result['modules']] == ["mod:a"]
+        merged = result['modules'][0]
+        assert merged.loc == 40
+        assert merged.display_label == "pkg.a"
+        assert merged.degree == 3
+        assert self.canonicalizer.module_aliases == {"mod:pkg.a": "mod:a"}
+
+        # Both edges now point at the canonical module and merge into one
+        assert [(r.from_entity, r.to_entity) for r in result['relationships']] == [("mod:pkg.b", "mod:a")]
+        assert result['relationships'][0].id == create_relationship_id("mod:pkg.b", "mod:a", DependencyType.IMPORT)
+
+    def test_alias_self_loops_are_dropped(self):
+        """Test an edge between two names of one file does not become a self-import"""
+        modules = [
+            ModuleInfo(id="mod:pkg.a", name="pkg.a", file_path="/proj/pkg/a.py"),
+            ModuleInfo(id="mod:a", name="a", file_path="/proj/pkg/a.py", loc=10),
+        ]
+        result = self.canonicalize(modules=modules, relationships=[make_rel("mod:pkg.a", "mod:a")])
+
+        assert result['relationships'] == []
+
+    def test_file_named_pydeps_module_joins_its_file(self):
+        """Test a pathless pydeps record named "x.py" merges into the module of x.py without its package"""
+        phantom = ModuleInfo(id="mod:cache_index", name="cache_index.py", file_path="",
+                             package_id="pkg:cache_index", display_label="cache_index.py")
+        real = ModuleInfo(id="mod:pyview.cache_index", name="pyview.cache_index",
+                          file_path="/proj/pyview/cache_index.py", loc=30)
+        packages = [PackageInfo(id="pkg:cache_index", name="cache_index", path="", modules=["mod:cache_index"])]
+
+        result = self.canonicalizer.canonicalize(
+            packages, [phantom, real], [], [], [], [make_rel("mod:pyview.app", "mod:cache_index")]
+        )
+
+        assert [(m.id, m.package_id, m.display_label) for m in result['modules']] == [
+            ("mod:pyview.cache_index", None, None)
+        ]
+        assert result['packages'] == []
+        assert result['relationships'][0].to_entity == "mod:pyview.cache_index"
+        assert phantom.package_id == "pkg:cache_index"  # inputs are not modified
+
+    def test_duplicate_edges_merge_deterministically(self):
+        """Test repeated edges keep the earliest line and the strongest strength"""
+        result = self.canonicalize(relationships=[
+            make_rel("mod:x", "mod:y", line_number=9, strength=0.5),
+            make_rel("mod:x", "mod:y", line_number=3, strength=0.2),
+        ])
+
+        assert len(result['relationships']) == 1
+        assert result['relationships'][0].line_number == 3
+        assert result['relationships'][0].strength == 0.5
+        assert self.canonicalizer.duplicates_removed['relationships'] == 1
+
+    def test_duplicate_fields_merge(self):
+        """Test fields with one ID merge: earliest line, instance variable if set in __init__"""
+        first = FieldInfo(id="field:cls:mod:a:A:x", name="x", class_id="cls:mod:a:A",
+                          line_number=12, file_path="/proj/pkg/a.py", is_class_variable=True)
+        second = FieldInfo(id="field:cls:mod:a:A:x", name="x", class_id="cls:mod:a:A",
+                           line_number=4, file_path="/proj/pkg/a.py", type_annotation="int",
+                           is_class_variable=False)
+
+        fields = self.canonicalize(fields=[first, second])['fields']
+
+        assert len(fields) == 1
+        assert fields[0].line_number == 4
+        assert fields[0].type_annotation == "int"
+        assert fields[0].is_class_variable is False
+
+    def test_cycles_dedupe_by_entity_set(self):
+        """Test the same cycle reported by two detectors is kept once, most severe first"""
+        cycles = self.canonicalizer.canonicalize_cycles([
+            {'id': 'import_cycle_0', 'entities': ["mod:a", "mod:b"], 'cycle_type': 'import', 'severity': 'medium'},
+            {'id': 'import_cycle_0', 'entities': ["mod:b", "mod:a"], 'cycle_type': 'import', 'severity': 'high'},
+            {'id': 'import_cycle_0', 'entities': ["mod:b", "mod:c"], 'cycle_type': 'import', 'severity': 'low'},
+        ])
+
+        assert len(cycles) == 2
+        assert cycles[0]['severity'] == 'high'
+        assert len({c['id'] for c in cycles}) == 2
+
+    def test_quality_metrics_one_per_entity(self):
+        """Test metrics are resolved through aliases and deduplicated"""
+        self.canonicalizer.module_aliases = {"mod:pkg.a": "mod:a"}
+        metrics = self.canonicalizer.canonicalize_quality_metrics([
+            QualityMetrics(entity_id="mod:a", entity_type=EntityType.MODULE),
+            QualityMetrics(entity_id="mod:pkg.a", entity_type=EntityType.MODULE),
+        ])
+
+        assert [m.entity_id for m in metrics] == ["mod:a"]
@@ -0,0 +1,102 @@
+"""
+Tests for PyView code quality metrics
+"""
+
+import ast
+
+import pytest
+
+from pyview.code_metrics import CodeMetricsEngine, ComplexityMetrics, TokenStream
+
+
+SOURCE = b'''# -*- coding: utf-8 -*-
+"""Module docstring"""
+
+
+def add(a, b):  # inline comment
+    # full-line comment
+    total = a + b; total = total * 2
+
+    return total
+
+
+class Greeter:
+    def greet(self, name):
+        return "hello " + name
+'''
+
+
+class TestTokenStream:
+    """Test single-pass token metrics"""
+
+    def setup_method(self):
+        self.tokens = TokenStream(SOURCE)
+
+    def test_file_line_counts(self):
+        """Test physical, source, comment, blank and logical lines for the whole file"""
+        lines = self.tokens.line_metrics()
+
+        assert lines.physical_lines == 14
+        assert lines.source_lines == 7
+        assert lines.comment_lines == 3
+        assert lines.blank_lines == 5
+        # docstring, def, two statements on one line, return, class, def, return
+        assert lines.logical_lines == 8
+
+    def test_function_span(self):
+        """Test line counts and Halstead measures for a function span"""
+        lines = self.tokens.line_metrics(5, 9)
+        halstead = self.tokens.halstead(5, 9)
+
+        assert lines.physical_lines == 5
+        assert lines.source_lines == 3
+        assert lines.comment_lines == 2
+        assert lines.blank_lines == 1
+        assert lines.logical_lines == 4
+
+        # def ( , : = + ; * return
+        assert halstead.distinct_operators == 9
+        # add a b total 2
+        assert halstead.distinct_operands == 5
+        assert halstead.total_operands == 10
+        assert halstead.volume == pytest.approx(halstead.length * 3.807354922)
+
+    def test_untokenizable_source(self):
+        """Test unterminated source yields no token stream"""
+        assert TokenStream.try_build(b'def f(:\n    """open') is None
+
+    def test_str_source_matches_bytes(self):
+        """Test text input gives the same counts as bytes"""
+        assert TokenStream(SOURCE.decode('utf-8')).line_metrics() == self.tokens.line_metrics()
+
+
+class TestMaintainabilityIndex:
+    """Test maintainability index from token metrics"""
+
+    def setup_method(self):
+        self.engine = CodeMetricsEngine()
+
+    def test_volume_lowers_index(self):
+        """Test Halstead volume is part of the index"""
+        plain = ComplexityMetrics(cyclomatic_complexity=2, lines_of_code=10)
+        heavy = ComplexityMetrics(cyclomatic_complexity=2, lines_of_code=10, halstead_volume=500.0)
+
+        assert self.engine.maintainability_index(heavy) < self.engine.maintainability_index(plain)
+        assert self.engine.maintainability_index(heavy) == pytest.approx(
+            171 - 5.2 * 6.2146081 - 0.23 * 2 - 16.2 * 2.3025851, abs=1e-4
+        )
+
+    def test_module_quality_uses_token_counts(self):
+        """Test legacy module entry point reports source lines, not text splits"""
+        metrics = self.engine.analyze_module_quality(None, SOURCE.decode('utf-8'))
+
+        assert metrics.complexity.lines_of_code == 7
+        assert metrics.complexity.comment_lines == 3
+        assert metrics.complexity.halstead_volume > 0
+
+    def test_class_quality_without_match(self):
+        """Test a missing class yields empty metrics instead of a LOC estimate"""
+        metrics = self.engine.analyze_class_quality("Missing", SOURCE.decode('utf-8'))
+
+        assert metrics.complexity.cyclomatic_complexity == 1
+        assert metrics.complexity.lines_of_code == 0
@@ -0,0 +1,103 @@
+"""
+Tests for PyView analysis cost model (sampling, prediction and strategy selection)
+"""
+
+import os
+import tempfile
+
+from pyview.analyzer_engine import AnalyzerEngine, AnalysisOptions
+from pyview.cost_model import CostModel, ProjectManifest, SampleProfile
+
+
+SOURCE = '''
+class Shape{n}:
+    sides: int = {n}
+
+    def area(self, scale):
+        return self.sides * scale
+'''
+
+
+def write_project(file_count: int, sizes=None) -> str:
+    root = tempfile.mkdtemp()
+    os.makedirs(os.path.join(root, "pkg"))
+    with open(os.path.join(root, "pkg", "__init__.py"), 'w') as f:
+        f.write("")
+    for n in range(file_count):
+        repeat = sizes[n] if sizes else 1
+        with open(os.path.join(root, "pkg", f"mod{n}.py"), 'w') as f:
+            f.write("".join(SOURCE.format(n=n * 1000 + r) for r in range(repeat)))
+    return root
+
+
+def profile(seconds_per_kb=0.005, memory_per_kb=7 * 1024.0):
+    return SampleProfile(files=10, seconds_per_file=0.0005, seconds_per_kb=seconds_per_kb,
+                         entities_per_kb=18.0, memory_per_kb=memory_per_kb)
+
+
+class TestCostModel:
+    """Manifest, sampling and the plan chosen for a predicted cost"""
+
+    def test_manifest_quantiles(self):
+        """Test the manifest reports count, total and size quantiles"""
+        manifest = ProjectManifest.from_sizes(list(range(1, 101)))
+
+        assert manifest.file_count == 100 and manifest.total_bytes == 5050
+        assert (manifest.median_bytes, manifest.p90_bytes, manifest.p99_bytes, manifest.max_bytes) == (51, 91, 100, 100)
+        assert ProjectManifest.from_sizes([]).file_count == 0
+
+    def test_sample_spans_the_size_distribution(self):
+        """Test the sample includes the smallest and largest files and is spread over ranks"""
+        sizes = [(f"f{i}.py", (i * 7919) % 1000) for i in range(1000)]
+        sample = CostModel(sample_size=8).sample(sizes)
+        sample_sizes = [size for _, size in sample]
+
+        assert len(sample) == 8
+        assert sample_sizes == sorted(sample_sizes)
+        assert sample_sizes[0] == 0 and sample_sizes[-1] == 999
+
+    def test_profile_fits_measured_costs(self):
+        """Test sampled parses give positive per-KB costs and entity counts"""
+        root = write_project(12, sizes=[1, 2, 4, 8, 16, 32] * 2)
+        model = CostModel(sample_size=6)
+        measured = model.profile(model.sample(model.file_sizes(
+            [os.path.join(root, "pkg", name) for name in os.listdir(os.path.join(root, "pkg"))]
+        )))
+
+        assert measured.files == 6 and measured.failures == 0
+        assert measured.seconds_per_kb > 0 and measured.memory_per_kb > 0
+        assert measured.entities_per_kb > 1
+        assert CostModel._fit_line([(1.0, 2.0), (2.0, 3.0), (3.0, 4.0)]) == (1.0, 1.0)
+
+    def test_memory_budget_selects_streaming_path(self):
+        """Test a project whose result does not fit the budget is planned on the large-project path"""
+        manifest = ProjectManifest.from_sizes([200 * 1024] * 2000)
+
+        roomy = CostModel(max_memory_mb=64 * 1024, max_workers=8).predict(manifest, profile())
+        tight = CostModel(max_memory_mb=4 * 1024, max_workers=8).predict(manifest, profile())
+
+        assert roomy.strategy == "standard" and roomy.workers == 8
+        assert tight.strategy == "large" and tight.reasons
+        assert tight.predicted_memory_mb < roomy.predicted_memory_mb
+        assert 10 <= tight.batch_size <= 1000
+
+    def test_small_project_runs_in_process(self):
+        """Test too little parsing work for worker start-up plans a single worker"""
+        plan = CostModel(max_workers=8).predict(ProjectManifest.from_sizes([2048] * 20), profile())
+
+        assert plan.strategy == "standard" and plan.workers == 1
+
+    def test_engine_records_prediction_and_actuals(self):
+        """Test an engine run stores the plan, the prediction and the measured cost in the result"""
+        root = write_project(40)
+        engine = AnalyzerEngine(AnalysisOptions(max_workers=4, enable_caching=False))
+
+        result = engine.analyze_project(root)
+
+        cost = result.metrics['cost_model']
+        assert cost['plan']['strategy'] == "standard" and cost['plan']['workers'] == 1
+        assert cost['plan']['manifest']['file_count'] == 41
+        assert cost['plan']['profile']['files'] == 32
+        assert cost['predicted']['entities'] > 0 and cost['actual']['entities'] > 0
+        assert cost['actual']['seconds'] > 0
+        assert engine.analysis_plan.workers == 1
@@ -0,0 +1,102 @@
+"""
+Tests for PyView entity registry (integer IDs, edge tables and graph algorithms)
+"""
+
+import random
+
+from pyview.analyzer_engine import AnalyzerEngine, AnalysisOptions
+from pyview.entity_registry import CycleMembership, EntityRegistry
+from pyview.models import DependencyType, MethodInfo, Relationship
+
+
+def rel(source: str, target: str, kind=DependencyType.CALL) -> Relationship:
+    return Relationship(id=f"rel:{source}->{target}", from_entity=source, to_entity=target,
+                        relationship_type=kind, line_number=1, file_path="/m.py")
+
+
+def reference_first_cycles(relationships):
+    """The original recursive search, with neighbours in first-seen order"""
+    graph = {}
+    for r in relationships:
+        neighbours = graph.setdefault(r.from_entity, [])
+        if r.to_entity not in neighbours:
+            neighbours.append(r.to_entity)
+
+    def has_cycle(node, path):
+        if node in path:
+            return path[path.index(node):] + [node]
+        if node not in graph:
+            return None
+        path.append(node)
+        for neighbour in graph[node]:
+            cycle = has_cycle(neighbour, path)
+            if cycle:
+                return cycle
+        path.pop()
+        return None
+
+    return [cycle for cycle in (has_cycle(node, []) for node in graph) if cycle]
+
+
+class TestEntityRegistry:
+    """Dense IDs, integer edges and the algorithms built on them"""
+
+    def test_dense_ids_and_rendering(self):
+        """Test IDs are assigned in registration order and render back to strings"""
+        registry = EntityRegistry()
+        registry.register([MethodInfo(id="func:mod:a:run", name="run", line_number=1, file_path="/a.py")])
+        edges = registry.edges([rel("func:mod:a:run", "func:mod:b:stop"), rel("func:mod:b:stop", "func:mod:a:run")])
+
+        assert registry.get("func:mod:a:run") == 0 and registry.get("func:mod:b:stop") == 1
+        assert list(edges.sources) == [0, 1] and list(edges.targets) == [1, 0]
+        assert registry.render([1, 0]) == ["func:mod:b:stop", "func:mod:a:run"]
+        assert edges.degrees() == ([1, 1], [1, 1])
+
+    def test_strongly_connected_components(self):
+        """Test SCCs on a mixed graph and on a long cycle that would overflow a recursive search"""
+        registry = EntityRegistry()
+        edges = registry.edges([rel("a", "b"), rel("b", "a"), rel("b", "c"), rel("c", "d"),
+                                rel("d", "e"), rel("e", "c"), rel("e", "f")])
+        assert sorted(sorted(registry.render(c)) for c in edges.strongly_connected_components()) == [
+            ["a", "b"], ["c", "d", "e"]
+        ]
+
+        ring = [rel(f"m{i}", f"m{(i + 1) % 5000}") for i in range(5000)]
+        components = EntityRegistry().edges(ring).strongly_connected_components()
+        assert [len(c) for c in components] == [5000]
+
+    def test_first_cycles_match_recursive_search(self):
+        """Test the pruned iterative search finds the same cycles as the original recursion"""
+        generator = random.Random(7)
+        for _ in range(20):
+            relationships = [rel(f"n{generator.randrange(40)}", f"n{generator.randrange(40)}") for _ in range(60)]
+            registry = EntityRegistry()
+            found = [registry.render(c) for c in registry.edges(relationships).first_cycles()]
+            assert sorted(found) == sorted(reference_first_cycles(relationships))
+
+    def test_cycle_membership(self):
+        """Test each entity maps to its most severe cycle and partners are rendered on demand"""
+        membership = CycleMembership([
+            {'entities': ["a", "b"], 'severity': "low", 'cycle_type': "call"},
+            {'entities': ["b", "c", "d"], 'severity': "high", 'cycle_type': "import"},
+        ])
+
+        assert "a" in membership and "z" not in membership
+        assert membership.get("a") == {'severity': "low", 'cycle_type': "call", 'partners': ["b"]}
+        assert membership.get("b") == {'severity': "high", 'cycle_type': "import", 'partners': ["c", "d"]}
+        assert membership.severity("z") is None and membership.get("z", {}) == {}
+
+    def test_engine_metrics_and_cycles_use_registry(self):
+        """Test coupling metrics and import cycles computed on integer IDs keep their string output"""
+        engine = AnalyzerEngine(AnalysisOptions(enable_caching=False))
+        relationships = [rel("mod:a", "mod:b", DependencyType.IMPORT), rel("mod:b", "mod:a", DependencyType.IMPORT),
+                         rel("mod:b", "mod:c", DependencyType.IMPORT)]
+
+        coupling = engine._calculate_enhanced_metrics([], [], [], [], relationships)['coupling_metrics']
+        cycles = engine._detect_cycles_by_type(relationships, 'import')
+
+        assert coupling["mod:b"] == {'afferent_coupling': 1, 'efferent_coupling': 2, 'instability': 2 / 3}
+        assert coupling["mod:c"]['instability'] == 0.0
+        assert [sorted(c['entities']) for c in cycles] == [["mod:a", "mod:b"]]
+        assert len(cycles[0]['paths']) == 2
+        assert engine._cycle_region(relationships, {"mod:a"}) == {"mod:a", "mod:b"}
@@ -0,0 +1,187 @@
+"""
+Tests for PyView content-addressed file analysis cache
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+
+import pytest
+
+from pyview.ast_analyzer import ASTAnalyzer
+from pyview.cache_manager import CacheManager
+from pyview.file_cache import FileAnalysisCache, analyzer_fingerprint, main
+
+
+SOURCE = '''
+class Service:
+    def run(self, value):
+        if value:
+            return helper(value)
+        return None
+
+
+def helper(value):
+    return value * 2
+'''
+
+
+class TestFileAnalysisCache:
+    """Test per-file caching keyed by content"""
+
+    def setup_method(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = FileAnalysisCache(self.cache_dir)
+
+    def teardown_method(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def write_project(self, content: str = SOURCE) -> str:
+        project_dir = tempfile.mkdtemp()
+        file_path = os.path.join(project_dir, "service.py")
+        with open(file_path, 'w') as f:
+            f.write(content)
+        return file_path
+
+    def test_hit_across_checkouts(self):
+        """Test identical bytes in another checkout reuse the entry with the new path"""
+        first_path = self.write_project()
+        second_path = self.write_project()
+
+        first = ASTAnalyzer(file_cache=self.cache).analyze_file(first_path)
+        second = ASTAnalyzer(file_cache=self.cache).analyze_file(second_path)
+
+        assert self.cache.misses == 1
+        assert self.cache.hits == 1
+        assert second.file_path == second_path
+        assert second.module_info.file_path == second_path
+        assert all(m.file_path == second_path for m in second.methods)
+        assert [m.id for m in second.methods] == [m.id for m in first.methods]
+        assert [q.entity_id for q in second.quality_metrics] == [q.entity_id for q in first.quality_metrics]
+
+    def test_changed_content_or_options_miss(self):
+        """Test edits and output-changing options produce new keys"""
+        file_path = self.write_project()
+        ASTAnalyzer(file_cache=self.cache).analyze_file(file_path)
+        ASTAnalyzer(enable_quality_metrics=False, file_cache=self.cache).analyze_file(file_path)
+
+        with open(file_path, 'a') as f:
+            f.write("\n\ndef extra():\n    pass\n")
+        analysis = ASTAnalyzer(file_cache=self.cache).analyze_file(file_path)
+
+        assert self.cache.hits == 0
+        assert self.cache.misses == 3
+        assert "extra" in {m.name for m in analysis.methods}
+
+    def test_corrupt_entry_is_dropped(self):
+        """Test an unreadable entry is treated as a miss and removed"""
+        file_path = self.write_project()
+        analyzer = ASTAnalyzer(file_cache=self.cache)
+        analyzer.analyze_file(file_path)
+        key = next(iter(self.cache.iter_keys()))
+        with open(self.cache._object_path(key), 'wb') as f:
+            f.write(b"not a pickle")
+
+        assert analyzer.analyze_file(file_path) is not None
+        assert self.cache.misses == 2
+        assert self.cache.get(key) is not None  # rewritten by the re-analysis
+
+    def test_blobs_are_indexed_and_evicted(self):
+        """Test objects and memos are accounted in the index and the oldest go past the budget"""
+        analyzer = ASTAnalyzer(file_cache=self.cache)
+        analyzer.analyze_file(self.write_project())
+        first_keys = set(self.cache.iter_keys())
+        assert self.cache.index.blob_count() == 2  # object + memo
+        self.cache.max_size_bytes = int(self.cache.index.blob_total_size() * 1.5)
+
+        analyzer.analyze_file(self.write_project(SOURCE + "\n\ndef extra():\n    pass\n"))
+
+        assert self.cache.index.blob_total_size() <= self.cache.max_size_bytes
+        assert not first_keys & set(self.cache.iter_keys())
+        stored = [os.path.join(root, name) for root, _, names in os.walk(self.cache_dir)
+                  for name in names if name.endswith(".pkl")]
+        assert sum(os.path.getsize(path) for path in stored) == self.cache.index.blob_total_size()
+
+    def test_recent_hits_do_not_write_the_index(self, monkeypatch):
+        """Test a hit on a recently accessed blob does not open a write transaction"""
+        file_path = self.write_project()
+        analyzer = ASTAnalyzer(file_cache=self.cache)
+        analyzer.analyze_file(file_path)
+        key = next(iter(self.cache.iter_keys()))
+        blob = str(self.cache._object_path(key))
+        transaction = self.cache.index.transaction
+        writes = []
+
+        def counting_transaction():
+            writes.append(1)
+            return transaction()
+        monkeypatch.setattr(self.cache.index, "transaction", counting_transaction)
+
+        assert self.cache.get(key) is not None
+        assert writes == []
+
+        self.cache.index.blob_touch_interval = -1  # recorded access is now stale
+        before = self.cache.index._read("SELECT last_access FROM blobs WHERE path = ?", (blob,))[0][0]
+        assert self.cache.get(key) is not None
+        after = self.cache.index._read("SELECT last_access FROM blobs WHERE path = ?", (blob,))[0][0]
+        assert writes == [1] and after > before
+
+    def test_manager_budget_and_clear_cover_file_blobs(self):
+        """Test the manager's size limit and clear_all_caches include the per-file store"""
+        manager = CacheManager(self.cache_dir)
+        ASTAnalyzer(file_cache=manager.file_cache).analyze_file(self.write_project())
+        assert manager.get_cache_stats()['file_cache']['entry_count'] == 2
+
+        manager.max_cache_size = 1
+        ASTAnalyzer(file_cache=manager.file_cache).analyze_file(self.write_project(SOURCE + "\nX = 1\n"))
+        assert manager.index.blob_count() == 1  # only the blob just written survives
+
+        manager.clear_all_caches()
+        assert manager.index.blob_total_size() == 0
+        assert not list(manager.file_cache.iter_keys())
+        assert not os.path.exists(manager.file_cache.memos_dir)
+
+    def test_untrusted_bundles_are_rejected(self):
+        """Test a bundle with another fingerprint or unexpected members writes nothing"""
+        bundle_dir = tempfile.mkdtemp()
+        entry = "objects/" + "a" * 40 + ".pkl"
+
+        def make_bundle(name, fingerprint, members):
+            path = os.path.join(bundle_dir, name)
+            with zipfile.ZipFile(path, 'w') as bundle:
+                for member in members:
+                    bundle.writestr(member, b"payload")
+                bundle.writestr("manifest.json", json.dumps({
+                    'analyzer_fingerprint': fingerprint, 'entries': len(members)}))
+            return path
+
+        for path in (make_bundle("foreign.zip", "0" * 32, [entry]),
+                     make_bundle("traversal.zip", analyzer_fingerprint(), [entry, "objects/../../evil.pkl"]),
+                     make_bundle("short.zip", analyzer_fingerprint(), ["objects/ab.pkl"])):
+            with pytest.raises(ValueError):
+                self.cache.import_bundle(path)
+        assert main(["import", path, "--cache-dir", self.cache_dir]) == 1
+
+        assert not list(self.cache.iter_keys())
+        assert self.cache.index.blob_count() == 0
+        shutil.rmtree(bundle_dir, ignore_errors=True)
+
+    def test_bundle_roundtrip(self):
+        """Test exporting a bundle and importing it into an empty cache gives warm hits"""
+        file_path = self.write_project()
+        ASTAnalyzer(file_cache=CacheManager(self.cache_dir).file_cache).analyze_file(file_path)
+        bundle_path = os.path.join(tempfile.mkdtemp(), "cache.zip")
+
+        assert main(["export", bundle_path, "--cache-dir", self.cache_dir]) == 0
+
+        warm_dir = tempfile.mkdtemp()
+        warm_cache = FileAnalysisCache(warm_dir)
+        assert warm_cache.import_bundle(bundle_path) == 1
+        assert warm_cache.import_bundle(bundle_path) == 0
+        assert warm_cache.index.blob_count() == 1
+
+        ASTAnalyzer(file_cache=warm_cache).analyze_file(self.write_project())
+        assert warm_cache.hits == 1
+        shutil.rmtree(warm_dir, ignore_errors=True)
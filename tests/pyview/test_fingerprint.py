@@ -0,0 +1,102 @@
+"""
+Tests for PyView entity fingerprints and per-function result replay
+"""
+
+import ast
+import dataclasses
+import pickle
+
+from pyview.ast_analyzer import ASTAnalyzer
+from pyview.fingerprint import EntityMemo, fingerprint_entities
+
+
+SOURCE = '''
+import os
+
+
+class Store:
+    """Key/value store"""
+
+    def __init__(self, root):
+        self.root = root
+        self.items = {}
+
+    def get(self, key):
+        # Cached lookups first
+        if key in self.items:
+            return self.items[key]
+        return os.path.join(self.root, key)
+
+
+def helper(value):
+    return Store(value).get("x")
+'''
+
+
+def fingerprints(source):
+    return {node.name: fp for node, fp in fingerprint_entities(ast.parse(source)).items()}
+
+
+def comparable(analysis):
+    data = dataclasses.asdict(analysis)
+    data.pop('content_hash')
+    data.pop('file_stat')
+    return data
+
+
+class TestFingerprints:
+    """Semantic fingerprints ignore positions, comments and docstrings"""
+
+    def test_cosmetic_edits_keep_fingerprints(self):
+        """Test moving code and editing comments or docstrings changes nothing"""
+        original = fingerprints(SOURCE)
+        edited = fingerprints("# header\n\n" + SOURCE.replace("# Cached lookups first", "# hit")
+                              .replace('"""Key/value store"""', '"""A store"""'))
+
+        assert edited == original
+
+    def test_body_edits_change_semantic_fingerprint(self):
+        """Test a changed expression changes the function and its enclosing class only"""
+        original = fingerprints(SOURCE)
+        edited = fingerprints(SOURCE.replace('return os.path.join(self.root, key)', 'return None'))
+
+        assert edited['get'].semantic != original['get'].semantic
+        assert edited['Store'].semantic != original['Store'].semantic
+        assert edited['__init__'] == original['__init__']
+        assert edited['helper'] == original['helper']
+
+    def test_layout_tracks_lines_inside_the_entity(self):
+        """Test an inserted blank line changes the layout but not the meaning"""
+        original = fingerprints(SOURCE)
+        edited = fingerprints(SOURCE.replace("        if key in self.items:", "\n        if key in self.items:"))
+
+        assert edited['get'].semantic == original['get'].semantic
+        assert edited['get'].layout != original['get'].layout
+        assert edited['Store'].has_nested_scope and not edited['get'].has_nested_scope
+
+
+class TestEntityMemo:
+    """Replayed function records must equal a fresh analysis"""
+
+    def analyse_edit(self, edited_source):
+        analyzer = ASTAnalyzer()
+        memo = EntityMemo()
+        analyzer.analyze_source(SOURCE, "/project/store.py", "store", memo=memo)
+        memo = pickle.loads(pickle.dumps(memo))
+        replayed = analyzer.analyze_source(edited_source, "/project/store.py", "store", memo=memo)
+        fresh = ASTAnalyzer().analyze_source(edited_source, "/project/store.py", "store")
+        return memo, replayed, fresh
+
+    def test_moved_functions_are_replayed(self):
+        """Test shifting the whole file reuses every function at its new lines"""
+        memo, replayed, fresh = self.analyse_edit("import sys\n\n\n" + SOURCE)
+
+        assert comparable(replayed) == comparable(fresh)
+        assert (memo.reused, memo.analysed) == (3, 0)
+
+    def test_edited_function_is_reanalysed(self):
+        """Test only the edited function is analysed again"""
+        memo, replayed, fresh = self.analyse_edit(SOURCE.replace('.get("x")', '.get("y").strip()'))
+
+        assert comparable(replayed) == comparable(fresh)
+        assert (memo.reused, memo.analysed) == (2, 1)
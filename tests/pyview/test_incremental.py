@@ -0,0 +1,343 @@
+"""
+Tests for PyView incremental analysis (entity-level merge against a full run)
+"""
+
+import os
+import tempfile
+
+import pytest
+
+from pyview import analyzer_engine
+from pyview.analyzer_engine import AnalyzerEngine, AnalysisOptions
+from pyview.cache_manager import CacheManager
+from pyview.legacy_bridge import LegacyBridge
+from pyview.models import Relationship, DependencyType
+from pyview.module_graph import ModuleGraph
+
+
+PROJECT = {
+    "app/__init__.py": "",
+    "app/models.py": '''
+from app import utils
+
+class User:
+    def __init__(self, name):
+        self.name = name
+
+    def display(self):
+        return utils.format_name(self.name)
+''',
+    "app/utils.py": '''
+def format_name(name):
+    if name:
+        return name.title()
+    return ""
+''',
+    "app/service.py": '''
+from app.models import User
+from app import helpers
+
+class Service:
+    def create(self, name):
+        user = User(name)
+        return user.display()
+''',
+    "app/legacy.py": '''
+import app.service
+
+def old_entry():
+    return app.service.Service()
+''',
+}
+
+
+def write_file(root: str, relative_path: str, content: str):
+    path = os.path.join(root, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+@pytest.fixture(autouse=True)
+def without_pydeps(monkeypatch):
+    """pydeps is not re-run incrementally; compare the graph built from AST imports"""
+    def unavailable(*args, **kwargs):
+        raise RuntimeError("pydeps disabled for this test")
+    monkeypatch.setattr(LegacyBridge, "analyze_with_pydeps", unavailable)
+
+
+def snapshot(result):
+    """Order-independent view of everything the incremental merge must reproduce"""
+    graph = result.dependency_graph
+    return {
+        'modules': sorted(m.id for m in graph.modules),
+        'bacon_distances': {m.id: m.bacon_distance for m in graph.modules},
+        'classes': sorted(c.id for c in graph.classes),
+        'methods': sorted(m.id for m in graph.methods),
+        'fields': sorted(f.id for f in graph.fields),
+        'relationships': sorted(r.id for r in result.relationships),
+        'import_cycles': sorted(sorted(c.entities) for c in result.cycles if c.cycle_type == 'import'),
+        'quality': sorted((q.entity_id, q.cyclomatic_complexity, q.lines_of_code, q.quality_grade)
+                          for q in result.quality_metrics),
+        'entity_counts': result.metrics['entity_counts'],
+        'complexity': result.metrics['complexity_metrics'],
+        'coupling': result.metrics['coupling_metrics'],
+        'distribution_levels': {level: summary['count'] for level, summary
+                                in result.metrics['quality_distribution']['levels'].items()},
+    }
+
+
+class TestIncrementalMerge:
+    """Incremental results must equal a full run of the same tree"""
+
+    @pytest.fixture(autouse=True)
+    def isolated_cache(self, monkeypatch):
+        cache_dir = tempfile.mkdtemp()
+        monkeypatch.setattr(analyzer_engine, "CacheManager", lambda: CacheManager(cache_dir))
+
+    def setup_method(self):
+        self.project_dir = tempfile.mkdtemp()
+        for relative_path, content in PROJECT.items():
+            write_file(self.project_dir, relative_path, content)
+
+    def incremental_engine(self):
+        """Engine whose second run must not fall back to a full analysis"""
+        engine = AnalyzerEngine(AnalysisOptions(enable_caching=True, max_workers=1))
+        engine.analyze_project(self.project_dir)
+
+        def fail_full_analysis(*args, **kwargs):
+            raise AssertionError("incremental run re-ran the full analysis")
+
+        engine._perform_full_analysis = fail_full_analysis
+        return engine
+
+    def full_run(self):
+        return AnalyzerEngine(AnalysisOptions(enable_caching=False, max_workers=1)).analyze_project(self.project_dir)
+
+    def test_unchanged_project_reuses_cache(self):
+        """Test a second run with no changes returns the cached result"""
+        engine = self.incremental_engine()
+        assert snapshot(engine.analyze_project(self.project_dir)) == snapshot(self.full_run())
+
+    def test_modified_file_matches_full_run(self):
+        """Test editing a file replaces only its entities and edges"""
+        engine = self.incremental_engine()
+        write_file(self.project_dir, "app/utils.py", '''
+from app import models
+
+def format_name(name):
+    return name.strip().title() if name else ""
+
+def make_user(name):
+    for _ in range(2):
+        if name:
+            return models.User(name)
+    return None
+''')
+
+        incremental = engine.analyze_project(self.project_dir)
+        full = self.full_run()
+
+        assert snapshot(incremental) == snapshot(full)
+        assert "func:mod:app.utils:make_user" in snapshot(incremental)['methods']
+        # models <-> utils now import each other
+        assert ["mod:app.models", "mod:app.utils"] in snapshot(incremental)['import_cycles']
+
+    def test_added_and_deleted_files_match_full_run(self):
+        """Test new modules resolve pending imports and deleted modules lose their edges"""
+        engine = self.incremental_engine()
+        write_file(self.project_dir, "app/helpers.py", '''
+class Helper:
+    def help(self):
+        return 1
+''')
+        os.remove(os.path.join(self.project_dir, "app/legacy.py"))
+
+        incremental = engine.analyze_project(self.project_dir)
+        full = self.full_run()
+
+        assert snapshot(incremental) == snapshot(full)
+        relationships = snapshot(incremental)['relationships']
+        assert "rel:mod:app.service->mod:app.helpers:import" in relationships
+        assert not any("mod:app.legacy" in rel for rel in relationships)
+
+    def test_consecutive_incremental_runs(self):
+        """Test merged results are themselves a valid base for the next merge"""
+        engine = self.incremental_engine()
+        write_file(self.project_dir, "app/helpers.py", "from app import service\n")
+        engine.analyze_project(self.project_dir)
+        write_file(self.project_dir, "app/helpers.py", "import os\n\nVALUE = 1\n")
+
+        assert snapshot(engine.analyze_project(self.project_dir)) == snapshot(self.full_run())
+
+    def test_previous_run_metrics_are_not_carried_over(self):
+        """Test the cost model entry of the cached full run is not reported for the merged result"""
+        engine = self.incremental_engine()
+        write_file(self.project_dir, "app/helpers.py", "import os\n")
+
+        incremental = engine.analyze_project(self.project_dir)
+        full = self.full_run()
+
+        assert 'cost_model' in full.metrics and 'cost_model' not in incremental.metrics
+        assert set(incremental.metrics) == set(full.metrics) - {'cost_model'}
+
+    def test_module_graph_is_stored_and_spliced(self, monkeypatch):
+        """Test the merge updates the cached module graph instead of rebuilding it"""
+        engine = self.incremental_engine()
+        cache_id = engine.cache_manager.generate_cache_key(self.project_dir, vars(engine.options))
+        stored = engine.cache_manager.get_cache(cache_id).module_graph
+        assert stored.imports["mod:app.models"] == {"mod:app", "mod:app.utils"}
+
+        def fail_rebuild(*args, **kwargs):
+            raise AssertionError("module graph rebuilt from relationships")
+
+        write_file(self.project_dir, "app/utils.py", "from app import models\n")
+        rebuild = ModuleGraph.from_relationships
+        monkeypatch.setattr(ModuleGraph, "from_relationships", fail_rebuild)
+        incremental = engine.analyze_project(self.project_dir)
+        monkeypatch.setattr(ModuleGraph, "from_relationships", rebuild)
+
+        assert snapshot(incremental) == snapshot(self.full_run())
+        spliced = engine.cache_manager.get_cache(cache_id).module_graph
+        assert ("mod:app.models", "mod:app.utils") in spliced.import_cycles()
+
+    def test_merge_leaves_cached_objects_untouched(self):
+        """Test the merge copies the cached module graph and the records it changes"""
+        engine = self.incremental_engine()
+        cache_id = engine.cache_manager.generate_cache_key(self.project_dir, vars(engine.options))
+        cache = engine.cache_manager.get_cache(cache_id)
+        cached_json = cache.load_result().to_json()
+        cached_graph = cache.module_graph.copy()
+
+        write_file(self.project_dir, "app/entry.py", "import app.utils\n")  # utils gets a shorter bacon distance
+        incremental = engine.analyze_project(self.project_dir)
+
+        assert snapshot(incremental) == snapshot(self.full_run())
+        assert cache.analysis_result.to_json() == cached_json
+        assert cache.module_graph == cached_graph
+        utils = next(m for m in incremental.dependency_graph.modules if m.id == "mod:app.utils")
+        assert utils.bacon_distance == 1
+
+    def test_mostly_changed_project_stores_module_graph(self):
+        """Test the full re-run taken when most files changed still caches its module graph"""
+        engine = AnalyzerEngine(AnalysisOptions(enable_caching=True, max_workers=1))
+        engine.analyze_project(self.project_dir)
+        for relative_path, content in PROJECT.items():
+            write_file(self.project_dir, relative_path, content + "\n# edited\n")
+
+        engine.analyze_project(self.project_dir)
+
+        cache_id = engine.cache_manager.generate_cache_key(self.project_dir, vars(engine.options))
+        stored = engine.cache_manager.get_cache(cache_id).module_graph
+        assert stored is not None
+        assert stored.imports["mod:app.models"] == {"mod:app", "mod:app.utils"}
+
+
+def import_edge(importer: str, imported: str) -> Relationship:
+    return Relationship(id=f"{importer}->{imported}", from_entity=importer, to_entity=imported,
+                        relationship_type=DependencyType.IMPORT, line_number=1, file_path="")
+
+
+class TestModuleGraph:
+    """Spliced module graphs must equal a graph rebuilt from scratch"""
+
+    def test_bacon_distances_and_cycles(self):
+        """Test distances count hops from modules nobody imports and cycles are SCCs"""
+        graph = ModuleGraph.build(["a", "b", "c", "d", "e"], [
+            import_edge("a", "b"), import_edge("b", "c"), import_edge("c", "b"), import_edge("d", "e"),
+            import_edge("e", "d")
+        ])
+
+        assert graph.bacon == {"a": 0, "b": 1, "c": 2}
+        assert graph.import_cycles() == [("b", "c"), ("d", "e")]
+
+    def test_splice_matches_rebuild(self):
+        """Test edge and module changes update only what they affect, with the rebuild's result"""
+        edges = [import_edge("a", "b"), import_edge("b", "c"), import_edge("c", "d"),
+                 import_edge("x", "y"), import_edge("y", "x")]
+        graph = ModuleGraph.build(["a", "b", "c", "d", "x", "y"], edges)
+        untouched_cycle = graph.components["x"]
+
+        region = graph.apply_changes(removed=[import_edge("a", "b")],
+                                     added=[import_edge("d", "b"), import_edge("n", "a")],
+                                     removed_modules=[], added_modules=["n"])
+        expected = ModuleGraph.build(["a", "b", "c", "d", "n", "x", "y"], edges[1:] + [
+            import_edge("d", "b"), import_edge("n", "a")
+        ])
+
+        assert graph.bacon == expected.bacon == {"n": 0, "a": 1}
+        assert graph.components == expected.components
+        assert graph.components["b"] == ("b", "c", "d")
+        assert region == {"a", "b", "c", "d", "n"}
+        assert graph.components["x"] is untouched_cycle
+
+    def test_removed_module_breaks_cycle(self):
+        """Test removing a module drops its edges and the cycle through it"""
+        graph = ModuleGraph.build(["a", "b", "c"], [
+            import_edge("a", "b"), import_edge("b", "c"), import_edge("c", "a")
+        ])
+        graph.apply_changes(removed=[], added=[], removed_modules=["c"])
+
+        assert graph.import_cycles() == []
+        assert graph.bacon == {"a": 0, "b": 1}
+        assert "c" not in graph.imports and graph.imported_by["a"] == set()
+
+
+class TestDependencyInvalidation:
+    """Importers of changed files are found through the cached reverse import graph"""
+
+    @pytest.fixture(autouse=True)
+    def isolated_cache(self, monkeypatch):
+        self.cache_manager = CacheManager(tempfile.mkdtemp())
+        monkeypatch.setattr(analyzer_engine, "CacheManager", lambda: self.cache_manager)
+
+    def setup_method(self):
+        self.project_dir = tempfile.mkdtemp()
+        write_file(self.project_dir, "pkg/__init__.py", "")
+        write_file(self.project_dir, "pkg/base.py", "VALUE = 1\n")
+        write_file(self.project_dir, "pkg/middle.py", "from . import base\n")
+        write_file(self.project_dir, "pkg/sub/__init__.py", "")
+        write_file(self.project_dir, "pkg/sub/top.py", "from ..middle import base as m\n")
+        write_file(self.project_dir, "other.py", "import os\n")
+
+    def path(self, relative_path: str) -> str:
+        return os.path.join(self.project_dir, relative_path)
+
+    def cached_plan(self, depth):
+        engine = AnalyzerEngine(AnalysisOptions(enable_caching=True, max_workers=1))
+        files = engine._discover_project_files(self.project_dir)
+        engine.analyze_project(self.project_dir)
+        cache = self.cache_manager.get_cache(
+            self.cache_manager.generate_cache_key(self.project_dir, vars(engine.options))
+        )
+        write_file(self.project_dir, "pkg/base.py", "VALUE = 22\n")
+        self.cache_manager.invalidation_depth = depth
+        return cache, self.cache_manager.get_incremental_analysis_plan(cache, files)
+
+    def test_reverse_graph_resolves_relative_imports(self):
+        """Test relative imports (including "from . import x") become reverse edges"""
+        cache, _ = self.cached_plan(depth=1)
+
+        assert cache.reverse_imports[self.path("pkg/base.py")] == [self.path("pkg/middle.py")]
+        assert self.path("pkg/sub/top.py") in cache.reverse_imports[self.path("pkg/middle.py")]
+
+    def test_direct_importers_only(self):
+        """Test depth 1 re-analyses direct importers and reuses the rest"""
+        _, plan = self.cached_plan(depth=1)
+
+        assert plan['dependents'] == [self.path("pkg/middle.py")]
+        assert set(plan['reanalyze']) == {self.path("pkg/base.py"), self.path("pkg/middle.py")}
+        assert self.path("other.py") in plan['reuse']
+
+    def test_transitive_importers(self):
+        """Test depth None follows importers of importers"""
+        _, plan = self.cached_plan(depth=None)
+
+        assert plan['dependents'] == [self.path("pkg/middle.py"), self.path("pkg/sub/top.py")]
+
+    def test_depth_zero_skips_importers(self):
+        """Test depth 0 re-analyses only the changed file"""
+        _, plan = self.cached_plan(depth=0)
+
+        assert plan['dependents'] == []
+        assert plan['reanalyze'] == [self.path("pkg/base.py")]
@@ -0,0 +1,125 @@
+"""
+Tests for PyView quality metric distributions
+"""
+
+import pytest
+
+from pyview import metric_distributions
+from pyview.metric_distributions import (
+    StreamingMetricsAggregator, compute_metric_distributions, package_of, ROOT_PACKAGE
+)
+from pyview.models import QualityMetrics, EntityType
+
+
+def make_metric(entity_id: str, complexity: int, grade: str = "A",
+                entity_type: EntityType = EntityType.METHOD,
+                maintainability_index: float = None) -> QualityMetrics:
+    return QualityMetrics(
+        entity_id=entity_id,
+        entity_type=entity_type,
+        cyclomatic_complexity=complexity,
+        lines_of_code=complexity * 10,
+        maintainability_index=100.0 - complexity if maintainability_index is None else maintainability_index,
+        quality_grade=grade
+    )
+
+
+class TestStreamingMetricsAggregator:
+    """Test streaming aggregation of per-entity metrics"""
+
+    def test_package_of(self):
+        """Test top-level package extraction"""
+        assert package_of("core.models.user") == "core"
+        assert package_of("main") == ROOT_PACKAGE
+        assert package_of("") == ROOT_PACKAGE
+
+    def test_levels_and_packages(self):
+        """Test metrics are bucketed per package and per level"""
+        aggregator = StreamingMetricsAggregator()
+        aggregator.add_file("core.models", [
+            make_metric("m1", 1),
+            make_metric("m2", 12, grade="B"),
+            make_metric("c1", 4, entity_type=EntityType.CLASS),
+        ])
+        aggregator.add_file("api.views", [make_metric("m3", 3)])
+
+        result = aggregator.to_dict()
+
+        assert result['entity_count'] == 4
+        assert set(result['packages']) == {"core", "api"}
+        assert result['levels']['method']['count'] == 3
+        assert result['levels']['class']['count'] == 1
+        assert result['levels']['method']['grades']['B'] == 1
+
+        core_methods = result['packages']['core']['method']['metrics']['cyclomatic_complexity']
+        assert core_methods['min'] == 1
+        assert core_methods['max'] == 12
+        assert sum(core_methods['histogram']['counts']) == 2
+
+    def test_percentiles_are_bounded_by_observed_range(self):
+        """Test histogram percentile estimates stay within min/max"""
+        aggregator = StreamingMetricsAggregator()
+        aggregator.add_file("pkg.mod", [make_metric(f"m{i}", i) for i in range(1, 101)])
+
+        summary = aggregator.to_dict()['levels']['method']['metrics']['cyclomatic_complexity']
+
+        assert summary['mean'] == pytest.approx(50.5)
+        assert 1 <= summary['p50'] <= summary['p90'] <= summary['p99'] <= 100
+        assert 40 <= summary['p50'] <= 60
+
+    def test_worst_entities(self):
+        """Test the bounded worst-N list keeps the lowest maintainability entities"""
+        aggregator = StreamingMetricsAggregator(worst_n=3)
+        aggregator.add_file("pkg.a", [make_metric(f"m{i}", i) for i in range(1, 51)])
+        aggregator.add_file("other.b", [make_metric("tie", 50)])
+
+        worst = aggregator.to_dict()['levels']['method']['worst']
+
+        assert len(worst) == 3
+        assert worst[0]['maintainability_index'] == 50.0
+        assert {w['entity_id'] for w in worst} == {"m50", "tie", "m49"}
+        assert 'worst' not in aggregator.to_dict()['packages']['pkg']['method']
+
+
+class TestComputeMetricDistributions:
+    """Test completion-time distributions"""
+
+    def file_metrics(self):
+        return [
+            ("core.models", [make_metric(f"core{i}", i) for i in range(1, 81)]),
+            ("core.views", [make_metric("cls", 7, grade="C", entity_type=EntityType.CLASS)]),
+            ("main", [make_metric("slow", 40, grade="D", maintainability_index=5.0)]),
+        ]
+
+    def test_exact_percentiles_and_groups(self):
+        """Test NumPy summaries are exact and grouped per package and level"""
+        pytest.importorskip("numpy")
+        result = compute_metric_distributions(self.file_metrics(), worst_n=2)
+
+        assert result['method'] == 'exact'
+        assert result['entity_count'] == 82
+        assert set(result['packages']) == {"core", ROOT_PACKAGE}
+        assert set(result['packages']['core']) == {"method", "class"}
+
+        core_cc = result['packages']['core']['method']['metrics']['cyclomatic_complexity']
+        assert core_cc['p50'] == pytest.approx(40.5)
+        assert core_cc['p99'] == pytest.approx(79.21)
+        assert sum(core_cc['histogram']['counts']) == 80
+
+        methods = result['levels']['method']
+        assert methods['count'] == 81
+        assert methods['grades']['D'] == 1
+        assert [w['entity_id'] for w in methods['worst']] == ["slow", "core80"]
+
+    def test_matches_streaming_layout_without_numpy(self, monkeypatch):
+        """Test the fallback produces the same layout through the streaming aggregator"""
+        monkeypatch.setattr(metric_distributions, "HAS_NUMPY", False)
+        result = compute_metric_distributions(self.file_metrics(), worst_n=2)
+
+        assert result['method'] == 'histogram'
+        assert result['levels']['method']['count'] == 81
+        assert [w['entity_id'] for w in result['levels']['method']['worst']] == ["slow", "core80"]
+
+    def test_empty(self):
+        """Test no metrics produce an empty summary"""
+        assert compute_metric_distributions([])['entity_count'] == 0
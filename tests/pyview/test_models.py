@@ -4,10 +4,14 @@ PyView 데이터 모델 테스트
 
 import pytest
 import json
+import pickle
+import copy
+import tracemalloc
+from dataclasses import fields, make_dataclass, replace
 from pyview.models import (
     PackageInfo, ModuleInfo, ClassInfo, MethodInfo, FieldInfo,
     Relationship, DependencyType, AnalysisResult, ProjectInfo,
-    DependencyGraph, create_module_id, create_class_id
+    DependencyGraph, create_module_id, create_class_id, create_method_id, EMPTY_LIST
 )
 
 
@@ -170,6 +174,10 @@ class TestDataModels:
         
         class_id = create_class_id("mod:mymodule", "MyClass")
         assert class_id == "cls:mod:mymodule:MyClass"
+        
+        assert create_method_id(class_id, "run") == "meth:cls:mod:mymodule:MyClass:run"
+        assert create_method_id(None, "main", module_id) == "func:mod:mypackage.mymodule:main"
+        assert create_method_id(None, "main", module_id, occurrence=2) == "func:mod:mypackage.mymodule:main#2"
     
     def test_entity_count(self):
         """Test entity counting in AnalysisResult"""
@@ -206,4 +214,177 @@ class TestDataModels:
         assert counts['packages'] == 1
         assert counts['modules'] == 1  
         assert counts['classes'] == 1
-        assert counts['relationships'] == 1
\ No newline at end of file
+        assert counts['relationships'] == 1
+
+def worker_payload(cls, file_index: int, count: int = 20) -> bytes:
+    """Methods of one file, pickled as a worker process returns them"""
+    path = f"/src/project/pkg{file_index % 10}/module{file_index}.py"
+    class_id = f"cls:mod:pkg{file_index % 10}.module{file_index}:Widget"
+    return pickle.dumps([
+        cls(id=f"{class_id}:m{i}".replace("cls:", "meth:cls:", 1), name=f"m{i}", line_number=i,
+            file_path=path, class_id=class_id, args=["self", "value"],
+            calls=["func:mod:pkg0.util:log"] if i % 2 else [])
+        for i in range(count)
+    ], protocol=pickle.HIGHEST_PROTOCOL)
+
+
+PlainMethodInfo = make_dataclass("PlainMethodInfo", [(f.name, f.type, f) for f in fields(MethodInfo)])
+PlainMethodInfo.__module__ = __name__
+
+
+class TestCompactEntities:
+    """Slotted entities with interned strings and a shared copy-on-write empty list"""
+
+    def test_slotted_and_pickled_by_position(self):
+        """Test entities have no __dict__ and round-trip through pickle unchanged"""
+        method = MethodInfo(id="func:mod:m:run", name="run", line_number=3, file_path="/m.py",
+                            args=["a"], docstring="Runs.")
+        assert not hasattr(method, '__dict__')
+        with pytest.raises(AttributeError):
+            method.extra = 1
+
+        restored = pickle.loads(pickle.dumps(method))
+        assert restored == method and restored.calls == [] and restored.docstring == "Runs."
+        assert b"docstring" not in pickle.dumps(method)
+        assert replace(restored, name="go").name == "go"
+
+    def test_strings_interned_and_empty_lists_shared(self):
+        """Test unpickled entities share ID/path strings across payloads and one empty list"""
+        first = pickle.loads(worker_payload(MethodInfo, 1))
+        second = pickle.loads(worker_payload(MethodInfo, 1))
+
+        assert first[0].file_path is second[0].file_path
+        assert first[0].class_id is second[5].class_id
+        assert first[1].calls[0] is second[3].calls[0]
+        slot = MethodInfo.__dict__['calls'].slot
+        assert slot.__get__(first[0]) is slot.__get__(second[2]) is EMPTY_LIST
+        assert first[0].calls == [] and EMPTY_LIST == []
+
+    def test_round_tripped_list_fields_are_mutable(self):
+        """Test list fields of pickled or copied entities can be appended to independently"""
+        cls = ClassInfo(id="cls:mod:m:A", name="A", module_id="mod:m", line_number=1, file_path="/m.py")
+        method = MethodInfo(id="meth:cls:mod:m:A:run", name="run", line_number=2, file_path="/m.py")
+        first, second = pickle.loads(pickle.dumps(cls)), pickle.loads(pickle.dumps(cls))
+        copied = copy.deepcopy(cls)
+
+        first.methods.append(method)
+        copied.bases.append("cls:mod:m:Base")
+        first.decorators.extend(["dataclass"])
+
+        assert first.methods == [method] and second.methods == []
+        assert copied.bases == ["cls:mod:m:Base"] and cls.bases == [] and second.bases == []
+        assert second.decorators == [] and first.methods is not first.fields
+
+    def test_empty_list_is_copied_on_first_write(self):
+        """Test a read empty list joins its entity when modified, and copies keep sharing the sentinel"""
+        restored = pickle.loads(pickle.dumps(MethodInfo(id="m", name="m", line_number=1, file_path="/m.py")))
+        calls = restored.calls
+        decorators = restored.decorators
+        copied = replace(restored)
+
+        calls.append("func:mod:m:log")
+        calls += ["func:mod:m:save"]
+        restored.args += ["self"]
+        assert restored.calls is calls and restored.calls == ["func:mod:m:log", "func:mod:m:save"]
+        assert restored.args == ["self"] and decorators == [] and restored.decorators == []
+        assert copied.calls == [] and MethodInfo.__dict__['calls'].slot.__get__(copied) is EMPTY_LIST
+        assert pickle.loads(pickle.dumps(restored)).calls == ["func:mod:m:log", "func:mod:m:save"]
+        assert json.loads(json.dumps(restored.calls)) == restored.calls
+
+    def test_memory_benchmark(self):
+        """Test 20k methods from worker payloads take far less memory than plain dataclasses"""
+        def resident(cls):
+            payloads = [worker_payload(cls, index) for index in range(1000)]
+            tracemalloc.start()
+            entities = [pickle.loads(payload) for payload in payloads]
+            size, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            assert sum(map(len, entities)) == 20000
+            return size
+
+        plain, compact = resident(PlainMethodInfo), resident(MethodInfo)
+        assert compact < plain * 0.8  # ~30% less on 3.11, whose plain instances already store values inline
+
+
+class TestResultIndexes:
+    """Lazily built relationship/entity indexes and neighbourhood queries"""
+
+    def make_result(self):
+        graph = DependencyGraph(
+            packages=[PackageInfo(id="pkg:shop", name="shop", path="/shop")],
+            modules=[ModuleInfo(id=f"mod:shop.{name}", name=f"shop.{name}", file_path=f"/shop/{name}.py",
+                                package_id="pkg:shop") for name in ("cart", "items", "tax")],
+            classes=[ClassInfo(id="cls:mod:shop.cart:Cart", name="Cart", module_id="mod:shop.cart",
+                               line_number=1, file_path="/shop/cart.py")],
+            methods=[MethodInfo(id="meth:cls:mod:shop.cart:Cart:add", name="add", line_number=2,
+                                file_path="/shop/cart.py", class_id="cls:mod:shop.cart:Cart")]
+        )
+        edges = [("mod:shop.cart", "mod:shop.items", DependencyType.IMPORT),
+                 ("mod:shop.items", "mod:shop.tax", DependencyType.IMPORT),
+                 ("meth:cls:mod:shop.cart:Cart:add", "mod:shop.items", DependencyType.CALL),
+                 ("mod:shop.tax", "mod:shop.cart", DependencyType.CALL)]
+        relationships = [Relationship(id=f"rel:{i}", from_entity=source, to_entity=target, relationship_type=kind,
+                                      line_number=i, file_path="/shop/cart.py")
+                         for i, (source, target, kind) in enumerate(edges)]
+        project_info = ProjectInfo(name="shop", path="/shop", analyzed_at="2024-01-01T00:00:00",
+                                   total_files=3, analysis_duration_seconds=1.0)
+        return AnalysisResult(analysis_id="shop", project_info=project_info, dependency_graph=graph,
+                              relationships=relationships)
+
+    def test_queries_match_linear_scans(self):
+        """Test indexed queries return what a scan would, in list order"""
+        result = self.make_result()
+        items = "mod:shop.items"
+
+        assert result.get_entity_relationships(items) == [
+            r for r in result.relationships if items in (r.from_entity, r.to_entity)]
+        assert result.get_relationships_by_type(DependencyType.CALL) == [
+            r for r in result.relationships if r.relationship_type == DependencyType.CALL]
+        assert result.get_entity("cls:mod:shop.cart:Cart").name == "Cart"
+        assert [e.id for e in result.dependency_graph.get_children("mod:shop.cart")] == ["cls:mod:shop.cart:Cart"]
+        assert len(result.dependency_graph.get_children("pkg:shop")) == 3
+
+    def test_indexes_follow_direct_list_changes(self):
+        """Test appending to or replacing the lists refreshes the indexes"""
+        result = self.make_result()
+        assert result.get_entity_relationships("mod:shop.new") == []
+        assert result.get_entity("mod:shop.new") is None
+
+        result.relationships.append(Relationship(id="rel:new", from_entity="mod:shop.new", to_entity="mod:shop.tax",
+                                                 relationship_type=DependencyType.IMPORT, line_number=1,
+                                                 file_path="/shop/new.py"))
+        result.dependency_graph.modules.append(ModuleInfo(id="mod:shop.new", name="shop.new",
+                                                          file_path="/shop/new.py"))
+        assert [r.id for r in result.get_entity_relationships("mod:shop.new")] == ["rel:new"]
+        assert result.get_entity("mod:shop.new").name == "shop.new"
+
+        result.dependency_graph.modules = result.dependency_graph.modules[:1]
+        result.relationships = result.relationships[:1]
+        assert result.get_entity("mod:shop.tax") is None
+        assert result.get_entity_relationships("mod:shop.tax") == []
+
+    def test_neighborhood_and_subgraph(self):
+        """Test neighbourhoods follow the requested types/direction and subgraphs keep inner edges"""
+        result = self.make_result()
+
+        imports = result.neighborhood("mod:shop.cart", depth=2, types=["import"], direction="out")
+        assert [m.id for m in imports.dependency_graph.modules] == ["mod:shop.cart", "mod:shop.items", "mod:shop.tax"]
+        assert [r.id for r in imports.relationships] == ["rel:0", "rel:1"]
+
+        callers = result.neighborhood("mod:shop.items", depth=1, direction="in")
+        assert {e.id for e in callers.dependency_graph.methods} == {"meth:cls:mod:shop.cart:Cart:add"}
+        assert {r.id for r in callers.relationships} == {"rel:0", "rel:2"}
+
+        modules_only = result.subgraph(lambda entity: isinstance(entity, ModuleInfo))
+        assert [r.id for r in modules_only.relationships] == ["rel:0", "rel:1", "rel:3"]
+        assert modules_only.dependency_graph.classes == []
+
+    def test_indexes_are_not_pickled(self):
+        """Test cached results do not carry the derived indexes"""
+        result = self.make_result()
+        result.get_entity_relationships("mod:shop.cart")
+        result.get_entity("mod:shop.cart")
+
+        restored = pickle.loads(pickle.dumps(result))
+        assert restored._relationship_index is None and restored.dependency_graph._index is None
+        assert restored.get_entity("mod:shop.cart").name == "shop.cart"
@@ -0,0 +1,354 @@
+"""
+Tests for PyView parallel scheduling (bounded window, ordering and memory backpressure)
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pyview.models import (
+    AnalysisResult, ClassInfo, DependencyGraph, DependencyType, FieldInfo, MethodInfo, ModuleInfo, PackageInfo,
+    ProjectInfo, Relationship
+)
+from pyview.performance_optimizer import (
+    CursorPaginator, InvalidCursorError, MemoryMonitor, ParallelAnalyzer, PerformanceConfig,
+    WorkerController, file_size
+)
+from pyview.snapshot import AnalysisSnapshot, write_snapshot, HAS_NUMPY
+
+MB = 1024 * 1024
+
+
+def size_and_pid(path: str):
+    return file_size(path), os.getpid()
+
+
+def build_tree(root: str, file_count: int):
+    """Synthetic project: packages of 100 modules with sizes varying by index"""
+    paths = []
+    for i in range(file_count):
+        package = os.path.join(root, f"pkg{i // 100}")
+        if i % 100 == 0:
+            os.makedirs(package)
+        path = os.path.join(package, f"mod{i % 100}.py")
+        with open(path, 'w') as f:
+            f.write("x = 1\n" * (i % 37))
+        paths.append(path)
+    return paths
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+    """Thread pool that records every submission with the in-flight count at that time"""
+
+    def __init__(self, max_workers, monitor=None):
+        super().__init__(max_workers=max_workers)
+        self.monitor = monitor
+        self.lock = threading.Lock()
+        self.running = 0
+        self.submitted = []
+        self.in_flight_at_submit = []
+        self.ratio_at_submit = []
+
+    def submit(self, fn, *args, **kwargs):
+        with self.lock:
+            self.running += 1
+            self.submitted.append(args[0])
+            self.in_flight_at_submit.append(self.running)
+            if self.monitor is not None:
+                self.ratio_at_submit.append(self.monitor.ratio)
+
+        def run():
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self.lock:
+                    self.running -= 1
+
+        return super().submit(run)
+
+
+class FakeMemoryMonitor:
+    """Memory usage set by the test; garbage collection frees it after a few calls"""
+
+    def __init__(self, collections_to_free=3):
+        self.ratio = 0.1
+        self.collections = 0
+        self.collections_to_free = collections_to_free
+
+    def usage_ratio(self):
+        return self.ratio
+
+    def is_memory_critical(self):
+        return self.ratio > 0.8
+
+    def force_garbage_collection(self):
+        self.collections += 1
+        if self.collections >= self.collections_to_free:
+            self.ratio = 0.5
+
+
+class ScriptedTreeMonitor:
+    """Process tree whose parent and worker memory are set by the test"""
+
+    def __init__(self, max_memory_mb, parent_mb, workers_mb):
+        self.max_memory_bytes = max_memory_mb * MB
+        self.parent = parent_mb * MB
+        self.set_workers(workers_mb)
+
+    def set_workers(self, workers_mb):
+        self.workers = [mb * MB for mb in workers_mb]
+
+    def get_parent_memory(self):
+        return self.parent
+
+    def get_worker_memory(self):
+        return list(self.workers)
+
+    def get_memory_usage(self):
+        return self.parent + sum(self.workers)
+
+
+class TestWorkerMemory:
+    """Memory budget over the worker tree and the adaptive worker count"""
+
+    def test_monitor_counts_child_processes(self):
+        """Test memory held by a child process counts towards the budget"""
+        child = subprocess.Popen([sys.executable, "-c",
+                                  "import sys, time; b = bytearray(96 << 20); print(1, flush=True); time.sleep(60)"],
+                                 stdout=subprocess.PIPE)
+        try:
+            child.stdout.readline()
+            tree = MemoryMonitor(1024, sample_interval=0)
+            parent_only = MemoryMonitor(1024, include_children=False, sample_interval=0)
+
+            assert max(tree.get_worker_memory()) >= 96 * MB
+            assert tree.get_memory_usage() - parent_only.get_memory_usage() >= 96 * MB
+            assert tree.get_memory_stats()['workers'] >= 1
+        finally:
+            child.kill()
+            child.wait()
+
+    def test_controller_grows_stepwise_and_shrinks_at_once(self):
+        """Test the active count follows (budget - parent) / worker footprint"""
+        monitor = ScriptedTreeMonitor(1000, parent_mb=100, workers_mb=[150])
+        controller = WorkerController(monitor, min_workers=1, max_workers=8, target_ratio=0.7)
+
+        assert [controller.update() for _ in range(5)] == [2, 3, 4, 4, 4]
+
+        monitor.set_workers([150, 150, 400, 150])  # One huge file
+        assert controller.update() == 1
+
+        monitor.set_workers([50, 50])  # Small files again: the footprint decays slowly
+        counts = [controller.update() for _ in range(40)]
+        assert counts[0] == 1 and counts == sorted(counts) and counts[-1] == 8
+
+    def test_adaptive_run_with_recycled_workers(self):
+        """Test an adaptive run stays within max_workers and recycles workers after N tasks"""
+        paths = build_tree(tempfile.mkdtemp(), 200)
+        analyzer = ParallelAnalyzer(PerformanceConfig(max_workers=3, max_tasks_per_child=50, enable_progress=False))
+
+        results = analyzer.process_parallel(paths, size_and_pid)
+
+        assert [size for size, _ in results] == [len("x = 1\n") * (i % 37) for i in range(200)]
+        assert 1 <= analyzer.peak_active_workers <= 3
+        if sys.version_info >= (3, 11):
+            assert len({pid for _, pid in results}) >= 200 // 50
+
+
+class TestParallelAnalyzer:
+    """Scheduler behaviour on a synthetic 20k-file tree and under memory pressure"""
+
+    def test_synthetic_tree_in_worker_processes(self):
+        """Test every file of a 20k-file tree is processed once, in task order, within the window"""
+        paths = build_tree(tempfile.mkdtemp(), 20000)
+        analyzer = ParallelAnalyzer(PerformanceConfig(max_workers=2, max_in_flight=8, adaptive_workers=False,
+                                                      enable_progress=False))
+
+        results = analyzer.process_parallel(paths, file_size)
+
+        assert results == [len("x = 1\n") * (i % 37) for i in range(20000)]
+        assert analyzer.peak_in_flight == 8
+        assert analyzer.failed_tasks == 0
+
+    def test_largest_files_first_within_window(self):
+        """Test submission order is by descending size and the window is never exceeded"""
+        paths = build_tree(tempfile.mkdtemp(), 20000)
+        executors = []
+
+        def make_executor(workers):
+            executors.append(RecordingExecutor(workers))
+            return executors[0]
+
+        analyzer = ParallelAnalyzer(PerformanceConfig(max_workers=4, max_in_flight=6, adaptive_workers=False,
+                                                      enable_progress=False),
+                                    executor_factory=make_executor)
+        order = [paths[index] for index, _ in analyzer.iter_parallel(paths, file_size)]
+
+        assert len(order) == 20000 and set(order) == set(paths)
+        assert max(executors[0].in_flight_at_submit) <= 6
+        sizes = [file_size(path) for path in executors[0].submitted]
+        assert sizes == sorted(sizes, reverse=True)
+
+    def test_memory_pressure_pauses_submission(self):
+        """Test submission stops at critical memory and resumes only once usage drops"""
+        monitor = FakeMemoryMonitor()
+        executor = RecordingExecutor(1, monitor)
+
+        def worker(task):
+            if task == 2:
+                monitor.ratio = 0.9  # This task pushes memory over the limit
+            time.sleep(0.001)
+            return task * 10
+
+        analyzer = ParallelAnalyzer(PerformanceConfig(max_workers=1, max_in_flight=1, adaptive_workers=False,
+                                                      enable_progress=False),
+                                    memory_monitor=monitor, executor_factory=lambda workers: executor)
+        results = analyzer.process_parallel(list(range(6)), worker, task_size=lambda task: -task)
+
+        assert results == [0, 10, 20, 30, 40, 50]
+        assert analyzer.memory_pauses == 1
+        assert monitor.collections >= 3
+        assert all(ratio < 0.7 for ratio in executor.ratio_at_submit)
+
+    def test_failures_are_skipped_and_closures_rejected(self):
+        """Test failing tasks are counted and unpicklable workers fail before any work"""
+        def flaky(task):
+            if task % 2:
+                raise ValueError(task)
+            return task
+
+        analyzer = ParallelAnalyzer(PerformanceConfig(max_workers=2, enable_progress=False),
+                                    executor_factory=lambda workers: ThreadPoolExecutor(workers))
+        assert analyzer.process_parallel(list(range(6)), flaky) == [0, 2, 4]
+        assert analyzer.failed_tasks == 3
+
+        with pytest.raises(TypeError, match="cannot be pickled"):
+            ParallelAnalyzer(PerformanceConfig(max_workers=1)).process_parallel(["a.py"], flaky)
+
+
+def serialized_result():
+    """Result dict with two packages, each holding modules, classes, methods and fields"""
+    packages, modules, classes, methods, fields, relationships = [], [], [], [], [], []
+    for p in ("alpha", "beta"):
+        packages.append({'id': f"pkg:{p}", 'name': p})
+        for m in range(3):
+            module_id = f"mod:{p}.m{m}"
+            path = f"/src/{p}/m{m}.py"
+            modules.append({'id': module_id, 'name': f"{p}.m{m}", 'file_path': path, 'package_id': f"pkg:{p}"})
+            class_id = f"cls:{module_id}:Widget{m}"
+            classes.append({'id': class_id, 'name': f"Widget{m}", 'module_id': module_id, 'file_path': path})
+            for name in ("render", "update"):
+                methods.append({'id': f"meth:{class_id}:{name}", 'name': name, 'file_path': path,
+                                'class_id': class_id})
+            methods.append({'id': f"func:{module_id}:render_all", 'name': "render_all", 'file_path': path})
+            fields.append({'id': f"field:{class_id}:size", 'name': "size", 'class_id': class_id, 'file_path': path})
+            relationships.append({'id': f"rel:{module_id}", 'from_entity': module_id,
+                                  'to_entity': "mod:alpha.m0", 'relationship_type': "import"})
+    return {
+        'analysis_id': "0123456789",
+        'dependency_graph': {'packages': packages, 'modules': modules, 'classes': classes,
+                             'methods': methods, 'fields': fields},
+        'relationships': relationships
+    }
+
+
+def result_model(serialized):
+    """The AnalysisResult a serialized_result() dict describes"""
+    graph = serialized['dependency_graph']
+    return AnalysisResult(
+        analysis_id=serialized['analysis_id'],
+        project_info=ProjectInfo(name="demo", path="/src", analyzed_at="", total_files=6,
+                                 analysis_duration_seconds=0.0),
+        dependency_graph=DependencyGraph(
+            packages=[PackageInfo(id=p['id'], name=p['name'], path="/src") for p in graph['packages']],
+            modules=[ModuleInfo(**m) for m in graph['modules']],
+            classes=[ClassInfo(line_number=1, **c) for c in graph['classes']],
+            methods=[MethodInfo(line_number=1, **m) for m in graph['methods']],
+            fields=[FieldInfo(line_number=1, **f) for f in graph['fields']]),
+        relationships=[Relationship(id=r['id'], from_entity=r['from_entity'], to_entity=r['to_entity'],
+                                    relationship_type=DependencyType.IMPORT, line_number=1, file_path="")
+                       for r in serialized['relationships']])
+
+
+class TestCursorPaginator:
+    """Complete results served as stable, filtered pages"""
+
+    def walk(self, paginator, **filters):
+        ids, cursor = [], None
+        while True:
+            page = paginator.page(cursor=cursor, **filters)
+            ids.extend(item['id'] for item in page['items'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                return ids, page
+
+    def test_pages_cover_every_row_once(self):
+        """Test walking all pages returns each entity exactly once, grouped by type"""
+        paginator = CursorPaginator(serialized_result(), page_size=4)
+        ids, last_page = self.walk(paginator)
+
+        assert len(ids) == len(set(ids)) == len(paginator) == 2 + 6 + 6 + 18 + 6 + 6
+        assert ids[:2] == ["pkg:alpha", "pkg:beta"]
+        assert last_page['total'] == len(ids)
+        assert last_page['counts'] == {'package': 2, 'module': 6, 'class': 6, 'method': 18,
+                                       'field': 6, 'relationship': 6}
+
+    def test_filters_by_type_package_and_text(self):
+        """Test type, package and text filters combine, with counts for the filtered rows"""
+        paginator = CursorPaginator(serialized_result(), page_size=2)
+
+        ids, page = self.walk(paginator, entity_type="method", package="pkg:beta", text="RENDER")
+        assert page['total'] == len(ids) == 6
+        assert all(i.startswith("meth:cls:mod:beta") or i.startswith("func:mod:beta") for i in ids)
+
+        page = paginator.page(package="pkg:alpha", text="m1")
+        assert page['counts'] == {'module': 1, 'class': 1, 'method': 3, 'field': 1, 'relationship': 1}
+
+    def test_model_pages_match_serialized_pages(self):
+        """Test paging the AnalysisResult itself gives the pages of its serialized form"""
+        model = result_model(serialized_result())
+        from_model = CursorPaginator(model, page_size=5)
+        from_dict = CursorPaginator(model.to_dict(), page_size=5)
+
+        assert self.walk(from_model) == self.walk(from_dict)
+        page = from_model.page(entity_type="relationship", package="pkg:beta")
+        assert page == from_dict.page(entity_type="relationship", package="pkg:beta")
+        assert page['items'][0]['relationship_type'] == "import"
+
+    @pytest.mark.skipif(not HAS_NUMPY, reason="snapshots require NumPy")
+    def test_snapshot_pages_match_model_pages(self, tmp_path):
+        """Test paging a snapshot gives the model's pages and builds only the entities shown"""
+        model = result_model(serialized_result())
+        write_snapshot(model, tmp_path / "result.snap")
+        from_model = CursorPaginator(model, page_size=5)
+
+        with AnalysisSnapshot(tmp_path / "result.snap") as snapshot:
+            from_snapshot = CursorPaginator(snapshot, page_size=5)
+            assert len(from_snapshot) == len(from_model) and not snapshot._entities
+
+            page = from_snapshot.page(entity_type="method", package="pkg:beta", text="render")
+            assert page == from_model.page(entity_type="method", package="pkg:beta", text="render")
+            assert len(snapshot._entities) == 5
+
+            assert self.walk(from_snapshot) == self.walk(from_model)
+            assert (from_snapshot.page(entity_type="relationship", package="pkg:beta")
+                    == from_model.page(entity_type="relationship", package="pkg:beta"))
+
+    def test_cursors_are_checked(self):
+        """Test cursors from another result or garbage are rejected"""
+        paginator = CursorPaginator(serialized_result(), page_size=3)
+        other = dict(serialized_result(), analysis_id="ffffffff")
+        cursor = CursorPaginator(other, page_size=3).page()['next_cursor']
+
+        with pytest.raises(InvalidCursorError):
+            paginator.page(cursor=cursor)
+        with pytest.raises(InvalidCursorError):
+            paginator.page(cursor="not-a-cursor")
+        with pytest.raises(ValueError):
+            paginator.page(entity_type="variable")
@@ -0,0 +1,179 @@
+"""
+Tests for PyView large-project pipeline (segment spill and streaming integration)
+"""
+
+import os
+import tempfile
+
+from pyview.analyzer_engine import AnalyzerEngine, AnalysisOptions, ProgressCallback
+from pyview.ast_analyzer import ASTAnalyzer
+from pyview.cache_manager import CacheManager
+from pyview.pipeline import SegmentFile, StreamingIntegrator
+
+
+SOURCE = '''
+class Model{n}:
+    size: int = 0
+
+    def save(self, path):
+        return open(path, "w").write(str(self.size))
+
+
+def build{n}():
+    return Model{n}().save("out")
+'''
+
+
+class CriticalMonitor:
+    """Memory monitor that always reports critical usage"""
+
+    def is_memory_critical(self):
+        return True
+
+
+def write_project(file_count: int) -> str:
+    root = tempfile.mkdtemp()
+    os.makedirs(os.path.join(root, "pkg"))
+    with open(os.path.join(root, "pkg", "__init__.py"), 'w') as f:
+        f.write("")
+    for n in range(file_count):
+        with open(os.path.join(root, "pkg", f"mod{n}.py"), 'w') as f:
+            f.write(SOURCE.format(n=n))
+    return root
+
+
+def analyse(root: str):
+    analyzer = ASTAnalyzer()
+    return [analyzer.analyze_file(os.path.join(root, "pkg", name))
+            for name in sorted(os.listdir(os.path.join(root, "pkg")))]
+
+
+class TestSegmentFile:
+    """Length-prefixed records survive appends, random reads and iteration"""
+
+    def test_append_read_iterate_and_delete(self):
+        """Test records come back by offset and in order, and the file is removed on close"""
+        with SegmentFile(tempfile.mkdtemp()) as segment:
+            offsets = [segment.append({'batch': i, 'items': list(range(i))}) for i in range(5)]
+            path = segment.path
+
+            assert segment.read(offsets[3]) == {'batch': 3, 'items': [0, 1, 2]}
+            assert [record['batch'] for record in segment] == [0, 1, 2, 3, 4]
+            assert len(segment) == 5
+        assert not os.path.exists(path)
+
+
+class TestStreamingIntegrator:
+    """Spilled and resident batches integrate to the same tables"""
+
+    def test_strings_are_shared_across_entities(self):
+        """Test every entity of a file points at one file path object"""
+        integrator = StreamingIntegrator(batch_size=2)
+        for analysis in analyse(write_project(3)):
+            integrator.add(analysis)
+        tables = integrator.tables()
+
+        methods = [m for m in tables['methods'] if m.name == 'save']
+        classes = {c.id: c for c in tables['classes']}
+        assert len(methods) == 3
+        for method in methods:
+            owner = classes[method.class_id]
+            assert method.file_path is owner.file_path
+            assert method.class_id is owner.id
+
+    def test_spilled_tables_match_resident_tables(self):
+        """Test spilling every batch to disk returns the same entities in arrival order"""
+        analyses = analyse(write_project(7))
+        resident = StreamingIntegrator(batch_size=3)
+        spilling = StreamingIntegrator(CriticalMonitor(), batch_size=3, spill_dir=tempfile.mkdtemp())
+        for analysis in analyses:
+            resident.add(analysis)
+            spilling.add(analysis)
+
+        expected = resident.tables()
+        segment_path = spilling.segment.path
+        actual = spilling.tables()
+
+        assert spilling.get_stats()['spilled_batches'] == 3
+        assert not os.path.exists(segment_path)
+        for name in ('modules', 'classes', 'methods', 'fields', 'relationships'):
+            assert [e.id for e in actual[name]] == [e.id for e in expected[name]]
+        assert [module for module, _ in actual['quality']] == [module for module, _ in expected['quality']]
+
+    def test_large_project_path_is_unaffected_by_spilling(self):
+        """Test the engine's large-project result is the same with and without spills"""
+        root = write_project(12)
+
+        def run(max_memory_mb):
+            engine = AnalyzerEngine(AnalysisOptions(max_workers=1, enable_caching=False,
+                                                    max_memory_mb=max_memory_mb))
+            engine.large_project_analyzer.config.batch_size = 4
+            engine.current_analysis_id = "large"
+            files = engine._discover_project_files(root)
+            result = engine._analyze_large_project(root, files, ProgressCallback(lambda data: None), 0.0)
+            return result, engine
+
+        relaxed, _ = run(1 << 20)
+        spilled, engine = run(1)
+
+        graph = spilled.dependency_graph
+        assert len(graph.modules) == 13 and len(graph.methods) == 24
+        assert [m.id for m in graph.methods] == [m.id for m in relaxed.dependency_graph.methods]
+        assert [r.id for r in spilled.relationships] == [r.id for r in relaxed.relationships]
+        assert spilled.relationships
+        assert [q.entity_id for q in spilled.quality_metrics] == [q.entity_id for q in relaxed.quality_metrics]
+        assert spilled.metrics['quality_distribution'] == relaxed.metrics['quality_distribution']
+        assert spilled.metrics['quality_distribution']['entity_count'] == len(spilled.quality_metrics) > 0
+        assert spilled.metrics['quality_distribution']['method'] == 'exact'
+        assert len(engine.file_metadata) == 13
+
+    def test_large_project_result_is_complete(self):
+        """Test a project past the old truncation limits keeps every module, package and import cycle"""
+        root = write_project(1001)
+        with open(os.path.join(root, "pkg", "mod0.py"), 'a') as f:
+            f.write("\nfrom pkg import mod1\n")
+        with open(os.path.join(root, "pkg", "mod1.py"), 'a') as f:
+            f.write("\nfrom pkg import mod0\n")
+
+        engine = AnalyzerEngine(AnalysisOptions(max_workers=1, enable_caching=False))
+        engine.current_analysis_id = "large"
+        files = engine._discover_project_files(root)
+        result = engine._analyze_large_project(root, files, ProgressCallback(lambda data: None), 0.0)
+
+        graph = result.dependency_graph
+        assert len(graph.modules) == 1002 and len(graph.methods) == 2002
+        assert [p.name for p in graph.packages] == ["pkg"] and len(graph.packages[0].modules) == 1001
+        assert [sorted(c.entities) for c in result.cycles] == [["mod:pkg.mod0", "mod:pkg.mod1"]]
+        assert result.metrics['entity_counts']['relationships'] == len(result.relationships) > 1000
+
+    def test_large_project_result_is_cached(self):
+        """Test a large-path result (with its per-entity metrics) is cached and merged incrementally"""
+        root = write_project(6)
+        cache_manager = CacheManager(tempfile.mkdtemp())
+
+        def run():
+            engine = AnalyzerEngine(AnalysisOptions(max_workers=1, enable_caching=True, max_memory_mb=1),
+                                    cache_manager=cache_manager)
+            return engine.analyze_project(root), engine
+
+        first, engine = run()
+        assert engine.analysis_plan.strategy == "large"
+        assert first.metrics['quality_distribution']['entity_count'] > 0
+
+        cached, _ = run()
+        assert cached.analysis_id == first.analysis_id
+        assert cached.metrics['quality_distribution'] == first.metrics['quality_distribution']
+
+        with open(os.path.join(root, "pkg", "mod0.py"), 'a') as f:
+            f.write("\ndef extra():\n    return 1\n")
+        engine = AnalyzerEngine(AnalysisOptions(max_workers=1, enable_caching=True, max_memory_mb=1),
+                                cache_manager=cache_manager)
+
+        def fail_full_analysis(*args, **kwargs):
+            raise AssertionError("incremental run re-ran the full analysis")
+        engine._perform_planned_analysis = fail_full_analysis
+        updated = engine.analyze_project(root)
+        assert updated.analysis_id != first.analysis_id
+        assert len(updated.dependency_graph.methods) == len(first.dependency_graph.methods) + 1
+        assert len(updated.quality_metrics) == len(first.quality_metrics) + 1
+        assert updated.metrics['quality_distribution']['entity_count'] == len(updated.quality_metrics)
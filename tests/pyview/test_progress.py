@@ -0,0 +1,113 @@
+"""
+Tests for PyView progress channel (coalesced snapshots, stage timings and ETA)
+"""
+
+import os
+import tempfile
+import time
+
+from pyview.analyzer_engine import AnalyzerEngine, AnalysisOptions, ProgressCallback
+from pyview.progress import ProgressChannel
+
+
+class FakeClock:
+    """Clock advanced by the test"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestProgressChannel:
+    """Counters are cheap; snapshots are rate limited and carry totals, timings and ETA"""
+
+    def test_snapshots_are_rate_limited(self):
+        """Test per-file advances emit at most once per interval"""
+        clock = FakeClock()
+        snapshots = []
+        channel = ProgressChannel(snapshots.append, rate_hz=10, clock=clock)
+        channel.update("Analyzing files", 30)
+        channel.set_totals(1000, end_progress=65)
+
+        for _ in range(1000):
+            clock.now += 0.001  # 1 ms per file: one second in total
+            channel.advance()
+
+        assert 10 <= len(snapshots) <= 12
+        assert snapshots[-1]['files_done'] >= 990 and snapshots[-1]['files_total'] == 1000
+        progress = [snapshot['progress'] for snapshot in snapshots]
+        assert progress == sorted(progress) and 30 <= progress[0] and progress[-1] <= 65
+
+    def test_bytes_drive_progress_and_eta(self):
+        """Test progress and ETA follow bytes when the byte total is known"""
+        clock = FakeClock()
+        snapshots = []
+        channel = ProgressChannel(snapshots.append, rate_hz=0, clock=clock)
+        channel.update("Analyzing files", 0)
+        channel.set_totals(4, bytes_total=1000, end_progress=100)
+
+        clock.now += 2.0
+        channel.advance(bytes_done=250)
+        channel.advance(failed=1)
+
+        snapshot = snapshots[-1]
+        assert snapshot['progress'] == 25.0
+        assert snapshot['eta_seconds'] == 6.0
+        assert snapshot['bytes_per_second'] == 125.0
+        assert (snapshot['files_done'], snapshot['failed_files']) == (2, 1)
+
+    def test_stage_timings(self):
+        """Test each finished stage is timed and counters reset on a stage change"""
+        clock = FakeClock()
+        snapshots = []
+        channel = ProgressChannel(snapshots.append, clock=clock)
+        channel.update("Discovering project files", 5, project="demo")
+        clock.now += 0.5
+        channel.update("Analyzing files", 30)
+        channel.set_totals(10)
+        clock.now += 1.5
+        channel.advance(files=10)
+        channel.update("Assembling final results", 95)
+
+        assert snapshots[0]['project'] == "demo"
+        assert snapshots[-1]['stage_timings'] == [
+            {'stage': "Discovering project files", 'seconds': 0.5},
+            {'stage': "Analyzing files", 'seconds': 1.5, 'files': 10, 'bytes': 0, 'failed': 0}
+        ]
+        assert snapshots[-1]['files_done'] == 0 and snapshots[-1]['files_total'] is None
+
+    def test_hundred_thousand_files(self):
+        """Test counting 100k files with the real clock is cheap and sends few snapshots"""
+        snapshots = []
+        channel = ProgressChannel(snapshots.append)
+        channel.update("Analyzing files", 30)
+        channel.set_totals(100000, end_progress=65)
+
+        started = time.perf_counter()
+        for _ in range(100000):
+            channel.advance(bytes_done=2048)
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 1.0
+        assert len(snapshots) <= elapsed * 10 + 2
+
+    def test_engine_reports_file_counts(self):
+        """Test an engine run reports real file counts instead of one update per file"""
+        root = tempfile.mkdtemp()
+        for n in range(60):
+            with open(os.path.join(root, f"mod{n}.py"), 'w') as f:
+                f.write(f"def handler{n}(event):\n    return event\n")
+        snapshots = []
+        engine = AnalyzerEngine(AnalysisOptions(max_workers=1, enable_caching=False))
+
+        engine.analyze_project(root, ProgressCallback(snapshots.append))
+
+        file_updates = [s for s in snapshots if s['stage'] == "Analyzing files"]
+        assert len(file_updates) < 60
+        assert file_updates[-1]['files_total'] == 60
+        assert snapshots[-1]['stage'] == "Analysis complete" and snapshots[-1]['progress'] == 100
+        timings = {timing['stage']: timing for timing in snapshots[-1]['stage_timings']}
+        assert timings["Analyzing files"]['files'] == 60 and timings["Analyzing files"]['failed'] == 0
+        assert "Discovering project files" in timings
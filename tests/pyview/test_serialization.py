@@ -0,0 +1,64 @@
+"""
+Tests for PyView result serialization (streamed JSON, optional fast backends)
+"""
+
+import importlib.util
+import json
+import sys
+
+import pytest
+
+import pyview.serialization as serialization
+from pyview.models import DependencyGraph, DependencyType, MethodInfo, Relationship
+from pyview.serialization import decode_json, encode_json, encode_msgpack, iter_json, HAS_MSGPACK
+
+
+class TestSerialization:
+    """Encoded output matches to_dict() without building it"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, analyze_shop):
+        self.analyze = analyze_shop
+
+    def test_json_matches_to_dict(self):
+        """Test the streamed JSON decodes to the same document as to_json()"""
+        result = self.analyze()
+
+        encoded = encode_json(result)
+
+        assert decode_json(encoded) == json.loads(result.to_json())
+        assert b"\n" not in encoded and b"_classes_map" not in encoded
+        assert result.to_json(indent=None) == encoded.decode()
+
+    def test_lists_are_streamed_in_batches(self):
+        """Test entity lists are split into chunks and the batch size does not change the output"""
+        relationships = [Relationship(id=f"rel{i}", from_entity=f"a{i}", to_entity=f"b{i}",
+                                      relationship_type=DependencyType.CALL, line_number=i, file_path="/m.py")
+                         for i in range(10)]
+        graph = DependencyGraph(methods=[MethodInfo(id="m", name="m", line_number=1, file_path="/m.py")])
+
+        chunks = list(iter_json(graph, batch_size=1))
+
+        assert len(chunks) > 5
+        assert encode_json(relationships, batch_size=3) == encode_json(relationships)
+        assert decode_json(b"".join(chunks))['methods'][0]['id'] == "m"
+        assert decode_json(encode_json({"plain": [1, 2]})) == {"plain": [1, 2]}
+
+    def test_standard_library_backend(self, monkeypatch):
+        """Test the encoder without orjson produces the same document"""
+        monkeypatch.setitem(sys.modules, "orjson", None)
+        spec = importlib.util.spec_from_file_location("pyview_serialization_stdlib", serialization.__file__)
+        fallback = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(fallback)
+        result = self.analyze()
+
+        assert not fallback.HAS_ORJSON
+        assert json.loads(fallback.encode_json(result)) == json.loads(result.to_json())
+
+    @pytest.mark.skipif(not HAS_MSGPACK, reason="msgpack is not installed")
+    def test_msgpack(self):
+        """Test MessagePack output has the JSON layout"""
+        import msgpack
+        result = self.analyze()
+
+        assert msgpack.unpackb(encode_msgpack(result), raw=False) == decode_json(encode_json(result))
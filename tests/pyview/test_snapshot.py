@@ -0,0 +1,79 @@
+"""
+Tests for PyView columnar analysis snapshots
+"""
+
+import json
+
+import pytest
+
+from pyview.models import Relationship, DependencyType, EntityType
+from pyview.snapshot import AnalysisSnapshot, write_snapshot, HAS_NUMPY
+
+pytestmark = pytest.mark.skipif(not HAS_NUMPY, reason="snapshots require NumPy")
+
+
+def as_json(result):
+    return json.loads(json.dumps(result.to_dict(), default=str))
+
+
+class TestAnalysisSnapshot:
+    """Columnar snapshots round-trip results and materialise entities lazily"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, analyze_shop, tmp_path):
+        self.analyze = analyze_shop
+        self.snapshot_path = str(tmp_path / "result.snap")
+
+    @pytest.mark.parametrize("compression", [None, "zlib", "lzma"])
+    def test_round_trip(self, compression):
+        """Test the materialised result equals the written one"""
+        result = self.analyze()
+        write_snapshot(result, self.snapshot_path, compression=compression)
+
+        with AnalysisSnapshot(self.snapshot_path) as snapshot:
+            assert snapshot.compression == compression
+            assert as_json(snapshot.to_analysis_result()) == as_json(result)
+
+    def test_lazy_entity_access(self):
+        """Test lookups by ID build only the requested entity"""
+        result = self.analyze()
+        write_snapshot(result, self.snapshot_path)
+        book = next(c for c in result.dependency_graph.classes if c.name == "Book")
+
+        snapshot = AnalysisSnapshot(self.snapshot_path)
+        assert snapshot.entity(book.id) == book
+        assert list(snapshot._entities) == [snapshot.index_of(book.id)]
+
+        row = snapshot.index_of(book.id)
+        module_row = snapshot.parent(row)
+        assert snapshot.entity_id(module_row) == book.module_id
+        assert snapshot.entity_kind(module_row) == EntityType.MODULE
+        assert row in snapshot.children(module_row)
+
+        expected = sorted(r.id for r in result.get_entity_relationships(book.id))
+        assert sorted(r.id for r in snapshot.relationships_of(book.id)) == expected
+        assert snapshot.index_of("cls:mod:missing:Nope") is None
+        snapshot.close()
+
+    def test_external_endpoints(self):
+        """Test edges to entities outside the graph keep their IDs"""
+        result = self.analyze()
+        module_id = result.dependency_graph.modules[0].id
+        result.relationships.append(Relationship(
+            id="rel:external", from_entity=module_id, to_entity="mod:os",
+            relationship_type=DependencyType.IMPORT, line_number=3, file_path="x.py", context="os"
+        ))
+        write_snapshot(result, self.snapshot_path, compression="zlib")
+
+        with AnalysisSnapshot(self.snapshot_path) as snapshot:
+            assert snapshot.relationships_of("mod:os")[0] == result.relationships[-1]
+            assert snapshot.entity("mod:os") is None
+            assert len(list(snapshot.entities(EntityType.MODULE))) == len(result.dependency_graph.modules)
+
+    def test_rejects_other_files(self):
+        """Test a file without the snapshot header is refused"""
+        with open(self.snapshot_path, 'wb') as f:
+            f.write(b"not a snapshot at all")
+
+        with pytest.raises(ValueError):
+            AnalysisSnapshot(self.snapshot_path)